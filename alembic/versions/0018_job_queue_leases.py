@@ -0,0 +1,35 @@
+"""Job queue leases — worker lease, heartbeat and retry scheduling columns.
+
+Revision ID: 0018
+Revises: 0017
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "0018"
+down_revision: str = "0017"
+branch_labels: tuple[str, ...] | None = None
+depends_on: tuple[str, ...] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("available_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("jobs", sa.Column("lease_owner", sa.String(100), nullable=True))
+    op.add_column("jobs", sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("jobs", sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_jobs_status_available", "jobs", ["status", "available_at"])
+    op.create_index("ix_jobs_status_lease", "jobs", ["status", "lease_expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_status_lease", table_name="jobs")
+    op.drop_index("ix_jobs_status_available", table_name="jobs")
+    op.drop_column("jobs", "heartbeat_at")
+    op.drop_column("jobs", "lease_expires_at")
+    op.drop_column("jobs", "lease_owner")
+    op.drop_column("jobs", "available_at")
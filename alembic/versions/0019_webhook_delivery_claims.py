@@ -0,0 +1,27 @@
+"""Webhook delivery claims — lets concurrent delivery engines claim rows.
+
+Revision ID: 0019
+Revises: 0018
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "0019"
+down_revision: str = "0018"
+branch_labels: tuple[str, ...] | None = None
+depends_on: tuple[str, ...] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("webhook_deliveries", sa.Column("claimed_by", sa.String(100), nullable=True))
+    op.add_column("webhook_deliveries", sa.Column("claimed_until", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("webhook_deliveries", "claimed_until")
+    op.drop_column("webhook_deliveries", "claimed_by")
@@ -0,0 +1,44 @@
+"""Usage rollups — hourly pre-aggregated usage counts, backfilled from usage_events.
+
+Revision ID: 0020
+Revises: 0019
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "0020"
+down_revision: str = "0019"
+branch_labels: tuple[str, ...] | None = None
+depends_on: tuple[str, ...] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "usage_rollups_hourly",
+        sa.Column("bucket_start", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("organization_id", sa.String(32), primary_key=True, server_default=""),
+        sa.Column("event_type", sa.String(50), primary_key=True),
+        sa.Column("total_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("event_count", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_usage_rollups_org_bucket", "usage_rollups_hourly", ["organization_id", "bucket_start"])
+
+    if op.get_bind().dialect.name == "postgresql":
+        bucket = "date_trunc('hour', created_at)"
+    else:
+        bucket = "strftime('%Y-%m-%d %H:00:00.000000', created_at)"
+    op.execute(
+        "INSERT INTO usage_rollups_hourly (bucket_start, organization_id, event_type, total_count, event_count) "  # noqa: S608 - fixed SQL fragments
+        f"SELECT {bucket}, COALESCE(organization_id, ''), event_type, SUM(count), COUNT(*) "
+        "FROM usage_events GROUP BY 1, 2, 3"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_usage_rollups_org_bucket", table_name="usage_rollups_hourly")
+    op.drop_table("usage_rollups_hourly")
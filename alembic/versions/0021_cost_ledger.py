@@ -0,0 +1,111 @@
+"""Cost ledger — typed per-event LLM costs and daily cost rollups, backfilled from usage_events.
+
+Revision ID: 0021
+Revises: 0020
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "0021"
+down_revision: str = "0020"
+branch_labels: tuple[str, ...] | None = None
+depends_on: tuple[str, ...] | None = None
+
+_COST_EVENT_TYPES = "('gateway_call', 'conversation_generated')"
+
+
+def _backfill_expressions(dialect: str) -> dict[str, str]:
+    if dialect == "postgresql":
+
+        def number(key: str, cast: str) -> str:
+            field = f"metadata->>'{key}'"
+            return f"CASE WHEN {field} ~ '^-?[0-9]+(\\.[0-9]+)?([eE][-+]?[0-9]+)?$' THEN ({field})::{cast} ELSE 0 END"
+
+        return {
+            "text": "metadata->>'{key}'",
+            "cost": number("cost_usd", "numeric"),
+            "input": f"CAST({number('input_tokens', 'numeric')} AS integer)",
+            "output": f"CAST({number('output_tokens', 'numeric')} AS integer)",
+            "tokens": f"CAST({number('tokens', 'numeric')} AS integer)",
+            "day": "CAST(created_at AT TIME ZONE 'UTC' AS date)",
+        }
+    return {
+        "text": "json_extract(metadata, '$.{key}')",
+        "cost": "COALESCE(CAST(json_extract(metadata, '$.cost_usd') AS REAL), 0)",
+        "input": "COALESCE(CAST(json_extract(metadata, '$.input_tokens') AS INTEGER), 0)",
+        "output": "COALESCE(CAST(json_extract(metadata, '$.output_tokens') AS INTEGER), 0)",
+        "tokens": "COALESCE(CAST(json_extract(metadata, '$.tokens') AS INTEGER), 0)",
+        "day": "date(created_at)",
+    }
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cost_ledger",
+        sa.Column("id", sa.String(32), primary_key=True),
+        sa.Column("usage_event_id", sa.String(32), nullable=False),
+        sa.Column("organization_id", sa.String(32), nullable=True),
+        sa.Column("event_type", sa.String(50), nullable=False),
+        sa.Column("provider", sa.String(50), nullable=False, server_default="unknown"),
+        sa.Column("model", sa.String(200), nullable=True),
+        sa.Column("job_id", sa.String(64), nullable=True),
+        sa.Column("cost_usd", sa.Numeric(14, 6), nullable=False, server_default="0"),
+        sa.Column("input_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("output_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_cost_ledger_usage_event_id", "cost_ledger", ["usage_event_id"])
+    op.create_index("ix_cost_ledger_org_created", "cost_ledger", ["organization_id", "created_at"])
+    op.create_index("ix_cost_ledger_org_provider_created", "cost_ledger", ["organization_id", "provider", "created_at"])
+    op.create_index("ix_cost_ledger_job", "cost_ledger", ["job_id"])
+
+    op.create_table(
+        "cost_rollups_daily",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("organization_id", sa.String(32), primary_key=True, server_default=""),
+        sa.Column("provider", sa.String(50), primary_key=True),
+        sa.Column("event_type", sa.String(50), primary_key=True),
+        sa.Column("cost_usd", sa.Numeric(18, 6), nullable=False, server_default="0"),
+        sa.Column("input_tokens", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("output_tokens", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("total_tokens", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("event_count", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_cost_rollups_org_day", "cost_rollups_daily", ["organization_id", "day"])
+
+    expr = _backfill_expressions(op.get_bind().dialect.name)
+    provider = f"substr({expr['text'].format(key='provider')}, 1, 50)"
+    model = f"substr({expr['text'].format(key='model')}, 1, 200)"
+    job_id = f"substr({expr['text'].format(key='job_id')}, 1, 64)"
+    op.execute(
+        "INSERT INTO cost_ledger (id, usage_event_id, organization_id, event_type, provider, model, job_id, "  # noqa: S608 - fixed SQL fragments
+        "cost_usd, input_tokens, output_tokens, total_tokens, created_at) "
+        f"SELECT id, id, organization_id, event_type, COALESCE({provider}, 'unknown'), {model}, "
+        f"COALESCE({job_id}, resource_id), {expr['cost']}, {expr['input']}, {expr['output']}, "
+        f"CASE WHEN {expr['tokens']} > 0 THEN {expr['tokens']} ELSE {expr['input']} + {expr['output']} END, "
+        f"created_at FROM usage_events WHERE event_type IN {_COST_EVENT_TYPES}"
+    )
+    day = expr["day"]
+    op.execute(
+        "INSERT INTO cost_rollups_daily (day, organization_id, provider, event_type, cost_usd, input_tokens, "  # noqa: S608 - fixed SQL fragments
+        "output_tokens, total_tokens, event_count) "
+        f"SELECT {day}, COALESCE(organization_id, ''), provider, event_type, SUM(cost_usd), SUM(input_tokens), "
+        "SUM(output_tokens), SUM(total_tokens), COUNT(*) "
+        f"FROM cost_ledger GROUP BY {day}, COALESCE(organization_id, ''), provider, event_type"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cost_rollups_org_day", table_name="cost_rollups_daily")
+    op.drop_table("cost_rollups_daily")
+    op.drop_index("ix_cost_ledger_job", table_name="cost_ledger")
+    op.drop_index("ix_cost_ledger_org_provider_created", table_name="cost_ledger")
+    op.drop_index("ix_cost_ledger_org_created", table_name="cost_ledger")
+    op.drop_index("ix_cost_ledger_usage_event_id", table_name="cost_ledger")
+    op.drop_table("cost_ledger")
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Benchmark the evaluation, privacy, parsing and rendering hot paths.
+
+Each benchmark runs one function over a synthetic batch from
+:mod:`benchmarks.corpus`, across a grid of conversation lengths (turns) and
+batch sizes, and reports per-batch timings and per-item latency:
+
+* ``rouge_l_score``: conversation text vs. a seed-derived reference.
+* ``compute_memorization_score``: conversation vs. its seed.
+* ``type_token_ratio``: tokens of the whole conversation.
+* ``pii_scan``: ``PIIScanner.scan`` on every turn (regex engine, plus
+  Presidio when it is installed).
+* ``prompt_shield``: ``PromptShield.scan`` on every turn.
+* ``jsonl_parse``: ``JSONLConversationParser.parse`` of the batch as OpenAI JSONL.
+* ``render_batch``: ChatML ``render_batch`` of the batch.
+
+Results are written as JSON with environment metadata so runs can be tracked
+over time; ``--compare`` checks a run against an earlier one and exits
+non-zero when any case regressed by more than ``--max-slowdown``.
+
+Usage:
+    python -m benchmarks.bench_hot_paths
+    python -m benchmarks.bench_hot_paths --quick --only rouge_l_score --only pii_scan
+    python -m benchmarks.bench_hot_paths --json bench.json --compare baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from benchmarks.corpus import conversation_text, make_corpus, to_openai_jsonl
+from uncase._version import __version__
+from uncase.core.evaluator.metrics.diversity import type_token_ratio
+from uncase.core.evaluator.metrics.memorization import compute_memorization_score
+from uncase.core.evaluator.metrics.rouge import rouge_l_score
+from uncase.core.parser.jsonl_parser import JSONLConversationParser
+from uncase.core.privacy.prompt_shield import PromptShield
+from uncase.core.privacy.scanner import PIIScanner
+from uncase.log_config import setup_logging
+from uncase.templates import get_template, register_all_templates
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from uncase.schemas.conversation import Conversation
+    from uncase.schemas.seed import SeedSchema
+
+TURNS = (4, 16, 64)
+BATCHES = (1, 16, 128)
+QUICK_TURNS = (4, 16)
+QUICK_BATCHES = (1, 16)
+
+# Quadratic (LCS) benchmarks are capped so a full run stays in minutes
+_MAX_ITEMS_QUADRATIC = 16 * 64
+
+
+def _seed_reference(seed: SeedSchema) -> str:
+    parts = [seed.objetivo, seed.parametros_factuales.contexto, *seed.parametros_factuales.restricciones]
+    return " ".join(parts)
+
+
+def _bench_rouge(seed: SeedSchema, conversations: list[Conversation]) -> Callable[[], object]:
+    reference = _seed_reference(seed)
+    texts = [conversation_text(c) for c in conversations]
+    return lambda: [rouge_l_score(text, reference) for text in texts]
+
+
+def _bench_memorization(seed: SeedSchema, conversations: list[Conversation]) -> Callable[[], object]:
+    return lambda: [compute_memorization_score(c, seed) for c in conversations]
+
+
+def _bench_ttr(seed: SeedSchema, conversations: list[Conversation]) -> Callable[[], object]:
+    token_lists = [conversation_text(c).lower().split() for c in conversations]
+    return lambda: [type_token_ratio(tokens) for tokens in token_lists]
+
+
+def _bench_pii(seed: SeedSchema, conversations: list[Conversation]) -> Callable[[], object]:
+    scanner = PIIScanner()
+    texts = [turn.contenido for c in conversations for turn in c.turnos]
+    return lambda: [scanner.scan(text) for text in texts]
+
+
+def _bench_shield(seed: SeedSchema, conversations: list[Conversation]) -> Callable[[], object]:
+    shield = PromptShield()
+    texts = [turn.contenido for c in conversations for turn in c.turnos]
+    return lambda: [shield.scan(text) for text in texts]
+
+
+def _bench_jsonl(seed: SeedSchema, conversations: list[Conversation]) -> Callable[[], object]:
+    parser = JSONLConversationParser()
+    payload = to_openai_jsonl(conversations)
+    loop = asyncio.new_event_loop()
+    return lambda: loop.run_until_complete(parser.parse(payload, "openai"))
+
+
+def _bench_render(seed: SeedSchema, conversations: list[Conversation]) -> Callable[[], object]:
+    register_all_templates()
+    template = get_template("chatml")
+    return lambda: template.render_batch(conversations)
+
+
+# name -> (setup, quadratic in conversation length)
+BENCHMARKS: dict[str, tuple[Callable[[SeedSchema, list[Conversation]], Callable[[], object]], bool]] = {
+    "rouge_l_score": (_bench_rouge, True),
+    "compute_memorization_score": (_bench_memorization, True),
+    "type_token_ratio": (_bench_ttr, False),
+    "pii_scan": (_bench_pii, False),
+    "prompt_shield": (_bench_shield, False),
+    "jsonl_parse": (_bench_jsonl, False),
+    "render_batch": (_bench_render, False),
+}
+
+
+def _time(fn: Callable[[], object], min_rounds: int, min_time: float) -> list[float]:
+    """Call *fn* until both *min_rounds* and *min_time* are reached; return round times."""
+    fn()  # warm-up
+    rounds: list[float] = []
+    started = time.perf_counter()
+    while len(rounds) < min_rounds or (time.perf_counter() - started < min_time and len(rounds) < 10_000):
+        t0 = time.perf_counter()
+        fn()
+        rounds.append(time.perf_counter() - t0)
+    return rounds
+
+
+def run(
+    names: list[str],
+    turns_grid: tuple[int, ...],
+    batch_grid: tuple[int, ...],
+    *,
+    min_rounds: int = 5,
+    min_time: float = 0.5,
+) -> dict[str, Any]:
+    """Run the selected benchmarks over the grid and return JSON-ready results."""
+    results: dict[str, Any] = {
+        "meta": {
+            "uncase_version": __version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        },
+        "cases": [],
+    }
+
+    for name in names:
+        setup, quadratic = BENCHMARKS[name]
+        for turns in turns_grid:
+            for batch in batch_grid:
+                if quadratic and turns * batch > _MAX_ITEMS_QUADRATIC:
+                    continue
+                seed, conversations = make_corpus(turns, batch)
+                rounds = _time(setup(seed, conversations), min_rounds, min_time)
+                median = statistics.median(rounds)
+                results["cases"].append(
+                    {
+                        "benchmark": name,
+                        "turns": turns,
+                        "batch": batch,
+                        "rounds": len(rounds),
+                        "min_ms": round(min(rounds) * 1e3, 4),
+                        "median_ms": round(median * 1e3, 4),
+                        "mean_ms": round(statistics.fmean(rounds) * 1e3, 4),
+                        "stdev_ms": round(statistics.stdev(rounds) * 1e3, 4) if len(rounds) > 1 else 0.0,
+                        "per_conversation_us": round(median / batch * 1e6, 2),
+                    }
+                )
+    return results
+
+
+def _case_key(case: dict[str, Any]) -> tuple[str, int, int]:
+    return case["benchmark"], case["turns"], case["batch"]
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], max_slowdown: float) -> list[str]:
+    """Return a line per case whose median is more than *max_slowdown* times the baseline's."""
+    previous = {_case_key(c): c for c in baseline["cases"]}
+    regressions = []
+    for case in current["cases"]:
+        old = previous.get(_case_key(case))
+        if old is None or old["median_ms"] <= 0:
+            continue
+        ratio = case["median_ms"] / old["median_ms"]
+        case["vs_baseline"] = round(ratio, 3)
+        if ratio > max_slowdown:
+            regressions.append(
+                f"{case['benchmark']} turns={case['turns']} batch={case['batch']}: "
+                f"{old['median_ms']:.3f}ms -> {case['median_ms']:.3f}ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--quick", action="store_true", help="Smaller grid and shorter rounds (smoke run)")
+    parser.add_argument("--json", type=Path, default=None, help="Write results as JSON to this path")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline JSON from an earlier run")
+    parser.add_argument(
+        "--max-slowdown", type=float, default=1.25, help="With --compare, fail if any median is this many times slower"
+    )
+    args = parser.parse_args()
+
+    # Per-call info logs (parser, scanner) would dominate both output and timings
+    setup_logging(log_level="WARNING")
+
+    names = args.only or list(BENCHMARKS)
+    if args.quick:
+        results = run(names, QUICK_TURNS, QUICK_BATCHES, min_rounds=3, min_time=0.1)
+    else:
+        results = run(names, TURNS, BATCHES)
+
+    regressions: list[str] = []
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.max_slowdown)
+
+    print(f"{'benchmark':<28} {'turns':>5} {'batch':>5} {'median (ms)':>12} {'stdev (ms)':>11} {'per conv (us)':>14}")
+    for case in results["cases"]:
+        line = (
+            f"{case['benchmark']:<28} {case['turns']:>5} {case['batch']:>5} {case['median_ms']:>12.3f} "
+            f"{case['stdev_ms']:>11.3f} {case['per_conversation_us']:>14.1f}"
+        )
+        if "vs_baseline" in case:
+            line += f"  {case['vs_baseline']:.2f}x"
+        print(line)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.max_slowdown:.2f}x:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
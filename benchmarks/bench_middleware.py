@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Benchmark HTTP middleware overhead: fused pure-ASGI layer vs. BaseHTTPMiddleware stack.
+
+Drives the ASGI apps directly (no server, no HTTP client) so the numbers
+isolate middleware cost:
+
+* ``request``: per-request latency of a tiny JSON endpoint (like ``/health``).
+* ``sse``: throughput of a streamed ``text/event-stream`` response (like
+  ``/gateway/chat``), in chunks per second.
+
+The ``legacy`` stack rebuilds the former three ``BaseHTTPMiddleware`` layers
+(security headers, metrics, rate limiting) on top of the same helpers, so
+both stacks do identical work per request.
+
+Usage:
+    python benchmarks/bench_middleware.py
+    python benchmarks/bench_middleware.py --requests 20000 --chunks 2000 --json results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from uncase.api import metrics, rate_limit
+from uncase.api.http_middleware import HTTPMiddleware
+from uncase.api.security_headers import security_headers
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
+    from starlette.requests import Request
+    from starlette.responses import Response
+    from starlette.types import ASGIApp, Message, Receive
+
+
+class _LegacySecurityHeaders(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable[..., Any]) -> Response:
+        response: Response = await call_next(request)
+        for name, value in security_headers(request.url.path):
+            response.headers[name.decode()] = value.decode()
+        return response
+
+
+class _LegacyMetrics(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable[..., Any]) -> Response:
+        start = metrics.request_started()
+        status = None
+        try:
+            response: Response = await call_next(request)
+            status = response.status_code
+        finally:
+            metrics.request_finished(request.scope, status, start)
+        return response
+
+
+class _LegacyRateLimit(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable[..., Any]) -> Response:
+        client_ip = request.client.host if request.client else "unknown"
+        key = rate_limit.rate_limit_key(
+            request.headers.get("x-api-key", ""), request.headers.get("authorization", ""), client_ip
+        )
+        allowed, limit, remaining, reset = rate_limit.check_rate_limit(key)
+        if not allowed:
+            return rate_limit.rate_limited_response(limit, reset)
+        response: Response = await call_next(request)
+        for name, value in rate_limit.rate_limit_headers(limit, remaining, reset):
+            response.headers[name.decode()] = value.decode()
+        return response
+
+
+async def _health(_: Request) -> JSONResponse:
+    return JSONResponse({"status": "healthy"})
+
+
+def _routes(chunks: int) -> list[Route]:
+    async def _stream(_: Request) -> StreamingResponse:
+        async def _events() -> AsyncIterator[bytes]:
+            for i in range(chunks):
+                yield b'data: {"delta": "token %d"}\n\n' % i
+
+        return StreamingResponse(_events(), media_type="text/event-stream")
+
+    return [Route("/api/v1/health", _health), Route("/api/v1/stream", _stream)]
+
+
+def build_apps(chunks: int) -> dict[str, ASGIApp]:
+    """Return the ASGI apps under comparison, keyed by stack name."""
+    return {
+        "none": Starlette(routes=_routes(chunks)),
+        "legacy": Starlette(
+            routes=_routes(chunks),
+            middleware=[
+                Middleware(_LegacyRateLimit),
+                Middleware(_LegacyMetrics),
+                Middleware(_LegacySecurityHeaders),
+            ],
+        ),
+        "fused": Starlette(routes=_routes(chunks), middleware=[Middleware(HTTPMiddleware)]),
+    }
+
+
+def _receiver() -> Receive:
+    delivered = False
+
+    async def _receive() -> Message:
+        nonlocal delivered
+        if delivered:
+            await asyncio.Event().wait()
+        delivered = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    return _receive
+
+
+async def _request(app: ASGIApp, path: str) -> int:
+    """Run one GET through *app* and return the number of non-empty body chunks."""
+    chunks = 0
+
+    async def _send(message: Message) -> None:
+        nonlocal chunks
+        if message["type"] == "http.response.body" and message.get("body"):
+            chunks += 1
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"x-api-key", b"uc_test_bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    await app(scope, _receiver(), _send)
+    return chunks
+
+
+async def _bench_requests(app: ASGIApp, n: int) -> float:
+    for _ in range(min(n, 200)):  # warm-up
+        await _request(app, "/api/v1/health")
+    start = time.perf_counter()
+    for _ in range(n):
+        await _request(app, "/api/v1/health")
+    return (time.perf_counter() - start) / n
+
+
+async def _bench_sse(app: ASGIApp, repeats: int) -> float:
+    await _request(app, "/api/v1/stream")  # warm-up
+    total = 0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        total += await _request(app, "/api/v1/stream")
+    return total / (time.perf_counter() - start)
+
+
+async def run(requests: int, chunks: int, repeats: int) -> dict[str, Any]:
+    """Run both benchmarks for every stack and return the results."""
+    # Rate limiting is part of the measured work, but must never trigger a 429
+    rate_limit.RATE_LIMITS["default"] = (10**9, 60)
+
+    results: dict[str, Any] = {"requests": requests, "chunks": chunks, "repeats": repeats, "stacks": {}}
+    for name, app in build_apps(chunks).items():
+        rate_limit._counter.reset()
+        per_request = await _bench_requests(app, requests)
+        rate_limit._counter.reset()
+        throughput = await _bench_sse(app, repeats)
+        results["stacks"][name] = {
+            "request_latency_us": round(per_request * 1e6, 2),
+            "sse_chunks_per_second": round(throughput),
+        }
+
+    baseline = results["stacks"]["none"]["request_latency_us"]
+    for stats in results["stacks"].values():
+        stats["middleware_overhead_us"] = round(stats["request_latency_us"] - baseline, 2)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per stack for the latency benchmark")
+    parser.add_argument("--chunks", type=int, default=1000, help="SSE chunks per streamed response")
+    parser.add_argument("--repeats", type=int, default=20, help="Streamed responses per stack")
+    parser.add_argument("--json", type=Path, default=None, help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.requests, args.chunks, args.repeats))
+
+    print(f"{'stack':<8} {'latency (us)':>14} {'overhead (us)':>14} {'SSE chunks/s':>14}")
+    for name, stats in results["stacks"].items():
+        print(
+            f"{name:<8} {stats['request_latency_us']:>14.1f} {stats['middleware_overhead_us']:>14.1f} "
+            f"{stats['sse_chunks_per_second']:>14,}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
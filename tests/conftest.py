@@ -9,11 +9,12 @@ import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from uncase.api.deps import get_db, get_settings
+from uncase.api.deps import get_db, get_db_factory, get_settings
 from uncase.api.main import create_app
 from uncase.api.rate_limit import _counter
 from uncase.config import UNCASESettings
 from uncase.db.base import Base
+from uncase.services.webhook_index import get_subscription_index
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
@@ -50,6 +51,8 @@ async def async_session() -> AsyncGenerator[AsyncSession, None]:
         await conn.run_sync(Base.metadata.create_all)
 
     session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    # Every test gets a fresh database, so cached subscriptions of a previous test are stale
+    get_subscription_index().clear()
 
     async with session_factory() as session:
         yield session
@@ -70,6 +73,9 @@ async def client(async_session: AsyncSession, settings: UNCASESettings) -> Async
         yield async_session
 
     app.dependency_overrides[get_db] = _override_db
+    app.dependency_overrides[get_db_factory] = lambda: async_sessionmaker(
+        bind=async_session.bind, class_=AsyncSession, expire_on_commit=False
+    )
     app.dependency_overrides[get_settings] = lambda: settings
 
     transport = ASGITransport(app=app)
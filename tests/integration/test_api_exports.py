@@ -0,0 +1,160 @@
+"""Integration tests for the conversation export API endpoints."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uncase.api.routers import exports as exports_router
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from httpx import AsyncClient
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from uncase.config import UNCASESettings
+    from uncase.schemas.export import ExportRequest
+
+
+def _make_conversation_dict(conversation_id: str, *, dominio: str = "automotive.sales") -> dict:
+    """Build a minimal conversation create payload with fictional data."""
+    return {
+        "conversation_id": conversation_id,
+        "dominio": dominio,
+        "idioma": "es",
+        "turnos": [
+            {"turno": 1, "rol": "usuario", "contenido": "Busco un vehículo familiar con buen rendimiento."},
+            {"turno": 2, "rol": "asistente", "contenido": "Con gusto le ayudo. ¿Tiene alguna preferencia?"},
+        ],
+        "es_sintetica": True,
+    }
+
+
+async def _create_conversations(client: AsyncClient) -> None:
+    payload = {
+        "conversations": [
+            _make_conversation_dict("exp-001"),
+            _make_conversation_dict("exp-002"),
+            _make_conversation_dict("exp-003", dominio="medical.consultation"),
+        ]
+    }
+    response = await client.post("/api/v1/conversations/bulk", json=payload)
+    assert response.status_code == 201
+
+
+@pytest.mark.integration
+class TestStreamExport:
+    async def test_stream_jsonl(self, client: AsyncClient) -> None:
+        await _create_conversations(client)
+
+        response = await client.post("/api/v1/exports/conversations", json={"domain": "automotive.sales"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert "attachment" in response.headers["content-disposition"]
+
+        ids = sorted(json.loads(line)["conversation_id"] for line in response.text.splitlines())
+        assert ids == ["exp-001", "exp-002"]
+
+    async def test_stream_gzip_rendered(self, client: AsyncClient) -> None:
+        await _create_conversations(client)
+
+        response = await client.post(
+            "/api/v1/exports/conversations",
+            json={"format": "jsonl.gz", "template_name": "llama"},
+        )
+        assert response.status_code == 200
+
+        records = [json.loads(line) for line in gzip.decompress(response.content).decode("utf-8").splitlines()]
+        assert len(records) == 3
+        assert all(r["template"] == "llama" for r in records)
+
+    async def test_unknown_template_returns_404(self, client: AsyncClient) -> None:
+        response = await client.post("/api/v1/exports/conversations", json={"template_name": "nope"})
+        assert response.status_code == 404
+
+    async def test_invalid_format_returns_422(self, client: AsyncClient) -> None:
+        response = await client.post("/api/v1/exports/conversations", json={"format": "csv"})
+        assert response.status_code == 422
+
+    async def test_parquet_without_pyarrow_fails_before_streaming(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+        response = await client.post("/api/v1/exports/conversations", json={"format": "parquet"})
+
+        assert response.status_code == 503
+        assert "pyarrow" in response.json()["detail"]
+
+
+@pytest.mark.integration
+class TestExportJobs:
+    async def test_job_runs_and_download(
+        self,
+        client: AsyncClient,
+        async_session: AsyncSession,
+        settings: UNCASESettings,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        await _create_conversations(client)
+        settings.uncase_exports_dir = str(tmp_path)
+
+        launched: list[tuple[str, ExportRequest, str | None]] = []
+
+        async def _capture(job_id: str, request: ExportRequest, _settings: object, org_id: str | None) -> None:
+            launched.append((job_id, request, org_id))
+
+        monkeypatch.setattr(exports_router, "_execute_export_job", _capture)
+
+        response = await client.post("/api/v1/exports/conversations/jobs", json={"format": "jsonl"})
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        # Downloading before completion is rejected
+        pending = await client.get(f"/api/v1/exports/conversations/jobs/{job_id}/download")
+        assert pending.status_code == 422
+
+        # Run the job inline on the test session
+        _, request, org_id = launched[0]
+        await exports_router.execute_export_job(async_session, job_id, request, settings, org_id)
+
+        job = await client.get(f"/api/v1/jobs/{job_id}")
+        assert job.json()["status"] == "completed"
+        assert job.json()["result"]["exported"] == 3
+
+        download = await client.get(f"/api/v1/exports/conversations/jobs/{job_id}/download")
+        assert download.status_code == 200
+        assert len(download.text.splitlines()) == 3
+
+    async def test_download_unknown_job_returns_404(self, client: AsyncClient) -> None:
+        response = await client.get("/api/v1/exports/conversations/jobs/missing/download")
+        assert response.status_code == 404
+
+    async def test_download_missing_file_returns_404(
+        self,
+        client: AsyncClient,
+        async_session: AsyncSession,
+        settings: UNCASESettings,
+        tmp_path: Path,
+    ) -> None:
+        """A file written on a worker without a shared exports volume is reported as not found."""
+        from uncase.schemas.export import ExportRequest
+
+        await _create_conversations(client)
+        settings.uncase_exports_dir = str(tmp_path)
+        settings.job_execution_mode = "worker"
+
+        response = await client.post("/api/v1/exports/conversations/jobs", json={"format": "jsonl"})
+        job_id = response.json()["job_id"]
+        await exports_router.execute_export_job(async_session, job_id, ExportRequest(format="jsonl"), settings, None)
+
+        (tmp_path / "conversations" / f"{job_id}.jsonl").unlink()
+
+        download = await client.get(f"/api/v1/exports/conversations/jobs/{job_id}/download")
+        assert download.status_code == 404
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 from typing import TYPE_CHECKING
 
 import pytest
 
 from uncase.db.models.job import JobModel
+from uncase.services.job_progress import ProgressEvent, job_events
+from uncase.services.jobs import JobService
 
 if TYPE_CHECKING:
     from httpx import AsyncClient
@@ -145,3 +149,58 @@ class TestCancelJob:
     async def test_cancel_nonexistent_job(self, client: AsyncClient) -> None:
         response = await client.post("/api/v1/jobs/no-such-job/cancel")
         assert response.status_code == 404
+
+
+def _sse_events(body: str) -> list[tuple[str, dict[str, object]]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if "data" in lines:
+            events.append((lines.get("event", "message"), json.loads(lines["data"])))
+    return events
+
+
+@pytest.mark.integration
+class TestJobEvents:
+    async def test_completed_job_sends_complete_event(self, client: AsyncClient, completed_job: JobModel) -> None:
+        response = await client.get(f"/api/v1/jobs/{completed_job.id}/events")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+
+        events = _sse_events(response.text)
+        assert [name for name, _ in events] == ["complete"]
+        assert events[0][1]["result"] == {"passed": 10, "failed": 2}
+
+    async def test_pushes_progress_until_completion(
+        self, client: AsyncClient, async_session: AsyncSession, running_job: JobModel
+    ) -> None:
+        async def _run_job() -> None:
+            await asyncio.sleep(0.1)
+            job_events.publish(ProgressEvent(running_job.id, "evaluation", 0.75, "Evaluating 3/4"))
+            await asyncio.sleep(0.1)
+            await JobService(async_session).mark_completed(running_job.id, result={"ok": True})
+
+        task = asyncio.create_task(_run_job())
+        response = await client.get(f"/api/v1/jobs/{running_job.id}/events")
+        await task
+
+        events = _sse_events(response.text)
+        assert events[0] == (
+            "progress",
+            {
+                "job_id": running_job.id,
+                "status": "running",
+                "stage": "generation",
+                "progress": 0.5,
+                "message": "Generating...",
+            },
+        )
+        assert ("progress", {**events[0][1], "stage": "evaluation", "progress": 0.75, "message": "Evaluating 3/4"}) in (
+            events
+        )
+        assert events[-1][0] == "complete"
+        assert events[-1][1]["status"] == "completed"
+
+    async def test_nonexistent_job(self, client: AsyncClient) -> None:
+        response = await client.get("/api/v1/jobs/no-such-job/events")
+        assert response.status_code == 404
@@ -7,8 +7,12 @@ from typing import TYPE_CHECKING
 import pytest
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from httpx import AsyncClient
 
+    from uncase.config import UNCASESettings
+
 
 def _make_conversation_dict(
     *,
@@ -139,3 +143,88 @@ class TestExportTemplate:
 
         response = await client.post("/api/v1/templates/export", json=body)
         assert response.status_code == 404
+
+
+@pytest.mark.integration
+class TestTokenAccounting:
+    @pytest.fixture(autouse=True)
+    def _word_accountant(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        from uncase.api.routers import templates as templates_router
+        from uncase.templates.tokens import TokenAccountant, TokenCounter
+
+        class _WordCounter(TokenCounter):
+            @property
+            def name(self) -> str:
+                return "words"
+
+            def count_batch(self, texts: Sequence[str]) -> list[int]:
+                return [len(text.split()) for text in texts]
+
+        monkeypatch.setattr(templates_router, "get_token_accountant", lambda _spec: TokenAccountant(_WordCounter()))
+
+    async def test_render_returns_token_counts(self, client: AsyncClient) -> None:
+        body = {
+            "conversations": [_make_conversation_dict()],
+            "template_name": "chatml",
+            "tokenizer": "tiktoken:cl100k_base",
+        }
+
+        response = await client.post("/api/v1/templates/render", json=body)
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["token_counts"] == [len(data["rendered"][0].split())]
+        assert data["dropped"] == data["truncated"] == []
+
+    async def test_render_drops_over_length(self, client: AsyncClient) -> None:
+        body = {
+            "conversations": [_make_conversation_dict()],
+            "template_name": "chatml",
+            "tokenizer": "tiktoken:cl100k_base",
+            "max_tokens": 5,
+        }
+
+        response = await client.post("/api/v1/templates/render", json=body)
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["count"] == 0
+        assert len(data["dropped"]) == 1
+
+    async def test_export_reports_truncated_count(self, client: AsyncClient) -> None:
+        body = {
+            "conversations": [_make_conversation_dict()],
+            "template_name": "chatml",
+            "tokenizer": "tiktoken:cl100k_base",
+            "max_tokens": 10,
+            "over_length": "truncate",
+        }
+
+        response = await client.post("/api/v1/templates/export", json=body)
+        assert response.status_code == 200
+        assert response.headers["X-Truncated-Count"] == "1"
+        assert response.headers["X-Dropped-Count"] == "0"
+        assert "Con gusto" not in response.text
+
+    async def test_max_tokens_requires_tokenizer(self, client: AsyncClient) -> None:
+        body = {"conversations": [_make_conversation_dict()], "template_name": "chatml", "max_tokens": 10}
+
+        response = await client.post("/api/v1/templates/render", json=body)
+        assert response.status_code == 422
+
+    async def test_tokenizer_outside_allowlist_is_rejected(self, client: AsyncClient) -> None:
+        body = {
+            "conversations": [_make_conversation_dict()],
+            "template_name": "chatml",
+            "tokenizer": "evil/remote-code",
+        }
+
+        response = await client.post("/api/v1/templates/render", json=body)
+        assert response.status_code == 422
+
+    async def test_hf_tokenizer_requires_authentication(self, client: AsyncClient, settings: UNCASESettings) -> None:
+        settings.template_tokenizers = "tiktoken:cl100k_base,gpt2"
+        body = {"conversations": [_make_conversation_dict()], "template_name": "chatml", "tokenizer": "gpt2"}
+
+        response = await client.post("/api/v1/templates/export", json=body)
+        assert response.status_code == 401
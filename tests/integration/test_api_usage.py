@@ -133,39 +133,22 @@ class TestUsageTimeline:
         assert response.status_code == 422
 
     async def test_timeline_empty(self, client: AsyncClient) -> None:
-        """Timeline uses date_trunc which is PostgreSQL-only.
-
-        SQLite does not support it, so this test verifies the endpoint
-        exists and processes the request. The OperationalError from SQLite
-        may either be caught by the exception handler (returning 500) or
-        propagate through the ASGI transport.
-        """
-        try:
-            response = await client.get(
-                "/api/v1/usage/timeline",
-                params={"event_type": "seed_created"},
-            )
-            # If we get a response, accept 200 (PostgreSQL) or 500 (caught error)
-            assert response.status_code in (200, 500)
-            if response.status_code == 200:
-                data = response.json()
-                assert data["event_type"] == "seed_created"
-                assert isinstance(data["points"], list)
-        except Exception:
-            # SQLite OperationalError may propagate through ASGI transport
-            pytest.skip("date_trunc not supported on SQLite")
+        response = await client.get(
+            "/api/v1/usage/timeline",
+            params={"event_type": "seed_created"},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["event_type"] == "seed_created"
+        assert data["points"] == []
 
     async def test_timeline_with_data(self, client: AsyncClient, sample_events: list[UsageEventModel]) -> None:
-        """Timeline with data. date_trunc is PostgreSQL-only."""
-        try:
-            response = await client.get(
-                "/api/v1/usage/timeline",
-                params={"event_type": "seed_created", "granularity": "day"},
-            )
-            assert response.status_code in (200, 500)
-            if response.status_code == 200:
-                data = response.json()
-                assert data["event_type"] == "seed_created"
-                assert data["granularity"] == "day"
-        except Exception:
-            pytest.skip("date_trunc not supported on SQLite")
+        response = await client.get(
+            "/api/v1/usage/timeline",
+            params={"event_type": "seed_created", "granularity": "day"},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["event_type"] == "seed_created"
+        assert data["granularity"] == "day"
+        assert sum(point["count"] for point in data["points"]) == 2
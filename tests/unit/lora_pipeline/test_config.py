@@ -8,6 +8,7 @@ import pytest
 from pydantic import ValidationError
 
 from uncase.core.lora_pipeline.config import (
+    DatasetConfig,
     LoraConfig,
     PipelineConfig,
     PrivacyConfig,
@@ -185,6 +186,24 @@ class TestPrivacyConfigValidation:
             PrivacyConfig(max_grad_norm=0.0)
 
 
+class TestDatasetConfig:
+    """Verify DatasetConfig defaults and constraints."""
+
+    async def test_defaults(self) -> None:
+        cfg = DatasetConfig()
+        assert cfg.format == "jsonl"
+        assert cfg.num_shards == 1
+        assert cfg.row_group_size == 1000
+
+    async def test_invalid_format_rejected(self) -> None:
+        with pytest.raises(ValidationError):
+            DatasetConfig(format="csv")  # type: ignore[arg-type]
+
+    async def test_num_shards_must_be_positive(self) -> None:
+        with pytest.raises(ValidationError):
+            DatasetConfig(num_shards=0)
+
+
 class TestPipelineConfig:
     """Verify PipelineConfig combines sub-configs correctly."""
 
@@ -0,0 +1,170 @@
+"""Tests for the columnar (Parquet) LoRA dataset writer.
+
+Uses a whitespace tokenizer stub so no ML model downloads are needed;
+pyarrow is required and the tests are skipped without it.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import pytest
+
+from uncase.core.lora_pipeline.dataset import (
+    DATASET_INFO_FILE,
+    ParquetDatasetWriter,
+    is_parquet_dataset,
+    read_dataset_info,
+    render_messages,
+    shard_files,
+    shard_for,
+)
+from uncase.core.lora_pipeline.pipeline import LoraPipeline
+from uncase.schemas.conversation import Conversation, ConversationTurn
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+class _WhitespaceTokenizer:
+    """Minimal tokenizer stub: one token per whitespace-separated word."""
+
+    name_or_path = "stub/whitespace"
+    chat_template = None
+
+    def __init__(self) -> None:
+        self._vocab: dict[str, int] = {}
+
+    def __call__(self, texts: list[str], **_: Any) -> dict[str, list[list[int]]]:
+        ids = [[self._vocab.setdefault(w, len(self._vocab) + 1) for w in t.split()] for t in texts]
+        return {"input_ids": ids, "attention_mask": [[1] * len(i) for i in ids]}
+
+
+def _records(n: int, words: int = 5) -> list[tuple[str, list[dict[str, str]]]]:
+    return [
+        (
+            f"conv-{i:04d}",
+            [
+                {"role": "user", "content": " ".join(["hola"] * words)},
+                {"role": "assistant", "content": "respuesta ficticia"},
+            ],
+        )
+        for i in range(n)
+    ]
+
+
+class TestShardFor:
+    def test_single_shard_is_zero(self) -> None:
+        assert shard_for("anything", 1) == 0
+
+    def test_is_deterministic_and_in_range(self) -> None:
+        indices = [shard_for(f"conv-{i}", 4) for i in range(200)]
+        assert indices == [shard_for(f"conv-{i}", 4) for i in range(200)]
+        assert set(indices) == {0, 1, 2, 3}
+
+
+class TestRenderMessages:
+    def test_chatml_fallback_without_template(self) -> None:
+        text, templated = render_messages(_WhitespaceTokenizer(), [{"role": "user", "content": "hola"}])
+        assert text == "<|im_start|>user\nhola<|im_end|>"
+        assert templated is False
+
+
+class TestParquetDatasetWriter:
+    def test_writes_pretokenized_columns(self, tmp_path: Path) -> None:
+        writer = ParquetDatasetWriter(tmp_path / "ds", tokenizer=_WhitespaceTokenizer(), max_seq_length=128)
+        info = writer.write(_records(3))
+
+        table = pq.read_table(tmp_path / "ds" / info.shards[0])
+        assert table.num_rows == 3
+        assert set(table.column_names) == {"conversation_id", "text", "input_ids", "attention_mask", "num_tokens"}
+        row = table.slice(0, 1).to_pylist()[0]
+        assert len(row["input_ids"]) == len(row["attention_mask"]) == row["num_tokens"]
+        assert info.total_tokens == sum(table.column("num_tokens").to_pylist())
+
+    def test_truncates_to_max_seq_length(self, tmp_path: Path) -> None:
+        writer = ParquetDatasetWriter(tmp_path / "ds", tokenizer=_WhitespaceTokenizer(), max_seq_length=4)
+        info = writer.write(_records(2, words=20))
+
+        assert info.truncated == 2
+        table = pq.read_table(tmp_path / "ds" / info.shards[0])
+        assert table.column("num_tokens").to_pylist() == [4, 4]
+
+    def test_sharding_is_deterministic_and_complete(self, tmp_path: Path) -> None:
+        records = _records(50)
+        first = ParquetDatasetWriter(
+            tmp_path / "a", tokenizer=_WhitespaceTokenizer(), max_seq_length=128, num_shards=3, row_group_size=7
+        ).write(records)
+        ParquetDatasetWriter(tmp_path / "b", tokenizer=_WhitespaceTokenizer(), max_seq_length=128, num_shards=3).write(
+            records
+        )
+
+        assert first.shards == [
+            "part-00000-of-00003.parquet",
+            "part-00001-of-00003.parquet",
+            "part-00002-of-00003.parquet",
+        ]
+        seen: list[str] = []
+        for name in first.shards:
+            ids_a = pq.read_table(tmp_path / "a" / name).column("conversation_id").to_pylist()
+            ids_b = pq.read_table(tmp_path / "b" / name).column("conversation_id").to_pylist()
+            assert ids_a == ids_b
+            seen.extend(ids_a)
+        assert sorted(seen) == [cid for cid, _ in records]
+
+    def test_dataset_info_round_trips(self, tmp_path: Path) -> None:
+        info = ParquetDatasetWriter(tmp_path / "ds", tokenizer=_WhitespaceTokenizer(), max_seq_length=64).write(
+            _records(2)
+        )
+
+        assert is_parquet_dataset(tmp_path / "ds")
+        assert read_dataset_info(tmp_path / "ds") == info
+        assert json.loads((tmp_path / "ds" / DATASET_INFO_FILE).read_text())["tokenizer"] == "stub/whitespace"
+
+
+class TestShardFiles:
+    def test_round_robin_assignment(self, tmp_path: Path) -> None:
+        ParquetDatasetWriter(tmp_path, tokenizer=_WhitespaceTokenizer(), max_seq_length=64, num_shards=4).write(
+            _records(10)
+        )
+
+        worker0 = [p.name for p in shard_files(tmp_path, worker_index=0, num_workers=2)]
+        worker1 = [p.name for p in shard_files(tmp_path, worker_index=1, num_workers=2)]
+        assert worker0 == ["part-00000-of-00004.parquet", "part-00002-of-00004.parquet"]
+        assert worker1 == ["part-00001-of-00004.parquet", "part-00003-of-00004.parquet"]
+
+    def test_invalid_worker_index_raises(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="worker_index"):
+            shard_files(tmp_path, worker_index=2, num_workers=2)
+
+
+class TestPrepareDatasetParquet:
+    async def test_prepare_dataset_writes_parquet_directory(self, tmp_path: Path) -> None:
+        pipeline = LoraPipeline(output_dir=str(tmp_path / "outputs"), dataset_format="parquet", dataset_shards=2)
+        conv = Conversation(
+            conversation_id="conv-parquet-001",
+            seed_id="seed-001",
+            dominio="automotive.sales",
+            turnos=[
+                ConversationTurn(turno=1, rol="vendedor", contenido="Buenos dias, en que puedo ayudarle?"),
+                ConversationTurn(turno=2, rol="cliente", contenido="Busco informacion sobre vehiculos."),
+            ],
+            es_sintetica=True,
+        )
+
+        with patch.object(LoraPipeline, "_load_tokenizer", return_value=_WhitespaceTokenizer()):
+            dataset_path = await pipeline.prepare_dataset([conv])
+
+        assert dataset_path.name == "train_parquet"
+        assert is_parquet_dataset(dataset_path)
+        info = read_dataset_info(dataset_path)
+        assert info.num_rows == 1
+        assert info.num_shards == 2
+        assert (
+            "<|im_start|>assistant"
+            in pq.read_table(dataset_path / info.shards[shard_for(conv.conversation_id, 2)])["text"][0].as_py()
+        )
@@ -0,0 +1,206 @@
+"""Tests for sequence packing and length-grouped batching."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import pytest
+from pydantic import ValidationError
+
+from uncase.core.lora_pipeline.config import DatasetConfig
+from uncase.core.lora_pipeline.dataset import ParquetDatasetWriter, read_dataset_info
+from uncase.core.lora_pipeline.packing import (
+    PackingStats,
+    group_by_length_stats,
+    length_grouped_order,
+    pack_lengths,
+    pack_parquet_dataset,
+    padding_efficiency,
+)
+from uncase.core.lora_pipeline.pipeline import LoraPipeline
+from uncase.schemas.conversation import Conversation, ConversationTurn
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class _WhitespaceTokenizer:
+    """Minimal tokenizer stub: one token per whitespace-separated word."""
+
+    name_or_path = "stub/whitespace"
+    chat_template = None
+
+    def __call__(self, texts: list[str], **_: Any) -> dict[str, list[list[int]]]:
+        ids = [[len(w) for w in t.split()] for t in texts]
+        return {"input_ids": ids, "attention_mask": [[1] * len(i) for i in ids]}
+
+
+def _write_dataset(path: Path, word_counts: list[int], num_shards: int = 1) -> None:
+    records = [
+        (f"conv-{i:03d}", [{"role": "user", "content": " ".join(["palabra"] * n)}]) for i, n in enumerate(word_counts)
+    ]
+    ParquetDatasetWriter(path, tokenizer=_WhitespaceTokenizer(), max_seq_length=64, num_shards=num_shards).write(
+        records
+    )
+
+
+class TestPaddingEfficiency:
+    def test_uniform_lengths_are_fully_efficient(self) -> None:
+        assert padding_efficiency([10, 10, 10, 10], batch_size=2) == pytest.approx(1.0)
+
+    def test_mixed_lengths(self) -> None:
+        # batches [10, 2] and [10, 2] -> 24 real tokens in 40 slots
+        assert padding_efficiency([10, 2, 10, 2], batch_size=2) == pytest.approx(0.6)
+
+    def test_empty_input(self) -> None:
+        assert padding_efficiency([], batch_size=4) == 1.0
+
+    def test_length_grouping_improves_efficiency(self) -> None:
+        lengths = [10, 2, 10, 2]
+        grouped = [lengths[i] for i in length_grouped_order(lengths, batch_size=2)]
+        assert sorted(length_grouped_order(lengths, batch_size=2)) == [0, 1, 2, 3]
+        assert padding_efficiency(grouped, batch_size=2) == pytest.approx(1.0)
+
+
+class TestPackLengths:
+    def test_every_sample_packed_once_within_capacity(self) -> None:
+        lengths = [7, 3, 5, 5, 2, 8, 1]
+        bins = pack_lengths(lengths, max_seq_length=10)
+
+        assert sorted(i for b in bins for i in b) == list(range(len(lengths)))
+        assert all(sum(lengths[i] for i in b) <= 10 for b in bins)
+        assert len(bins) == 4  # 31 tokens -> at least 4 bins of 10
+
+    def test_best_fit_fills_tightest_bin(self) -> None:
+        bins = pack_lengths([6, 4, 3, 3], max_seq_length=10)
+        assert sorted(sorted(b) for b in bins) == [[0, 1], [2, 3]]
+
+    def test_oversized_sample_raises(self) -> None:
+        with pytest.raises(ValueError, match="max_seq_length"):
+            pack_lengths([11], max_seq_length=10)
+
+
+class TestPackParquetDataset:
+    def test_packs_with_boundaries(self, tmp_path: Path) -> None:
+        pq = pytest.importorskip("pyarrow.parquet")
+        _write_dataset(tmp_path / "src", [3, 4, 5, 10, 2], num_shards=2)
+
+        info, stats = pack_parquet_dataset(tmp_path / "src", tmp_path / "packed", max_seq_length=16, batch_size=2)
+
+        assert info.packing == "pack"
+        assert info.num_shards == 2
+        assert stats.num_examples == 5
+        assert stats.num_sequences == info.num_rows < 5
+        assert stats.padding_efficiency > stats.baseline_efficiency
+
+        rows = [row for name in info.shards for row in pq.read_table(tmp_path / "packed" / name).to_pylist()]
+        assert sum(len(r["conversation_ids"]) for r in rows) == 5
+        for row in rows:
+            assert row["num_tokens"] == len(row["input_ids"]) == len(row["position_ids"]) <= 16
+            assert row["position_ids"].count(0) == len(row["conversation_ids"])
+
+        assert read_dataset_info(tmp_path / "packed").packing_stats["num_sequences"] == stats.num_sequences
+
+    def test_group_by_length_stats(self, tmp_path: Path) -> None:
+        pytest.importorskip("pyarrow")
+        _write_dataset(tmp_path, [20, 2, 20, 2])
+
+        stats = group_by_length_stats(tmp_path, batch_size=2)
+
+        assert stats.num_sequences == stats.num_examples == 4
+        assert stats.padding_efficiency == pytest.approx(1.0)
+        assert stats.baseline_efficiency < 1.0
+
+
+class TestPackingStats:
+    def test_as_metrics_are_prefixed_numbers(self) -> None:
+        stats = PackingStats(
+            strategy="pack",
+            num_examples=10,
+            num_sequences=4,
+            total_tokens=100,
+            baseline_efficiency=0.25,
+            padding_efficiency=0.9,
+        )
+        metrics = stats.as_metrics()
+
+        assert all(key.startswith("packing_") for key in metrics)
+        assert metrics["packing_examples_per_sequence"] == pytest.approx(2.5)
+        assert metrics["packing_estimated_speedup"] == pytest.approx(3.6)
+
+
+class TestPackedSequenceCollator:
+    def test_masks_boundaries_and_padding(self) -> None:
+        pytest.importorskip("torch")
+        from uncase.core.lora_pipeline.packing import PackedSequenceCollator
+
+        batch = PackedSequenceCollator(pad_token_id=0)(
+            [
+                {"input_ids": [5, 6, 7, 8], "position_ids": [0, 1, 0, 1]},
+                {"input_ids": [9, 9], "position_ids": [0, 1]},
+            ]
+        )
+
+        assert batch["input_ids"].tolist() == [[5, 6, 7, 8], [9, 9, 0, 0]]
+        assert batch["labels"].tolist() == [[-100, 6, -100, 8], [-100, 9, -100, -100]]
+        assert "attention_mask" not in batch
+
+
+class TestPackingConfig:
+    def test_packing_requires_parquet(self) -> None:
+        with pytest.raises(ValidationError):
+            DatasetConfig(packing="pack")
+
+    def test_packing_with_parquet_is_valid(self) -> None:
+        assert DatasetConfig(format="parquet", packing="group_by_length").packing == "group_by_length"
+
+    async def test_prepare_dataset_returns_packed_directory(self, tmp_path: Path) -> None:
+        pytest.importorskip("pyarrow")
+        pipeline = LoraPipeline(output_dir=str(tmp_path), dataset_format="parquet", packing="pack", max_seq_length=128)
+        conversations = [
+            Conversation(
+                conversation_id=f"conv-pack-{i}",
+                seed_id="seed-001",
+                dominio="automotive.sales",
+                turnos=[
+                    ConversationTurn(turno=1, rol="cliente", contenido="Busco informacion sobre vehiculos."),
+                    ConversationTurn(turno=2, rol="vendedor", contenido="Con gusto le ayudo."),
+                ],
+                es_sintetica=True,
+            )
+            for i in range(3)
+        ]
+
+        with patch.object(LoraPipeline, "_load_tokenizer", return_value=_WhitespaceTokenizer()):
+            dataset_path = await pipeline.prepare_dataset(conversations)
+
+        assert dataset_path.name == "train_packed"
+        info = read_dataset_info(dataset_path)
+        assert info.num_rows == 1
+        assert info.packing_stats["num_examples"] == 3
+
+
+class TestOverLengthPolicy:
+    async def test_prepare_dataset_drops_over_length(self, tmp_path: Path) -> None:
+        pipeline = LoraPipeline(output_dir=str(tmp_path), over_length="drop", max_seq_length=128)
+        long_text = " ".join(["palabra"] * 200)
+        conversations = [
+            Conversation(
+                conversation_id=f"conv-len-{i}",
+                seed_id="seed-001",
+                dominio="automotive.sales",
+                turnos=[
+                    ConversationTurn(turno=1, rol="cliente", contenido=long_text if i == 0 else "Hola."),
+                    ConversationTurn(turno=2, rol="vendedor", contenido="Con gusto le ayudo."),
+                ],
+                es_sintetica=True,
+            )
+            for i in range(2)
+        ]
+
+        with patch.object(LoraPipeline, "_load_tokenizer", return_value=_WhitespaceTokenizer()):
+            dataset_path = await pipeline.prepare_dataset(conversations)
+
+        assert dataset_path.read_text(encoding="utf-8").count("\n") == 1
+        assert pipeline.config.dataset.over_length == "drop"
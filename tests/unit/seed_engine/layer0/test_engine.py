@@ -7,17 +7,20 @@ Interviewer and back.
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 from unittest.mock import AsyncMock
 
 import pytest
 
 from uncase.core.seed_engine.layer0.config import Layer0Config
-from uncase.core.seed_engine.layer0.engine import AgenticExtractionEngine
-from uncase.core.seed_engine.layer0.extractor import SeedExtractor
+from uncase.core.seed_engine.layer0.engine import AgenticExtractionEngine, _draft_action, _speculation_holds
+from uncase.core.seed_engine.layer0.extractor import ExtractedField, ExtractionResult, SeedExtractor
 from uncase.core.seed_engine.layer0.interviewer.base_provider import BaseLLMProvider
 from uncase.core.seed_engine.layer0.interviewer.interviewer import Interviewer
 from uncase.core.seed_engine.layer0.schemas.automotriz import SeedAutomotriz
+from uncase.core.seed_engine.layer0.schemas.base import FieldMeta
+from uncase.core.seed_engine.layer0.state_manager import ActionType, NextAction
 
 # ── Mock Provider ───────────────────────────────────────────────────
 
@@ -362,3 +365,279 @@ class TestEngineFactory:
             provider=mock,
         )
         assert engine.state.schema.idioma == "en"
+
+
+# ===================================================================
+# Incremental extraction
+# ===================================================================
+
+
+class TestIncrementalExtraction:
+    """Test that extraction prompts stay flat as the interview grows."""
+
+    @staticmethod
+    def _engine(config: Layer0Config) -> tuple[AgenticExtractionEngine, AsyncMock]:
+        extract = AsyncMock(return_value={})
+        extractor = SeedExtractor(config=config, anthropic_client=AsyncMock())
+        extractor.extract = extract  # type: ignore[method-assign]
+        engine = AgenticExtractionEngine(
+            config=config,
+            schema=SeedAutomotriz(),
+            extractor=extractor,
+            interviewer=Interviewer(MockInterviewerProvider(), config),
+        )
+        return engine, extract
+
+    async def test_sends_only_new_turns_with_periodic_full_pass(self) -> None:
+        """Incremental passes see one question/answer pair; every Nth turn sees the whole transcript."""
+        engine, extract = self._engine(Layer0Config(max_turns=10, full_extraction_interval=3))
+        await engine.get_initial_question()
+
+        for i, turn in enumerate(SIMULATED_CONVERSATION[:3]):
+            extract.return_value = turn["extraction"]
+            await engine.process_turn(turn["user_response"])
+            kwargs = extract.await_args.kwargs
+            if i < 2:
+                assert kwargs["incremental"] is True
+                assert [m["role"] for m in kwargs["conversation_history"]] == ["interviewer", "user"]
+                assert kwargs["conversation_history"][1]["content"] == turn["user_response"]
+            else:
+                assert "incremental" not in kwargs
+                assert len(kwargs["conversation_history"]) == 6
+
+        second = extract.await_args_list[1].kwargs
+        assert second["current_schema_state"] == {
+            "cliente_perfil.tipo_cliente": "particular",
+            "cliente_perfil.urgencia": "explorando",
+        }
+        assert "cliente_perfil.tipo_cliente" not in second["field_descriptions"]
+        assert "intencion.uso_principal" in second["field_descriptions"]
+
+    async def test_failed_extraction_turns_are_resent(self) -> None:
+        """Turns from a pass that raised are included in the next incremental pass."""
+        engine, extract = self._engine(Layer0Config(max_turns=10))
+        await engine.get_initial_question()
+
+        extract.side_effect = Exception("API down")
+        await engine.process_turn("Soy empresa.")
+        extract.side_effect = None
+        await engine.process_turn("Es para negocio.")
+
+        history = extract.await_args.kwargs["conversation_history"]
+        assert [m["content"] for m in history if m["role"] == "user"] == ["Soy empresa.", "Es para negocio."]
+
+    async def test_extractor_failure_then_success_resends_the_failed_turn(self) -> None:
+        """An LLM failure inside the extractor does not mark the turn as extracted."""
+        config = Layer0Config(max_turns=10)
+        extractor = SeedExtractor(config=config, anthropic_client=AsyncMock())
+        call_llm = AsyncMock(
+            side_effect=[
+                Exception("API down"),
+                ExtractionResult(
+                    fields=[ExtractedField(field_name="cliente_perfil.tipo_cliente", value="empresa", confidence=0.95)]
+                ),
+            ]
+        )
+        extractor._call_llm = call_llm  # type: ignore[method-assign]
+        engine = AgenticExtractionEngine(
+            config=config,
+            schema=SeedAutomotriz(),
+            extractor=extractor,
+            interviewer=Interviewer(MockInterviewerProvider(), config),
+        )
+        await engine.get_initial_question()
+
+        await engine.process_turn("Soy empresa.")
+        assert engine._extracted_upto == 0
+        await engine.process_turn("Es para negocio.")
+
+        prompt = call_llm.await_args.args[0]
+        assert "Soy empresa." in prompt
+        assert "Es para negocio." in prompt
+        assert engine._extracted_upto == len(engine.history) - 1  # all but the new question
+        assert engine.state.schema.to_extraction_dict()["cliente_perfil.tipo_cliente"] == "empresa"
+
+    async def test_full_mode_sends_whole_transcript(self) -> None:
+        """With incremental extraction disabled every pass sees the full history."""
+        engine, extract = self._engine(Layer0Config(max_turns=10, incremental_extraction=False))
+        await engine.get_initial_question()
+
+        await engine.process_turn("Soy particular.")
+        await engine.process_turn("Es para la familia.")
+
+        kwargs = extract.await_args.kwargs
+        assert "incremental" not in kwargs
+        assert len(kwargs["conversation_history"]) == 4
+
+
+# ===================================================================
+# Speculative question generation
+# ===================================================================
+
+
+class TestSpeculativeQuestions:
+    """Test that the next question is drafted concurrently with extraction."""
+
+    @staticmethod
+    def _engine(config: Layer0Config) -> tuple[AgenticExtractionEngine, SeedExtractor, MockInterviewerProvider]:
+        provider = MockInterviewerProvider()
+        extractor = SeedExtractor(config=config, anthropic_client=AsyncMock())
+        engine = AgenticExtractionEngine(
+            config=config,
+            schema=SeedAutomotriz(),
+            extractor=extractor,
+            interviewer=Interviewer(provider, config),
+        )
+        return engine, extractor, provider
+
+    async def test_draft_runs_during_extraction_and_is_reused(self) -> None:
+        """The question is generated while extraction is in flight and reused when nothing was extracted."""
+        engine, extractor, provider = self._engine(Layer0Config(max_turns=10))
+        await engine.get_initial_question()
+
+        async def slow_extract(**kwargs: Any) -> dict[str, Any]:
+            for _ in range(10):
+                if provider._call_count == 2:
+                    break
+                await asyncio.sleep(0)
+            assert provider._call_count == 2, "next question was not drafted during extraction"
+            return {}
+
+        extractor.extract = slow_extract  # type: ignore[method-assign]
+        result = await engine.process_turn(SIMULATED_CONVERSATION[0]["user_response"])
+
+        assert result["type"] == "question"
+        assert result["content"] == provider._questions[1]
+        assert provider._call_count == 2
+        assert engine.speculation_stats == {"hits": 1, "misses": 0, "discarded": 0, "hit_rate": 1.0}
+
+    async def test_other_filled_fields_keep_the_draft(self) -> None:
+        """Answers to fields the draft does not ask about leave it valid."""
+        engine, extractor, provider = self._engine(Layer0Config(max_turns=10))
+        await engine.get_initial_question()
+
+        extractor.extract = AsyncMock(return_value=SIMULATED_CONVERSATION[0]["extraction"])  # type: ignore[method-assign]
+        result = await engine.process_turn(SIMULATED_CONVERSATION[0]["user_response"])
+
+        assert result["type"] == "question"
+        assert provider._call_count == 2
+        assert engine.speculation_stats == {"hits": 1, "misses": 0, "discarded": 0, "hit_rate": 1.0}
+
+    async def test_filled_field_regenerates(self) -> None:
+        """The field the draft asks about was answered, so the draft is dropped."""
+        engine, extractor, _ = self._engine(Layer0Config(max_turns=10))
+        await engine.get_initial_question()
+
+        extractor.extract = AsyncMock(  # type: ignore[method-assign]
+            return_value={"cliente_perfil.nivel_experiencia_compra": {"value": "primera_compra", "confidence": 0.95}}
+        )
+        result = await engine.process_turn("Es mi primera compra.")
+
+        assert result["type"] == "question"
+        assert engine.speculation_stats == {"hits": 0, "misses": 1, "discarded": 0, "hit_rate": 0.0}
+
+    async def test_changed_action_regenerates(self) -> None:
+        """A newly ambiguous field switches to clarification, so the draft is dropped."""
+        engine, extractor, _ = self._engine(Layer0Config(max_turns=10))
+        await engine.get_initial_question()
+        engine._interviewer.generate_clarification = AsyncMock(  # type: ignore[method-assign]
+            return_value="¿Es un particular o una empresa?"
+        )
+
+        extractor.extract = AsyncMock(  # type: ignore[method-assign]
+            return_value={"cliente_perfil.tipo_cliente": {"value": "empresa", "confidence": 0.5}}
+        )
+        result = await engine.process_turn("Quizá empresa.")
+
+        assert result["content"] == "¿Es un particular o una empresa?"
+        assert engine.speculation_stats["misses"] == 1
+        assert engine.speculation_stats["hit_rate"] == 0.0
+
+    async def test_completed_interview_discards_draft(self) -> None:
+        """When extraction completes the seed, the draft is discarded and a summary returned."""
+        from uncase.core.seed_engine.layer0.schemas.automotriz import REQUIRED_FIELDS_AUTOMOTRIZ
+
+        engine, extractor, _ = self._engine(Layer0Config(max_turns=10))
+        await engine.get_initial_question()
+
+        all_fields = {name: {"value": "test_value", "confidence": 0.95} for name in REQUIRED_FIELDS_AUTOMOTRIZ}
+        extractor.extract = AsyncMock(return_value=all_fields)  # type: ignore[method-assign]
+        result = await engine.process_turn("Les doy toda la información necesaria.")
+
+        assert result["type"] == "summary"
+        assert engine.speculation_stats["discarded"] == 1
+
+    async def test_disabled_generates_after_extraction(self) -> None:
+        """With speculation off the question is generated once, after extraction."""
+        engine, extractor, provider = self._engine(Layer0Config(max_turns=10, speculative_questions=False))
+        await engine.get_initial_question()
+
+        extractor.extract = AsyncMock(return_value={})  # type: ignore[method-assign]
+        await engine.process_turn("No sé.")
+
+        assert provider._call_count == 2
+        assert engine.speculation_stats == {"hits": 0, "misses": 0, "discarded": 0, "hit_rate": 0.0}
+
+    def test_draft_holds_while_its_field_is_pending(self) -> None:
+        """A draft targets one field and holds only while that field is still pending."""
+        a, b, c = (FieldMeta(field_name=name) for name in ("a", "b", "c"))
+        draft = _draft_action(NextAction(action=ActionType.ASK_QUESTION, missing_fields=[a, b]))
+
+        assert [fm.field_name for fm in draft.missing_fields] == ["a"]
+        assert _speculation_holds(draft, NextAction(action=ActionType.ASK_QUESTION, missing_fields=[a, b]))
+        assert _speculation_holds(draft, NextAction(action=ActionType.ASK_QUESTION, missing_fields=[a]))
+        assert not _speculation_holds(draft, NextAction(action=ActionType.ASK_QUESTION, missing_fields=[b, c]))
+        assert not _speculation_holds(
+            draft, NextAction(action=ActionType.REQUEST_CLARIFICATION, missing_fields=[a], ambiguous_fields=[b])
+        )
+
+    def test_clarification_draft_targets_one_ambiguous_field(self) -> None:
+        """A clarification draft asks about the first ambiguous field only."""
+        a, b, c = (FieldMeta(field_name=name) for name in ("a", "b", "c"))
+        draft = _draft_action(
+            NextAction(action=ActionType.REQUEST_CLARIFICATION, missing_fields=[c], ambiguous_fields=[a, b])
+        )
+
+        assert [fm.field_name for fm in draft.ambiguous_fields] == ["a"]
+        assert _speculation_holds(draft, NextAction(action=ActionType.REQUEST_CLARIFICATION, ambiguous_fields=[a]))
+        assert not _speculation_holds(
+            draft, NextAction(action=ActionType.REQUEST_CLARIFICATION, missing_fields=[c], ambiguous_fields=[b])
+        )
+
+
+# ===================================================================
+# Serialization
+# ===================================================================
+
+
+class TestEngineSerialization:
+    """Test that an interview can be resumed from serialized state."""
+
+    async def test_resumes_from_serialized_state(self, config: Layer0Config) -> None:
+        """A rebuilt engine continues with the same history, values and field statuses."""
+        import json
+
+        provider = MockInterviewerProvider()
+        extractor = SeedExtractor(config=config, anthropic_client=AsyncMock())
+        engine = AgenticExtractionEngine(
+            config=config, schema=SeedAutomotriz(), extractor=extractor, interviewer=Interviewer(provider, config)
+        )
+        await engine.get_initial_question()
+        for turn in SIMULATED_CONVERSATION[:2]:
+            extractor.extract = AsyncMock(return_value=turn["extraction"])  # type: ignore[method-assign]
+            await engine.process_turn(turn["user_response"])
+
+        restored = AgenticExtractionEngine.from_state(
+            json.loads(json.dumps(engine.to_state())), extractor=extractor, interviewer=Interviewer(provider, config)
+        )
+
+        assert restored.history == engine.history
+        assert restored.state.get_progress() == engine.state.get_progress()
+        assert restored.state.schema.to_extraction_dict() == engine.state.schema.to_extraction_dict()
+        assert restored.speculation_stats == engine.speculation_stats
+
+        extractor.extract = AsyncMock(return_value=SIMULATED_CONVERSATION[2]["extraction"])  # type: ignore[method-assign]
+        result = await restored.process_turn(SIMULATED_CONVERSATION[2]["user_response"])
+        assert result["progress"]["turn"] == 3
+        sent = extractor.extract.await_args.kwargs["conversation_history"]
+        assert [m["content"] for m in sent if m["role"] == "user"] == [SIMULATED_CONVERSATION[2]["user_response"]]
@@ -8,6 +8,7 @@ import pytest
 
 from uncase.core.seed_engine.layer0.config import Layer0Config
 from uncase.core.seed_engine.layer0.extractor import ExtractedField, ExtractionResult, SeedExtractor
+from uncase.exceptions import ExtractionError
 
 # ── Fixtures ────────────────────────────────────────────────────────
 
@@ -101,18 +102,17 @@ class TestExtractorWithMockedLLM:
         assert result["cliente_perfil.tipo_cliente"]["confidence"] == 0.95
         assert result["cliente_perfil.urgencia"]["confidence"] == 0.85
 
-    async def test_extract_handles_api_failure(self, extractor: SeedExtractor) -> None:
-        """extract() returns empty dict on API failure."""
+    async def test_extract_reports_api_failure(self, extractor: SeedExtractor) -> None:
+        """extract() raises ExtractionError on API failure instead of returning no fields."""
         extractor._call_llm = AsyncMock(side_effect=Exception("API Error"))  # type: ignore[method-assign]
 
-        result = await extractor.extract(
-            conversation_history=[
-                {"role": "user", "content": "test"},
-            ],
-            current_schema_state={},
-        )
-
-        assert result == {}
+        with pytest.raises(ExtractionError, match="API Error"):
+            await extractor.extract(
+                conversation_history=[
+                    {"role": "user", "content": "test"},
+                ],
+                current_schema_state={},
+            )
 
     async def test_extract_empty_conversation(self, extractor: SeedExtractor) -> None:
         """extract() handles empty conversation gracefully."""
@@ -182,3 +182,18 @@ class TestPromptBuilding:
             field_descriptions={"cliente_perfil.tipo_cliente": "Tipo de cliente"},
         )
         assert "Tipo de cliente" in prompt
+
+    def test_incremental_prompt_is_compact(self, extractor: SeedExtractor) -> None:
+        """Incremental prompt carries only the new turns, captured fields and pending descriptions."""
+        prompt = extractor._build_prompt(
+            conversation_history=[{"role": "user", "content": "Por WhatsApp."}],
+            current_state={"cliente_perfil.tipo_cliente": "particular"},
+            field_descriptions={"contexto_conversacion.canal": "Canal de la conversación"},
+            incremental=True,
+        )
+        assert "## New Conversation Turns" in prompt
+        assert "Por WhatsApp." in prompt
+        assert '{"cliente_perfil.tipo_cliente":"particular"}' in prompt
+        assert "## Fields Still Needed" in prompt
+        assert "Canal de la conversación" in prompt
+        assert "Conversation Transcript" not in prompt
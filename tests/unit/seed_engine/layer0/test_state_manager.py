@@ -274,3 +274,37 @@ class TestProgressTracking:
         )
         progress = state.get_progress()
         assert progress["filled_fields"] >= 1
+
+
+# ===================================================================
+# Incremental extraction context
+# ===================================================================
+
+
+class TestExtractionContext:
+    """Test captured_state and pending_fields."""
+
+    def test_captured_state_only_lists_filled_fields(self, state: StateManager) -> None:
+        """Untouched fields and their defaults are left out."""
+        assert state.captured_state() == {}
+
+        state.update({"cliente_perfil.tipo_cliente": {"value": "particular", "confidence": 0.95}})
+
+        assert state.captured_state() == {"cliente_perfil.tipo_cliente": "particular"}
+
+    def test_pending_fields_shrink_as_fields_are_confirmed(self, state: StateManager) -> None:
+        """Confirmed fields drop out; ambiguous ones stay pending."""
+        total = len(state.get_progress()["fields"])
+        assert len(state.pending_fields()) == total
+
+        state.update(
+            {
+                "cliente_perfil.tipo_cliente": {"value": "particular", "confidence": 0.95},
+                "cliente_perfil.urgencia": {"value": "explorando", "confidence": 0.5},
+            }
+        )
+
+        pending = {fm.field_name for fm in state.pending_fields()}
+        assert len(pending) == total - 1
+        assert "cliente_perfil.tipo_cliente" not in pending
+        assert "cliente_perfil.urgencia" in pending
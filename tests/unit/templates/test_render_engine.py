@@ -0,0 +1,119 @@
+"""Tests for the compiled rendering engine shared by all templates."""
+
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from uncase.templates import get_template_registry, register_all_templates
+from uncase.templates.base import BaseChatTemplate, RenderContext, ToolCallMode
+from uncase.templates.chatml import ChatMLTemplate
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from uncase.schemas.conversation import Conversation
+    from uncase.tools.schemas import ToolDefinition
+
+register_all_templates()
+_TEMPLATE_NAMES = sorted(get_template_registry().list_names())
+
+
+class _RenderOnlyTemplate(BaseChatTemplate):
+    """Third-party style template that implements only ``render``."""
+
+    @property
+    def name(self) -> str:
+        return "render_only"
+
+    @property
+    def display_name(self) -> str:
+        return "Render Only"
+
+    @property
+    def supports_tool_calls(self) -> bool:
+        return False
+
+    def get_special_tokens(self) -> list[str]:
+        return []
+
+    def render(
+        self,
+        conversation: Conversation,
+        tool_call_mode: ToolCallMode = ToolCallMode.NONE,
+        system_prompt: str | None = None,
+        available_tools: list[ToolDefinition] | None = None,
+    ) -> str:
+        return f"{system_prompt or ''}|{len(conversation.turnos)}"
+
+
+@pytest.mark.parametrize("template_name", _TEMPLATE_NAMES)
+@pytest.mark.parametrize("mode", list(ToolCallMode))
+def test_iter_render_matches_render(
+    template_name: str,
+    mode: ToolCallMode,
+    basic_conversation: Conversation,
+    conversation_with_tools: Conversation,
+    sample_tool_definitions: list[ToolDefinition],
+) -> None:
+    template = get_template_registry().get(template_name)
+    conversations = [basic_conversation, conversation_with_tools, basic_conversation]
+
+    # Mistral draws random tool-call IDs, so every pass starts from the same seed
+    random.seed(0)
+    expected = [template.render(c, mode, "Eres un asistente.", sample_tool_definitions) for c in conversations]
+    random.seed(0)
+    streamed = list(template.iter_render(conversations, mode, "Eres un asistente.", sample_tool_definitions))
+    random.seed(0)
+    batch = template.render_batch(conversations, mode, "Eres un asistente.", sample_tool_definitions)
+
+    assert streamed == expected
+    assert batch == expected
+
+
+def test_iter_render_consumes_input_lazily(basic_conversation: Conversation) -> None:
+    consumed: list[int] = []
+
+    def _source() -> Iterator[Conversation]:
+        for i in range(3):
+            consumed.append(i)
+            yield basic_conversation
+
+    rendered = ChatMLTemplate().iter_render(_source())
+    assert consumed == []
+
+    next(rendered)
+    assert consumed == [0]
+    assert len(list(rendered)) == 2
+
+
+def test_system_prefix_compiled_once_per_batch(
+    basic_conversation: Conversation, sample_tool_definitions: list[ToolDefinition]
+) -> None:
+    template = ChatMLTemplate()
+    with patch.object(ChatMLTemplate, "_build_system_prompt", wraps=ChatMLTemplate._build_system_prompt) as spy:
+        template.render_batch([basic_conversation] * 5, ToolCallMode.INLINE, "Sistema", sample_tool_definitions)
+
+    assert spy.call_count == 1
+
+
+def test_compiled_context_can_be_reused(basic_conversation: Conversation) -> None:
+    template = ChatMLTemplate()
+    context = template.compile(system_prompt="Sistema")
+
+    first = list(template.iter_render([basic_conversation], context=context))
+    second = list(template.iter_render([basic_conversation], context=context))
+
+    assert isinstance(context, RenderContext)
+    assert context.prefix == "<|im_start|>system\nSistema<|im_end|>"
+    assert first == second == [template.render(basic_conversation, system_prompt="Sistema")]
+
+
+def test_render_only_template_uses_default_engine(basic_conversation: Conversation) -> None:
+    template = _RenderOnlyTemplate()
+
+    assert list(template.iter_render([basic_conversation] * 2, system_prompt="S")) == ["S|3", "S|3"]
+    assert template.compile().prefix is None
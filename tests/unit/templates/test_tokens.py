@@ -0,0 +1,157 @@
+"""Tests for token accounting and length filtering of rendered templates."""
+
+from __future__ import annotations
+
+import functools
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uncase.exceptions import MLDependencyError, ValidationError
+from uncase.templates.chatml import ChatMLTemplate
+from uncase.templates.tokens import (
+    TiktokenCounter,
+    TokenAccountant,
+    TokenCounter,
+    check_tokenizer_allowed,
+    load_token_counter,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from uncase.schemas.conversation import Conversation
+
+
+class _WordCounter(TokenCounter):
+    """Counts whitespace-separated words and records every batch it is given."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    @property
+    def name(self) -> str:
+        return "words"
+
+    def count_batch(self, texts: Sequence[str]) -> list[int]:
+        self.batches.append(list(texts))
+        return [len(text.split()) for text in texts]
+
+
+def _render(template: ChatMLTemplate) -> functools.partial:
+    return functools.partial(template.iter_render, context=template.compile())
+
+
+class TestTokenAccountantCache:
+    def test_counts_each_distinct_text_once(self) -> None:
+        counter = _WordCounter()
+        accountant = TokenAccountant(counter)
+
+        assert accountant.count(["a b", "c", "a b"]) == [2, 1, 2]
+        assert accountant.count(["c", "d e f"]) == [1, 3]
+
+        assert counter.batches == [["a b", "c"], ["d e f"]]
+        assert (accountant.hits, accountant.misses) == (1, 3)
+
+    def test_lru_eviction(self) -> None:
+        counter = _WordCounter()
+        accountant = TokenAccountant(counter, cache_size=2)
+
+        accountant.count(["a", "b"])
+        accountant.count(["a"])  # refresh "a"; "b" is now least recent
+        accountant.count(["c"])
+        accountant.count(["a", "b"])
+
+        assert counter.batches[-1] == ["b"]
+
+
+class TestCountConversations:
+    def test_per_turn_counts_and_overhead(self, basic_conversation: Conversation) -> None:
+        template = ChatMLTemplate()
+        accountant = TokenAccountant(_WordCounter())
+        rendered = template.render_batch([basic_conversation])
+
+        (count,) = accountant.count_conversations([basic_conversation], rendered)
+
+        assert count.conversation_id == basic_conversation.conversation_id
+        assert count.total_tokens == len(rendered[0].split())
+        assert count.turn_tokens == [len(t.contenido.split()) for t in basic_conversation.turnos]
+        assert count.template_overhead == count.total_tokens - sum(count.turn_tokens)
+
+
+class TestFit:
+    def test_keep_reports_counts_without_filtering(self, basic_conversation: Conversation) -> None:
+        template = ChatMLTemplate()
+        result = TokenAccountant(_WordCounter()).fit(
+            [basic_conversation], _render(template), max_tokens=1, policy="keep"
+        )
+
+        assert [text for _, text, _ in result.kept] == template.render_batch([basic_conversation])
+        assert result.dropped == result.truncated == []
+
+    def test_drop_removes_over_length(self, basic_conversation: Conversation) -> None:
+        template = ChatMLTemplate()
+        accountant = TokenAccountant(_WordCounter())
+        total = accountant.count(template.render_batch([basic_conversation]))[0]
+        short = basic_conversation.model_copy(update={"turnos": basic_conversation.turnos[:1]})
+
+        result = accountant.fit([basic_conversation, short], _render(template), max_tokens=total - 1, policy="drop")
+
+        assert [conv.conversation_id for conv, _, _ in result.kept] == [short.conversation_id]
+        assert result.dropped == [basic_conversation.conversation_id]
+
+    def test_truncate_keeps_longest_fitting_prefix(self, basic_conversation: Conversation) -> None:
+        template = ChatMLTemplate()
+        accountant = TokenAccountant(_WordCounter())
+        two_turns = basic_conversation.model_copy(update={"turnos": basic_conversation.turnos[:2]})
+        limit = accountant.count(template.render_batch([two_turns]))[0]
+
+        result = accountant.fit([basic_conversation], _render(template), max_tokens=limit, policy="truncate")
+
+        ((conv, text, tokens),) = result.kept
+        assert len(conv.turnos) == 2
+        assert text == template.render(two_turns)
+        assert tokens == limit
+        assert result.truncated == [basic_conversation.conversation_id]
+
+    def test_truncate_drops_when_first_turn_does_not_fit(self, basic_conversation: Conversation) -> None:
+        result = TokenAccountant(_WordCounter()).fit(
+            [basic_conversation], _render(ChatMLTemplate()), max_tokens=1, policy="truncate"
+        )
+
+        assert result.kept == []
+        assert result.dropped == [basic_conversation.conversation_id]
+
+
+class TestCounters:
+    def test_tiktoken_counter_with_local_encoding(self) -> None:
+        tiktoken = pytest.importorskip("tiktoken")
+        # Byte-level encoding built in memory, so no BPE download is needed
+        encoding = tiktoken.Encoding(
+            name="bytes",
+            pat_str=r"\S+|\s+",
+            mergeable_ranks={bytes([i]): i for i in range(256)},
+            special_tokens={},
+        )
+        counter = TiktokenCounter(encoding)
+
+        assert counter.name == "tiktoken:bytes"
+        assert counter.count_batch(["hola", "<|im_start|>"]) == [4, 12]
+
+    def test_unknown_tiktoken_encoding_raises_validation_error(self) -> None:
+        pytest.importorskip("tiktoken")
+        with pytest.raises(ValidationError, match="Could not load tokenizer"):
+            load_token_counter("tiktoken:no_such_encoding")
+
+    def test_missing_tiktoken_is_a_dependency_error(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setitem(sys.modules, "tiktoken", None)
+        with pytest.raises(MLDependencyError, match=r"uncase\[tokens\]"):
+            TiktokenCounter.from_encoding_name("cl100k_base")
+
+    def test_tokenizer_allowlist(self) -> None:
+        allowed = ["tiktoken:cl100k_base"]
+
+        assert check_tokenizer_allowed("tiktoken:cl100k_base", allowed) == "tiktoken:cl100k_base"
+        with pytest.raises(ValidationError, match="not enabled"):
+            check_tokenizer_allowed("some-org/model-with-custom-code", allowed)
@@ -0,0 +1,137 @@
+"""Tests for the verified API key cache and batched last_used_at writes."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from uncase.exceptions import APIKeyRevokedError, AuthenticationError
+from uncase.schemas.organization import APIKeyCreate, OrganizationCreate
+from uncase.services.api_key_cache import LastUsedRecorder, VerifiedKeyCache
+from uncase.services.organization import OrganizationService
+from uncase.utils.security import verify_api_key
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def _org_with_key(service: OrganizationService) -> tuple[str, str, str]:
+    """Create a fictional org with one key; return (org_id, key_id, plain_key)."""
+    org = await service.create_organization(OrganizationCreate(name="Cache Test Labs", slug="cache-test-labs"))
+    key = await service.create_api_key(org.id, APIKeyCreate(name="cache-key", scopes="read"))
+    return org.id, key.key_id, key.plain_key
+
+
+class TestVerifiedKeyCache:
+    def test_hit_after_add(self) -> None:
+        cache = VerifiedKeyCache()
+        cache.add("uc_test_raw", "kid", "hash-1")
+
+        assert cache.is_verified("uc_test_raw", "kid", "hash-1")
+        assert not cache.is_verified("uc_test_other", "kid", "hash-1")
+
+    def test_changed_hash_is_a_miss(self) -> None:
+        cache = VerifiedKeyCache()
+        cache.add("uc_test_raw", "kid", "hash-1")
+
+        assert not cache.is_verified("uc_test_raw", "kid", "hash-2")
+        assert len(cache) == 0
+
+    def test_entries_expire(self) -> None:
+        cache = VerifiedKeyCache(ttl_seconds=10)
+        with patch("uncase.services.api_key_cache.time.monotonic", return_value=100.0):
+            cache.add("uc_test_raw", "kid", "hash-1")
+        with patch("uncase.services.api_key_cache.time.monotonic", return_value=111.0):
+            assert not cache.is_verified("uc_test_raw", "kid", "hash-1")
+
+    def test_zero_ttl_disables_cache(self) -> None:
+        cache = VerifiedKeyCache(ttl_seconds=0)
+        cache.add("uc_test_raw", "kid", "hash-1")
+
+        assert not cache.is_verified("uc_test_raw", "kid", "hash-1")
+
+    def test_invalidate_by_key_id(self) -> None:
+        cache = VerifiedKeyCache()
+        cache.add("uc_test_a", "kid-a", "hash-a")
+        cache.add("uc_test_b", "kid-b", "hash-b")
+
+        cache.invalidate("kid-a")
+
+        assert not cache.is_verified("uc_test_a", "kid-a", "hash-a")
+        assert cache.is_verified("uc_test_b", "kid-b", "hash-b")
+
+    def test_bounded_size(self) -> None:
+        cache = VerifiedKeyCache(max_entries=4)
+        for i in range(10):
+            cache.add(f"uc_test_{i}", f"kid-{i}", "hash")
+
+        assert len(cache) <= 4
+        assert cache.is_verified("uc_test_9", "kid-9", "hash")
+
+
+class TestVerifyWithCache:
+    async def test_warm_verification_skips_argon2(self, async_session: AsyncSession) -> None:
+        service = OrganizationService(async_session)
+        org_id, _, plain_key = await _org_with_key(service)
+
+        with patch("uncase.services.organization.verify_api_key", wraps=verify_api_key) as spy:
+            for _ in range(3):
+                org = await service.verify_and_get_org(plain_key)
+
+        assert org.id == org_id
+        assert spy.call_count == 1
+        assert service.last_verified_key is not None
+
+    async def test_wrong_secret_is_never_cached(self, async_session: AsyncSession) -> None:
+        service = OrganizationService(async_session)
+        _, _, plain_key = await _org_with_key(service)
+        tampered = plain_key.rsplit("-", 1)[0] + "-" + "x" * 43
+
+        for _ in range(2):
+            with pytest.raises(AuthenticationError, match="Invalid API key"):
+                await service.verify_and_get_org(tampered)
+
+    async def test_revoked_key_rejected_after_cache_warmup(self, async_session: AsyncSession) -> None:
+        service = OrganizationService(async_session)
+        org_id, key_id, plain_key = await _org_with_key(service)
+        await service.verify_and_get_org(plain_key)
+
+        await service.revoke_api_key(org_id, key_id)
+
+        with pytest.raises(APIKeyRevokedError):
+            await service.verify_and_get_org(plain_key)
+
+
+class TestLastUsedRecorder:
+    async def test_flush_writes_batched_timestamps(self, async_session: AsyncSession) -> None:
+        service = OrganizationService(async_session)
+        org_id, _, plain_key = await _org_with_key(service)
+        await service.verify_and_get_org(plain_key)
+        assert service.last_verified_key is not None
+
+        recorder = LastUsedRecorder()
+        used_at = datetime(2030, 1, 1, tzinfo=UTC)
+        recorder.touch(service.last_verified_key.id, used_at)
+
+        assert await recorder.flush(async_session) == 1
+        assert len(recorder) == 0
+        async_session.expire_all()
+        keys = await service.list_api_keys(org_id)
+        assert keys[0].last_used_at is not None
+        assert keys[0].last_used_at.replace(tzinfo=UTC) == used_at
+
+    async def test_warm_hits_are_buffered(self, async_session: AsyncSession) -> None:
+        service = OrganizationService(async_session)
+        _, _, plain_key = await _org_with_key(service)
+        recorder = LastUsedRecorder()
+
+        with patch("uncase.services.organization.get_last_used_recorder", return_value=recorder):
+            await service.verify_and_get_org(plain_key)
+            assert len(recorder) == 0
+            await service.verify_and_get_org(plain_key)
+
+        assert len(recorder) == 1
+        assert await recorder.flush(async_session) == 1
@@ -2,15 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 from typing import TYPE_CHECKING
 
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
 from uncase.db.models.audit import AuditLogModel
-from uncase.services.audit import AuditService, audit
+from uncase.services import audit as audit_module
+from uncase.services.audit import AuditService, AuditSink, audit
 
 if TYPE_CHECKING:
+    import pytest
     from sqlalchemy.ext.asyncio import AsyncSession
 
 
+async def _count_logs(session: AsyncSession) -> int:
+    return (await session.execute(select(func.count()).select_from(AuditLogModel))).scalar_one()
+
+
 class TestAuditFunction:
     async def test_basic_audit(self, async_session: AsyncSession) -> None:
         await audit(
@@ -94,6 +105,89 @@ class TestAuditService:
         assert len(page2) == 2
 
 
+class TestAuditSink:
+    async def test_audit_enqueues_while_flusher_runs(
+        self, async_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        sink = AuditSink()
+        sink._running = True
+        monkeypatch.setattr(audit_module, "_audit_sink", sink)
+
+        for i in range(3):
+            await audit(async_session, action="create", resource_type="seed", resource_id=f"s-{i}")
+        assert len(sink) == 3
+        assert await _count_logs(async_session) == 0
+
+        assert await sink.flush(async_session) == 3
+        logs = await AuditService(async_session).list_logs()
+        assert sorted(log.resource_id or "" for log in logs) == ["s-0", "s-1", "s-2"]
+
+    async def test_audit_does_not_commit_caller_session(
+        self, async_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        sink = AuditSink()
+        sink._running = True
+        monkeypatch.setattr(audit_module, "_audit_sink", sink)
+        async_session.add(AuditLogModel(action="pending", resource_type="seed"))
+
+        await audit(async_session, action="create", resource_type="seed")
+        await async_session.rollback()
+
+        assert await _count_logs(async_session) == 0
+
+    async def test_full_sink_writes_inline(self, async_session: AsyncSession, monkeypatch: pytest.MonkeyPatch) -> None:
+        sink = AuditSink(max_entries=1)
+        sink._running = True
+        monkeypatch.setattr(audit_module, "_audit_sink", sink)
+
+        await audit(async_session, action="create", resource_type="seed")
+        await audit(async_session, action="delete", resource_type="seed")
+
+        assert len(sink) == 1
+        assert [log.action for log in await AuditService(async_session).list_logs()] == ["delete"]
+
+    async def test_bad_entry_is_rejected_and_the_rest_written(self, async_session: AsyncSession) -> None:
+        sink = AuditSink(batch_size=4)
+        for i in range(3):
+            sink.enqueue({"id": f"a{i}", "action": "create", "resource_type": "seed"})
+        sink.enqueue({"id": "bad", "action": None, "resource_type": "seed"})
+        sink.enqueue({"id": "a3", "action": "create", "resource_type": "seed"})
+
+        assert await sink.flush(async_session) == 4
+
+        assert len(sink) == 0
+        assert sink.rejected == 1
+        assert await _count_logs(async_session) == 4
+
+    async def test_unreachable_database_requeues_up_to_the_cap(self, async_session: AsyncSession) -> None:
+        sink = AuditSink(max_entries=2)
+        sink.enqueue({"id": "a1", "action": "create", "resource_type": "seed"})
+        sink.enqueue({"id": "a2", "action": "create", "resource_type": "seed"})
+
+        async def _fail(*args: object) -> int:
+            raise OperationalError("INSERT", {}, ConnectionError("database unavailable"))
+
+        sink._write = _fail  # type: ignore[method-assign]
+        with contextlib.suppress(OperationalError):
+            await sink.flush(async_session)
+
+        assert len(sink) == 2
+        assert not sink.enqueue({"id": "a3", "action": "create", "resource_type": "seed"})
+
+    async def test_run_flushes_on_cancel(self, async_session: AsyncSession) -> None:
+        sink = AuditSink(flush_interval=60)
+        runner = asyncio.create_task(sink.run(lambda: contextlib.nullcontext(async_session)))  # type: ignore[arg-type]
+        await asyncio.sleep(0)
+        sink.enqueue({"id": "a1", "action": "create", "resource_type": "seed"})
+
+        runner.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await runner
+
+        assert not sink.running
+        assert await _count_logs(async_session) == 1
+
+
 class TestAuditLogModel:
     def test_tablename(self) -> None:
         assert AuditLogModel.__tablename__ == "audit_logs"
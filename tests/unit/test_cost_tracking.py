@@ -2,16 +2,17 @@
 
 from __future__ import annotations
 
-import uuid
 from datetime import UTC, datetime, timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from uncase.db.models.usage import UsageEventModel
+from uncase.schemas.usage import UsageEventRecord
 from uncase.services.cost_tracking import (
     PROVIDER_PRICING,
     CostTrackingService,
     estimate_cost,
+    ledger_row,
 )
+from uncase.services.usage import UsageMeteringService, event_row
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -26,16 +27,20 @@ def _make_usage_event(
     provider: str = "anthropic",
     tokens: int = 0,
     created_at: datetime | None = None,
-) -> UsageEventModel:
-    return UsageEventModel(
-        id=uuid.uuid4().hex,
+) -> dict[str, Any]:
+    """Build a usage event row carrying cost metadata."""
+    record = UsageEventRecord(
         event_type=event_type,
         organization_id=organization_id,
         resource_id=resource_id,
-        count=1,
-        metadata_={"cost_usd": cost_usd, "provider": provider, "tokens": tokens},
-        created_at=created_at or datetime.now(UTC),
+        metadata={"cost_usd": cost_usd, "provider": provider, "tokens": tokens},
     )
+    return event_row(record, created_at=created_at or datetime.now(UTC))
+
+
+async def _record(session: AsyncSession, *rows: dict[str, Any]) -> None:
+    """Write usage events through the metering service, which maintains the cost ledger."""
+    await UsageMeteringService(session).record_batch(list(rows))
 
 
 class TestEstimateCost:
@@ -66,8 +71,8 @@ class TestCostTrackingService:
         assert summary["event_count"] == 0
 
     async def test_org_summary_with_events(self, async_session: AsyncSession) -> None:
-        async_session.add(_make_usage_event(cost_usd=0.05, tokens=5000, provider="anthropic"))
-        async_session.add(_make_usage_event(cost_usd=0.03, tokens=3000, provider="openai"))
+        await _record(async_session, _make_usage_event(cost_usd=0.05, tokens=5000, provider="anthropic"))
+        await _record(async_session, _make_usage_event(cost_usd=0.03, tokens=3000, provider="openai"))
         await async_session.commit()
 
         service = CostTrackingService(async_session)
@@ -80,7 +85,7 @@ class TestCostTrackingService:
 
     async def test_org_summary_excludes_old_events(self, async_session: AsyncSession) -> None:
         old_date = datetime.now(UTC) - timedelta(days=60)
-        async_session.add(_make_usage_event(cost_usd=1.00, tokens=10000, created_at=old_date))
+        await _record(async_session, _make_usage_event(cost_usd=1.00, tokens=10000, created_at=old_date))
         await async_session.commit()
 
         service = CostTrackingService(async_session)
@@ -88,8 +93,8 @@ class TestCostTrackingService:
         assert summary["total_cost_usd"] == 0.0
 
     async def test_org_summary_filters_by_org(self, async_session: AsyncSession) -> None:
-        async_session.add(_make_usage_event(organization_id="org-1", cost_usd=0.05, tokens=1000))
-        async_session.add(_make_usage_event(organization_id="org-2", cost_usd=0.10, tokens=2000))
+        await _record(async_session, _make_usage_event(organization_id="org-1", cost_usd=0.05, tokens=1000))
+        await _record(async_session, _make_usage_event(organization_id="org-2", cost_usd=0.10, tokens=2000))
         await async_session.commit()
 
         service = CostTrackingService(async_session)
@@ -103,9 +108,9 @@ class TestCostTrackingService:
         assert result["job_id"] == "job-999"
 
     async def test_job_cost_with_events(self, async_session: AsyncSession) -> None:
-        async_session.add(_make_usage_event(resource_id="job-100", cost_usd=0.02, tokens=2000))
-        async_session.add(_make_usage_event(resource_id="job-100", cost_usd=0.03, tokens=3000))
-        async_session.add(_make_usage_event(resource_id="job-200", cost_usd=0.10, tokens=10000))
+        await _record(async_session, _make_usage_event(resource_id="job-100", cost_usd=0.02, tokens=2000))
+        await _record(async_session, _make_usage_event(resource_id="job-100", cost_usd=0.03, tokens=3000))
+        await _record(async_session, _make_usage_event(resource_id="job-200", cost_usd=0.10, tokens=10000))
         await async_session.commit()
 
         service = CostTrackingService(async_session)
@@ -120,7 +125,7 @@ class TestCostTrackingService:
         assert daily == []
 
     async def test_daily_costs_with_events(self, async_session: AsyncSession) -> None:
-        async_session.add(_make_usage_event(cost_usd=0.01, tokens=100))
+        await _record(async_session, _make_usage_event(cost_usd=0.01, tokens=100))
         await async_session.commit()
 
         service = CostTrackingService(async_session)
@@ -129,11 +134,79 @@ class TestCostTrackingService:
         assert daily[0]["event_count"] >= 1
 
     async def test_daily_costs_org_filter(self, async_session: AsyncSession) -> None:
-        async_session.add(_make_usage_event(organization_id="org-A", cost_usd=0.01, tokens=100))
-        async_session.add(_make_usage_event(organization_id="org-B", cost_usd=0.02, tokens=200))
+        await _record(async_session, _make_usage_event(organization_id="org-A", cost_usd=0.01, tokens=100))
+        await _record(async_session, _make_usage_event(organization_id="org-B", cost_usd=0.02, tokens=200))
         await async_session.commit()
 
         service = CostTrackingService(async_session)
         daily = await service.get_daily_costs(organization_id="org-A")
         total_events = sum(d["event_count"] for d in daily)
         assert total_events == 1
+
+
+class TestCostLedger:
+    def test_ledger_row_reads_metadata(self) -> None:
+        row = _make_usage_event(resource_id="job-1", cost_usd=0.25, tokens=1500, provider="openai")
+        row["metadata_"].update({"input_tokens": 1000, "output_tokens": 500, "model": "gpt-4o"})
+
+        ledger = ledger_row(row)
+
+        assert ledger is not None
+        assert ledger["usage_event_id"] == row["id"]
+        assert (ledger["provider"], ledger["model"], ledger["job_id"]) == ("openai", "gpt-4o", "job-1")
+        assert (ledger["cost_usd"], ledger["input_tokens"], ledger["output_tokens"]) == (0.25, 1000, 500)
+        assert ledger["total_tokens"] == 1500
+
+    def test_ledger_row_tolerates_bad_metadata(self) -> None:
+        row = _make_usage_event()
+        row["metadata_"] = {"cost_usd": "n/a", "input_tokens": 10, "output_tokens": 5, "job_id": "job-7"}
+
+        ledger = ledger_row(row)
+
+        assert ledger is not None
+        assert (ledger["cost_usd"], ledger["total_tokens"], ledger["provider"]) == (0.0, 15, "unknown")
+        assert ledger["job_id"] == "job-7"
+
+    def test_non_cost_events_are_skipped(self) -> None:
+        assert ledger_row(_make_usage_event(event_type="seed_created")) is None
+
+    async def test_only_cost_events_reach_the_ledger(self, async_session: AsyncSession) -> None:
+        await _record(
+            async_session,
+            _make_usage_event(cost_usd=0.05, tokens=500),
+            _make_usage_event(event_type="seed_created", cost_usd=9.99),
+        )
+
+        summary = await CostTrackingService(async_session).get_org_cost_summary("org-1")
+        assert summary["event_count"] == 1
+        assert summary["total_cost_usd"] == 0.05
+
+    async def test_summary_groups_by_provider_and_type(self, async_session: AsyncSession) -> None:
+        await _record(
+            async_session,
+            _make_usage_event(cost_usd=0.10, provider="anthropic"),
+            _make_usage_event(cost_usd=0.20, provider="anthropic", event_type="conversation_generated"),
+            _make_usage_event(cost_usd=0.05, provider="groq"),
+        )
+
+        summary = await CostTrackingService(async_session).get_org_cost_summary("org-1")
+        assert summary["cost_by_provider"] == {"anthropic": 0.3, "groq": 0.05}
+        assert summary["cost_by_event_type"] == {"gateway_call": 0.15, "conversation_generated": 0.2}
+
+    async def test_daily_rollups_accumulate_per_day(self, async_session: AsyncSession) -> None:
+        today = datetime.now(UTC)
+        yesterday = today - timedelta(days=1)
+        await _record(async_session, _make_usage_event(cost_usd=0.01, tokens=100, created_at=yesterday))
+        await _record(
+            async_session,
+            _make_usage_event(cost_usd=0.02, tokens=200, created_at=today),
+            _make_usage_event(cost_usd=0.03, tokens=300, created_at=today, provider="openai"),
+        )
+        await _record(async_session, _make_usage_event(cost_usd=0.04, tokens=400, created_at=today))
+
+        daily = await CostTrackingService(async_session).get_daily_costs(organization_id="org-1")
+
+        assert daily == [
+            {"date": yesterday.date().isoformat(), "cost_usd": 0.01, "tokens": 100, "event_count": 1},
+            {"date": today.date().isoformat(), "cost_usd": 0.09, "tokens": 900, "event_count": 3},
+        ]
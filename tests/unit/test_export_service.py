@@ -0,0 +1,181 @@
+"""Tests for the streaming conversation export service."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uncase.db.models.evaluation import EvaluationReportModel
+from uncase.exceptions import TemplateNotFoundError
+from uncase.schemas.conversation import ConversationTurn
+from uncase.schemas.conversation_api import ConversationCreateRequest
+from uncase.schemas.export import ExportRequest
+from uncase.services.conversation import ConversationService
+from uncase.services.export import ExportService
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _make_create_request(conversation_id: str, **overrides: object) -> ConversationCreateRequest:
+    """Build a valid ConversationCreateRequest with fictional defaults."""
+    defaults: dict[str, object] = {
+        "conversation_id": conversation_id,
+        "dominio": "automotive.sales",
+        "idioma": "es",
+        "turnos": [
+            ConversationTurn(turno=1, rol="vendedor", contenido="Buenos dias, en que puedo ayudarle?"),
+            ConversationTurn(turno=2, rol="cliente", contenido="Busco informacion sobre vehiculos."),
+        ],
+        "es_sintetica": True,
+    }
+    defaults.update(overrides)
+    return ConversationCreateRequest(**defaults)  # type: ignore[arg-type]
+
+
+async def _seed_conversations(session: AsyncSession, count: int = 5, **overrides: object) -> None:
+    service = ConversationService(session)
+    prefix = str(overrides.pop("prefix", "conv"))
+    for i in range(count):
+        await service.create_conversation(_make_create_request(f"{prefix}-{i:03d}", **overrides))
+
+
+async def _collect(service: ExportService, request: ExportRequest, **kwargs: object) -> bytes:
+    return b"".join([chunk async for chunk in service.stream(request, **kwargs)])  # type: ignore[arg-type]
+
+
+class TestExportJSONL:
+    async def test_raw_export_one_line_per_conversation(self, async_session: AsyncSession) -> None:
+        await _seed_conversations(async_session, 5)
+        service = ExportService(async_session)
+
+        data = await _collect(service, ExportRequest(batch_size=2))
+        lines = data.decode("utf-8").splitlines()
+
+        assert len(lines) == 5
+        record = json.loads(lines[0])
+        assert record["conversation_id"] == "conv-000"
+        assert record["num_turnos"] == 2
+        assert record["turnos"][0]["rol"] == "vendedor"
+        assert service.exported == 5
+
+    async def test_rendered_export_uses_template(self, async_session: AsyncSession) -> None:
+        await _seed_conversations(async_session, 3)
+        service = ExportService(async_session)
+
+        data = await _collect(service, ExportRequest(template_name="chatml"))
+        records = [json.loads(line) for line in data.decode("utf-8").splitlines()]
+
+        assert len(records) == 3
+        assert all(r["template"] == "chatml" for r in records)
+        assert "<|im_start|>assistant" in records[0]["text"]
+
+    async def test_unknown_template_raises(self, async_session: AsyncSession) -> None:
+        await _seed_conversations(async_session, 1)
+        service = ExportService(async_session)
+
+        with pytest.raises(TemplateNotFoundError):
+            await _collect(service, ExportRequest(template_name="does_not_exist"))
+
+    async def test_empty_result_produces_no_bytes(self, async_session: AsyncSession) -> None:
+        service = ExportService(async_session)
+        assert await _collect(service, ExportRequest()) == b""
+
+
+class TestExportFilters:
+    async def test_filter_by_domain_and_status(self, async_session: AsyncSession) -> None:
+        await _seed_conversations(async_session, 3, prefix="auto", status="valid")
+        await _seed_conversations(async_session, 2, prefix="med", dominio="medical.consultation", status="valid")
+        await _seed_conversations(async_session, 2, prefix="bad", status="invalid")
+        service = ExportService(async_session)
+
+        request = ExportRequest(domain="automotive.sales", status="valid")
+        data = await _collect(service, request)
+
+        ids = sorted(json.loads(line)["conversation_id"] for line in data.decode("utf-8").splitlines())
+        assert ids == ["auto-000", "auto-001", "auto-002"]
+        assert await service.count(request) == 3
+
+    async def test_filter_by_organization(self, async_session: AsyncSession) -> None:
+        service = ConversationService(async_session)
+        await service.create_conversation(_make_create_request("org-a"), organization_id="org-a")
+        await service.create_conversation(_make_create_request("org-b"), organization_id="org-b")
+
+        data = await _collect(ExportService(async_session), ExportRequest(), organization_id="org-a")
+        assert [json.loads(line)["conversation_id"] for line in data.decode("utf-8").splitlines()] == ["org-a"]
+
+    async def test_filter_by_quality_score(self, async_session: AsyncSession) -> None:
+        await _seed_conversations(async_session, 3)
+        for conv_id, score in (("conv-000", 0.9), ("conv-001", 0.4)):
+            async_session.add(
+                EvaluationReportModel(
+                    conversation_id=conv_id,
+                    rouge_l=0.8,
+                    fidelidad_factual=0.9,
+                    diversidad_lexica=0.7,
+                    coherencia_dialogica=0.9,
+                    privacy_score=0.0,
+                    memorizacion=0.0,
+                    composite_score=score,
+                    passed=score >= 0.5,
+                    failures=[],
+                )
+            )
+        await async_session.commit()
+
+        data = await _collect(ExportService(async_session), ExportRequest(min_quality_score=0.8))
+        assert [json.loads(line)["conversation_id"] for line in data.decode("utf-8").splitlines()] == ["conv-000"]
+
+    async def test_limit(self, async_session: AsyncSession) -> None:
+        await _seed_conversations(async_session, 5)
+        data = await _collect(ExportService(async_session), ExportRequest(limit=2))
+        assert len(data.decode("utf-8").splitlines()) == 2
+
+
+class TestExportFormats:
+    async def test_gzip_stream_is_valid_gzip(self, async_session: AsyncSession) -> None:
+        await _seed_conversations(async_session, 4)
+        data = await _collect(ExportService(async_session), ExportRequest(format="jsonl.gz", batch_size=1))
+
+        lines = gzip.decompress(data).decode("utf-8").splitlines()
+        assert len(lines) == 4
+
+    async def test_parquet_stream_round_trips(self, async_session: AsyncSession) -> None:
+        pq = pytest.importorskip("pyarrow.parquet")
+        await _seed_conversations(async_session, 5)
+
+        data = await _collect(
+            ExportService(async_session), ExportRequest(format="parquet", template_name="chatml", batch_size=2)
+        )
+        parquet_file = pq.ParquetFile(io.BytesIO(data))
+
+        assert parquet_file.metadata.num_rows == 5
+        assert parquet_file.metadata.num_row_groups == 3
+        table = parquet_file.read()
+        assert table.column("template").to_pylist() == ["chatml"] * 5
+
+
+class TestExportToFile:
+    async def test_writes_file_and_reports_progress(self, async_session: AsyncSession, tmp_path: Path) -> None:
+        await _seed_conversations(async_session, 5)
+        progress: list[int] = []
+
+        async def _on_batch(exported: int) -> None:
+            progress.append(exported)
+
+        target = tmp_path / "exports" / "out.jsonl"
+        summary = await ExportService(async_session).export_to_file(
+            ExportRequest(batch_size=2), target, on_batch=_on_batch
+        )
+
+        assert target.exists()
+        assert summary.exported == 5
+        assert summary.bytes_written == target.stat().st_size
+        assert progress == [2, 4, 5]
+        assert not list(target.parent.glob(".*.partial"))
@@ -0,0 +1,171 @@
+"""Tests for the fused pure-ASGI HTTP middleware."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+from prometheus_client import REGISTRY
+from starlette.responses import PlainTextResponse, StreamingResponse
+
+from uncase.api import rate_limit
+from uncase.api.http_middleware import HTTPMiddleware
+from uncase.telemetry import UNMATCHED_ROUTE
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from starlette.types import Message, Receive, Scope, Send
+
+
+def _scope(path: str = "/api/v1/things", headers: list[tuple[bytes, bytes]] | None = None) -> Scope:
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "headers": headers or [],
+        "client": ("10.0.0.1", 1234),
+        "query_string": b"",
+    }
+
+
+def _receiver() -> Receive:
+    """Deliver an empty request body, then block like a client that stays connected."""
+    delivered = False
+
+    async def _receive() -> Message:
+        nonlocal delivered
+        if delivered:
+            await asyncio.Event().wait()
+        delivered = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    return _receive
+
+
+async def _call(app: HTTPMiddleware, scope: Scope) -> list[Message]:
+    sent: list[Message] = []
+
+    async def _send(message: Message) -> None:
+        sent.append(message)
+
+    await app(scope, _receiver(), _send)
+    return sent
+
+
+def _headers(message: Message) -> dict[bytes, bytes]:
+    return dict(message["headers"])
+
+
+class TestHeaders:
+    async def test_security_and_rate_limit_headers(self) -> None:
+        app = HTTPMiddleware(PlainTextResponse("ok"))
+        start, _ = await _call(app, _scope())
+
+        headers = _headers(start)
+        assert headers[b"x-frame-options"] == b"DENY"
+        assert headers[b"cache-control"] == b"no-store, no-cache, must-revalidate, private"
+        assert headers[b"x-ratelimit-limit"] == str(rate_limit.RATE_LIMITS["default"][0]).encode()
+
+    async def test_app_headers_of_same_name_are_replaced(self) -> None:
+        app = HTTPMiddleware(PlainTextResponse("ok", headers={"X-Frame-Options": "SAMEORIGIN"}))
+        start, _ = await _call(app, _scope())
+
+        values = [v for k, v in start["headers"] if k.lower() == b"x-frame-options"]
+        assert values == [b"DENY"]
+
+    async def test_exempt_paths_have_no_rate_limit_headers(self) -> None:
+        app = HTTPMiddleware(PlainTextResponse("ok"))
+        start, _ = await _call(app, _scope("/health"))
+
+        assert b"x-ratelimit-limit" not in _headers(start)
+        assert b"cache-control" not in _headers(start)
+
+
+class TestRateLimit:
+    async def test_over_limit_returns_429_without_calling_app(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        calls: list[Scope] = []
+
+        async def _app(scope: Scope, receive: Receive, send: Send) -> None:
+            calls.append(scope)
+            await PlainTextResponse("ok")(scope, receive, send)
+
+        monkeypatch.setitem(rate_limit.RATE_LIMITS, "default", (1, 60))
+        app = HTTPMiddleware(_app)
+        scope_headers = [(b"x-api-key", b"uc_test_middleware")]
+
+        first, _ = await _call(app, _scope(headers=scope_headers))
+        second, _ = await _call(app, _scope(headers=scope_headers))
+
+        assert first["status"] == 200
+        assert second["status"] == 429
+        assert _headers(second)[b"retry-after"]
+        assert _headers(second)[b"x-content-type-options"] == b"nosniff"
+        assert len(calls) == 1
+
+
+class TestStreaming:
+    async def test_chunks_pass_through_unbuffered(self) -> None:
+        sent: list[Message] = []
+
+        async def _chunks() -> AsyncIterator[str]:
+            for i in range(3):
+                yield f"data: {i}\n\n"
+                # Each chunk must already be on the wire before the next is produced
+                assert sum(1 for m in sent if m["type"] == "http.response.body" and m.get("body")) == i + 1
+
+        async def _send(message: Message) -> None:
+            sent.append(message)
+
+        app = HTTPMiddleware(StreamingResponse(_chunks(), media_type="text/event-stream"))
+        await app(_scope("/api/v1/gateway/chat"), _receiver(), _send)
+
+        bodies = [m["body"] for m in sent if m["type"] == "http.response.body" and m.get("body")]
+        assert bodies == [b"data: 0\n\n", b"data: 1\n\n", b"data: 2\n\n"]
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetrics:
+    async def test_records_status_and_duration(self) -> None:
+        app = HTTPMiddleware(PlainTextResponse("missing", status_code=404))
+        labels = {"method": "PUT", "route": UNMATCHED_ROUTE}
+        before = _sample("uncase_http_requests_total", **labels, status="404")
+        before_hist = _sample("uncase_http_request_duration_seconds_count", **labels)
+
+        await _call(app, {**_scope("/api/v1/metrics-test"), "method": "PUT"})
+
+        assert _sample("uncase_http_requests_total", **labels, status="404") == before + 1
+        assert _sample("uncase_http_request_duration_seconds_count", **labels) == before_hist + 1
+        assert _sample("uncase_http_errors_total", **labels, status="404") >= 1
+        assert _sample("uncase_active_requests") == 0
+
+    async def test_exception_counts_as_500(self) -> None:
+        async def _boom(scope: Scope, receive: Receive, send: Send) -> None:
+            raise RuntimeError("boom")
+
+        app = HTTPMiddleware(_boom)
+        labels = {"method": "DELETE", "route": UNMATCHED_ROUTE, "status": "500"}
+        before = _sample("uncase_http_errors_total", **labels)
+
+        with pytest.raises(RuntimeError):
+            await _call(app, {**_scope("/api/v1/boom"), "method": "DELETE"})
+
+        assert _sample("uncase_http_errors_total", **labels) == before + 1
+        assert _sample("uncase_active_requests") == 0
+
+    async def test_non_http_scopes_pass_through(self) -> None:
+        seen: list[str] = []
+
+        async def _app(scope: Scope, receive: Receive, send: Send) -> None:
+            seen.append(scope["type"])
+
+        await HTTPMiddleware(_app)({"type": "lifespan"}, _receiver(), _send_noop)
+        assert seen == ["lifespan"]
+
+
+async def _send_noop(message: Message) -> None:
+    return None
@@ -0,0 +1,113 @@
+"""Tests for coalesced job progress reporting."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from uncase.services.job_progress import JobEventBroker, ProgressEvent, ProgressReporter, shared_session
+from uncase.services.jobs import JobService
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def _reporter(session: AsyncSession, *, interval: float, min_delta: float = 0.01) -> ProgressReporter:
+    job = await JobService(session).create_job(job_type="test", config={})
+    return ProgressReporter(
+        job.id, shared_session(session), interval=interval, min_delta=min_delta, broker=JobEventBroker()
+    )
+
+
+class TestProgressReporter:
+    async def test_bursts_are_coalesced(self, async_session: AsyncSession) -> None:
+        reporter = await _reporter(async_session, interval=60)
+
+        reporter.report("generation", 0.0, "0/200 conversations")
+        await asyncio.sleep(0.01)
+        for i in range(1, 201):
+            reporter.report("generation", i / 200, f"{i}/200 conversations")
+        await reporter.aclose()
+
+        # First report plus the final state, not 201 writes
+        assert reporter.writes == 2
+        job = await JobService(async_session).get_job(reporter._job_id)
+        await async_session.refresh(job)
+        assert job.progress == 1.0
+        assert job.status_message == "200/200 conversations"
+
+    async def test_trailing_write_after_interval(self, async_session: AsyncSession) -> None:
+        reporter = await _reporter(async_session, interval=0.05)
+
+        reporter.report("seed_engine", 0.1, "start")
+        await asyncio.sleep(0.01)
+        reporter.report("seed_engine", 0.3, "a third")
+        reporter.report("seed_engine", 0.5, "halfway")
+        await asyncio.sleep(0.15)
+
+        assert reporter.writes == 2
+        job = await JobService(async_session).get_job(reporter._job_id)
+        await async_session.refresh(job)
+        assert job.status_message == "halfway"
+        await reporter.aclose()
+
+    async def test_small_changes_are_not_written(self, async_session: AsyncSession) -> None:
+        reporter = await _reporter(async_session, interval=0, min_delta=0.1)
+
+        await reporter.update("export", 0.0, "0/1000")
+        for i in range(1, 50):
+            await reporter.update("export", i / 1000, f"{i}/1000")
+        assert reporter.writes == 1
+
+        await reporter.update("export", 0.2, "200/1000")
+        assert reporter.writes == 2
+
+    async def test_stage_change_is_written(self, async_session: AsyncSession) -> None:
+        reporter = await _reporter(async_session, interval=0, min_delta=0.5)
+
+        await reporter.update("generation", 1.0, "done")
+        await reporter.update("evaluation", 1.0, "starting")
+
+        assert reporter.writes == 2
+
+    async def test_aclose_without_flush_discards_pending(self, async_session: AsyncSession) -> None:
+        reporter = await _reporter(async_session, interval=60)
+
+        reporter.report("generation", 0.1, "first")
+        await asyncio.sleep(0.01)
+        reporter.report("generation", 0.9, "pending")
+        await reporter.aclose(flush=False)
+
+        assert reporter.writes == 1
+
+
+class TestJobEventBroker:
+    async def test_subscriber_receives_latest_event(self) -> None:
+        broker = JobEventBroker()
+        with broker.subscribe("job-1") as subscription:
+            broker.publish(ProgressEvent("job-1", "generation", 0.1, "a"))
+            broker.publish(ProgressEvent("job-1", "generation", 0.2, "b"))
+            broker.publish(ProgressEvent("job-2", "generation", 0.9, "other job"))
+
+            event = await subscription.next(timeout=1)
+            assert event == ProgressEvent("job-1", "generation", 0.2, "b")
+            assert await subscription.next(timeout=0.01) is None
+
+    def test_unsubscribes_on_exit(self) -> None:
+        broker = JobEventBroker()
+        with broker.subscribe("job-1"):
+            pass
+        assert broker._subscribers == {}
+
+    async def test_reporter_publishes_every_report(self, async_session: AsyncSession) -> None:
+        broker = JobEventBroker()
+        job = await JobService(async_session).create_job(job_type="test", config={})
+        reporter = ProgressReporter(job.id, shared_session(async_session), interval=60, broker=broker)
+
+        with broker.subscribe(job.id) as subscription:
+            await reporter.update("generation", 0.3, "3/10")
+            await reporter.update("generation", 0.301, "3/10 (retry)")
+            event = await subscription.next(timeout=1)
+
+        assert event is not None
+        assert event.message == "3/10 (retry)"
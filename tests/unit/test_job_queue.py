@@ -0,0 +1,317 @@
+"""Tests for the durable job queue and worker."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from uncase.db.base import Base
+from uncase.db.models.job import JobModel
+from uncase.services.job_queue import JobContext, JobQueue, get_job_handler, job_handler, load_job_handlers
+from uncase.services.job_worker import JobWorker
+from uncase.services.jobs import JobService
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+    from pathlib import Path
+
+    from uncase.config import UNCASESettings
+
+LEASE = 60
+
+
+async def _expire_lease(session: AsyncSession, job_id: str) -> None:
+    past = datetime.now(UTC) - timedelta(seconds=1)
+    await session.execute(update(JobModel).where(JobModel.id == job_id).values(lease_expires_at=past))
+    await session.commit()
+
+
+class TestJobQueueClaim:
+    async def test_claims_oldest_pending_job(self, async_session: AsyncSession) -> None:
+        service = JobService(async_session)
+        first = await service.create_job(job_type="test", config={})
+        await service.create_job(job_type="test", config={})
+
+        job = await JobQueue(async_session).claim("w1", lease_seconds=LEASE)
+
+        assert job is not None
+        assert job.id == first.id
+        assert job.status == "running"
+        assert job.lease_owner == "w1"
+        assert job.lease_expires_at is not None
+        assert job.attempts == 1
+
+    async def test_job_is_claimed_once(self, async_session: AsyncSession) -> None:
+        await JobService(async_session).create_job(job_type="test", config={})
+        queue = JobQueue(async_session)
+
+        assert await queue.claim("w1", lease_seconds=LEASE) is not None
+        assert await queue.claim("w2", lease_seconds=LEASE) is None
+
+    async def test_claimed_job_is_not_marked_running_again(self, async_session: AsyncSession) -> None:
+        service = JobService(async_session)
+        job = await service.create_job(job_type="test", config={})
+
+        assert await JobQueue(async_session).claim("w1", lease_seconds=LEASE) is not None
+        assert await service.mark_running(job.id) is False
+
+    async def test_job_created_running_is_not_claimed(self, async_session: AsyncSession) -> None:
+        job = await JobService(async_session).create_job(job_type="test", config={}, running=True)
+
+        assert job.status == "running"
+        assert job.attempts == 1
+        assert await JobQueue(async_session).claim("w1", lease_seconds=LEASE) is None
+
+    async def test_filters_by_job_type(self, async_session: AsyncSession) -> None:
+        await JobService(async_session).create_job(job_type="export", config={})
+        queue = JobQueue(async_session)
+
+        assert await queue.claim("w1", lease_seconds=LEASE, job_types=["pipeline_run"]) is None
+        assert await queue.claim("w1", lease_seconds=LEASE, job_types=["export"]) is not None
+
+    async def test_skips_jobs_not_yet_available(self, async_session: AsyncSession) -> None:
+        job = await JobService(async_session).create_job(job_type="test", config={})
+        future = datetime.now(UTC) + timedelta(minutes=5)
+        await async_session.execute(update(JobModel).where(JobModel.id == job.id).values(available_at=future))
+        await async_session.commit()
+
+        assert await JobQueue(async_session).claim("w1", lease_seconds=LEASE) is None
+
+    async def test_reclaims_job_with_expired_lease(self, async_session: AsyncSession) -> None:
+        job = await JobService(async_session).create_job(job_type="test", config={})
+        queue = JobQueue(async_session)
+        await queue.claim("w1", lease_seconds=LEASE)
+        await _expire_lease(async_session, job.id)
+
+        reclaimed = await queue.claim("w2", lease_seconds=LEASE)
+
+        assert reclaimed is not None
+        assert reclaimed.lease_owner == "w2"
+        assert reclaimed.attempts == 2
+        assert await queue.heartbeat(job.id, "w1", lease_seconds=LEASE) is False
+
+
+class TestJobQueueLease:
+    async def test_heartbeat_extends_lease(self, async_session: AsyncSession) -> None:
+        job = await JobService(async_session).create_job(job_type="test", config={})
+        queue = JobQueue(async_session)
+        await queue.claim("w1", lease_seconds=LEASE)
+
+        assert await queue.heartbeat(job.id, "w1", lease_seconds=LEASE) is True
+        assert await queue.heartbeat(job.id, "someone-else", lease_seconds=LEASE) is False
+
+    async def test_heartbeat_fails_after_cancel(self, async_session: AsyncSession) -> None:
+        service = JobService(async_session)
+        job = await service.create_job(job_type="test", config={})
+        queue = JobQueue(async_session)
+        await queue.claim("w1", lease_seconds=LEASE)
+
+        await service.cancel_job(job.id)
+
+        assert await queue.heartbeat(job.id, "w1", lease_seconds=LEASE) is False
+        assert await queue.complete(job.id, "w1", {"ok": True}) is False
+        assert (await service.get_job(job.id)).status == "cancelled"
+
+    async def test_complete_stores_result(self, async_session: AsyncSession) -> None:
+        service = JobService(async_session)
+        job = await service.create_job(job_type="test", config={})
+        queue = JobQueue(async_session)
+        await queue.claim("w1", lease_seconds=LEASE)
+
+        assert await queue.complete(job.id, "w1", {"rows": 3}) is True
+
+        done = await service.get_job(job.id)
+        await async_session.refresh(done)
+        assert done.status == "completed"
+        assert done.result == {"rows": 3}
+        assert done.lease_owner is None
+
+    async def test_release_returns_attempt(self, async_session: AsyncSession) -> None:
+        service = JobService(async_session)
+        job = await service.create_job(job_type="test", config={})
+        queue = JobQueue(async_session)
+        await queue.claim("w1", lease_seconds=LEASE)
+
+        assert await queue.release(job.id, "w1") is True
+
+        released = await service.get_job(job.id)
+        await async_session.refresh(released)
+        assert released.status == "pending"
+        assert released.attempts == 0
+
+
+class TestJobQueueRetry:
+    async def test_failed_attempt_is_retried_with_backoff(self, async_session: AsyncSession) -> None:
+        service = JobService(async_session)
+        job = await service.create_job(job_type="test", config={})
+        queue = JobQueue(async_session)
+        await queue.claim("w1", lease_seconds=LEASE)
+
+        assert await queue.fail(job.id, "w1", "boom", retry_backoff_seconds=30) is True
+
+        retried = await service.get_job(job.id)
+        await async_session.refresh(retried)
+        assert retried.status == "pending"
+        assert retried.error_message == "boom"
+        assert retried.available_at is not None
+        # Not claimable until the backoff elapses
+        assert await queue.claim("w1", lease_seconds=LEASE) is None
+
+    async def test_last_attempt_fails_job(self, async_session: AsyncSession) -> None:
+        service = JobService(async_session)
+        job = await service.create_job(job_type="test", config={})
+        queue = JobQueue(async_session)
+
+        for _ in range(job.max_attempts):
+            claimed = await queue.claim("w1", lease_seconds=LEASE)
+            assert claimed is not None
+            retry = await queue.fail(job.id, "w1", "boom", retry_backoff_seconds=0)
+
+        assert retry is False
+        failed = await service.get_job(job.id)
+        await async_session.refresh(failed)
+        assert failed.status == "failed"
+        assert failed.attempts == job.max_attempts
+
+    async def test_fail_exhausted_fails_expired_final_attempt(self, async_session: AsyncSession) -> None:
+        service = JobService(async_session)
+        job = await service.create_job(job_type="test", config={})
+        await async_session.execute(update(JobModel).where(JobModel.id == job.id).values(max_attempts=1))
+        await async_session.commit()
+        queue = JobQueue(async_session)
+        await queue.claim("w1", lease_seconds=LEASE)
+        await _expire_lease(async_session, job.id)
+
+        assert await queue.claim("w2", lease_seconds=LEASE) is None
+        assert await queue.fail_exhausted() == 1
+
+        failed = await service.get_job(job.id)
+        await async_session.refresh(failed)
+        assert failed.status == "failed"
+
+
+class TestJobHandlers:
+    def test_builtin_handlers_registered(self) -> None:
+        types = load_job_handlers()
+        assert "pipeline_run" in types
+        assert "export" in types
+
+    def test_unknown_type_has_no_handler(self) -> None:
+        assert get_job_handler("no-such-type") is None
+
+
+@pytest.fixture()
+async def session_factory(tmp_path: Path) -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    """A file-backed SQLite database, so worker sessions see each other's commits."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _no_fsync(dbapi_connection: Any, _record: Any) -> None:
+        dbapi_connection.execute("PRAGMA synchronous = OFF")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+class TestJobWorker:
+    async def test_runs_job_and_records_result(
+        self, session_factory: async_sessionmaker[AsyncSession], settings: UNCASESettings
+    ) -> None:
+        @job_handler("test_echo")
+        async def _echo(ctx: JobContext) -> dict[str, Any]:
+            await ctx.progress("echo", 0.5, "halfway")
+            return {"echo": ctx.config["value"], "attempt": ctx.attempt}
+
+        async with session_factory() as session:
+            job = await JobService(session).create_job(job_type="test_echo", config={"value": 42})
+
+        worker = JobWorker(session_factory, settings, worker_id="w1", job_types=["test_echo"])
+        assert await worker.claim_available() == 1
+        await worker.wait_idle()
+
+        async with session_factory() as session:
+            done = await JobService(session).get_job(job.id)
+        assert done.status == "completed"
+        assert done.result == {"echo": 42, "attempt": 1}
+
+    async def test_failing_handler_is_retried(
+        self, session_factory: async_sessionmaker[AsyncSession], settings: UNCASESettings
+    ) -> None:
+        @job_handler("test_fail")
+        async def _fail(ctx: JobContext) -> None:
+            raise RuntimeError("handler exploded")
+
+        async with session_factory() as session:
+            job = await JobService(session).create_job(job_type="test_fail", config={})
+
+        worker = JobWorker(session_factory, settings, worker_id="w1", job_types=["test_fail"])
+        await worker.claim_available()
+        await worker.wait_idle()
+
+        async with session_factory() as session:
+            retried = await JobService(session).get_job(job.id)
+        assert retried.status == "pending"
+        assert retried.error_message == "handler exploded"
+
+    async def test_cancelled_job_stops_on_heartbeat(
+        self, session_factory: async_sessionmaker[AsyncSession], settings: UNCASESettings
+    ) -> None:
+        started = asyncio.Event()
+        stopped = asyncio.Event()
+
+        @job_handler("test_slow")
+        async def _slow(ctx: JobContext) -> None:
+            started.set()
+            try:
+                await asyncio.sleep(30)
+            finally:
+                stopped.set()
+
+        async with session_factory() as session:
+            job = await JobService(session).create_job(job_type="test_slow", config={})
+
+        settings = settings.model_copy(update={"job_heartbeat_interval": 0})
+        worker = JobWorker(session_factory, settings, worker_id="w1", job_types=["test_slow"])
+        await worker.claim_available()
+        await started.wait()
+
+        async with session_factory() as session:
+            await JobService(session).cancel_job(job.id)
+
+        await asyncio.wait_for(worker.wait_idle(), timeout=5)
+        assert stopped.is_set()
+        async with session_factory() as session:
+            assert (await JobService(session).get_job(job.id)).status == "cancelled"
+
+    async def test_shutdown_releases_running_jobs(
+        self, session_factory: async_sessionmaker[AsyncSession], settings: UNCASESettings
+    ) -> None:
+        started = asyncio.Event()
+
+        @job_handler("test_block")
+        async def _block(ctx: JobContext) -> None:
+            started.set()
+            await asyncio.sleep(30)
+
+        async with session_factory() as session:
+            job = await JobService(session).create_job(job_type="test_block", config={})
+
+        settings = settings.model_copy(update={"job_poll_interval": 0.01})
+        worker = JobWorker(session_factory, settings, worker_id="w1", job_types=["test_block"])
+        runner = asyncio.create_task(worker.run())
+        await asyncio.wait_for(started.wait(), timeout=5)
+
+        worker.stop()
+        await asyncio.wait_for(runner, timeout=5)
+
+        async with session_factory() as session:
+            released = await JobService(session).get_job(job.id)
+        assert released.status == "pending"
+        assert released.attempts == 0
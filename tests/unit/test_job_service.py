@@ -92,10 +92,18 @@ class TestJobServiceLifecycle:
     async def test_mark_running(self, async_session: AsyncSession) -> None:
         service = JobService(async_session)
         job = await service.create_job(job_type="test", config={})
-        await service.mark_running(job.id)
+        assert await service.mark_running(job.id) is True
         updated = await service.get_job(job.id)
         assert updated.status == "running"
 
+    async def test_mark_running_only_once(self, async_session: AsyncSession) -> None:
+        service = JobService(async_session)
+        job = await service.create_job(job_type="test", config={})
+        await service.mark_running(job.id)
+        assert await service.mark_running(job.id) is False
+        updated = await service.get_job(job.id)
+        assert updated.attempts == 1
+
     async def test_mark_completed(self, async_session: AsyncSession) -> None:
         service = JobService(async_session)
         job = await service.create_job(job_type="test", config={})
@@ -38,3 +38,18 @@ class TestMetricsEndpoint:
         response = await client.get("/metrics")
         text = response.text
         assert "uncase_http_requests_total" in text
+
+    async def test_latency_is_a_histogram(self, client: AsyncClient) -> None:
+        await client.get("/health")
+        text = (await client.get("/metrics")).text
+
+        assert "# TYPE uncase_http_request_duration_seconds histogram" in text
+        assert 'uncase_http_request_duration_seconds_bucket{le="0.005",method="GET",route="/health"}' in text
+
+    async def test_routes_are_labelled_by_template(self, client: AsyncClient) -> None:
+        await client.get("/api/v1/seeds/seed-does-not-exist-1")
+        await client.get("/api/v1/seeds/seed-does-not-exist-2")
+        text = (await client.get("/metrics")).text
+
+        assert 'route="/api/v1/seeds/{seed_id}"' in text
+        assert "seed-does-not-exist" not in text
@@ -0,0 +1,107 @@
+"""Tests for batched PII anonymization on PIIScanner.
+
+All PII used here is fictional.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uncase.core.privacy import scanner as scanner_module
+from uncase.core.privacy.scanner import PIIEntity, PIIScanner, _anonymize, shutdown_process_pool
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_TEXTS = [
+    "Escribe a juan.perez@correo.com o llama al 555-123-4567",
+    "Sin datos sensibles aqui",
+    "",
+    "RFC GODE561231GR8, IP 192.168.1.10, tarjeta 4111 1111 1111 1111",
+    "Mi SSN es 123-45-6789 y mi correo ana@example.org",
+]
+
+
+class TestScanAndAnonymizeMany:
+    def test_matches_single_text_results(self) -> None:
+        scanner = PIIScanner()
+
+        batch = scanner.scan_and_anonymize_many(_TEXTS)
+
+        for text, result in zip(_TEXTS, batch, strict=True):
+            single = scanner.scan_and_anonymize(text)
+            assert result.anonymized_text == single.anonymized_text
+            assert result.entities == single.entities
+        assert batch[0].anonymized_text == "Escribe a [EMAIL] o llama al [PHONE]"
+        assert not batch[1].pii_found
+
+    def test_bypass_words_apply_to_batches(self) -> None:
+        scanner = PIIScanner(bypass_words={"ana@example.org"})
+
+        [result] = scanner.scan_and_anonymize_many([_TEXTS[4]])
+
+        assert result.anonymized_text == "Mi SSN es [SSN] y mi correo ana@example.org"
+
+    def test_empty_batch(self) -> None:
+        assert PIIScanner().scan_and_anonymize_many([]) == []
+
+
+class TestProcessPool:
+    @pytest.fixture(autouse=True)
+    def small_batches_use_the_pool(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+        monkeypatch.setattr(scanner_module, "_MIN_TEXTS_PER_PROCESS", 2)
+        yield
+        shutdown_process_pool()
+
+    def test_process_pool_preserves_order(self) -> None:
+        scanner = PIIScanner()
+        texts = _TEXTS * 3
+
+        pooled = scanner.scan_and_anonymize_many(texts, processes=2)
+
+        assert [r.anonymized_text for r in pooled] == [scanner.scan_and_anonymize(t).anonymized_text for t in texts]
+
+    async def test_async_batches_share_one_long_lived_pool(self) -> None:
+        strict = PIIScanner(bypass_words={"ana@example.org"})
+        texts = _TEXTS * 3
+
+        first = await strict.scan_and_anonymize_many_async(texts, processes=2)
+        pool = scanner_module._process_pool
+        second = await PIIScanner().scan_and_anonymize_many_async(texts, processes=2)
+
+        assert pool is not None
+        assert scanner_module._process_pool is pool
+        assert [r.anonymized_text for r in first] == [strict.scan_and_anonymize(t).anonymized_text for t in texts]
+        assert "ana@example.org" in first[4].anonymized_text
+        assert "ana@example.org" not in second[4].anonymized_text
+
+        shutdown_process_pool()
+        assert scanner_module._process_pool is None
+
+    async def test_small_async_batches_stay_in_process(self) -> None:
+        results = await PIIScanner().scan_and_anonymize_many_async(_TEXTS[:3], processes=2)
+
+        assert results[0].anonymized_text == "Escribe a [EMAIL] o llama al [PHONE]"
+        assert scanner_module._process_pool is None
+
+
+class TestAnonymize:
+    def test_overlapping_entities_collapse_into_one_placeholder(self) -> None:
+        text = "Tel +52 555 123 4567 gracias"
+        entities = [
+            PIIEntity(category="phone_intl", text="+52 555 123 4567", start=4, end=20),
+            PIIEntity(category="phone_local", text="555 123 4567", start=8, end=20),
+        ]
+
+        assert _anonymize(text, entities) == "Tel [PHONE] gracias"
+
+    def test_partial_overlap_leaves_no_fragment(self) -> None:
+        text = "abcdefghij"
+        entities = [
+            PIIEntity(category="A", text="bcde", start=1, end=5),
+            PIIEntity(category="B", text="defgh", start=3, end=8),
+        ]
+
+        assert _anonymize(text, entities) == "a[A]ij"
@@ -12,6 +12,7 @@ from uncase.core.pipeline_orchestrator import (
     PipelineResult,
     PipelineStageResult,
 )
+from uncase.core.profiling import PipelineProfiler
 
 
 class TestPipelineStageResult:
@@ -268,3 +269,51 @@ class TestPipelineOrchestrator:
                 run_id="custom-123",
             )
             assert result.run_id == "custom-123"
+
+    async def test_profiled_run(self, mock_settings: MagicMock) -> None:
+        with (
+            patch("uncase.core.pipeline_orchestrator.SeedEngine") as mock_engine_cls,
+            patch("uncase.core.pipeline_orchestrator.LiteLLMGenerator") as mock_gen_cls,
+            patch("uncase.core.pipeline_orchestrator.ConversationEvaluator") as mock_eval_cls,
+        ):
+            mock_engine_cls.return_value.create_seed = AsyncMock(return_value=_make_mock_seed())
+            mock_gen_cls.return_value.generate = AsyncMock(return_value=[_make_mock_conversation()])
+            mock_eval_cls.return_value.evaluate = AsyncMock(return_value=_make_mock_report())
+
+            orchestrator = PipelineOrchestrator(settings=mock_settings)
+            result = await orchestrator.run(
+                raw_conversations=["test"],
+                domain="automotive.sales",
+                count=1,
+                train_adapter=False,
+                profiler=PipelineProfiler(),
+            )
+
+        assert result.profile is not None
+        assert [s.stage for s in result.profile.stages] == ["seed_engine", "generation", "evaluation"]
+        assert result.profile.to_dict()["stages"][2]["stage"] == "evaluation"
+
+    async def test_unwritable_profile_dir_does_not_fail_run(self, mock_settings: MagicMock, tmp_path: Path) -> None:
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("")
+        with (
+            patch("uncase.core.pipeline_orchestrator.SeedEngine") as mock_engine_cls,
+            patch("uncase.core.pipeline_orchestrator.LiteLLMGenerator") as mock_gen_cls,
+            patch("uncase.core.pipeline_orchestrator.ConversationEvaluator") as mock_eval_cls,
+        ):
+            mock_engine_cls.return_value.create_seed = AsyncMock(return_value=_make_mock_seed())
+            mock_gen_cls.return_value.generate = AsyncMock(return_value=[_make_mock_conversation()])
+            mock_eval_cls.return_value.evaluate = AsyncMock(return_value=_make_mock_report())
+
+            orchestrator = PipelineOrchestrator(settings=mock_settings)
+            result = await orchestrator.run(
+                raw_conversations=["test"],
+                domain="automotive.sales",
+                count=1,
+                train_adapter=False,
+                profiler=PipelineProfiler(dump_dir=blocker / "profiles"),
+            )
+
+        assert result.success
+        assert result.profile is not None
+        assert [s.stage for s in result.profile.stages] == ["seed_engine", "generation", "evaluation"]
@@ -0,0 +1,133 @@
+"""Tests for opt-in pipeline profiling."""
+
+from __future__ import annotations
+
+import asyncio
+import pstats
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uncase.core.profiling import PipelineProfiler, get_active_profiler, profile_span
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _busy_wait(seconds: float) -> None:
+    """Hold the event loop thread, like sync CPU work inside a coroutine."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestPipelineProfiler:
+    async def test_stage_and_span_timings(self) -> None:
+        profiler = PipelineProfiler()
+        with profiler.activate():
+            profiler.begin_stage("evaluation")
+            for _ in range(3):
+                with profile_span("metric.rouge_l"):
+                    _busy_wait(0.002)
+            profiler.end_stage()
+
+        (stage,) = profiler.profile.stages
+        assert stage.stage == "evaluation"
+        assert stage.wall_seconds >= 0.006
+        assert stage.cpu_seconds > 0
+        assert stage.spans["metric.rouge_l"].count == 3
+        assert stage.spans["metric.rouge_l"].cpu_seconds > 0
+
+    async def test_detects_event_loop_blocking_with_stack(self) -> None:
+        profiler = PipelineProfiler(block_threshold_ms=50)
+        with profiler.activate():
+            profiler.begin_stage("seed_engine")
+            await asyncio.sleep(0.03)
+            _busy_wait(0.3)
+            await asyncio.sleep(0.05)
+
+        assert profiler.profile.blocking_event_count >= 1
+        event = profiler.profile.blocking_events[0]
+        assert event.stage == "seed_engine"
+        assert event.duration_ms >= 200
+        assert any("_busy_wait" in line for line in event.stack)
+
+    async def test_writes_cprofile_dump_per_stage(self, tmp_path: Path) -> None:
+        profiler = PipelineProfiler(dump_dir=tmp_path)
+        with profiler.activate():
+            profiler.begin_stage("generation")
+            _busy_wait(0.001)
+            profiler.begin_stage("evaluation")
+
+        assert [s.stage for s in profiler.profile.stages] == ["generation", "evaluation"]
+        dump = tmp_path / "generation.prof"
+        assert profiler.profile.stages[0].profile_path == str(dump)
+        assert pstats.Stats(str(dump)).total_calls > 0
+        assert (tmp_path / "evaluation.prof").exists()
+
+    async def test_failed_dump_still_closes_the_stage(self, tmp_path: Path) -> None:
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("")
+        profiler = PipelineProfiler(dump_dir=blocker / "profiles")
+
+        with profiler.activate():
+            profiler.begin_stage("generation")
+            with pytest.raises(OSError):
+                profiler.end_stage()
+
+        assert [s.stage for s in profiler.profile.stages] == ["generation"]
+        assert profiler.profile.stages[0].profile_path is None
+
+        # The cProfile slot was released despite the failure
+        after = PipelineProfiler(dump_dir=tmp_path / "after")
+        with after.activate():
+            after.begin_stage("evaluation")
+        assert not after.profile.cprofile_skipped
+        assert (tmp_path / "after" / "evaluation.prof").exists()
+
+    async def test_inactive_outside_activate(self) -> None:
+        profiler = PipelineProfiler()
+        with profiler.activate():
+            assert get_active_profiler() is profiler
+        assert get_active_profiler() is None
+
+        with profile_span("ignored"):
+            pass
+
+    async def test_to_dict_is_json_ready(self) -> None:
+        profiler = PipelineProfiler()
+        with profiler.activate():
+            profiler.begin_stage("training")
+            with profile_span("prepare_dataset"):
+                pass
+
+        data = profiler.profile.to_dict()
+        assert data["stages"][0]["stage"] == "training"
+        assert data["stages"][0]["spans"]["prepare_dataset"]["count"] == 1
+        assert data["block_threshold_ms"] == 100.0
+
+    async def test_concurrent_profiled_runs_share_cprofile(self, tmp_path: Path) -> None:
+        async def run(profiler: PipelineProfiler) -> None:
+            with profiler.activate():
+                for stage in ("generation", "evaluation"):
+                    profiler.begin_stage(stage)
+                    _busy_wait(0.001)
+                    await asyncio.sleep(0.01)
+
+        first = PipelineProfiler(dump_dir=tmp_path / "first")
+        second = PipelineProfiler(dump_dir=tmp_path / "second")
+        await asyncio.gather(run(first), run(second))
+
+        assert [s.stage for s in first.profile.stages] == ["generation", "evaluation"]
+        assert [s.stage for s in second.profile.stages] == ["generation", "evaluation"]
+        assert all(s.profile_path is not None for s in first.profile.stages)
+        assert all(s.profile_path is None for s in second.profile.stages)
+        assert not first.profile.cprofile_skipped
+        assert second.profile.cprofile_skipped
+
+        # The cProfile slot is free again once both runs are done
+        third = PipelineProfiler(dump_dir=tmp_path / "third")
+        await run(third)
+        assert not third.profile.cprofile_skipped
+        assert (tmp_path / "third" / "evaluation.prof").exists()
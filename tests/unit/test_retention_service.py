@@ -5,6 +5,9 @@ from __future__ import annotations
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING
 
+from sqlalchemy import func, select
+
+from uncase.db.models.audit import AuditLogModel
 from uncase.db.models.job import JobModel
 from uncase.services.retention import DEFAULT_RETENTION, RetentionService
 
@@ -110,6 +113,21 @@ class TestRetentionService:
         stats = await service.apply_policies()
         assert stats["completed_jobs_deleted"] == 1
 
+    async def test_deletes_in_batches_with_progress(self, async_session: AsyncSession) -> None:
+        old_date = datetime.now(UTC) - timedelta(days=400)
+        async_session.add_all(AuditLogModel(action="read", resource_type="seed", created_at=old_date) for _ in range(5))
+        async_session.add(AuditLogModel(action="read", resource_type="seed"))
+        await async_session.commit()
+
+        reports: list[tuple[str, int]] = []
+        service = RetentionService(async_session, batch_size=2)
+        stats = await service.apply_policies(progress=lambda policy, deleted: reports.append((policy, deleted)))
+
+        assert stats["audit_logs_deleted"] == 5
+        assert reports == [("audit_logs", 2), ("audit_logs", 4), ("audit_logs", 5)]
+        remaining = (await async_session.execute(select(func.count()).select_from(AuditLogModel))).scalar_one()
+        assert remaining == 1
+
     async def test_get_retention_config(self, async_session: AsyncSession) -> None:
         service = RetentionService(async_session)
         config = await service.get_retention_config()
@@ -0,0 +1,395 @@
+"""Tests for sandbox fan-out over pluggable backends (offline: no E2B, no LLM calls)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import textwrap
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, ClassVar
+
+import pytest
+
+from uncase.config import UNCASESettings
+from uncase.sandbox.e2b_client import E2BSandboxOrchestrator
+from uncase.sandbox.local_backend import LocalSubprocessBackend
+from uncase.sandbox.orchestrator import SandboxOrchestrator, create_sandbox_orchestrator
+from uncase.sandbox.schemas import SandboxGenerateResponse, SandboxProgress
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+
+def _seed(seed_id: str) -> dict[str, Any]:
+    return {"seed_id": seed_id, "dominio": "automotive.sales", "roles": ["usuario", "asistente"]}
+
+
+def _worker_result(seed: dict[str, Any], count: int) -> dict[str, Any]:
+    conversations = [
+        {
+            "conversation_id": f"{seed['seed_id']}-{i}",
+            "seed_id": seed["seed_id"],
+            "turnos": [{"turno": 1, "rol": "usuario", "contenido": "Hola"}],
+        }
+        for i in range(count)
+    ]
+    reports = [
+        {"conversation_id": c["conversation_id"], "seed_id": seed["seed_id"], "composite_score": 0.8, "passed": True}
+        for c in conversations
+    ]
+    return {"conversations": conversations, "reports": reports, "error": None}
+
+
+def _packed_output(
+    payload: dict[str, Any], failures: dict[str, str] | None = None
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Worker output for *payload*: the streamed conversation events and the final result."""
+    events: list[dict[str, Any]] = []
+    results = []
+    for index, seed_payload in enumerate(payload["payloads"]):
+        failure = (failures or {}).get(seed_payload["seed"]["seed_id"])
+        if failure:
+            results.append({"conversations_streamed": 0, "error": failure})
+            continue
+        generated = _worker_result(seed_payload["seed"], seed_payload["count"])
+        for conversation, report in zip(generated["conversations"], generated["reports"], strict=True):
+            events.append({"event": "conversation", "index": index, "conversation": conversation, "report": report})
+        results.append({"conversations_streamed": seed_payload["count"], "error": None})
+    return events, {"results": results, "error": None}
+
+
+class _FakeBackend:
+    name = "fake"
+    timeout_seconds = 5
+
+    def __init__(self, failures: dict[str, BaseException | str] | None = None) -> None:
+        self.failures = failures or {}
+        self.payloads: list[dict[str, Any]] = []
+        self.timeouts: list[float | None] = []
+        self.demand: list[int] = []
+        self.drained = 0
+
+    async def run(
+        self,
+        payload: dict[str, Any],
+        progress: Callable[[str], object],
+        on_event: Callable[[dict[str, Any]], object],
+        *,
+        timeout: float | None = None,
+    ) -> dict[str, Any]:
+        self.payloads.append(payload)
+        self.timeouts.append(timeout)
+        progress("generating")
+        # The other seeds of the pack stream their conversations before a run-level failure
+        events, result = _packed_output(
+            payload, {k: v if isinstance(v, str) else repr(v) for k, v in self.failures.items()}
+        )
+        for event in events:
+            on_event(event)
+        for seed_payload in payload["payloads"]:
+            failure = self.failures.get(seed_payload["seed"]["seed_id"])
+            if isinstance(failure, BaseException):
+                raise failure
+        return result
+
+    def resize(self, pending_runs: int) -> None:
+        self.demand.append(pending_runs)
+
+    async def drain(self) -> None:
+        self.drained += 1
+
+
+class TestSandboxOrchestrator:
+    async def test_fan_out_collects_results_and_errors(self) -> None:
+        backend = _FakeBackend({"s2": "LLM call failed", "s3": RuntimeError("worker crashed")})
+        orchestrator = SandboxOrchestrator(backend, max_parallel=2)
+
+        response = await orchestrator.fan_out_generate(
+            seeds=[_seed("s1"), _seed("s2"), _seed("s3")], count_per_seed=2, evaluate_after=True
+        )
+
+        assert [r.seed_id for r in response.results] == ["s1", "s2", "s3"]
+        assert len(response.results[0].conversations) == 2
+        assert response.results[1].error == "LLM call failed"
+        assert response.results[2].error == "worker crashed"
+        assert response.summary.total_conversations == 2
+        assert response.summary.total_passed == 2
+        assert response.summary.failed_seeds == 2
+        assert backend.payloads[0]["payloads"][0]["count"] == 2
+        assert backend.payloads[0]["max_concurrency"] == 4
+        assert backend.demand[0] == 3
+        assert backend.demand[-1] == 0
+        assert backend.drained == 1
+
+    async def test_timeout_becomes_a_failed_seed(self) -> None:
+        orchestrator = SandboxOrchestrator(_FakeBackend({"s1": TimeoutError()}), max_parallel=1)
+
+        response = await orchestrator.fan_out_generate(seeds=[_seed("s1")])
+
+        assert response.results[0].error == "Sandbox timed out after 5s"
+
+    async def test_pack_timeout_fails_only_unfinished_seeds(self) -> None:
+        backend = _FakeBackend({"s1": TimeoutError()})
+        orchestrator = SandboxOrchestrator(backend, max_parallel=1, seeds_per_run=3)
+
+        response = await orchestrator.fan_out_generate(seeds=[_seed("s0"), _seed("s1"), _seed("s2")], count_per_seed=2)
+
+        # The run's timeout is the per-seed budget times the pack size
+        assert backend.timeouts == [15]
+        assert [r.error for r in response.results] == [None, "Sandbox timed out after 15s", None]
+        assert [len(r.conversations) for r in response.results] == [2, 0, 2]
+        assert response.summary.total_conversations == 4
+        assert response.summary.failed_seeds == 1
+
+    async def test_stream_yields_progress_then_response(self) -> None:
+        orchestrator = SandboxOrchestrator(_FakeBackend(), max_parallel=2)
+
+        events = [event async for event in orchestrator.fan_out_generate_stream(seeds=[_seed("s1"), _seed("s2")])]
+
+        progress = [e for e in events if isinstance(e, SandboxProgress)]
+        assert [e.status for e in progress if e.seed_id == "s1"] == ["queued", "generating", "generating", "complete"]
+        assert isinstance(events[-1], SandboxGenerateResponse)
+        assert events[-1].summary.total_conversations == 2
+
+    async def test_streamed_conversations_are_reported_as_they_arrive(self) -> None:
+        orchestrator = SandboxOrchestrator(_FakeBackend(), max_parallel=1, worker_concurrency=2)
+
+        events = [
+            event
+            async for event in orchestrator.fan_out_generate_stream(
+                seeds=[_seed("s1")], count_per_seed=3, evaluate_after=False
+            )
+        ]
+
+        completed = [e.conversations_completed for e in events if isinstance(e, SandboxProgress)]
+        assert completed == [0, 0, 1, 2, 3, 3]
+        response = events[-1]
+        assert isinstance(response, SandboxGenerateResponse)
+        assert [c.conversation_id for c in response.results[0].conversations] == ["s1-0", "s1-1", "s1-2"]
+        assert response.results[0].reports is None
+
+    async def test_timeout_is_streamed_as_an_error(self) -> None:
+        orchestrator = SandboxOrchestrator(_FakeBackend({"s1": TimeoutError()}), max_parallel=1)
+
+        events = [event async for event in orchestrator.fan_out_generate_stream(seeds=[_seed("s1")])]
+
+        errors = [e.error for e in events if isinstance(e, SandboxProgress) and e.status == "error"]
+        assert errors == ["Sandbox timed out after 5s"]
+
+    async def test_seeds_are_packed_into_runs(self) -> None:
+        backend = _FakeBackend({"s3": "LLM call failed"})
+        orchestrator = SandboxOrchestrator(backend, max_parallel=2, seeds_per_run=2)
+
+        response = await orchestrator.fan_out_generate(seeds=[_seed(f"s{i}") for i in range(5)])
+
+        assert [len(p["payloads"]) for p in backend.payloads] == [2, 2, 1]
+        assert [r.seed_id for r in response.results] == ["s0", "s1", "s2", "s3", "s4"]
+        assert response.results[3].error == "LLM call failed"
+        assert response.results[2].error is None
+
+    async def test_failed_pack_fails_each_of_its_seeds(self) -> None:
+        orchestrator = SandboxOrchestrator(_FakeBackend({"s1": RuntimeError("boom")}), max_parallel=1, seeds_per_run=2)
+
+        events = [event async for event in orchestrator.fan_out_generate_stream(seeds=[_seed("s0"), _seed("s1")])]
+
+        response = events[-1]
+        assert isinstance(response, SandboxGenerateResponse)
+        assert [r.error for r in response.results] == ["boom", "boom"]
+
+    def test_automatic_pack_size(self) -> None:
+        orchestrator = SandboxOrchestrator(_FakeBackend(), max_parallel=5, seeds_per_run=0)
+
+        assert len(orchestrator._packs(500)) == 50
+        assert len(orchestrator._packs(12)) == 12
+
+
+class _FakeSandbox:
+    """Just enough of ``e2b_code_interpreter.AsyncSandbox`` for the pooled backend."""
+
+    created: ClassVar[list[_FakeSandbox]] = []
+
+    def __init__(self) -> None:
+        self.files = SimpleNamespace(write=self._write)
+        self.commands = SimpleNamespace(run=self._run)
+        self.payload: dict[str, Any] = {}
+        self.runs = 0
+        self.killed = False
+
+    @classmethod
+    async def create(cls, **kwargs: Any) -> _FakeSandbox:
+        sandbox = cls()
+        cls.created.append(sandbox)
+        return sandbox
+
+    async def set_timeout(self, timeout: int) -> None:
+        assert not self.killed
+
+    async def kill(self) -> None:
+        self.killed = True
+
+    async def _write(self, path: str, content: str) -> None:
+        if path.endswith("payload.json"):
+            self.payload = json.loads(content)
+
+    async def _run(self, command: str, timeout: int, on_stdout: Callable[[str], object]) -> SimpleNamespace:
+        self.runs += 1
+        await asyncio.sleep(0.01)
+        if self.payload["payloads"][0]["seed"]["seed_id"] == "crash":
+            return SimpleNamespace(exit_code=1, stdout="", stderr="Traceback")
+        events, result = _packed_output(self.payload)
+        stdout = "".join(json.dumps(message) + "\n" for message in [*events, result])
+        # Deliver output in chunks that split lines, as the SDK may
+        for start in range(0, len(stdout), 50):
+            on_stdout(stdout[start : start + 50])
+        return SimpleNamespace(exit_code=0, stdout=stdout, stderr="")
+
+
+class TestE2BSandboxPool:
+    @pytest.fixture(autouse=True)
+    def fake_e2b(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        _FakeSandbox.created = []
+        monkeypatch.setitem(sys.modules, "e2b_code_interpreter", SimpleNamespace(AsyncSandbox=_FakeSandbox))
+
+    def _orchestrator(self) -> E2BSandboxOrchestrator:
+        settings = UNCASESettings(e2b_enabled=True, e2b_api_key="e2b-test", e2b_max_parallel=3, e2b_seeds_per_run=1)
+        return E2BSandboxOrchestrator(settings=settings)
+
+    async def test_sandboxes_are_reused_across_seeds(self) -> None:
+        orchestrator = self._orchestrator()
+
+        response = await orchestrator.fan_out_generate(seeds=[_seed(f"s{i}") for i in range(12)])
+
+        assert response.summary.failed_seeds == 0
+        assert all(len(result.conversations) == 1 for result in response.results)
+        assert len(_FakeSandbox.created) == 3
+        assert sum(sandbox.runs for sandbox in _FakeSandbox.created) == 12
+        assert all(sandbox.killed for sandbox in _FakeSandbox.created)
+        assert orchestrator._backend.live_sandboxes == 0  # type: ignore[attr-defined]
+
+    async def test_pool_shrinks_with_the_queue(self) -> None:
+        orchestrator = self._orchestrator()
+
+        await orchestrator.fan_out_generate(seeds=[_seed(f"s{i}") for i in range(4)])
+
+        # Three sandboxes for the first wave; only one run was left for the second
+        assert len(_FakeSandbox.created) == 3
+        assert sorted(sandbox.runs for sandbox in _FakeSandbox.created) == [1, 1, 2]
+
+    async def test_failed_sandbox_is_not_reused(self) -> None:
+        orchestrator = self._orchestrator()
+
+        response = await orchestrator.fan_out_generate(seeds=[_seed("crash"), _seed("s1")], max_parallel=1)
+
+        assert response.results[0].error == "Traceback"
+        assert response.results[1].error is None
+        assert len(_FakeSandbox.created) == 2
+
+
+def _ignore(_: object) -> None:
+    pass
+
+
+_STUB_WORKER = textwrap.dedent(
+    """
+    import json, os, sys, time
+
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            break
+        payload = json.loads(line)
+        time.sleep(payload.get("sleep", 0))
+        if payload.get("crash"):
+            sys.exit(3)
+        for index in range(payload.get("events", 0)):
+            print(json.dumps({"event": "conversation", "index": index}), flush=True)
+        print(json.dumps({"pid": os.getpid(), "conversations": [], "reports": None, "error": None}), flush=True)
+    """
+)
+
+
+class TestLocalSubprocessBackend:
+    @pytest.fixture()
+    def stub_worker(self, tmp_path: Path) -> Path:
+        path = tmp_path / "worker.py"
+        path.write_text(_STUB_WORKER, encoding="utf-8")
+        return path
+
+    async def test_workers_are_reused_across_payloads(self, stub_worker: Path) -> None:
+        backend = LocalSubprocessBackend(max_workers=2, worker_path=stub_worker)
+        statuses: list[str] = []
+        try:
+            first = await backend.run({}, statuses.append, _ignore)
+            second = await backend.run({}, statuses.append, _ignore)
+        finally:
+            await backend.aclose()
+
+        assert first["pid"] == second["pid"]
+        assert statuses == ["booting", "generating", "generating"]
+
+    async def test_event_lines_are_forwarded_before_the_result(self, stub_worker: Path) -> None:
+        backend = LocalSubprocessBackend(max_workers=1, worker_path=stub_worker)
+        events: list[dict[str, Any]] = []
+        try:
+            result = await backend.run({"events": 3}, _ignore, events.append)
+        finally:
+            await backend.aclose()
+
+        assert [e["index"] for e in events] == [0, 1, 2]
+        assert result["error"] is None
+
+    async def test_concurrency_is_bounded_by_pool_size(self, stub_worker: Path) -> None:
+        backend = LocalSubprocessBackend(max_workers=2, worker_path=stub_worker)
+        try:
+            results = await asyncio.gather(*(backend.run({"sleep": 0.2}, _ignore, _ignore) for _ in range(4)))
+        finally:
+            await backend.aclose()
+
+        assert len({r["pid"] for r in results}) == 2
+
+    async def test_timed_out_worker_is_replaced(self, stub_worker: Path) -> None:
+        backend = LocalSubprocessBackend(max_workers=1, timeout_seconds=1, worker_path=stub_worker)
+        try:
+            with pytest.raises(TimeoutError):
+                await backend.run({"sleep": 5}, _ignore, _ignore)
+            assert backend.idle_workers == 0
+            result = await backend.run({}, _ignore, _ignore)
+        finally:
+            await backend.aclose()
+
+        assert result["error"] is None
+
+    async def test_crashed_worker_is_an_error(self, stub_worker: Path) -> None:
+        backend = LocalSubprocessBackend(max_workers=1, worker_path=stub_worker)
+
+        with pytest.raises(RuntimeError, match="exited with code 3"):
+            await backend.run({"crash": True}, _ignore, _ignore)
+        assert backend.idle_workers == 0
+
+    async def test_real_worker_serves_one_result_per_line(self) -> None:
+        backend = LocalSubprocessBackend(max_workers=1, python=sys.executable)
+        try:
+            first = await backend.run({"count": 1}, _ignore, _ignore)
+            second = await backend.run({"count": 1}, _ignore, _ignore)
+        finally:
+            await backend.aclose()
+
+        # No seed in the payload: the worker reports the error and keeps serving
+        assert first["error"] == "'seed'"
+        assert second["error"] == "'seed'"
+
+
+class TestCreateSandboxOrchestrator:
+    def test_none_without_a_usable_backend(self) -> None:
+        assert create_sandbox_orchestrator(UNCASESettings(e2b_enabled=False)) is None
+
+    def test_e2b_when_configured(self) -> None:
+        settings = UNCASESettings(e2b_enabled=True, e2b_api_key="e2b-test")
+        assert isinstance(create_sandbox_orchestrator(settings), E2BSandboxOrchestrator)
+
+    def test_local_backend(self) -> None:
+        orchestrator = create_sandbox_orchestrator(UNCASESettings(sandbox_backend="local"))
+        assert orchestrator is not None
+        assert orchestrator.backend_name == "local"
@@ -0,0 +1,94 @@
+"""Tests for concurrent generation in the sandbox worker script (LLM calls are mocked)."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+from uncase.sandbox.worker import run_payload
+
+if TYPE_CHECKING:
+    import pytest
+
+_TURNS = json.dumps(
+    [
+        {"turno": 1, "rol": "usuario", "contenido": "Hola, busco un auto compacto para la ciudad."},
+        {"turno": 2, "rol": "asistente", "contenido": "Con gusto, tenemos varias opciones disponibles."},
+    ]
+)
+
+
+def _payload(seed_id: str, count: int, **extra: Any) -> dict[str, Any]:
+    seed = {"seed_id": seed_id, "dominio": "automotive.sales", "roles": ["usuario", "asistente"]}
+    return {"seed": seed, "count": count, "model": "m", "evaluate_after": True, **extra}
+
+
+class _FakeLLM:
+    """Stands in for ``litellm.acompletion`` and records how many calls overlap."""
+
+    def __init__(self, fail_after: int | None = None) -> None:
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_after = fail_after
+
+    async def __call__(self, **kwargs: Any) -> SimpleNamespace:
+        self.calls += 1
+        call = self.calls
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+            if self.fail_after is not None and call > self.fail_after:
+                raise ValueError("provider unavailable")
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=_TURNS))])
+        finally:
+            self.in_flight -= 1
+
+
+def _lines(out: io.StringIO) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+class TestWorkerConcurrency:
+    async def test_conversations_are_generated_concurrently_and_streamed(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        llm = _FakeLLM()
+        monkeypatch.setattr("litellm.acompletion", llm)
+        out = io.StringIO()
+
+        result = await run_payload(json.dumps({**_payload("s1", 6), "max_concurrency": 3}), out)
+
+        assert result["error"] is None
+        assert result["conversations_streamed"] == 6
+        assert llm.max_in_flight == 3
+        events = _lines(out)
+        assert len(events) == 6
+        assert {e["conversation"]["metadata"]["generation_index"] for e in events} == {str(i) for i in range(6)}
+        assert all(e["report"]["conversation_id"] == e["conversation"]["conversation_id"] for e in events)
+
+    async def test_packed_seeds_share_the_in_flight_cap(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        llm = _FakeLLM()
+        monkeypatch.setattr("litellm.acompletion", llm)
+        out = io.StringIO()
+        packed = {"payloads": [_payload("s1", 3), _payload("s2", 3)], "max_concurrency": 2}
+
+        result = await run_payload(json.dumps(packed), out)
+
+        assert [r["conversations_streamed"] for r in result["results"]] == [3, 3]
+        assert llm.max_in_flight == 2
+        assert sorted(e["index"] for e in _lines(out)) == [0, 0, 0, 1, 1, 1]
+
+    async def test_first_failure_fails_the_seed(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        llm = _FakeLLM(fail_after=2)
+        monkeypatch.setattr("litellm.acompletion", llm)
+        out = io.StringIO()
+
+        result = await run_payload(json.dumps({**_payload("s1", 8), "max_concurrency": 2}), out)
+
+        assert "LLM call failed after 3 attempts" in result["error"]
+        assert result["conversations_streamed"] == len(_lines(out)) == 2
+        # The remaining conversations were cancelled rather than retried to exhaustion
+        assert llm.calls < 2 + 6 * 3
@@ -0,0 +1,267 @@
+"""Tests for the Layer 0 extraction session stores."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from uncase.api.session_store import InMemorySessionStore, RedisSessionStore, create_session_store
+from uncase.config import UNCASESettings
+from uncase.core.seed_engine.layer0.config import Layer0Config
+from uncase.core.seed_engine.layer0.engine import AgenticExtractionEngine
+from uncase.exceptions import ExtractionSessionConflictError
+
+if TYPE_CHECKING:
+    from uncase.core.seed_engine.layer0.interviewer.base_provider import BaseLLMProvider
+
+
+class _Provider:
+    provider_name = "fake"
+
+    async def generate(self, system_prompt: str, user_prompt: str, **kwargs: Any) -> str:
+        return "¿Qué tipo de cliente es?"
+
+
+def _engine() -> AgenticExtractionEngine:
+    provider: BaseLLMProvider = _Provider()  # type: ignore[assignment]
+    engine = AgenticExtractionEngine(Layer0Config(max_turns=10), provider=provider)
+    engine.state.update({"cliente_perfil.tipo_cliente": {"value": "particular", "confidence": 0.95}})
+    engine.state.increment_turn()
+    engine._history.extend(
+        [{"role": "interviewer", "content": "¿Tipo de cliente?"}, {"role": "user", "content": "Particular."}]
+    )
+    return engine
+
+
+class _FakeRedis:
+    """Just enough of ``redis.asyncio.Redis`` (hashes, TTLs, pipelines, the save script) for the session store."""
+
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.expiry: dict[str, int] = {}
+
+    def _hset(
+        self, key: str, field: str | None = None, value: object = None, mapping: dict[str, Any] | None = None
+    ) -> int:
+        values = dict(mapping or {})
+        if field is not None:
+            values[field] = value
+        self.hashes.setdefault(key, {}).update({k: str(v) for k, v in values.items()})
+        return len(values)
+
+    def _hincrby(self, key: str, field: str, amount: int) -> int:
+        bucket = self.hashes.setdefault(key, {})
+        bucket[field] = str(int(bucket.get(field, 0)) + amount)
+        return int(bucket[field])
+
+    def _expire(self, key: str, seconds: int) -> bool:
+        self.expiry[key] = seconds
+        return True
+
+    def _ttl(self, key: str) -> int:
+        if key not in self.hashes:
+            return -2
+        return self.expiry.get(key, -1)
+
+    async def hget(self, key: str, field: str) -> str | None:
+        return self.hashes.get(key, {}).get(field)
+
+    async def hmget(self, key: str, fields: list[str]) -> list[str | None]:
+        return [self.hashes.get(key, {}).get(f) for f in fields]
+
+    async def delete(self, key: str) -> int:
+        self.expiry.pop(key, None)
+        return 1 if self.hashes.pop(key, None) is not None else 0
+
+    async def eval(self, script: str, numkeys: int, key: str, expected: str, state: str) -> int:
+        """Run the session store's compare-and-set save script."""
+        bucket = self.hashes.get(key)
+        if bucket is None:
+            return 0
+        if bucket["version"] != expected:
+            return -1
+        bucket.update({"version": str(int(expected) + 1), "state": state})
+        return int(bucket["version"])
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis: _FakeRedis) -> None:
+        self._redis = redis
+        self._calls: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    async def __aenter__(self) -> _FakePipeline:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    def __getattr__(self, name: str) -> Any:
+        def _queue(*args: Any, **kwargs: Any) -> _FakePipeline:
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    async def execute(self) -> list[Any]:
+        return [getattr(self._redis, f"_{name}")(*args, **kwargs) for name, args, kwargs in self._calls]
+
+
+class TestInMemorySessionStore:
+    async def test_create_get_delete(self) -> None:
+        store = InMemorySessionStore()
+        engine = _engine()
+
+        session_id = await store.create(engine, organization_id="org-1")
+
+        assert await store.get(session_id) is engine
+        assert await store.get_organization_id(session_id) == "org-1"
+        assert await store.delete(session_id)
+        assert await store.get(session_id) is None
+        assert not await store.delete(session_id)
+
+    async def test_get_verified_checks_org(self) -> None:
+        store = InMemorySessionStore()
+        session_id = await store.create(_engine(), organization_id="org-1")
+
+        assert await store.get_verified(session_id, "org-1") is not None
+        assert await store.get_verified(session_id, None) is not None
+        assert await store.get_verified(session_id, "org-2") is None
+
+    async def test_expired_sessions_are_purged_from_the_heap(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        store = InMemorySessionStore(ttl_seconds=60)
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now)
+        first = await store.create(_engine())
+        second = await store.create(_engine())
+        await store.delete(second)
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+        third = await store.create(_engine())
+
+        assert len(store) == 1
+        assert await store.get(first) is None
+        assert await store.get(third) is not None
+        assert [sid for _, sid in store._deadlines] == [third]
+
+
+class TestRedisSessionStore:
+    async def test_session_is_shared_between_workers(self) -> None:
+        redis = _FakeRedis()
+        worker_a = RedisSessionStore(redis)  # type: ignore[arg-type]
+        worker_b = RedisSessionStore(redis)  # type: ignore[arg-type]
+        engine = _engine()
+
+        session_id = await worker_a.create(engine, organization_id="org-1")
+        restored = await worker_b.get_verified(session_id, "org-1")
+
+        assert restored is not None
+        assert restored is not engine
+        assert restored.history == engine.history
+        assert restored.state.get_progress() == engine.state.get_progress()
+        assert redis.expiry[f"layer0:session:{session_id}"] == 3600
+        assert await worker_b.get_verified(session_id, "org-2") is None
+
+    async def test_local_cache_is_reused_until_another_worker_saves(self) -> None:
+        redis = _FakeRedis()
+        worker_a = RedisSessionStore(redis)  # type: ignore[arg-type]
+        worker_b = RedisSessionStore(redis)  # type: ignore[arg-type]
+        session_id = await worker_a.create(_engine())
+
+        on_b = await worker_b.get(session_id)
+        assert await worker_b.get(session_id) is on_b
+
+        on_a = await worker_a.get(session_id)
+        assert on_a is not None
+        on_a.state.increment_turn()
+        await worker_a.save(session_id, on_a)
+
+        refreshed = await worker_b.get(session_id)
+        assert refreshed is not on_b
+        assert refreshed is not None
+        assert refreshed.state.turn_count == 2
+
+    async def test_save_does_not_resurrect_deleted_session(self) -> None:
+        redis = _FakeRedis()
+        store = RedisSessionStore(redis)  # type: ignore[arg-type]
+        engine = _engine()
+        session_id = await store.create(engine)
+        await RedisSessionStore(redis).delete(session_id)  # type: ignore[arg-type]
+
+        await store.save(session_id, engine)
+
+        assert redis.hashes == {}
+        assert await store.get(session_id) is None
+
+    async def test_concurrent_save_conflicts(self) -> None:
+        redis = _FakeRedis()
+        worker_a = RedisSessionStore(redis)  # type: ignore[arg-type]
+        worker_b = RedisSessionStore(redis)  # type: ignore[arg-type]
+        session_id = await worker_a.create(_engine())
+        on_a = await worker_a.get(session_id)
+        on_b = await worker_b.get(session_id)
+        assert on_a is not None
+        assert on_b is not None
+
+        on_a.state.increment_turn()
+        await worker_a.save(session_id, on_a)
+        on_b.state.increment_turn()
+        with pytest.raises(ExtractionSessionConflictError):
+            await worker_b.save(session_id, on_b)
+
+        key = f"layer0:session:{session_id}"
+        assert redis.hashes[key]["version"] == "2"
+        reloaded = await worker_b.get(session_id)
+        assert reloaded is not on_b
+        assert reloaded is not None
+        assert reloaded.state.turn_count == 2
+
+    async def test_save_works_without_local_cache(self) -> None:
+        redis = _FakeRedis()
+        store = RedisSessionStore(redis, cache_size=0)  # type: ignore[arg-type]
+        session_id = await store.create(_engine())
+
+        engine = await store.get(session_id)
+        assert engine is not None
+        await store.save(session_id, engine)
+        await store.save(session_id, engine)
+
+        assert redis.hashes[f"layer0:session:{session_id}"]["version"] == "3"
+
+    async def test_discard_reloads_saved_state(self) -> None:
+        store = RedisSessionStore(_FakeRedis())  # type: ignore[arg-type]
+        session_id = await store.create(_engine())
+        engine = await store.get(session_id)
+        assert engine is not None
+
+        engine.state.increment_turn()  # a failed turn left the engine half-updated
+        await store.discard(session_id)
+
+        reloaded = await store.get(session_id)
+        assert reloaded is not engine
+        assert reloaded is not None
+        assert reloaded.state.turn_count == 1
+
+    async def test_cache_is_bounded(self) -> None:
+        store = RedisSessionStore(_FakeRedis(), cache_size=2)  # type: ignore[arg-type]
+        for _ in range(3):
+            await store.create(_engine())
+
+        assert len(store._cache) == 2
+
+
+class TestCreateSessionStore:
+    def test_memory_by_default(self) -> None:
+        assert isinstance(create_session_store(UNCASESettings()), InMemorySessionStore)
+
+    def test_redis_backend(self) -> None:
+        settings = UNCASESettings(layer0_session_backend="redis", redis_url="redis://localhost:6379/0")
+        assert isinstance(create_session_store(settings), RedisSessionStore)
+
+    def test_redis_without_url_falls_back_to_memory(self) -> None:
+        settings = UNCASESettings(layer0_session_backend="redis", redis_url="")
+        assert isinstance(create_session_store(settings), InMemorySessionStore)
@@ -0,0 +1,58 @@
+"""Tests for the Prometheus instrumentation of the SCSF hot paths."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from prometheus_client import REGISTRY
+
+from tests.factories import make_conversation, make_seed
+from uncase.core.evaluator.evaluator import ConversationEvaluator
+from uncase.core.generator.litellm_generator import _record_token_usage
+from uncase.core.pipeline_orchestrator import PipelineStageResult, _record_stage
+from uncase.core.privacy.scanner import PIIScanner
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestCoreInstrumentation:
+    async def test_evaluator_observes_each_metric(self) -> None:
+        evaluator = ConversationEvaluator()
+        names = [metric.name for metric in evaluator._metrics]
+        before = {n: _sample("uncase_evaluator_metric_duration_seconds_count", metric=n) for n in names}
+
+        seed = make_seed()
+        await evaluator.evaluate(make_conversation(seed_id=seed.seed_id), seed)
+
+        for name in names:
+            assert _sample("uncase_evaluator_metric_duration_seconds_count", metric=name) == before[name] + 1
+
+    def test_pii_scan_observes_regex_engine(self) -> None:
+        before = _sample("uncase_pii_scan_duration_seconds_count", engine="regex")
+
+        PIIScanner().scan("Contacto: test@example.com")
+
+        assert _sample("uncase_pii_scan_duration_seconds_count", engine="regex") == before + 1
+
+    def test_token_usage_is_counted(self) -> None:
+        labels = {"model": "test-model"}
+        before = _sample("uncase_llm_tokens_total", **labels, kind="prompt")
+        response = SimpleNamespace(usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30))
+
+        _record_token_usage("test-model", response)
+        _record_token_usage("test-model", SimpleNamespace())
+
+        assert _sample("uncase_llm_tokens_total", **labels, kind="prompt") == before + 120
+        assert _sample("uncase_llm_tokens_total", **labels, kind="completion") >= 30
+
+    def test_pipeline_stage_is_observed(self) -> None:
+        labels = {"stage": "evaluation", "outcome": "error"}
+        before = _sample("uncase_pipeline_stage_duration_seconds_count", **labels)
+        stages: list[PipelineStageResult] = []
+
+        _record_stage(stages, PipelineStageResult(stage="evaluation", success=False, duration_seconds=1.5))
+
+        assert len(stages) == 1
+        assert _sample("uncase_pipeline_stage_duration_seconds_count", **labels) == before + 1
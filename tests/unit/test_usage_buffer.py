@@ -0,0 +1,202 @@
+"""Tests for the buffered usage metering pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from datetime import date
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from uncase.api.metering import meter
+from uncase.db.models.usage import UsageEventModel, UsageRollupModel
+from uncase.db.models.webhook import WebhookDeliveryModel
+from uncase.schemas.usage import UsageEventRecord
+from uncase.schemas.webhook import WebhookSubscriptionCreate
+from uncase.services import usage_buffer
+from uncase.services.usage_buffer import UsageBuffer
+from uncase.services.webhook import WebhookService
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _event(event_type: str = "seed_created", **overrides: object) -> UsageEventRecord:
+    values: dict[str, object] = {"organization_id": None, "event_type": event_type, "resource_id": "seed-abc123"}
+    values.update(overrides)
+    return UsageEventRecord(**values)  # type: ignore[arg-type]
+
+
+async def _count(session: AsyncSession, model: type[object]) -> int:
+    return (await session.execute(select(func.count()).select_from(model))).scalar_one()  # type: ignore[arg-type]
+
+
+def _shared(session: AsyncSession) -> object:
+    return lambda: contextlib.nullcontext(session)
+
+
+class TestUsageBuffer:
+    async def test_flush_writes_events_and_rollups(self, async_session: AsyncSession) -> None:
+        buffer = UsageBuffer()
+        for _ in range(3):
+            buffer.enqueue(_event(count=2))
+        buffer.enqueue(_event("evaluation_run"))
+
+        assert await buffer.flush(async_session) == 4
+        assert len(buffer) == 0
+        assert await _count(async_session, UsageEventModel) == 4
+
+        rollups = (await async_session.execute(select(UsageRollupModel))).scalars().all()
+        by_type = {r.event_type: (r.total_count, r.event_count) for r in rollups}
+        assert by_type == {"seed_created": (6, 3), "evaluation_run": (1, 1)}
+
+    async def test_flush_splits_batches(self, async_session: AsyncSession) -> None:
+        buffer = UsageBuffer(batch_size=2)
+        for _ in range(5):
+            buffer.enqueue(_event())
+
+        assert await buffer.flush(async_session) == 5
+        rollup = (await async_session.execute(select(UsageRollupModel))).scalars().one()
+        assert rollup.event_count == 5
+
+    async def test_full_buffer_drops(self) -> None:
+        buffer = UsageBuffer(max_events=2)
+
+        assert buffer.enqueue(_event())
+        assert buffer.enqueue(_event())
+        assert not buffer.enqueue(_event())
+        assert len(buffer) == 2
+        assert buffer.dropped == 1
+
+    async def test_full_buffer_spills_and_replays(self, async_session: AsyncSession, tmp_path: Path) -> None:
+        spill = tmp_path / "usage_spill.jsonl"
+        buffer = UsageBuffer(max_events=2, overflow="spill", spill_path=spill)
+        for i in range(5):
+            assert buffer.enqueue(_event(resource_id=f"seed-{i}"))
+
+        assert buffer.spilled == 3
+        assert len(spill.read_text().splitlines()) == 3
+
+        assert await buffer.flush(async_session) == 2
+        assert await buffer.flush(async_session) == 2
+        assert await buffer.flush(async_session) == 1
+        assert not spill.exists()
+        resources = (await async_session.execute(select(UsageEventModel.resource_id))).scalars().all()
+        assert sorted(resources) == [f"seed-{i}" for i in range(5)]
+
+    def test_spill_requires_path(self) -> None:
+        with pytest.raises(ValueError, match="spill_path"):
+            UsageBuffer(overflow="spill")
+
+    async def test_unreachable_database_keeps_events(self, async_session: AsyncSession) -> None:
+        buffer = UsageBuffer()
+        buffer.enqueue(_event())
+        buffer.enqueue(_event())
+
+        async def _fail(*args: object) -> int:
+            raise OperationalError("INSERT", {}, ConnectionError("database unavailable"))
+
+        buffer._write = _fail  # type: ignore[method-assign]
+        with pytest.raises(OperationalError):
+            await buffer.flush(async_session)
+        assert len(buffer) == 2
+        assert buffer.rejected == 0
+
+    async def test_requeue_is_capped(self, async_session: AsyncSession) -> None:
+        buffer = UsageBuffer(max_events=3, batch_size=2)
+        for _ in range(3):
+            buffer.enqueue(_event())
+
+        async def _fail(*args: object) -> int:
+            raise OperationalError("INSERT", {}, ConnectionError("database unavailable"))
+
+        buffer._write = _fail  # type: ignore[method-assign]
+        with pytest.raises(OperationalError):
+            await buffer.flush(async_session)
+        buffer.enqueue(_event())
+        with pytest.raises(OperationalError):
+            await buffer.flush(async_session)
+
+        assert len(buffer) == 3
+        assert buffer.dropped == 1
+
+    async def test_bad_event_does_not_block_the_batch(self, async_session: AsyncSession) -> None:
+        buffer = UsageBuffer(batch_size=4)
+        for i in range(6):
+            buffer.enqueue(_event(resource_id=f"seed-{i}"))
+        # Not JSON serializable: the row fails on its own at INSERT time
+        buffer.enqueue(_event(resource_id="seed-bad", metadata={"day": date(2025, 1, 12)}))
+        for i in range(6, 9):
+            buffer.enqueue(_event(resource_id=f"seed-{i}"))
+
+        assert await buffer.flush(async_session) == 9
+        assert await buffer.flush(async_session) == 0
+
+        assert len(buffer) == 0
+        assert buffer.rejected == 1
+        resources = (await async_session.execute(select(UsageEventModel.resource_id))).scalars().all()
+        assert sorted(resources) == [f"seed-{i}" for i in range(9)]
+
+    async def test_flush_dispatches_webhooks(self, async_session: AsyncSession) -> None:
+        await WebhookService(async_session).create_subscription(
+            "org-test-usage-001", WebhookSubscriptionCreate(url="https://hooks.example.test/u", events=["seed_created"])
+        )
+        buffer = UsageBuffer()
+        buffer.enqueue(_event(organization_id="org-test-usage-001"))
+        buffer.enqueue(_event("evaluation_run", organization_id="org-test-usage-001"))
+
+        await buffer.flush(async_session)
+
+        assert await _count(async_session, WebhookDeliveryModel) == 1
+
+    async def test_run_flushes_on_batch_size_and_on_cancel(self, async_session: AsyncSession) -> None:
+        buffer = UsageBuffer(batch_size=3, flush_interval=60)
+        runner = asyncio.create_task(buffer.run(_shared(async_session)))  # type: ignore[arg-type]
+        await asyncio.sleep(0)
+        assert buffer.running
+
+        for _ in range(3):
+            buffer.enqueue(_event())
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+            if len(buffer) == 0:
+                break
+        assert await _count(async_session, UsageEventModel) == 3
+
+        buffer.enqueue(_event())
+        runner.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await runner
+
+        assert not buffer.running
+        assert await _count(async_session, UsageEventModel) == 4
+
+
+class TestMeterBuffering:
+    async def test_meter_enqueues_while_flusher_runs(
+        self, async_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        buffer = UsageBuffer()
+        buffer._running = True
+        monkeypatch.setattr(usage_buffer, "_usage_buffer", buffer)
+
+        await meter(async_session, "seed_created", resource_id="seed-abc123")
+
+        assert len(buffer) == 1
+        assert await _count(async_session, UsageEventModel) == 0
+
+    async def test_meter_records_inline_without_flusher(
+        self, async_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        buffer = UsageBuffer()
+        monkeypatch.setattr(usage_buffer, "_usage_buffer", buffer)
+
+        await meter(async_session, "seed_created", resource_id="seed-abc123")
+
+        assert len(buffer) == 0
+        assert await _count(async_session, UsageEventModel) == 1
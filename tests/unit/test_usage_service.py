@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import select
+
+from uncase.db.models.usage import UsageRollupModel
 from uncase.schemas.usage import UsageEventRecord
-from uncase.services.usage import UsageMeteringService
+from uncase.services.usage import UsageMeteringService, event_row
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -110,6 +114,85 @@ class TestUsageMeteringSummary:
         assert summary.period_end != ""
 
 
+class TestUsageRollups:
+    async def _record_at(self, service: UsageMeteringService, *stamps: str, **overrides: object) -> None:
+        await service.record_batch(
+            [event_row(_make_event(**overrides), created_at=datetime.fromisoformat(s)) for s in stamps]
+        )
+
+    async def test_writes_maintain_hourly_rollups(self, async_session: AsyncSession) -> None:
+        service = UsageMeteringService(async_session)
+        await self._record_at(service, "2026-03-02T10:05:00+00:00", "2026-03-02T10:55:00+00:00", count=2)
+        await self._record_at(service, "2026-03-02T10:30:00+00:00", organization_id=None)
+
+        rollups = (await async_session.execute(select(UsageRollupModel))).scalars().all()
+        by_org = {r.organization_id: (r.total_count, r.event_count) for r in rollups}
+        assert by_org == {"org-test-001": (4, 2), "": (1, 1)}
+
+    async def test_summary_reads_rollups_and_partial_hours(self, async_session: AsyncSession) -> None:
+        service = UsageMeteringService(async_session)
+        await self._record_at(
+            service,
+            "2026-03-02T09:50:00+00:00",  # before the period
+            "2026-03-02T10:20:00+00:00",  # leading partial hour
+            "2026-03-02T11:10:00+00:00",  # whole hour, from rollups
+            "2026-03-02T12:40:00+00:00",  # whole hour, from rollups
+            "2026-03-02T13:05:00+00:00",  # trailing partial hour
+            "2026-03-02T13:45:00+00:00",  # after the period
+        )
+
+        summary = await service.get_summary(
+            period_start=datetime(2026, 3, 2, 10, 15, tzinfo=UTC),
+            period_end=datetime(2026, 3, 2, 13, 30, tzinfo=UTC),
+        )
+
+        assert [(i.event_type, i.total_count, i.event_count) for i in summary.items] == [("seed_created", 4, 4)]
+
+    async def test_summary_within_single_hour(self, async_session: AsyncSession) -> None:
+        service = UsageMeteringService(async_session)
+        await self._record_at(service, "2026-03-02T10:10:00+00:00", "2026-03-02T10:20:00+00:00")
+
+        summary = await service.get_summary(
+            period_start=datetime(2026, 3, 2, 10, 15, tzinfo=UTC),
+            period_end=datetime(2026, 3, 2, 10, 45, tzinfo=UTC),
+        )
+
+        assert summary.total_events == 1
+
+    async def test_timeline_granularities(self, async_session: AsyncSession) -> None:
+        service = UsageMeteringService(async_session)
+        await self._record_at(
+            service,
+            "2026-03-02T10:10:00+00:00",
+            "2026-03-02T11:10:00+00:00",
+            "2026-03-04T08:00:00+00:00",
+            "2026-03-10T08:00:00+00:00",
+        )
+        period = {
+            "period_start": datetime(2026, 3, 1, tzinfo=UTC),
+            "period_end": datetime(2026, 3, 31, tzinfo=UTC),
+        }
+
+        daily = await service.get_timeline(event_type="seed_created", granularity="day", **period)
+        assert [(p.period, p.count) for p in daily.points] == [
+            ("2026-03-02T00:00:00+00:00", 2),
+            ("2026-03-04T00:00:00+00:00", 1),
+            ("2026-03-10T00:00:00+00:00", 1),
+        ]
+
+        weekly = await service.get_timeline(event_type="seed_created", granularity="week", **period)
+        assert [(p.period, p.count) for p in weekly.points] == [
+            ("2026-03-02T00:00:00+00:00", 3),
+            ("2026-03-09T00:00:00+00:00", 1),
+        ]
+
+        monthly = await service.get_timeline(event_type="seed_created", granularity="month", **period)
+        assert [(p.period, p.count) for p in monthly.points] == [("2026-03-01T00:00:00+00:00", 4)]
+
+        other = await service.get_timeline(event_type="evaluation_run", **period)
+        assert other.points == []
+
+
 class TestUsageMeteringListEvents:
     async def test_list_empty(self, async_session: AsyncSession) -> None:
         service = UsageMeteringService(async_session)
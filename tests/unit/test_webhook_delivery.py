@@ -0,0 +1,230 @@
+"""Tests for the concurrent webhook delivery engine."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+from sqlalchemy import select, update
+
+from uncase.db.models.webhook import WebhookDeliveryModel
+from uncase.schemas.webhook import WebhookSubscriptionCreate
+from uncase.services import webhook_delivery
+from uncase.services.webhook import WebhookService
+from uncase.services.webhook_delivery import WebhookDeliveryEngine, sign_payload
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+ORG_ID = "org-test-wh-002"
+SLOW_URL = "https://slow.example.test/hooks"
+FAST_URL = "https://fast.example.test/hooks"
+
+
+async def _subscribe(session: AsyncSession, url: str) -> str:
+    """Create a subscription to ``seed_created``; returns its signing secret."""
+    sub = await WebhookService(session).create_subscription(
+        ORG_ID, WebhookSubscriptionCreate(url=url, events=["seed_created"])
+    )
+    return sub.secret
+
+
+async def _dispatch(session: AsyncSession, times: int = 1) -> None:
+    for _ in range(times):
+        await WebhookService(session).dispatch_event("seed_created", organization_id=ORG_ID, resource_id="s1")
+    await session.commit()
+
+
+def _engine(handler: Callable[[httpx.Request], Awaitable[httpx.Response]], **kwargs: object) -> WebhookDeliveryEngine:
+    engine = WebhookDeliveryEngine(**kwargs)  # type: ignore[arg-type]
+    engine._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return engine
+
+
+async def _statuses(session: AsyncSession) -> list[str]:
+    result = await session.execute(select(WebhookDeliveryModel.status).execution_options(populate_existing=True))
+    return list(result.scalars().all())
+
+
+class TestDeliveryEngine:
+    async def test_delivers_batch_with_signature(self, async_session: AsyncSession) -> None:
+        secret = await _subscribe(async_session, FAST_URL)
+        await _dispatch(async_session, times=3)
+        requests: list[httpx.Request] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(204)
+
+        engine = _engine(handler)
+        processed = await engine.deliver_pending(async_session)
+        await engine.aclose()
+
+        assert processed == 3
+        assert await _statuses(async_session) == ["delivered"] * 3
+        deliveries = (await async_session.execute(select(WebhookDeliveryModel))).scalars().all()
+        expected = {f"sha256={sign_payload(d.payload, secret)}" for d in deliveries}
+        assert {r.headers["X-Webhook-Signature"] for r in requests} == expected
+
+    async def test_slow_host_does_not_delay_other_hosts(self, async_session: AsyncSession) -> None:
+        await _subscribe(async_session, SLOW_URL)
+        await _subscribe(async_session, FAST_URL)
+        await _dispatch(async_session, times=4)
+        finished: dict[str, list[float]] = {"slow.example.test": [], "fast.example.test": []}
+        started = time.perf_counter()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host.startswith("slow"):
+                await asyncio.sleep(0.2)
+            finished[request.url.host].append(time.perf_counter() - started)
+            return httpx.Response(200)
+
+        engine = _engine(handler, per_host_limit=2)
+        assert await engine.deliver_pending(async_session) == 8
+        await engine.aclose()
+
+        # Four slow sends, two at a time -> ~0.4s; fast sends finish right away
+        assert max(finished["fast.example.test"]) < 0.15
+        assert max(finished["slow.example.test"]) >= 0.35
+
+    async def test_per_host_limit(self, async_session: AsyncSession) -> None:
+        await _subscribe(async_session, SLOW_URL)
+        await _dispatch(async_session, times=6)
+        in_flight = peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200)
+
+        engine = _engine(handler, per_host_limit=2)
+        await engine.deliver_pending(async_session)
+        await engine.aclose()
+
+        assert peak == 2
+
+    async def test_failures_are_retried_later(self, async_session: AsyncSession) -> None:
+        await _subscribe(async_session, FAST_URL)
+        await _dispatch(async_session)
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(503)
+
+        engine = _engine(handler)
+        assert await engine.drain(async_session) == 1
+        await engine.aclose()
+
+        delivery = (
+            (await async_session.execute(select(WebhookDeliveryModel).execution_options(populate_existing=True)))
+            .scalars()
+            .one()
+        )
+        assert delivery.status == "pending"
+        assert delivery.error_message == "HTTP 503"
+        assert delivery.next_retry_at is not None
+        assert delivery.claimed_by is None
+
+
+class TestDeliveryClaims:
+    async def test_claimed_rows_are_not_claimed_twice(self, async_session: AsyncSession) -> None:
+        await _subscribe(async_session, FAST_URL)
+        await _dispatch(async_session, times=2)
+
+        first = WebhookDeliveryEngine(engine_id="replica-a")
+        second = WebhookDeliveryEngine(engine_id="replica-b")
+
+        assert len(await first._claim(async_session, 100)) == 2
+        assert await second._claim(async_session, 100) == []
+
+    async def test_expired_claims_are_reclaimed(self, async_session: AsyncSession) -> None:
+        await _subscribe(async_session, FAST_URL)
+        await _dispatch(async_session)
+        await WebhookDeliveryEngine(engine_id="crashed")._claim(async_session, 100)
+
+        past = datetime.now(UTC) - timedelta(seconds=1)
+        await async_session.execute(update(WebhookDeliveryModel).values(claimed_until=past))
+        await async_session.commit()
+
+        claimed = await WebhookDeliveryEngine(engine_id="replica-b")._claim(async_session, 100)
+        assert [d.claimed_by for d in claimed] == ["replica-b"]
+
+    def test_batch_fits_in_the_claim(self) -> None:
+        engine = WebhookDeliveryEngine(per_host_limit=4, timeout=10.0, claim_seconds=120)
+
+        # (120s - 10s of slack) // 10s = 11 rounds of 4 sends to a single host
+        assert engine.max_batch_size == 44
+
+    async def test_drain_claims_batches_of_at_most_max_batch_size(self, async_session: AsyncSession) -> None:
+        await _subscribe(async_session, FAST_URL)
+        await _dispatch(async_session, times=5)
+        batches: list[int] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200)
+
+        # (3s - 1s of slack) // 1s = 2 rounds of 2 sends
+        engine = _engine(handler, per_host_limit=2, timeout=1.0, claim_seconds=3)
+        claim = engine._claim
+
+        async def recording_claim(session: AsyncSession, batch_size: int) -> list[WebhookDeliveryModel]:
+            claimed = await claim(session, batch_size)
+            batches.append(len(claimed))
+            return claimed
+
+        engine._claim = recording_claim  # type: ignore[method-assign]
+        assert await engine.drain(async_session) == 5
+        await engine.aclose()
+
+        assert batches == [4, 1]
+        assert await _statuses(async_session) == ["delivered"] * 5
+
+
+class TestDeliveryWakeup:
+    async def test_dispatch_wakes_engine_after_commit(
+        self, async_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        engine = WebhookDeliveryEngine()
+        monkeypatch.setattr(webhook_delivery, "_active_engine", engine)
+        await _subscribe(async_session, FAST_URL)
+
+        await WebhookService(async_session).dispatch_event("seed_created", organization_id=ORG_ID)
+        assert not engine._wakeup.is_set()
+
+        await async_session.commit()
+        assert engine._wakeup.is_set()
+
+    async def test_run_delivers_on_wake(self, async_session: AsyncSession) -> None:
+        await _subscribe(async_session, FAST_URL)
+        delivered = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            delivered.set()
+            return httpx.Response(200)
+
+        engine = _engine(handler)
+
+        class _SharedSession:
+            async def __aenter__(self) -> AsyncSession:
+                return async_session
+
+            async def __aexit__(self, *exc: object) -> None:
+                return None
+
+        runner = asyncio.create_task(engine.run(lambda: _SharedSession(), poll_interval=60))  # type: ignore[arg-type]
+        await asyncio.sleep(0.05)
+        await _dispatch(async_session)
+
+        await asyncio.wait_for(delivered.wait(), timeout=2)
+        runner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await runner
@@ -0,0 +1,131 @@
+"""Tests for the webhook subscription index used by event dispatch."""
+
+from __future__ import annotations
+
+import contextlib
+import time
+from typing import TYPE_CHECKING
+
+from sqlalchemy import event, func, select
+
+from uncase.db.models.webhook import WebhookDeliveryModel
+from uncase.schemas.webhook import WebhookSubscriptionCreate, WebhookSubscriptionUpdate
+from uncase.services.webhook import WebhookService
+from uncase.services.webhook_index import SubscriptionIndex, get_subscription_index
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+ORG_ID = "org-test-wh-003"
+
+
+@contextlib.contextmanager
+def _count_statements(session: AsyncSession) -> Iterator[list[str]]:
+    """Collect the SQL statements executed on *session*'s engine inside the block."""
+    statements: list[str] = []
+    engine = session.bind.sync_engine  # type: ignore[union-attr]
+
+    def _record(conn: object, cursor: object, statement: str, *args: object) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+async def _subscribe(session: AsyncSession, events: list[str]) -> str:
+    sub = await WebhookService(session).create_subscription(
+        ORG_ID, WebhookSubscriptionCreate(url="https://hooks.example.test/uncase", events=events)
+    )
+    return sub.id
+
+
+class TestSubscriptionIndex:
+    def test_lookup_groups_by_event(self) -> None:
+        index = SubscriptionIndex()
+        index.store("org", index.begin_load("org"), [("a", ["seed_created"]), ("b", ["seed_created", "x"])])
+
+        assert index.lookup("org", "seed_created") == ("a", "b")
+        assert index.lookup("org", "x") == ("b",)
+        assert index.lookup("org", "unknown") == ()
+        assert index.lookup("other-org", "seed_created") is None
+
+    def test_invalidate_discards_racing_load(self) -> None:
+        index = SubscriptionIndex()
+        token = index.begin_load("org")
+        index.invalidate("org")
+        index.store("org", token, [("a", ["seed_created"])])
+
+        assert index.lookup("org", "seed_created") is None
+
+    def test_expired_entry_is_a_miss(self) -> None:
+        index = SubscriptionIndex(ttl_seconds=0.01)
+        index.store("org", index.begin_load("org"), [("a", ["seed_created"])])
+        time.sleep(0.02)
+
+        assert index.lookup("org", "seed_created") is None
+
+    def test_zero_ttl_disables_caching(self) -> None:
+        index = SubscriptionIndex(ttl_seconds=0)
+        index.store("org", index.begin_load("org"), [("a", ["seed_created"])])
+
+        assert index.lookup("org", "seed_created") is None
+
+    def test_eviction_keeps_newest(self) -> None:
+        index = SubscriptionIndex(max_orgs=4)
+        for i in range(5):
+            index.store(f"org-{i}", 0, [])
+
+        assert len(index) <= 4
+        assert index.lookup("org-4", "seed_created") == ()
+
+
+class TestIndexedDispatch:
+    async def test_no_subscribers_needs_no_query_when_warm(self, async_session: AsyncSession) -> None:
+        await _subscribe(async_session, ["import_completed"])
+        service = WebhookService(async_session)
+        await service.dispatch_event("seed_created", organization_id=ORG_ID)
+
+        with _count_statements(async_session) as statements:
+            assert await service.dispatch_event("seed_created", organization_id=ORG_ID) == 0
+            assert await service.dispatch_event("evaluation_completed", organization_id=ORG_ID) == 0
+
+        assert statements == []
+
+    async def test_deliveries_inserted_in_one_statement(self, async_session: AsyncSession) -> None:
+        for _ in range(3):
+            await _subscribe(async_session, ["seed_created"])
+        service = WebhookService(async_session)
+        await service.dispatch_event("seed_created", organization_id=ORG_ID)
+
+        with _count_statements(async_session) as statements:
+            assert await service.dispatch_event("seed_created", organization_id=ORG_ID) == 3
+
+        assert len(statements) == 1
+        assert statements[0].lstrip().upper().startswith("INSERT INTO WEBHOOK_DELIVERIES")
+        await async_session.commit()
+        total = (await async_session.execute(select(func.count()).select_from(WebhookDeliveryModel))).scalar_one()
+        assert total == 6
+
+    async def test_subscription_changes_invalidate(self, async_session: AsyncSession) -> None:
+        service = WebhookService(async_session)
+        assert await service.dispatch_event("seed_created", organization_id=ORG_ID) == 0
+
+        sub_id = await _subscribe(async_session, ["seed_created"])
+        assert await service.dispatch_event("seed_created", organization_id=ORG_ID) == 1
+
+        await service.update_subscription(sub_id, ORG_ID, WebhookSubscriptionUpdate(is_active=False))
+        assert await service.dispatch_event("seed_created", organization_id=ORG_ID) == 0
+
+        await service.update_subscription(sub_id, ORG_ID, WebhookSubscriptionUpdate(is_active=True))
+        assert await service.dispatch_event("seed_created", organization_id=ORG_ID) == 1
+
+        await async_session.commit()
+        await service.delete_subscription(sub_id, ORG_ID)
+        assert get_subscription_index().lookup(ORG_ID, "seed_created") is None
+        assert await service.dispatch_event("seed_created", organization_id=ORG_ID) == 0
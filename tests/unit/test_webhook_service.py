@@ -10,7 +10,8 @@ import pytest
 from uncase.db.models.webhook import WebhookDeliveryModel
 from uncase.exceptions import UNCASEError
 from uncase.schemas.webhook import WebhookSubscriptionCreate, WebhookSubscriptionUpdate
-from uncase.services.webhook import MAX_DELIVERY_ATTEMPTS, WebhookService
+from uncase.services.webhook import WebhookService
+from uncase.services.webhook_delivery import MAX_DELIVERY_ATTEMPTS
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -0,0 +1,86 @@
+"""Tests for the streaming WhatsApp export connector."""
+
+from __future__ import annotations
+
+import io
+import zipfile
+from unittest.mock import patch
+
+from uncase.connectors.whatsapp import WhatsAppConnector
+
+
+def _export(messages: int, senders: tuple[str, ...] = ("Carlos", "Vendedor Ana")) -> str:
+    return "\n".join(
+        f"[12/01/2025, 10:{i % 60:02d}:00] {senders[i % len(senders)]}: Mensaje ficticio {i}" for i in range(messages)
+    )
+
+
+class TestWhatsAppConnector:
+    async def test_multiline_messages_and_system_lines(self) -> None:
+        text = (
+            "[12/01/2025, 10:00:00] Carlos: Hola,\n"
+            "busco un auto compacto.\n"
+            "\n"
+            "[12/01/2025, 10:00:30] Carlos: <Media omitted>\n"
+            "y automatico.\n"
+            "[12/01/2025, 10:01:00] Ana: Buenos dias.\n"
+            "[12/01/2025, 10:02:00] Carlos: Gracias.\n"
+        )
+        result = await WhatsAppConnector().ingest(text)
+
+        turns = result.conversations[0].turnos
+        assert [t.contenido for t in turns] == [
+            "Hola,\nbusco un auto compacto.\ny automatico.",
+            "Buenos dias.",
+            "Gracias.",
+        ]
+
+    async def test_groups_and_stops_at_max_conversations(self) -> None:
+        stream = io.BytesIO(_export(10_000).encode())
+
+        result = await WhatsAppConnector(max_conversations=3).ingest(stream)
+
+        assert result.total_imported == 3
+        assert all(len(c.turnos) == 20 for c in result.conversations)
+        assert stream.tell() < len(stream.getvalue()) // 2
+        assert not stream.closed
+
+    async def test_short_trailing_group_is_skipped(self) -> None:
+        result = await WhatsAppConnector().ingest(_export(42))
+
+        assert result.total_imported == 2
+        assert result.total_skipped == 1
+
+    async def test_sender_names_are_anonymized_once_per_export(self) -> None:
+        connector = WhatsAppConnector()
+        with patch.object(
+            connector._scanner, "scan_and_anonymize_many", wraps=connector._scanner.scan_and_anonymize_many
+        ) as scan:
+            await connector.ingest(_export(60))
+
+        assert scan.call_count == 1
+        scanned = scan.call_args.args[0]
+        assert scanned.count("Carlos") == 1
+        assert scanned.count("Vendedor Ana") == 1
+        assert len(scanned) == 60 + 2
+
+    async def test_zipped_export_ignores_media(self) -> None:
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("IMG-20250112-WA0001.jpg", b"\xff\xd8\xff" * 100)
+            zf.writestr("_chat.txt", ("﻿" + _export(25)).encode())
+
+        result = await WhatsAppConnector().ingest(archive.getvalue())
+
+        assert result.total_imported == 2
+        assert result.conversations[0].turnos[0].contenido == "Mensaje ficticio 0"
+
+    async def test_zip_without_transcript_is_an_error(self) -> None:
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("IMG-20250112-WA0001.jpg", b"\xff\xd8\xff")
+
+        result = await WhatsAppConnector().ingest(archive.getvalue())
+
+        assert result.total_imported == 0
+        assert "No chat transcript" in result.errors[0]
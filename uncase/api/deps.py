@@ -6,10 +6,10 @@ from collections.abc import AsyncGenerator, Callable
 from typing import Annotated
 
 from fastapi import Depends, Header
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from uncase.config import UNCASESettings
-from uncase.db.engine import get_async_session
+from uncase.db.engine import get_async_session, get_session_factory
 from uncase.db.models.organization import OrganizationModel
 from uncase.db.models.user import UserModel
 from uncase.exceptions import AuthenticationError, AuthorizationError, UserNotFoundError
@@ -37,6 +37,11 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+def get_db_factory() -> async_sessionmaker[AsyncSession]:
+    """Return the session factory, for long-lived responses that open short sessions as needed."""
+    return get_session_factory()
+
+
 async def get_current_org(
     x_api_key: Annotated[str, Header()],
     session: Annotated[AsyncSession, Depends(get_db)],
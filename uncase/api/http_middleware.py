@@ -0,0 +1,95 @@
+"""Fused pure-ASGI middleware: security headers, request metrics and rate limiting.
+
+Replaces three ``BaseHTTPMiddleware`` layers. ``BaseHTTPMiddleware`` runs the
+downstream app in a separate task and relays every body chunk through an
+in-memory stream, once per layer; this middleware only wraps ``send`` and
+edits the headers of the ``http.response.start`` message, so streamed
+responses (gateway SSE, exports) reach the server chunk by chunk untouched.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import structlog
+
+from uncase.api import metrics, rate_limit
+from uncase.api.security_headers import security_headers
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = structlog.get_logger(__name__)
+
+# Endpoints whose own requests are not counted
+_UNINSTRUMENTED_PATHS: frozenset[str] = frozenset({"/metrics"})
+
+
+def _header(scope: Scope, name: bytes) -> str:
+    for key, value in scope["headers"]:
+        if key == name:
+            return str(value.decode("latin-1"))
+    return ""
+
+
+class HTTPMiddleware:
+    """Apply rate limiting, record request metrics and inject security headers.
+
+    Per HTTP request:
+
+    1. Non-exempt paths are counted against the client's rate limit window;
+       over-limit clients get a 429 without reaching the app.
+    2. Active requests, status codes and duration histograms (until the
+       last body chunk is sent) are recorded for ``/metrics``, labelled by
+       route template.
+    3. Security and rate limit headers are added to ``http.response.start``,
+       replacing any headers of the same name set by the app.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path: str = scope["path"]
+        extra_headers = security_headers(path)
+        app = self.app
+
+        if path not in rate_limit.EXEMPT_PATHS:
+            client = scope.get("client")
+            client_ip = client[0] if client else "unknown"
+            rate_key = rate_limit.rate_limit_key(
+                _header(scope, b"x-api-key"), _header(scope, b"authorization"), client_ip
+            )
+            allowed, limit, remaining, reset = rate_limit.check_rate_limit(rate_key)
+
+            if allowed:
+                extra_headers = [*extra_headers, *rate_limit.rate_limit_headers(limit, remaining, reset)]
+            else:
+                logger.warning("rate_limit_exceeded", path=path, client=client_ip, limit=limit)
+                app = rate_limit.rate_limited_response(limit, reset)
+
+        extra_names = {name for name, _ in extra_headers}
+        status: int | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = [(k, v) for k, v in message.get("headers", ()) if k.lower() not in extra_names]
+                headers.extend(extra_headers)
+                message["headers"] = headers
+            await send(message)
+
+        if path in _UNINSTRUMENTED_PATHS:
+            await app(scope, receive, send_wrapper)
+            return
+
+        start = metrics.request_started()
+        try:
+            await app(scope, receive, send_wrapper)
+        finally:
+            metrics.request_finished(scope, status, start)
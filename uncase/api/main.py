@@ -11,10 +11,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from uncase._version import __version__
-from uncase.api.metrics import MetricsMiddleware
+from uncase.api.http_middleware import HTTPMiddleware
 from uncase.api.metrics import router as metrics_router
 from uncase.api.middleware import register_exception_handlers
-from uncase.api.rate_limit import RateLimitMiddleware
 from uncase.api.routers.audit import router as audit_router
 from uncase.api.routers.auth import router as auth_router
 from uncase.api.routers.blockchain import router as blockchain_router
@@ -23,6 +22,7 @@ from uncase.api.routers.conversations import router as conversations_router
 from uncase.api.routers.costs import router as costs_router
 from uncase.api.routers.e2b_webhooks import router as e2b_webhooks_router
 from uncase.api.routers.evaluations import router as evaluations_router
+from uncase.api.routers.exports import router as exports_router
 from uncase.api.routers.gateway import router as gateway_router
 from uncase.api.routers.generation import router as generation_router
 from uncase.api.routers.health import router as health_router
@@ -48,8 +48,6 @@ from uncase.log_config import setup_logging
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
 
-_WEBHOOK_INTERVAL_SECONDS = 30
-
 
 def _validate_secret_key(settings: UNCASESettings) -> None:
     """Abort startup if the API secret key is still the default in production."""
@@ -72,26 +70,45 @@ def _validate_secret_key(settings: UNCASESettings) -> None:
         )
 
 
-async def _webhook_scheduler() -> None:
-    """Background loop that processes pending webhook deliveries."""
+async def _webhook_scheduler(settings: UNCASESettings) -> None:
+    """Background loop that delivers pending webhooks, woken early by new dispatches."""
+    from uncase.db.engine import get_session_factory
+    from uncase.services.webhook_delivery import WebhookDeliveryEngine
+
+    engine = WebhookDeliveryEngine.from_settings(settings)
+    await engine.run(get_session_factory(), poll_interval=settings.webhook_poll_interval)
+
+
+async def _api_key_usage_flusher(interval: int) -> None:
+    """Background loop that writes buffered API key ``last_used_at`` timestamps."""
     from uncase.db.engine import get_async_session
-    from uncase.log_config import get_logger
-    from uncase.services.webhook import WebhookService
+    from uncase.services.api_key_cache import get_last_used_recorder
 
-    _logger = get_logger("uncase.webhook_scheduler")
+    recorder = get_last_used_recorder()
 
     while True:
-        await asyncio.sleep(_WEBHOOK_INTERVAL_SECONDS)
+        await asyncio.sleep(interval)
 
         with contextlib.suppress(Exception):
             async for session in get_async_session():
-                service = WebhookService(session)
-                processed = await service.execute_pending_deliveries()
+                await recorder.flush(session)
+                break
 
-                if processed:
-                    _logger.debug("webhook_scheduler_tick", processed=processed)
 
-                break
+async def _usage_flusher() -> None:
+    """Background loop that writes buffered usage events in batches."""
+    from uncase.db.engine import get_session_factory
+    from uncase.services.usage_buffer import get_usage_buffer
+
+    await get_usage_buffer().run(get_session_factory())
+
+
+async def _audit_flusher() -> None:
+    """Background loop that writes buffered audit entries in batches."""
+    from uncase.db.engine import get_session_factory
+    from uncase.services.audit import get_audit_sink
+
+    await get_audit_sink().run(get_session_factory())
 
 
 async def _blockchain_scheduler() -> None:
@@ -137,17 +154,43 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await _hydrate_tools_from_db()
     await _seed_featured_content()
 
-    webhook_task = asyncio.create_task(_webhook_scheduler())
+    webhook_task = asyncio.create_task(_webhook_scheduler(settings))
     blockchain_task = asyncio.create_task(_blockchain_scheduler())
+    api_key_usage_task = asyncio.create_task(_api_key_usage_flusher(settings.api_key_last_used_flush_interval))
+    usage_task = asyncio.create_task(_usage_flusher()) if settings.usage_buffer_enabled else None
+    audit_task = asyncio.create_task(_audit_flusher()) if settings.audit_buffer_enabled else None
     yield
+    # Cancelling the flushers writes what they still buffer, so stop them before the webhook engine
+    for flusher in (usage_task, audit_task):
+        if flusher is not None:
+            flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await flusher
     webhook_task.cancel()
     blockchain_task.cancel()
+    api_key_usage_task.cancel()
 
     with contextlib.suppress(asyncio.CancelledError):
         await webhook_task
     with contextlib.suppress(asyncio.CancelledError):
         await blockchain_task
+    with contextlib.suppress(asyncio.CancelledError):
+        await api_key_usage_task
+
+    # Persist any last_used_at timestamps still buffered
+    with contextlib.suppress(Exception):
+        from uncase.db.engine import get_async_session
+        from uncase.services.api_key_cache import get_last_used_recorder
 
+        async for session in get_async_session():
+            await get_last_used_recorder().flush(session)
+            break
+
+    from uncase.core.privacy.scanner import shutdown_process_pool
+    from uncase.sandbox.local_backend import close_local_backend
+
+    await close_local_backend()
+    await asyncio.to_thread(shutdown_process_pool)
     await close_engine()
 
 
@@ -246,18 +289,10 @@ def create_app() -> FastAPI:
     )
 
     # Middleware (applied in reverse order — last added = first executed)
-    # Security headers (outermost)
-    from uncase.api.security_headers import SecurityHeadersMiddleware
-
-    application.add_middleware(SecurityHeadersMiddleware)
-
-    # Metrics instrumentation
-    application.add_middleware(MetricsMiddleware)
-
-    # Rate limiting
-    application.add_middleware(RateLimitMiddleware)
+    # Rate limiting, metrics instrumentation and security headers (one pure-ASGI layer)
+    application.add_middleware(HTTPMiddleware)
 
-    # CORS
+    # CORS (outermost)
     application.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_origins_list,
@@ -295,6 +330,7 @@ def create_app() -> FastAPI:
     application.include_router(sandbox_router)
     application.include_router(connectors_router)
     application.include_router(conversations_router)
+    application.include_router(exports_router)
     application.include_router(gateway_router)
     application.include_router(knowledge_router)
     application.include_router(layer0_router)
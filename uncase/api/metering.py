@@ -5,6 +5,10 @@ Usage:
 
     result = await service.create_seed(data)
     await meter(session, "seed_created", resource_id=result.id)
+
+While the API's usage flusher is running, events are only queued here and
+written (with their webhook dispatches) in batches by
+:class:`~uncase.services.usage_buffer.UsageBuffer`.
 """
 
 from __future__ import annotations
@@ -14,6 +18,7 @@ from typing import TYPE_CHECKING
 from uncase.log_config import get_logger
 from uncase.schemas.usage import UsageEventRecord
 from uncase.services.usage import UsageMeteringService
+from uncase.services.usage_buffer import get_usage_buffer
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -33,17 +38,21 @@ async def meter(
 ) -> None:
     """Record a usage event. Non-fatal: logs but never raises."""
     try:
-        service = UsageMeteringService(session)
-        await service.record(
-            UsageEventRecord(
-                organization_id=organization_id,
-                event_type=event_type,
-                resource_id=resource_id,
-                count=count,
-                metadata=metadata,
-                ip_address=ip_address,
-            )
+        record = UsageEventRecord(
+            organization_id=organization_id,
+            event_type=event_type,
+            resource_id=resource_id,
+            count=count,
+            metadata=metadata,
+            ip_address=ip_address,
         )
+        buffer = get_usage_buffer()
+        if buffer.running:
+            buffer.enqueue(record)
+            return
+
+        service = UsageMeteringService(session)
+        await service.record(record)
 
         # Dispatch webhook event (fire-and-forget)
         try:
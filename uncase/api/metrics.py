@@ -1,123 +1,80 @@
 """Prometheus metrics endpoint and request instrumentation.
 
-Exposes ``/metrics`` in Prometheus text format with key platform metrics.
+Exposes ``/metrics`` in Prometheus text format. Metric definitions live in
+:mod:`uncase.telemetry`; this module records HTTP requests (called by
+:class:`uncase.api.http_middleware.HTTPMiddleware`) and serves the exposition.
 """
 
 from __future__ import annotations
 
 import time
-from collections import defaultdict
 from typing import TYPE_CHECKING
 
-import structlog
 from fastapi import APIRouter
-from fastapi.responses import PlainTextResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import Response
 
-if TYPE_CHECKING:
-    from collections.abc import Callable
-
-    from fastapi import Request
-    from starlette.responses import Response
+from uncase.telemetry import (
+    ACTIVE_REQUESTS,
+    HTTP_ERRORS,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    UNMATCHED_ROUTE,
+    render_latest,
+)
 
-logger = structlog.get_logger(__name__)
+if TYPE_CHECKING:
+    from starlette.types import Scope
 
 router = APIRouter(tags=["metrics"])
 
-# In-memory metric counters (swap to prometheus_client if installed)
-_request_count: dict[str, int] = defaultdict(int)
-_request_duration_sum: dict[str, float] = defaultdict(float)
-_request_duration_count: dict[str, int] = defaultdict(int)
-_error_count: dict[str, int] = defaultdict(int)
-_active_requests: int = 0
-
 
-class MetricsMiddleware(BaseHTTPMiddleware):
-    """Middleware that collects request metrics for the /metrics endpoint."""
+def route_template(scope: Scope) -> str:
+    """Return the matched route's path template (e.g. ``/api/v1/seeds/{seed_id}``).
 
-    async def dispatch(self, request: Request, call_next: Callable[..., Response]) -> Response:  # type: ignore[override]
-        """Instrument request with timing and status tracking."""
-        global _active_requests
-
-        path = request.url.path
-        method = request.method
-
-        # Skip metrics endpoint itself
-        if path == "/metrics":
-            return await call_next(request)  # type: ignore[misc, no-any-return]
+    Only valid once the router has handled the request; unmatched requests
+    share a single label.
+    """
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if not path_format:
+        return UNMATCHED_ROUTE
+    return f"{scope.get('root_path', '')}{path_format}"
 
-        _active_requests += 1
-        start = time.monotonic()
 
-        try:
-            response = await call_next(request)  # type: ignore[misc]
-        except Exception:
-            _error_count[f"{method}_{path}_500"] += 1
-            _active_requests -= 1
-            raise
+def request_started() -> float:
+    """Mark a request as active and return its start timestamp."""
+    ACTIVE_REQUESTS.inc()
+    return time.perf_counter()
 
-        duration = time.monotonic() - start
-        status = response.status_code
 
-        key = f"{method}_{path}_{status}"
-        _request_count[key] += 1
-        _request_duration_sum[key] += duration
-        _request_duration_count[key] += 1
+def request_finished(scope: Scope, status: int | None, start: float) -> None:
+    """Record a completed request; ``status=None`` means the app raised before responding."""
+    ACTIVE_REQUESTS.dec()
 
-        if status >= 400:
-            _error_count[key] += 1
+    method: str = scope["method"]
+    route = route_template(scope)
+    status_label = str(status or 500)
 
-        _active_requests -= 1
+    HTTP_REQUESTS.labels(method=method, route=route, status=status_label).inc()
+    HTTP_REQUEST_DURATION.labels(method=method, route=route).observe(time.perf_counter() - start)
 
-        return response  # type: ignore[no-any-return]
+    if status is None or status >= 400:
+        HTTP_ERRORS.labels(method=method, route=route, status=status_label).inc()
 
 
-@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
-async def prometheus_metrics() -> str:
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics() -> Response:
     """Prometheus-compatible metrics endpoint.
 
-    Exports:
-    - uncase_http_requests_total: Total HTTP requests by method, path, status
-    - uncase_http_request_duration_seconds: Request duration histogram
-    - uncase_http_errors_total: Total HTTP errors
-    - uncase_active_requests: Currently active requests
+    Exports (see :mod:`uncase.telemetry`):
+    - uncase_http_requests_total / uncase_http_errors_total: by method, route template, status
+    - uncase_http_request_duration_seconds: latency histogram by method, route template
+    - uncase_active_requests: currently active requests
+    - uncase_llm_*: LLM call latency, tokens and retries
+    - uncase_layer0_speculative_questions_total: speculative interview questions by outcome
+    - uncase_sandbox_acquisitions_total: E2B sandboxes handed to worker runs (booted vs reused)
+    - uncase_evaluator_metric_duration_seconds, uncase_pii_scan_duration_seconds,
+      uncase_pipeline_stage_duration_seconds: hot-path timings
     """
-    lines: list[str] = []
-
-    # Request count
-    lines.append("# HELP uncase_http_requests_total Total HTTP requests")
-    lines.append("# TYPE uncase_http_requests_total counter")
-    for key, count in sorted(_request_count.items()):
-        parts = key.rsplit("_", 1)
-        if len(parts) == 2:
-            method_path, status = parts
-            lines.append(f'uncase_http_requests_total{{endpoint="{method_path}",status="{status}"}} {count}')
-
-    # Request duration
-    lines.append("# HELP uncase_http_request_duration_seconds Request duration in seconds")
-    lines.append("# TYPE uncase_http_request_duration_seconds summary")
-    for key, total in sorted(_request_duration_sum.items()):
-        count = _request_duration_count.get(key, 1)
-        avg = total / count if count > 0 else 0
-        parts = key.rsplit("_", 1)
-        if len(parts) == 2:
-            method_path, status = parts
-            lines.append(
-                f'uncase_http_request_duration_seconds{{endpoint="{method_path}",status="{status}"}} {avg:.6f}'
-            )
-
-    # Error count
-    lines.append("# HELP uncase_http_errors_total Total HTTP errors (4xx + 5xx)")
-    lines.append("# TYPE uncase_http_errors_total counter")
-    for key, count in sorted(_error_count.items()):
-        parts = key.rsplit("_", 1)
-        if len(parts) == 2:
-            method_path, status = parts
-            lines.append(f'uncase_http_errors_total{{endpoint="{method_path}",status="{status}"}} {count}')
-
-    # Active requests
-    lines.append("# HELP uncase_active_requests Currently processing requests")
-    lines.append("# TYPE uncase_active_requests gauge")
-    lines.append(f"uncase_active_requests {_active_requests}")
-
-    return "\n".join(lines) + "\n"
+    payload, content_type = render_latest()
+    return Response(content=payload, media_type=content_type)
@@ -1,7 +1,8 @@
-"""Rate limiting middleware — per-key request throttling.
+"""Rate limiting — per-key request throttling.
 
 Uses Redis when ``REDIS_URL`` is set, falls back to an in-memory sliding
-window counter otherwise.
+window counter otherwise. Applied to every request by
+:class:`uncase.api.http_middleware.HTTPMiddleware`.
 """
 
 from __future__ import annotations
@@ -9,17 +10,10 @@ from __future__ import annotations
 import os
 import time
 from collections import defaultdict
-from typing import TYPE_CHECKING, Protocol
+from typing import Protocol
 
 import structlog
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-
-if TYPE_CHECKING:
-    from collections.abc import Callable
-
-    from fastapi import Request
-    from starlette.responses import Response
 
 logger = structlog.get_logger(__name__)
 
@@ -142,65 +136,49 @@ def _create_backend() -> RateLimitBackend:
 _counter: RateLimitBackend = _create_backend()
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """FastAPI middleware for per-key rate limiting.
+def rate_limit_key(api_key: str, authorization: str, client_ip: str) -> str:
+    """Identify the client for rate limiting.
+
+    Uses, in order: the X-API-Key header, the Authorization header, and the
+    client IP address.
+    """
+    return api_key or authorization or client_ip
+
+
+def check_rate_limit(rate_key: str, tier: str = "default") -> tuple[bool, int, int, int]:
+    """Count a request against *rate_key*'s window.
+
+    Returns:
+        Tuple of (allowed, limit, remaining, reset_seconds).
+    """
+    limit, window = RATE_LIMITS[tier]
+    allowed, remaining, reset = _counter.is_allowed(rate_key, limit, window)
+    return allowed, limit, remaining, reset
 
-    Identifies the client by:
-    1. X-API-Key header (if present)
-    2. Authorization header (if present)
-    3. Client IP address (fallback)
 
-    Rate limit headers are included in every response:
+def rate_limit_headers(limit: int, remaining: int, reset: int) -> list[tuple[bytes, bytes]]:
+    """Build the raw rate limit headers included in every response.
+
     - X-RateLimit-Limit: Maximum requests per window
     - X-RateLimit-Remaining: Remaining requests
     - X-RateLimit-Reset: Seconds until window resets
     """
-
-    async def dispatch(self, request: Request, call_next: Callable[..., Response]) -> Response:  # type: ignore[override]
-        """Apply rate limiting to the request."""
-        path = request.url.path
-
-        # Skip exempt paths
-        if path in EXEMPT_PATHS:
-            return await call_next(request)  # type: ignore[misc, no-any-return]
-
-        # Determine rate limit key
-        api_key = request.headers.get("x-api-key", "")
-        auth_header = request.headers.get("authorization", "")
-        client_ip = request.client.host if request.client else "unknown"
-
-        rate_key = api_key or auth_header or client_ip
-
-        # Determine tier (default for now — could be loaded from DB)
-        tier = "default"
-        limit, window = RATE_LIMITS[tier]
-
-        allowed, remaining, reset = _counter.is_allowed(rate_key, limit, window)
-
-        if not allowed:
-            logger.warning(
-                "rate_limit_exceeded",
-                path=path,
-                client=client_ip,
-                limit=limit,
-                window=window,
-            )
-            return JSONResponse(
-                status_code=429,
-                content={"detail": "Rate limit exceeded. Try again later."},
-                headers={
-                    "X-RateLimit-Limit": str(limit),
-                    "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(reset),
-                    "Retry-After": str(reset),
-                },
-            )
-
-        response = await call_next(request)  # type: ignore[misc]
-
-        # Add rate limit headers to response
-        response.headers["X-RateLimit-Limit"] = str(limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(reset)
-
-        return response  # type: ignore[no-any-return]
+    return [
+        (b"x-ratelimit-limit", str(limit).encode()),
+        (b"x-ratelimit-remaining", str(remaining).encode()),
+        (b"x-ratelimit-reset", str(reset).encode()),
+    ]
+
+
+def rate_limited_response(limit: int, reset: int) -> JSONResponse:
+    """Build the 429 response returned once a client exceeds its limit."""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Rate limit exceeded. Try again later."},
+        headers={
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(reset),
+            "Retry-After": str(reset),
+        },
+    )
@@ -32,23 +32,27 @@ logger = structlog.get_logger(__name__)
 
 @router.post("/whatsapp", response_model=ConnectorImportResponse)
 async def import_whatsapp(
-    file: Annotated[UploadFile, File(description="WhatsApp chat export (.txt)")],
+    file: Annotated[UploadFile, File(description="WhatsApp chat export (.txt, or .zip with or without media)")],
     session: Annotated[AsyncSession, Depends(get_db)],
     settings: Annotated[UNCASESettings, Depends(get_settings)],
     org: Annotated[OrganizationModel | None, Depends(get_optional_org)],
 ) -> ConnectorImportResponse:
     """Import conversations from a WhatsApp chat export file.
 
-    Accepts a .txt file exported from WhatsApp. The connector automatically:
+    Accepts a .txt file exported from WhatsApp, or the zipped export (media
+    files in the archive are ignored). The upload is parsed as a stream.
+    The connector automatically:
     - Detects message format (iOS/Android variants)
     - Skips system messages (group changes, media omitted, etc.)
     - Groups messages into conversations
     - Scans ALL text for PII (email, phone, SSN, etc.)
     - Anonymizes detected PII with placeholder tokens
     """
-    content = await file.read()
-    connector = WhatsAppConnector(pii_confidence=settings.uncase_pii_confidence_threshold)
-    result = await connector.ingest(content)
+    connector = WhatsAppConnector(
+        pii_confidence=settings.uncase_pii_confidence_threshold,
+        pii_processes=settings.uncase_pii_scan_processes,
+    )
+    result = await connector.ingest(file.file)
 
     organization_id = org.id if org else None
     logger.info(
@@ -84,7 +88,10 @@ async def receive_webhook(
     """
     import json
 
-    connector = WebhookConnector(pii_confidence=settings.uncase_pii_confidence_threshold)
+    connector = WebhookConnector(
+        pii_confidence=settings.uncase_pii_confidence_threshold,
+        pii_processes=settings.uncase_pii_scan_processes,
+    )
     result = await connector.ingest(json.dumps(payload.model_dump()))
 
     organization_id = org.id if org else None
@@ -272,8 +279,8 @@ async def list_connectors() -> list[dict[str, object]]:
         {
             "name": "WhatsApp Export",
             "slug": "whatsapp",
-            "description": "Import conversations from WhatsApp chat export files (.txt)",
-            "supported_formats": ["txt"],
+            "description": "Import conversations from WhatsApp chat export files (.txt or .zip)",
+            "supported_formats": ["txt", "zip"],
             "endpoint": "/api/v1/connectors/whatsapp",
             "method": "POST",
             "accepts": "file upload",
@@ -0,0 +1,226 @@
+"""Export API — stream persisted conversations out of the database.
+
+Unlike ``/templates/export`` (which renders conversations posted in the
+request body), these endpoints read conversations server-side and stream them
+in constant memory, either directly in the response or to a file via a
+background job.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Annotated, Any
+
+import structlog
+from fastapi import APIRouter, Depends
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from uncase.api.deps import get_db, get_optional_org, get_settings
+from uncase.api.metering import meter
+from uncase.config import UNCASESettings
+from uncase.db.models.organization import OrganizationModel
+from uncase.exceptions import JobNotFoundError, ValidationError
+from uncase.schemas.export import EXPORT_MEDIA_TYPES, ExportJobResponse, ExportRequest
+from uncase.services.export import ExportService, check_export_dependencies
+from uncase.services.job_progress import ProgressReporter, shared_session
+from uncase.services.job_queue import JobContext, job_handler
+from uncase.services.jobs import JobService
+from uncase.templates import get_template_registry, register_all_templates
+from uncase.templates.base import ToolCallMode
+
+# Background task references to prevent garbage collection (Python asyncio requirement)
+_background_tasks: set[asyncio.Task[None]] = set()
+
+router = APIRouter(prefix="/api/v1/exports", tags=["exports"])
+
+logger = structlog.get_logger(__name__)
+
+
+def _validate_request(request: ExportRequest) -> None:
+    """Fail fast on unknown templates, modes or missing encoder dependencies before any bytes are streamed."""
+    check_export_dependencies(request.format)
+    if request.template_name is not None:
+        register_all_templates()
+        get_template_registry().get(request.template_name)
+    try:
+        ToolCallMode(request.tool_call_mode)
+    except ValueError:
+        raise ValidationError(f"Invalid tool_call_mode '{request.tool_call_mode}'") from None
+
+
+def _export_path(settings: UNCASESettings, job_id: str, export_format: str) -> Path:
+    """Location of a job's export file under ``UNCASE_EXPORTS_DIR``.
+
+    Jobs run by ``uncase worker`` write the file on the worker's host, so in
+    ``worker`` mode this directory must be storage shared with the API.
+    """
+    return Path(settings.uncase_exports_dir) / "conversations" / f"{job_id}.{export_format}"
+
+
+@router.post("/conversations")
+async def stream_conversation_export(
+    request: ExportRequest,
+    session: Annotated[AsyncSession, Depends(get_db)],
+    org: Annotated[OrganizationModel | None, Depends(get_optional_org)],
+) -> StreamingResponse:
+    """Stream matching conversations as JSONL, gzip-compressed JSONL or Parquet."""
+    _validate_request(request)
+    org_id = org.id if org else None
+
+    await meter(
+        session,
+        "conversations_exported",
+        organization_id=org_id,
+        metadata={"format": request.format, "template": request.template_name},
+    )
+
+    service = ExportService(session)
+    filename = f"uncase_conversations.{request.format}"
+    logger.info("conversation_export_started", format=request.format, template=request.template_name, org_id=org_id)
+
+    return StreamingResponse(
+        service.stream(request, organization_id=org_id),
+        media_type=EXPORT_MEDIA_TYPES[request.format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/conversations/jobs", response_model=ExportJobResponse, status_code=202)
+async def submit_conversation_export_job(
+    request: ExportRequest,
+    session: Annotated[AsyncSession, Depends(get_db)],
+    settings: Annotated[UNCASESettings, Depends(get_settings)],
+    org: Annotated[OrganizationModel | None, Depends(get_optional_org)],
+) -> ExportJobResponse:
+    """Export matching conversations to a file in a background job."""
+    _validate_request(request)
+    org_id = org.id if org else None
+
+    job_service = JobService(session)
+    job = await job_service.create_job(job_type="export", config=request.model_dump(), organization_id=org_id)
+
+    await meter(
+        session,
+        "conversations_exported",
+        organization_id=org_id,
+        resource_id=job.id,
+        metadata={"format": request.format, "template": request.template_name},
+    )
+
+    if settings.job_execution_mode == "inline":
+        task = asyncio.create_task(_execute_export_job(job.id, request, settings, org_id))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    return ExportJobResponse(
+        job_id=job.id,
+        status="pending",
+        message=f"Export job {job.id} submitted. Download from /api/v1/exports/conversations/jobs/{job.id}/download.",
+    )
+
+
+@router.get("/conversations/jobs/{job_id}/download")
+async def download_conversation_export(
+    job_id: str,
+    session: Annotated[AsyncSession, Depends(get_db)],
+    settings: Annotated[UNCASESettings, Depends(get_settings)],
+    org: Annotated[OrganizationModel | None, Depends(get_optional_org)],
+) -> FileResponse:
+    """Download the file produced by a completed export job."""
+    job = await JobService(session).get_job(job_id)
+    if job.job_type != "export" or (org is not None and job.organization_id != org.id):
+        raise JobNotFoundError(f"Job {job_id} not found")
+    if job.status != "completed" or not job.result:
+        raise ValidationError(f"Export job {job_id} is not completed (status: {job.status})")
+
+    # Resolve against this process's exports directory: the recorded path is the
+    # writer's, which may be a worker with the shared volume mounted elsewhere
+    export_format = str(job.result["format"])
+    path = _export_path(settings, job_id, export_format)
+    if not path.is_file():
+        logger.warning("export_file_missing", job_id=job_id, path=str(path), mode=settings.job_execution_mode)
+        raise JobNotFoundError(
+            f"Export file for job {job_id} not found; with job_execution_mode='worker', "
+            "UNCASE_EXPORTS_DIR must be storage shared by the API and the workers"
+        )
+    return FileResponse(
+        path,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        filename=f"uncase_conversations_{job_id}.{export_format}",
+    )
+
+
+async def execute_export_job(
+    session: AsyncSession,
+    job_id: str,
+    request: ExportRequest,
+    settings: UNCASESettings,
+    organization_id: str | None,
+) -> None:
+    """Run an export job to completion on *session*, recording progress and result."""
+    svc = JobService(session)
+    if not await svc.mark_running(job_id):
+        logger.info("export_job_not_pending", job_id=job_id)
+        return
+
+    # The export reads through *session*, so progress is written inline between batches
+    reporter = ProgressReporter.from_settings(job_id, shared_session(session), settings)
+
+    try:
+        result = await _run_export(session, job_id, request, settings, organization_id, reporter.update)
+        await reporter.aclose()
+        await svc.mark_completed(job_id, result=result)
+
+    except Exception as exc:
+        logger.error("export_job_failed", job_id=job_id, error=str(exc))
+        try:
+            await svc.mark_failed(job_id, str(exc))
+        except Exception:
+            logger.error("failed_to_mark_job_failed", job_id=job_id)
+
+
+async def _run_export(
+    session: AsyncSession,
+    job_id: str,
+    request: ExportRequest,
+    settings: UNCASESettings,
+    organization_id: str | None,
+    progress: Callable[[str, float, str], Awaitable[None]],
+) -> dict[str, Any]:
+    """Write the export file for a job and return its summary as the job result."""
+    service = ExportService(session)
+    total = await service.count(request, organization_id=organization_id)
+
+    async def _on_batch(exported: int) -> None:
+        await progress("export", exported / total if total else 1.0, f"{exported}/{total} conversations exported")
+
+    summary = await service.export_to_file(
+        request,
+        _export_path(settings, job_id, request.format),
+        organization_id=organization_id,
+        on_batch=_on_batch,
+    )
+    return summary.model_dump()
+
+
+@job_handler("export")
+async def _export_job_handler(ctx: JobContext) -> dict[str, Any]:
+    """Run a queued export job on a worker (``job_execution_mode="worker"``)."""
+    request = ExportRequest.model_validate(ctx.config)
+    return await _run_export(ctx.session, ctx.job_id, request, ctx.settings, ctx.organization_id, ctx.progress)
+
+
+async def _execute_export_job(
+    job_id: str,
+    request: ExportRequest,
+    settings: UNCASESettings,
+    organization_id: str | None,
+) -> None:
+    """Execute an export job in the background with its own database session."""
+    from uncase.db.engine import get_async_session
+
+    async for session in get_async_session():
+        await execute_export_job(session, job_id, request, settings, organization_id)
@@ -2,21 +2,36 @@
 
 from __future__ import annotations
 
-from typing import Annotated, Any
+import json
+import time
+from typing import TYPE_CHECKING, Annotated, Any
 
 import structlog
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from uncase.api.deps import get_db, get_optional_org
+from uncase.api.deps import get_db, get_db_factory, get_optional_org
 from uncase.db.models.organization import OrganizationModel
+from uncase.services.job_progress import job_events
 from uncase.services.jobs import JobService
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    from uncase.db.models.job import JobModel
+
 router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"])
 
 logger = structlog.get_logger(__name__)
 
+# Seconds between database checks while streaming job events (picks up updates
+# written by other processes, e.g. workers, and the final status)
+_EVENTS_POLL_INTERVAL = 1.0
+# Seconds of silence after which a keep-alive comment is sent
+_EVENTS_KEEPALIVE_INTERVAL = 15.0
+
 
 class JobResponse(BaseModel):
     """Job status response."""
@@ -89,6 +104,83 @@ async def get_job(
     return _to_response(job)
 
 
+def _progress_payload(job: JobModel) -> dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "stage": job.current_stage,
+        "progress": job.progress,
+        "message": job.status_message,
+    }
+
+
+async def _load_job(session_factory: async_sessionmaker[AsyncSession], job_id: str) -> JobModel:
+    """Read a job on a short-lived session, so no connection is held between reads."""
+    async with session_factory() as session:
+        return await JobService(session).get_job(job_id)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    session_factory: Annotated[async_sessionmaker[AsyncSession], Depends(get_db_factory)],
+) -> StreamingResponse:
+    """Stream job progress as Server-Sent Events until the job finishes.
+
+    Returns a Server-Sent Events stream with:
+    - `event: progress` events with the job's status, stage, progress and message
+    - `event: complete` with the final job (same shape as `GET /jobs/{job_id}`)
+
+    Progress reported in this process is pushed as it happens; progress
+    written by other processes (e.g. ``uncase worker``) is picked up from the
+    job row about once per second.  Each check reads the row on its own
+    short-lived session, so open streams do not hold pooled connections.
+    """
+    job = await _load_job(session_factory, job_id)
+
+    async def event_generator() -> AsyncGenerator[str, None]:
+        nonlocal job
+        with job_events.subscribe(job_id) as subscription:
+            last_sent: dict[str, Any] | None = None
+            last_output = last_checked = last_pushed = float("-inf")
+            while True:
+                now = time.monotonic()
+                if now - last_checked >= _EVENTS_POLL_INTERVAL:
+                    last_checked = now
+                    job = await _load_job(session_factory, job_id)
+                    if job.is_terminal:
+                        yield f"event: complete\ndata: {_to_response(job).model_dump_json()}\n\n"
+                        return
+                    # The row lags behind pushed events (writes are coalesced); only
+                    # fall back to it when nothing was pushed recently
+                    payload = _progress_payload(job)
+                    if now - last_pushed > 2 * _EVENTS_POLL_INTERVAL and payload != last_sent:
+                        last_sent, last_output = payload, now
+                        yield f"event: progress\ndata: {json.dumps(payload)}\n\n"
+
+                event = await subscription.next(timeout=_EVENTS_POLL_INTERVAL)
+                now = time.monotonic()
+                if event is not None:
+                    last_pushed = now
+                    payload = {"status": job.status, **event.to_dict()}
+                    if payload != last_sent:
+                        last_sent, last_output = payload, now
+                        yield f"event: progress\ndata: {json.dumps(payload)}\n\n"
+                elif now - last_output >= _EVENTS_KEEPALIVE_INTERVAL:
+                    last_output = now
+                    yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @router.post("/{job_id}/cancel", response_model=JobResponse)
 async def cancel_job(
     job_id: str,
@@ -10,9 +10,9 @@ from typing import Annotated
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from uncase.api.deps import get_optional_org
-from uncase.api.session_store import extraction_sessions
-from uncase.core.seed_engine.layer0.config import Layer0Config
+from uncase.api.deps import get_optional_org, get_settings
+from uncase.api.session_store import get_session_store
+from uncase.config import UNCASESettings
 from uncase.core.seed_engine.layer0.engine import AgenticExtractionEngine
 from uncase.db.models.organization import OrganizationModel
 from uncase.schemas.layer0_api import (
@@ -36,18 +36,16 @@ router = APIRouter(prefix="/api/v1/seeds/extract", tags=["layer0"])
 async def start_extraction(
     body: StartExtractionRequest,
     org: Annotated[OrganizationModel | None, Depends(get_optional_org)],
+    settings: Annotated[UNCASESettings, Depends(get_settings)],
 ) -> StartExtractionResponse:
     """Create a new extraction session and return the initial question."""
-    config = Layer0Config(
-        industry=body.industry,
-        max_turns=body.max_turns,
-        default_locale=body.locale,
+    config = settings.to_layer0_config().model_copy(
+        update={"industry": body.industry, "max_turns": body.max_turns, "default_locale": body.locale}
     )
     engine = AgenticExtractionEngine(config=config)
     organization_id = org.id if org else None
-    session_id = extraction_sessions.create(engine, organization_id=organization_id)
-
     initial = await engine.get_initial_question()
+    session_id = await get_session_store().create(engine, organization_id=organization_id)
 
     logger.info(
         "extraction_started",
@@ -62,14 +60,20 @@ async def start_extraction(
 @router.post("/turn", response_model=TurnResponse)
 async def process_turn(body: TurnRequest) -> TurnResponse:
     """Process a single conversation turn."""
-    engine = extraction_sessions.get(body.session_id)
+    sessions = get_session_store()
+    engine = await sessions.get(body.session_id)
     if engine is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Session '{body.session_id}' not found or expired.",
         )
 
-    result = await engine.process_turn(body.user_message)
+    try:
+        result = await engine.process_turn(body.user_message)
+    except Exception:
+        # The turn may have updated the engine partway; reload the saved state next time
+        await sessions.discard(body.session_id)
+        raise
     is_complete = result.get("type") == "summary"
 
     logger.info(
@@ -80,7 +84,9 @@ async def process_turn(body: TurnRequest) -> TurnResponse:
     )
 
     if is_complete:
-        extraction_sessions.delete(body.session_id)
+        await sessions.delete(body.session_id)
+    else:
+        await sessions.save(body.session_id, engine)
 
     return TurnResponse(
         session_id=body.session_id,
@@ -92,7 +98,7 @@ async def process_turn(body: TurnRequest) -> TurnResponse:
 @router.get("/{session_id}/progress", response_model=ProgressResponse)
 async def get_progress(session_id: str) -> ProgressResponse:
     """Get the current progress of an extraction session."""
-    engine = extraction_sessions.get(session_id)
+    engine = await get_session_store().get(session_id)
     if engine is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -108,7 +114,7 @@ async def get_progress(session_id: str) -> ProgressResponse:
 @router.delete("/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def end_session(session_id: str) -> None:
     """Delete an extraction session."""
-    removed = extraction_sessions.delete(session_id)
+    removed = await get_session_store().delete(session_id)
     if not removed:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable
+from pathlib import Path
 from typing import Annotated, Any
 
 import structlog
@@ -13,7 +15,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from uncase.api.deps import get_db, get_optional_org, get_settings
 from uncase.api.metering import meter
 from uncase.config import UNCASESettings
+from uncase.core.profiling import PipelineProfiler
 from uncase.db.models.organization import OrganizationModel
+from uncase.services.job_progress import ProgressReporter, shared_session
+from uncase.services.job_queue import JobContext, job_handler
 from uncase.services.jobs import JobService
 
 # Background task references to prevent garbage collection (Python asyncio requirement)
@@ -40,6 +45,18 @@ class PipelineRunRequest(BaseModel):
     use_dp_sgd: bool = Field(default=False, description="Enable DP-SGD differential privacy")
     dp_epsilon: float = Field(default=8.0, gt=0.0, description="Privacy budget epsilon")
     async_mode: bool = Field(default=True, description="Run as background job (recommended for large runs)")
+    profile: bool = Field(
+        default=False,
+        description="Record per-stage and per-metric wall/CPU time and event loop blocking in the job result",
+    )
+    profile_dumps: bool = Field(
+        default=False,
+        description="With profile, also write a cProfile dump per stage next to the job's model artifacts; "
+        "skipped (see profile.cprofile_skipped) while another job is writing dumps",
+    )
+    profile_block_threshold_ms: float = Field(
+        default=100.0, gt=0.0, description="Event loop stalls at least this long are reported as blocking"
+    )
 
 
 class PipelineRunResponse(BaseModel):
@@ -62,6 +79,14 @@ class PipelineStatusResponse(BaseModel):
     error_message: str | None = None
 
 
+def _make_profiler(request: PipelineRunRequest, settings: UNCASESettings, job_id: str) -> PipelineProfiler | None:
+    """Build the profiler for a run, or None if profiling was not requested."""
+    if not request.profile:
+        return None
+    dump_dir = Path(settings.uncase_models_dir) / "profiles" / job_id if request.profile_dumps else None
+    return PipelineProfiler(dump_dir=dump_dir, block_threshold_ms=request.profile_block_threshold_ms)
+
+
 @router.post("/run", response_model=PipelineRunResponse, status_code=202)
 async def run_pipeline(
     request: PipelineRunRequest,
@@ -72,16 +97,18 @@ async def run_pipeline(
     """Submit an end-to-end pipeline run.
 
     The pipeline chains: Seed Engine -> Generation -> Evaluation -> LoRA Training.
-    By default, runs asynchronously as a background job.
+    By default, runs asynchronously as a background job: in the API process, or
+    on an ``uncase worker`` when ``job_execution_mode`` is ``"worker"``.
     """
     org_id = org.id if org else None
 
-    # Create the background job
+    # Create the background job; a synchronous run starts out running so no worker claims it
     job_service = JobService(session)
     job = await job_service.create_job(
         job_type="pipeline_run",
         config=request.model_dump(),
         organization_id=org_id,
+        running=not request.async_mode,
     )
 
     # Meter the event
@@ -94,10 +121,11 @@ async def run_pipeline(
     )
 
     if request.async_mode:
-        # Launch background execution — store reference to prevent GC
-        task = asyncio.create_task(_execute_pipeline_job(job.id, request, settings))
-        _background_tasks.add(task)
-        task.add_done_callback(_background_tasks.discard)
+        if settings.job_execution_mode == "inline":
+            # Launch background execution — store reference to prevent GC
+            task = asyncio.create_task(_execute_pipeline_job(job.id, request, settings))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
 
         return PipelineRunResponse(
             job_id=job.id,
@@ -106,66 +134,22 @@ async def run_pipeline(
         )
 
     # Synchronous mode (for small runs / testing)
-    from uncase.core.pipeline_orchestrator import PipelineOrchestrator
-
-    async def _update_progress(stage: str, progress: float, message: str) -> None:
-        try:
-            await job_service.update_progress(job.id, progress=progress, current_stage=stage, status_message=message)
-        except Exception:
-            logger.debug("progress_update_failed", job_id=job.id, stage=stage)
-
-    orchestrator = PipelineOrchestrator(
-        settings=settings,
-        progress_callback=lambda s, p, m: asyncio.create_task(_update_progress(s, p, m)),
-    )
-
-    await job_service.mark_running(job.id)
+    reporter = ProgressReporter.from_settings(job.id, shared_session(session), settings)
 
     try:
-        result = await orchestrator.run(
-            raw_conversations=request.raw_conversations,
-            domain=request.domain,
-            count=request.count,
-            model=request.model,
-            temperature=request.temperature,
-            train_adapter=request.train_adapter,
-            base_model=request.base_model,
-            use_qlora=request.use_qlora,
-            use_dp_sgd=request.use_dp_sgd,
-            dp_epsilon=request.dp_epsilon,
-        )
-
-        result_data = {
-            "run_id": result.run_id,
-            "success": result.success,
-            "seeds_created": result.seeds_created,
-            "conversations_generated": result.conversations_generated,
-            "conversations_passed": result.conversations_passed,
-            "avg_quality_score": result.avg_quality_score,
-            "pass_rate": result.pass_rate,
-            "adapter_path": str(result.adapter_path) if result.adapter_path else None,
-            "total_duration_seconds": result.total_duration_seconds,
-            "stages": [
-                {
-                    "stage": s.stage,
-                    "success": s.success,
-                    "duration_seconds": s.duration_seconds,
-                    "error": s.error,
-                }
-                for s in result.stages
-            ],
-        }
-
+        result_data = await _run_pipeline(job.id, request, settings, reporter.report)
+        await reporter.aclose()
         await job_service.mark_completed(job.id, result=result_data)
 
         return PipelineRunResponse(
             job_id=job.id,
             status="completed",
-            message=f"Pipeline completed: {result.conversations_generated} conversations, "
-            f"{result.conversations_passed} passed ({result.pass_rate:.0%} pass rate)",
+            message=f"Pipeline completed: {result_data['conversations_generated']} conversations, "
+            f"{result_data['conversations_passed']} passed ({result_data['pass_rate']:.0%} pass rate)",
         )
 
     except Exception as exc:
+        await reporter.aclose()
         await job_service.mark_failed(job.id, str(exc))
         return PipelineRunResponse(
             job_id=job.id,
@@ -174,64 +158,89 @@ async def run_pipeline(
         )
 
 
+async def _run_pipeline(
+    job_id: str,
+    request: PipelineRunRequest,
+    settings: UNCASESettings,
+    progress: Callable[[str, float, str], None],
+) -> dict[str, Any]:
+    """Run the orchestrator for a job and return the result stored on the job row."""
+    from uncase.core.pipeline_orchestrator import PipelineOrchestrator
+
+    orchestrator = PipelineOrchestrator(settings=settings, progress_callback=progress)
+
+    result = await orchestrator.run(
+        raw_conversations=request.raw_conversations,
+        domain=request.domain,
+        count=request.count,
+        model=request.model,
+        temperature=request.temperature,
+        train_adapter=request.train_adapter,
+        base_model=request.base_model,
+        use_qlora=request.use_qlora,
+        use_dp_sgd=request.use_dp_sgd,
+        dp_epsilon=request.dp_epsilon,
+        profiler=_make_profiler(request, settings, job_id),
+    )
+
+    result_data: dict[str, Any] = {
+        "run_id": result.run_id,
+        "success": result.success,
+        "seeds_created": result.seeds_created,
+        "conversations_generated": result.conversations_generated,
+        "conversations_passed": result.conversations_passed,
+        "avg_quality_score": result.avg_quality_score,
+        "pass_rate": result.pass_rate,
+        "adapter_path": str(result.adapter_path) if result.adapter_path else None,
+        "total_duration_seconds": result.total_duration_seconds,
+        "stages": [
+            {
+                "stage": s.stage,
+                "success": s.success,
+                "duration_seconds": s.duration_seconds,
+                "error": s.error,
+            }
+            for s in result.stages
+        ],
+    }
+    if result.profile is not None:
+        result_data["profile"] = result.profile.to_dict()
+    return result_data
+
+
+@job_handler("pipeline_run")
+async def _pipeline_job_handler(ctx: JobContext) -> dict[str, Any]:
+    """Run a queued pipeline job on a worker (``job_execution_mode="worker"``)."""
+    request = PipelineRunRequest.model_validate(ctx.config)
+    return await _run_pipeline(ctx.job_id, request, ctx.settings, ctx.reporter.report)
+
+
 async def _execute_pipeline_job(
     job_id: str,
     request: PipelineRunRequest,
     settings: UNCASESettings,
 ) -> None:
-    """Execute a pipeline job in the background.
+    """Execute a pipeline job in the background of the API process.
 
     Creates its own database session for the background task.
     """
-    from uncase.core.pipeline_orchestrator import PipelineOrchestrator
     from uncase.db.engine import get_async_session
 
     async for session in get_async_session():
         svc = JobService(session)
+        if not await svc.mark_running(job_id):
+            logger.info("pipeline_job_not_pending", job_id=job_id)
+            return
+        reporter = ProgressReporter.from_settings(job_id, shared_session(session), settings)
 
         try:
-            await svc.mark_running(job_id)
-
-            async def _update_progress(stage: str, progress: float, message: str, _svc: JobService = svc) -> None:
-                try:
-                    await _svc.update_progress(job_id, progress=progress, current_stage=stage, status_message=message)
-                except Exception:
-                    logger.debug("bg_progress_update_failed", job_id=job_id, stage=stage)
-
-            orchestrator = PipelineOrchestrator(
-                settings=settings,
-                progress_callback=lambda s, p, m: asyncio.ensure_future(_update_progress(s, p, m)),
-            )
-
-            result = await orchestrator.run(
-                raw_conversations=request.raw_conversations,
-                domain=request.domain,
-                count=request.count,
-                model=request.model,
-                temperature=request.temperature,
-                train_adapter=request.train_adapter,
-                base_model=request.base_model,
-                use_qlora=request.use_qlora,
-                use_dp_sgd=request.use_dp_sgd,
-                dp_epsilon=request.dp_epsilon,
-            )
-
-            result_data = {
-                "run_id": result.run_id,
-                "success": result.success,
-                "seeds_created": result.seeds_created,
-                "conversations_generated": result.conversations_generated,
-                "conversations_passed": result.conversations_passed,
-                "avg_quality_score": result.avg_quality_score,
-                "pass_rate": result.pass_rate,
-                "adapter_path": str(result.adapter_path) if result.adapter_path else None,
-                "total_duration_seconds": result.total_duration_seconds,
-            }
-
+            result_data = await _run_pipeline(job_id, request, settings, reporter.report)
+            await reporter.aclose()
             await svc.mark_completed(job_id, result=result_data)
 
         except Exception as exc:
             logger.error("background_pipeline_failed", job_id=job_id, error=str(exc))
+            await reporter.aclose(flush=False)
             try:
                 await svc.mark_failed(job_id, str(exc))
             except Exception:
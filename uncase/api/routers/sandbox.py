@@ -1,4 +1,4 @@
-"""Sandbox API endpoints — E2B parallel generation."""
+"""Sandbox API endpoints — parallel generation on E2B or local sandbox workers."""
 
 from __future__ import annotations
 
@@ -15,6 +15,7 @@ from uncase.api.deps import get_db, get_optional_org, get_settings
 from uncase.config import UNCASESettings
 from uncase.db.models.organization import OrganizationModel
 from uncase.exceptions import SandboxNotConfiguredError
+from uncase.sandbox.orchestrator import create_sandbox_orchestrator
 from uncase.sandbox.schemas import (
     DemoSandboxRequest,
     DemoSandboxResponse,
@@ -131,11 +132,13 @@ async def _persist_sandbox_results(
 async def sandbox_status(
     settings: Annotated[UNCASESettings, Depends(get_settings)],
 ) -> SandboxStatusResponse:
-    """Check E2B sandbox availability and configuration."""
+    """Check sandbox availability and configuration."""
+    local = settings.sandbox_backend == "local"
     return SandboxStatusResponse(
-        enabled=settings.sandbox_available,
-        max_parallel=settings.e2b_max_parallel,
+        enabled=local or settings.sandbox_available,
+        max_parallel=settings.sandbox_local_workers if local else settings.e2b_max_parallel,
         template_id=settings.e2b_template_id,
+        backend=settings.sandbox_backend,
     )
 
 
@@ -146,14 +149,15 @@ async def sandbox_generate(
     settings: Annotated[UNCASESettings, Depends(get_settings)],
     org: Annotated[OrganizationModel | None, Depends(get_optional_org)],
 ) -> SandboxGenerateResponse:
-    """Generate conversations in parallel using E2B sandboxes.
+    """Generate conversations in parallel using sandbox workers.
 
-    Each seed gets its own isolated sandbox running the generation
+    Each seed runs in an isolated worker (an E2B sandbox, or a local worker
+    subprocess with ``SANDBOX_BACKEND=local``) running the generation
     pipeline independently. Results are collected after all sandboxes
     complete. Generated conversations and quality reports are persisted
     to the database before returning.
 
-    Falls back to sequential local generation if E2B is not configured.
+    Falls back to sequential in-process generation if no sandbox backend is available.
     """
     organization_id = org.id if org else None
 
@@ -169,7 +173,8 @@ async def sandbox_generate(
     # Resolve API key
     api_key, api_base = await _resolve_api_key(settings, session, request.provider_id)
 
-    if not settings.sandbox_available:
+    orchestrator = create_sandbox_orchestrator(settings)
+    if orchestrator is None:
         # Fallback to local sequential generation
         response = await _local_fallback(
             request=request,
@@ -179,9 +184,6 @@ async def sandbox_generate(
             api_base=api_base,
         )
     else:
-        from uncase.sandbox.e2b_client import E2BSandboxOrchestrator
-
-        orchestrator = E2BSandboxOrchestrator(settings=settings)
         seed_dicts = [seed.model_dump(mode="json") for seed in request.seeds]
 
         response = await orchestrator.fan_out_generate(
@@ -218,15 +220,15 @@ async def sandbox_generate_stream(
     Generated conversations and quality reports are persisted to the
     database when the final event arrives.
     """
-    if not settings.sandbox_available:
-        raise SandboxNotConfiguredError("Streaming requires E2B sandboxes. Set E2B_API_KEY and E2B_ENABLED=true.")
+    orchestrator = create_sandbox_orchestrator(settings)
+    if orchestrator is None:
+        raise SandboxNotConfiguredError(
+            "Streaming requires a sandbox backend. Set E2B_API_KEY and E2B_ENABLED=true, or SANDBOX_BACKEND=local."
+        )
 
     organization_id = org.id if org else None
     api_key, api_base = await _resolve_api_key(settings, session, request.provider_id)
 
-    from uncase.sandbox.e2b_client import E2BSandboxOrchestrator
-
-    orchestrator = E2BSandboxOrchestrator(settings=settings)
     seed_dicts = [seed.model_dump(mode="json") for seed in request.seeds]
 
     async def event_generator() -> AsyncGenerator[str, None]:
@@ -6,27 +6,68 @@ with fallback defaults for unauthenticated requests.
 
 from __future__ import annotations
 
+import asyncio
+import functools
+from collections.abc import Iterator
 from typing import Annotated
 
 import structlog
 from fastapi import APIRouter, Depends
-from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from uncase.api.deps import get_db, get_optional_org
+from uncase.api.deps import get_db, get_optional_org, get_settings
 from uncase.api.metering import meter
+from uncase.config import UNCASESettings
 from uncase.db.models.organization import OrganizationModel
+from uncase.exceptions import AuthenticationError
 from uncase.schemas.template import RenderRequest, RenderResponse, TemplateInfo
 from uncase.schemas.template_config import TemplateConfigResponse, TemplateConfigUpdateRequest
 from uncase.services.template_service import TemplateService
 from uncase.templates import get_template_registry, register_all_templates
-from uncase.templates.base import ToolCallMode
+from uncase.templates.base import BaseChatTemplate, RenderContext, ToolCallMode
+from uncase.templates.tokens import (
+    LengthFilterResult,
+    check_tokenizer_allowed,
+    get_token_accountant,
+    is_tiktoken_spec,
+)
 
 router = APIRouter(prefix="/api/v1/templates", tags=["templates"])
 
 logger = structlog.get_logger(__name__)
 
 
+async def _fit_to_length(
+    template: BaseChatTemplate,
+    context: RenderContext,
+    body: RenderRequest,
+    tokenizer: str,
+    *,
+    settings: UNCASESettings,
+    org: OrganizationModel | None,
+) -> LengthFilterResult:
+    """Render and count ``body.conversations`` with *tokenizer*, applying the length policy.
+
+    Only tokenizers in ``TEMPLATE_TOKENIZERS`` are loaded, and HuggingFace
+    tokenizers (which may be fetched from the Hub) only for authenticated
+    requests. Tokenizer loading and counting are CPU-bound, so both run off
+    the event loop.
+    """
+    check_tokenizer_allowed(tokenizer, settings.template_tokenizers_list)
+    if org is None and not is_tiktoken_spec(tokenizer):
+        raise AuthenticationError("HuggingFace tokenizers require an authenticated request")
+
+    accountant = await asyncio.to_thread(get_token_accountant, tokenizer)
+    return await asyncio.to_thread(
+        accountant.fit,
+        body.conversations,
+        functools.partial(template.iter_render, context=context),
+        max_tokens=body.max_tokens,
+        policy=body.over_length,
+    )
+
+
 @router.get("", response_model=list[TemplateInfo])
 async def list_templates() -> list[TemplateInfo]:
     """List all available template formats."""
@@ -54,10 +95,13 @@ async def render_conversations(
     body: RenderRequest,
     session: Annotated[AsyncSession, Depends(get_db)],
     org: Annotated[OrganizationModel | None, Depends(get_optional_org)],
+    settings: Annotated[UNCASESettings, Depends(get_settings)],
 ) -> RenderResponse:
     """Render conversations using a specified template.
 
     Falls back to the org's default template if template_name is not provided.
+    When a tokenizer is given, the response includes exact token counts and
+    conversations longer than ``max_tokens`` are dropped or truncated.
     """
     register_all_templates()
     registry = get_template_registry()
@@ -79,12 +123,18 @@ async def render_conversations(
                 system_prompt = config.default_system_prompt
 
     template = registry.get(template_name)
-    tool_mode = ToolCallMode(tool_call_mode_str)
-    rendered = template.render_batch(
-        conversations=body.conversations,
-        tool_call_mode=tool_mode,
-        system_prompt=system_prompt,
-    )
+    context = template.compile(ToolCallMode(tool_call_mode_str), system_prompt)
+
+    token_counts: list[int] | None = None
+    dropped: list[str] = []
+    truncated: list[str] = []
+    if body.tokenizer:
+        fitted = await _fit_to_length(template, context, body, body.tokenizer, settings=settings, org=org)
+        rendered = [text for _, text, _ in fitted.kept]
+        token_counts = [tokens for _, _, tokens in fitted.kept]
+        dropped, truncated = fitted.dropped, fitted.truncated
+    else:
+        rendered = list(template.iter_render(body.conversations, context=context))
 
     org_id = org.id if org else None
     await meter(session, "template_rendered", organization_id=org_id, metadata={"template": template_name})
@@ -93,11 +143,16 @@ async def render_conversations(
         "conversations_rendered",
         template=template_name,
         count=len(rendered),
+        dropped=len(dropped),
+        truncated=len(truncated),
     )
     return RenderResponse(
         rendered=rendered,
         template_name=template_name,
         count=len(rendered),
+        token_counts=token_counts,
+        dropped=dropped,
+        truncated=truncated,
     )
 
 
@@ -106,21 +161,38 @@ async def export_conversations(
     body: RenderRequest,
     session: Annotated[AsyncSession, Depends(get_db)],
     org: Annotated[OrganizationModel | None, Depends(get_optional_org)],
-) -> Response:
-    """Export rendered conversations as a downloadable text file."""
+    settings: Annotated[UNCASESettings, Depends(get_settings)],
+) -> StreamingResponse:
+    """Export rendered conversations as a downloadable text file.
+
+    Conversations are rendered lazily while the response is streamed, so the
+    full export is never materialized in memory. When a tokenizer is given,
+    the length policy is applied up front and the number of dropped and
+    truncated conversations is reported in the ``X-Dropped-Count`` and
+    ``X-Truncated-Count`` headers.
+    """
     register_all_templates()
     registry = get_template_registry()
 
     template = registry.get(body.template_name)
-    tool_mode = ToolCallMode(body.tool_call_mode)
-    rendered = template.render_batch(
-        conversations=body.conversations,
-        tool_call_mode=tool_mode,
-        system_prompt=body.system_prompt,
-    )
+    context = template.compile(ToolCallMode(body.tool_call_mode), body.system_prompt)
+    headers: dict[str, str] = {}
+
+    rendered: Iterator[str]
+    if body.tokenizer:
+        fitted = await _fit_to_length(template, context, body, body.tokenizer, settings=settings, org=org)
+        rendered = (text for _, text, _ in fitted.kept)
+        headers["X-Dropped-Count"] = str(len(fitted.dropped))
+        headers["X-Truncated-Count"] = str(len(fitted.truncated))
+    else:
+        rendered = template.iter_render(body.conversations, context=context)
+
+    def _iter_content() -> Iterator[str]:
+        for index, text in enumerate(rendered):
+            yield f"\n\n{text}" if index else text
 
-    content = "\n\n".join(rendered)
     filename = f"uncase_export_{body.template_name}.txt"
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
 
     org_id = org.id if org else None
     await meter(session, "template_exported", organization_id=org_id, metadata={"template": body.template_name})
@@ -128,12 +200,12 @@ async def export_conversations(
     logger.info(
         "conversations_exported",
         template=body.template_name,
-        count=len(rendered),
+        count=len(body.conversations),
     )
-    return Response(
-        content=content,
+    return StreamingResponse(
+        _iter_content(),
         media_type="text/plain",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        headers=headers,
     )
 
 
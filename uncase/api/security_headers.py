@@ -1,22 +1,55 @@
-"""Security headers middleware — OWASP recommended headers."""
+"""Security headers — OWASP recommended headers.
 
-from __future__ import annotations
-
-from typing import TYPE_CHECKING
-
-from starlette.middleware.base import BaseHTTPMiddleware
-
-if TYPE_CHECKING:
-    from collections.abc import Callable
-
-    from fastapi import Request
-    from starlette.responses import Response
+Headers are precomputed as raw ASGI header pairs and injected on
+``http.response.start`` by :class:`uncase.api.http_middleware.HTTPMiddleware`.
+"""
 
+from __future__ import annotations
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Add OWASP-recommended security headers to all responses.
-
-    Headers added:
+# Paths that serve external JS/CSS (Swagger UI, ReDoc)
+_DOC_PATHS: frozenset[str] = frozenset({"/docs", "/redoc", "/openapi.json"})
+
+_COMMON_HEADERS: list[tuple[bytes, bytes]] = [
+    # HSTS: force HTTPS in production
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+    # Prevent MIME type sniffing
+    (b"x-content-type-options", b"nosniff"),
+    # Prevent clickjacking
+    (b"x-frame-options", b"DENY"),
+    # XSS protection (legacy browsers)
+    (b"x-xss-protection", b"1; mode=block"),
+    # Referrer policy
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    # Permissions policy (restrict browser features)
+    (b"permissions-policy", b"camera=(), microphone=(), geolocation=()"),
+]
+
+# Content Security Policy — relaxed for Swagger UI / ReDoc
+_DOCS_CSP = (
+    b"content-security-policy",
+    b"default-src 'self'; "
+    b"script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+    b"style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+    b"img-src 'self' data: https://cdn.jsdelivr.net; "
+    b"frame-ancestors 'none'",
+)
+_DEFAULT_CSP = (b"content-security-policy", b"default-src 'self'; frame-ancestors 'none'")
+
+# Cache control for API responses
+_API_CACHE_HEADERS: list[tuple[bytes, bytes]] = [
+    (b"cache-control", b"no-store, no-cache, must-revalidate, private"),
+    (b"pragma", b"no-cache"),
+]
+
+_DOCS_HEADERS = [*_COMMON_HEADERS, _DOCS_CSP]
+_API_HEADERS = [*_COMMON_HEADERS, _DEFAULT_CSP, *_API_CACHE_HEADERS]
+_OTHER_HEADERS = [*_COMMON_HEADERS, _DEFAULT_CSP]
+
+
+def security_headers(path: str) -> list[tuple[bytes, bytes]]:
+    """Return the OWASP-recommended security headers for a request path.
+
+    Headers returned:
     - Strict-Transport-Security (HSTS)
     - X-Content-Type-Options
     - X-Frame-Options
@@ -24,51 +57,12 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - Content-Security-Policy
     - Referrer-Policy
     - Permissions-Policy
-    - Cache-Control (for API responses)
-    """
-
-    # Paths that serve external JS/CSS (Swagger UI, ReDoc)
-    _DOC_PATHS: frozenset[str] = frozenset({"/docs", "/redoc", "/openapi.json"})
-
-    async def dispatch(self, request: Request, call_next: Callable[..., Response]) -> Response:  # type: ignore[override]
-        """Add security headers to the response."""
-        response = await call_next(request)  # type: ignore[misc]
+    - Cache-Control and Pragma (for ``/api/`` responses)
 
-        path = request.url.path
-
-        # HSTS: force HTTPS in production
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
-
-        # XSS protection (legacy browsers)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
-        # Content Security Policy — relaxed for Swagger UI / ReDoc
-        if path in self._DOC_PATHS:
-            response.headers["Content-Security-Policy"] = (
-                "default-src 'self'; "
-                "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-                "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-                "img-src 'self' data: https://cdn.jsdelivr.net; "
-                "frame-ancestors 'none'"
-            )
-        else:
-            response.headers["Content-Security-Policy"] = "default-src 'self'; frame-ancestors 'none'"
-
-        # Referrer policy
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        # Permissions policy (restrict browser features)
-        response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
-
-        # Cache control for API responses
-        if path.startswith("/api/"):
-            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, private"
-            response.headers["Pragma"] = "no-cache"
-
-        return response  # type: ignore[no-any-return]
+    The returned list is shared; callers must not mutate it.
+    """
+    if path in _DOC_PATHS:
+        return _DOCS_HEADERS
+    if path.startswith("/api/"):
+        return _API_HEADERS
+    return _OTHER_HEADERS
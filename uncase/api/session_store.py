@@ -1,62 +1,123 @@
-"""In-memory session store for Layer 0 extraction engines.
+"""Session stores for Layer 0 extraction engines.
 
-Stores AgenticExtractionEngine instances keyed by UUID with a TTL of 1 hour.
+Sessions are keyed by an unguessable token and expire a fixed time after
+creation (1 hour by default).  The backend is chosen by
+``LAYER0_SESSION_BACKEND``:
+
+- ``memory`` (default): live engines in a process-local dict.  Expiry is
+  driven by a min-heap of deadlines, so purging costs O(log n) per expired
+  session instead of a scan.  Sessions are only visible to the worker that
+  created them.
+- ``redis``: engines are serialized with
+  :meth:`AgenticExtractionEngine.to_state` into a Redis hash with a TTL, so
+  any worker or replica can serve any session.  Each worker keeps an LRU of
+  deserialized engines, checked against a per-session version counter so a
+  copy made stale by another worker is never used.  ``save`` only writes when
+  the version is still the one the engine was loaded at, so two concurrent
+  turns on one session cannot silently overwrite each other.
+
+Callers must :meth:`SessionBackend.save` an engine after processing a turn,
+and :meth:`SessionBackend.discard` it when the turn fails before that.
 """
 
 from __future__ import annotations
 
+import heapq
+import json
 import secrets
 import time
-from typing import TYPE_CHECKING
+import weakref
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Protocol
 
+from uncase.core.seed_engine.layer0.engine import AgenticExtractionEngine
+from uncase.exceptions import ExtractionSessionConflictError
 from uncase.log_config import get_logger
 
 if TYPE_CHECKING:
-    from uncase.core.seed_engine.layer0.engine import AgenticExtractionEngine
+    from redis.asyncio import Redis
+
+    from uncase.config import UNCASESettings
 
 logger = get_logger(__name__)
 
 _TTL_SECONDS = 3600  # 1 hour
+_REDIS_KEY_PREFIX = "layer0:session:"
+
+# Compare-and-set for RedisSessionStore.save: write the state only if the
+# session still exists at the expected version.  Returns the new version,
+# 0 if the session is gone and -1 on a version conflict.
+_SAVE_SCRIPT = """
+local version = redis.call('HGET', KEYS[1], 'version')
+if not version then
+    return 0
+end
+if version ~= ARGV[1] then
+    return -1
+end
+local next_version = tonumber(version) + 1
+redis.call('HSET', KEYS[1], 'version', next_version, 'state', ARGV[2])
+return next_version
+"""
+
+
+class SessionBackend(Protocol):
+    """Protocol for Layer 0 session stores."""
+
+    async def create(self, engine: AgenticExtractionEngine, organization_id: str | None = None) -> str: ...
+    async def get(self, session_id: str) -> AgenticExtractionEngine | None: ...
+    async def get_verified(self, session_id: str, organization_id: str | None) -> AgenticExtractionEngine | None: ...
+    async def get_organization_id(self, session_id: str) -> str | None: ...
+    async def save(self, session_id: str, engine: AgenticExtractionEngine) -> None: ...
+    async def discard(self, session_id: str) -> None: ...
+    async def delete(self, session_id: str) -> bool: ...
+
+
+def _org_matches(session_id: str, owner: str | None, organization_id: str | None) -> bool:
+    """Check a session's owning org against the caller's (``None`` skips the check)."""
+    if organization_id is not None and owner != organization_id:
+        logger.warning("session_org_mismatch", session_id=session_id, expected=owner, got=organization_id)
+        return False
+    return True
 
 
 class _SessionEntry:
-    __slots__ = ("created_at", "engine", "organization_id")
+    __slots__ = ("engine", "expires_at", "organization_id")
 
-    def __init__(self, engine: AgenticExtractionEngine, organization_id: str | None = None) -> None:
+    def __init__(self, engine: AgenticExtractionEngine, expires_at: float, organization_id: str | None = None) -> None:
         self.engine = engine
-        self.created_at = time.monotonic()
+        self.expires_at = expires_at
         self.organization_id = organization_id
 
-    def is_expired(self) -> bool:
-        return (time.monotonic() - self.created_at) > _TTL_SECONDS
 
+class InMemorySessionStore:
+    """Process-local store holding live engine objects."""
 
-class SessionStore:
-    """Thread-safe in-memory store for extraction engine sessions."""
-
-    def __init__(self) -> None:
+    def __init__(self, ttl_seconds: float = _TTL_SECONDS) -> None:
+        self._ttl = ttl_seconds
         self._sessions: dict[str, _SessionEntry] = {}
+        # (deadline, session_id); entries for deleted sessions are skipped when popped
+        self._deadlines: list[tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._sessions)
 
-    def create(self, engine: AgenticExtractionEngine, organization_id: str | None = None) -> str:
+    async def create(self, engine: AgenticExtractionEngine, organization_id: str | None = None) -> str:
         """Store an engine and return its session ID."""
         self._purge_expired()
         session_id = secrets.token_urlsafe(32)
-        self._sessions[session_id] = _SessionEntry(engine, organization_id=organization_id)
+        entry = _SessionEntry(engine, time.monotonic() + self._ttl, organization_id=organization_id)
+        self._sessions[session_id] = entry
+        heapq.heappush(self._deadlines, (entry.expires_at, session_id))
         logger.info("session_created", session_id=session_id, organization_id=organization_id)
         return session_id
 
-    def get(self, session_id: str) -> AgenticExtractionEngine | None:
+    async def get(self, session_id: str) -> AgenticExtractionEngine | None:
         """Retrieve an engine by session ID, or None if expired/missing."""
-        entry = self._sessions.get(session_id)
-        if entry is None:
-            return None
-        if entry.is_expired():
-            del self._sessions[session_id]
-            logger.info("session_expired", session_id=session_id)
-            return None
-        return entry.engine
+        entry = self._live_entry(session_id)
+        return entry.engine if entry else None
 
-    def get_verified(self, session_id: str, organization_id: str | None) -> AgenticExtractionEngine | None:
+    async def get_verified(self, session_id: str, organization_id: str | None) -> AgenticExtractionEngine | None:
         """Retrieve engine only if org matches the session's org.
 
         Args:
@@ -66,45 +127,207 @@ class SessionStore:
         Returns:
             The engine if found, not expired, and org matches; None otherwise.
         """
+        entry = self._live_entry(session_id)
+        if entry is None or not _org_matches(session_id, entry.organization_id, organization_id):
+            return None
+        return entry.engine
+
+    async def get_organization_id(self, session_id: str) -> str | None:
+        """Retrieve the organization ID for a session, or None if not set/expired/missing."""
+        entry = self._live_entry(session_id)
+        return entry.organization_id if entry else None
+
+    async def save(self, session_id: str, engine: AgenticExtractionEngine) -> None:
+        """No-op: the store holds the live engine object."""
+
+    async def discard(self, session_id: str) -> None:
+        """No-op: the live engine is the only copy, so there is nothing to reload."""
+
+    async def delete(self, session_id: str) -> bool:
+        """Remove a session. Returns True if it existed."""
+        removed = self._sessions.pop(session_id, None) is not None
+        if removed:
+            logger.info("session_deleted", session_id=session_id)
+        return removed
+
+    def _live_entry(self, session_id: str) -> _SessionEntry | None:
         entry = self._sessions.get(session_id)
         if entry is None:
             return None
-        if entry.is_expired():
+        if entry.expires_at <= time.monotonic():
             del self._sessions[session_id]
             logger.info("session_expired", session_id=session_id)
             return None
-        if organization_id is not None and entry.organization_id != organization_id:
-            logger.warning(
-                "session_org_mismatch",
-                session_id=session_id,
-                expected=entry.organization_id,
-                got=organization_id,
-            )
+        return entry
+
+    def _purge_expired(self) -> None:
+        """Remove sessions whose deadline has passed, popping them off the deadline heap."""
+        now = time.monotonic()
+        purged = 0
+        while self._deadlines and self._deadlines[0][0] <= now:
+            expires_at, session_id = heapq.heappop(self._deadlines)
+            entry = self._sessions.get(session_id)
+            if entry is not None and entry.expires_at == expires_at:
+                del self._sessions[session_id]
+                purged += 1
+        if purged:
+            logger.debug("sessions_purged", count=purged)
+
+
+class RedisSessionStore:
+    """Shared store keeping serialized engines in Redis hashes.
+
+    Each session is a hash with ``version``, ``org`` and ``state`` fields,
+    expiring ``ttl_seconds`` after creation.  ``save`` bumps the version, so
+    workers reuse their cached engine only while it is the latest one, and
+    fails with a conflict when another save happened since the engine was
+    loaded.
+
+    Args:
+        client: ``redis.asyncio`` client created with ``decode_responses=True``.
+        ttl_seconds: Session lifetime.
+        cache_size: Maximum number of deserialized engines cached locally.
+    """
+
+    def __init__(self, client: Redis, *, ttl_seconds: int = _TTL_SECONDS, cache_size: int = 256) -> None:
+        self._redis = client
+        self._ttl = ttl_seconds
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, tuple[int, AgenticExtractionEngine]] = OrderedDict()
+        # Version each engine handed out was loaded at, for save's compare-and-set
+        self._versions: weakref.WeakKeyDictionary[AgenticExtractionEngine, int] = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def from_url(cls, redis_url: str, *, ttl_seconds: int = _TTL_SECONDS, cache_size: int = 256) -> RedisSessionStore:
+        """Create a store connected to *redis_url*."""
+        from redis.asyncio import Redis
+
+        logger.info("session_store_backend", backend="redis", url=redis_url.split("@")[-1])
+        return cls(Redis.from_url(redis_url, decode_responses=True), ttl_seconds=ttl_seconds, cache_size=cache_size)
+
+    async def create(self, engine: AgenticExtractionEngine, organization_id: str | None = None) -> str:
+        """Store an engine and return its session ID."""
+        session_id = secrets.token_urlsafe(32)
+        key = _REDIS_KEY_PREFIX + session_id
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={"version": 1, "org": organization_id or "", "state": _dump(engine)})
+            pipe.expire(key, self._ttl)
+            await pipe.execute()
+        self._remember(session_id, 1, engine)
+        logger.info("session_created", session_id=session_id, organization_id=organization_id)
+        return session_id
+
+    async def get(self, session_id: str) -> AgenticExtractionEngine | None:
+        """Retrieve an engine by session ID, or None if expired/missing."""
+        loaded = await self._load(session_id)
+        return loaded[0] if loaded else None
+
+    async def get_verified(self, session_id: str, organization_id: str | None) -> AgenticExtractionEngine | None:
+        """Retrieve engine only if org matches the session's org."""
+        loaded = await self._load(session_id)
+        if loaded is None or not _org_matches(session_id, loaded[1], organization_id):
             return None
-        return entry.engine
+        return loaded[0]
 
-    def get_organization_id(self, session_id: str) -> str | None:
+    async def get_organization_id(self, session_id: str) -> str | None:
         """Retrieve the organization ID for a session, or None if not set/expired/missing."""
-        entry = self._sessions.get(session_id)
-        if entry is None or entry.is_expired():
-            return None
-        return entry.organization_id
+        # redis-py types hash commands as sync-or-async, hence the ignores below
+        org: str | None = await self._redis.hget(_REDIS_KEY_PREFIX + session_id, "org")  # type: ignore[misc]
+        return org or None
 
-    def delete(self, session_id: str) -> bool:
+    async def save(self, session_id: str, engine: AgenticExtractionEngine) -> None:
+        """Write the engine's state back and bump the session version.
+
+        Raises:
+            ExtractionSessionConflictError: If the session was saved by another
+                request since *engine* was loaded.
+        """
+        expected = self._versions.get(engine, 0)
+        version = int(
+            await self._redis.eval(  # type: ignore[misc]
+                _SAVE_SCRIPT, 1, _REDIS_KEY_PREFIX + session_id, str(expected), _dump(engine)
+            )
+        )
+        if version == 0:
+            # The session expired or was deleted meanwhile; the script does not resurrect it
+            self._cache.pop(session_id, None)
+            logger.info("session_expired", session_id=session_id)
+            return
+        if version < 0:
+            self._cache.pop(session_id, None)
+            logger.warning("session_save_conflict", session_id=session_id, expected_version=expected)
+            raise ExtractionSessionConflictError(
+                f"Session '{session_id}' was updated by another request; retry the turn."
+            )
+        self._remember(session_id, version, engine)
+
+    async def discard(self, session_id: str) -> None:
+        """Drop the locally cached engine, e.g. after a failed turn left it half-updated."""
+        self._cache.pop(session_id, None)
+
+    async def delete(self, session_id: str) -> bool:
         """Remove a session. Returns True if it existed."""
-        removed = self._sessions.pop(session_id, None) is not None
+        self._cache.pop(session_id, None)
+        removed = bool(await self._redis.delete(_REDIS_KEY_PREFIX + session_id))
         if removed:
             logger.info("session_deleted", session_id=session_id)
         return removed
 
-    def _purge_expired(self) -> None:
-        """Remove all expired sessions."""
-        expired = [sid for sid, entry in self._sessions.items() if entry.is_expired()]
-        for sid in expired:
-            del self._sessions[sid]
-        if expired:
-            logger.debug("sessions_purged", count=len(expired))
+    async def _load(self, session_id: str) -> tuple[AgenticExtractionEngine, str | None] | None:
+        """Return the session's engine and org, from the local cache when it is current."""
+        key = _REDIS_KEY_PREFIX + session_id
+        version, org = await self._redis.hmget(key, ["version", "org"])  # type: ignore[misc]
+        if version is None:
+            self._cache.pop(session_id, None)
+            return None
+
+        cached = self._cache.get(session_id)
+        if cached is not None and cached[0] == int(version):
+            self._cache.move_to_end(session_id)
+            return cached[1], org or None
+
+        raw: str | None = await self._redis.hget(key, "state")  # type: ignore[misc]
+        if raw is None:
+            return None
+        engine = AgenticExtractionEngine.from_state(json.loads(raw))
+        self._remember(session_id, int(version), engine)
+        return engine, org or None
+
+    def _remember(self, session_id: str, version: int, engine: AgenticExtractionEngine) -> None:
+        self._versions[engine] = version
+        if self._cache_size <= 0:
+            return
+        self._cache[session_id] = (version, engine)
+        self._cache.move_to_end(session_id)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+
+def _dump(engine: AgenticExtractionEngine) -> str:
+    return json.dumps(engine.to_state(), ensure_ascii=False, default=str)
+
+
+def create_session_store(settings: UNCASESettings) -> SessionBackend:
+    """Create the session store selected by ``LAYER0_SESSION_BACKEND``."""
+    if settings.layer0_session_backend == "redis":
+        if settings.redis_url:
+            return RedisSessionStore.from_url(
+                settings.redis_url,
+                ttl_seconds=settings.layer0_session_ttl,
+                cache_size=settings.layer0_session_cache_size,
+            )
+        logger.warning("redis_session_store_fallback", message="REDIS_URL is not set, using in-memory sessions.")
+    return InMemorySessionStore(ttl_seconds=settings.layer0_session_ttl)
+
+
+_session_store: SessionBackend | None = None
+
 
+def get_session_store() -> SessionBackend:
+    """Return the process-wide Layer 0 session store, configured from settings."""
+    global _session_store
+    if _session_store is None:
+        from uncase.config import UNCASESettings
 
-# Singleton instance
-extraction_sessions = SessionStore()
+        _session_store = create_session_store(UNCASESettings())
+    return _session_store
@@ -11,6 +11,7 @@ from uncase.cli.pipeline import pipeline_app
 from uncase.cli.seed import seed_app
 from uncase.cli.template import template_app
 from uncase.cli.tool import tool_app
+from uncase.cli.worker import run_worker
 
 app = typer.Typer(
     name="uncase",
@@ -26,6 +27,7 @@ app.add_typer(import_app, name="import")
 app.add_typer(tool_app, name="tool")
 app.add_typer(pipeline_app, name="pipeline")
 app.add_typer(evaluate_app, name="evaluate")
+app.command("worker")(run_worker)
 
 
 def version_callback(value: bool) -> None:
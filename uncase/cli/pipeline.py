@@ -3,10 +3,16 @@
 from __future__ import annotations
 
 import asyncio
+import json
+import uuid
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
 
+if TYPE_CHECKING:
+    from uncase.core.profiling import PipelineProfile
+
 pipeline_app = typer.Typer(help="End-to-end SCSF pipeline operations.")
 
 
@@ -25,11 +31,20 @@ def run_pipeline(
     use_dp: bool = typer.Option(False, "--dp/--no-dp", help="Enable DP-SGD differential privacy"),
     dp_epsilon: float = typer.Option(8.0, "--epsilon", help="Privacy budget epsilon"),
     output_dir: str = typer.Option("./outputs/pipeline", "--output", "-o", help="Output directory"),
+    profile: bool = typer.Option(
+        False, "--profile", help="Profile the run: per-stage/per-metric timings, event loop blocking, cProfile dumps"
+    ),
+    block_threshold_ms: float = typer.Option(
+        100.0, "--block-threshold-ms", help="With --profile, report event loop stalls at least this long"
+    ),
 ) -> None:
     """Run the full end-to-end SCSF pipeline.
 
     Takes raw conversations from a file, creates seeds, generates synthetic
     conversations, evaluates quality, and optionally trains a LoRA adapter.
+
+    With --profile, a cProfile dump per stage and a profile.json summary are
+    written to <output>/profiles/<run_id>/.
     """
     if not input_file.exists():
         typer.echo(f"Error: Input file not found: {input_file}", err=True)
@@ -53,8 +68,12 @@ def run_pipeline(
     async def _run() -> None:
         from uncase.config import UNCASESettings
         from uncase.core.pipeline_orchestrator import PipelineOrchestrator
+        from uncase.core.profiling import PipelineProfiler
 
         settings = UNCASESettings()
+        run_id = uuid.uuid4().hex[:12]
+        profile_dir = Path(output_dir) / "profiles" / run_id
+        profiler = PipelineProfiler(dump_dir=profile_dir, block_threshold_ms=block_threshold_ms) if profile else None
 
         def progress_callback(stage: str, progress: float, message: str) -> None:
             bar_width = 30
@@ -81,6 +100,8 @@ def run_pipeline(
             use_dp_sgd=use_dp,
             dp_epsilon=dp_epsilon,
             output_dir=output_dir,
+            run_id=run_id,
+            profiler=profiler,
         )
 
         typer.echo()
@@ -104,12 +125,34 @@ def run_pipeline(
             if stage.error:
                 typer.echo(f"        Error: {stage.error}")
 
+        if result.profile is not None:
+            _print_profile(result.profile)
+            profile_dir.mkdir(parents=True, exist_ok=True)
+            (profile_dir / "profile.json").write_text(json.dumps(result.profile.to_dict(), indent=2), encoding="utf-8")
+            typer.echo(f"  Profile written to {profile_dir}")
+
         if not result.success:
             raise typer.Exit(1)
 
     asyncio.run(_run())
 
 
+def _print_profile(profile: PipelineProfile) -> None:
+    """Print per-stage timings, the slowest spans and event loop blocking."""
+    typer.echo()
+    typer.echo("Profile:")
+    for stage in profile.stages:
+        typer.echo(f"  {stage.stage}: wall {stage.wall_seconds:.2f}s, cpu {stage.cpu_seconds:.2f}s")
+        spans = sorted(stage.spans.items(), key=lambda item: item[1].wall_seconds, reverse=True)
+        for name, timing in spans[:10]:
+            typer.echo(f"    {name}: {timing.count}x, wall {timing.wall_seconds:.3f}s, cpu {timing.cpu_seconds:.3f}s")
+
+    typer.echo(f"  Event loop blocked >= {profile.block_threshold_ms:.0f}ms: {profile.blocking_event_count} time(s)")
+    for event in sorted(profile.blocking_events, key=lambda e: e.duration_ms, reverse=True)[:5]:
+        where = event.stack[-1].strip().splitlines()[0] if event.stack else "unknown"
+        typer.echo(f"    {event.duration_ms:.0f}ms in {event.stage}: {where}")
+
+
 @pipeline_app.command("status")
 def pipeline_status(
     job_id: str = typer.Argument(..., help="Job ID to check"),
@@ -0,0 +1,51 @@
+"""Worker CLI — run queued background jobs outside the API process."""
+
+from __future__ import annotations
+
+import asyncio
+import signal
+
+import typer
+
+
+def run_worker(
+    concurrency: int = typer.Option(1, "--concurrency", "-c", min=1, help="Jobs run at once by this worker"),
+    job_types: list[str] = typer.Option(
+        None, "--job-type", "-j", help="Only claim this job type (repeatable); default: all registered types"
+    ),
+    worker_id: str = typer.Option(None, "--worker-id", help="Lease owner ID; default: host:pid:random"),
+) -> None:
+    """Claim and run jobs from the job queue until interrupted.
+
+    Requires ``JOB_EXECUTION_MODE=worker`` on the API so submitted jobs
+    are left for workers. SIGINT/SIGTERM stop claiming and hand running jobs
+    back to the queue.
+    """
+
+    async def _run() -> None:
+        from uncase.config import UNCASESettings
+        from uncase.db.engine import close_engine, get_session_factory, init_engine
+        from uncase.services.job_worker import JobWorker
+
+        settings = UNCASESettings()
+        init_engine(settings)
+
+        worker = JobWorker(
+            get_session_factory(),
+            settings,
+            worker_id=worker_id,
+            concurrency=concurrency,
+            job_types=job_types or None,
+        )
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, worker.stop)
+
+        typer.echo(f"Worker {worker.worker_id} started (concurrency {concurrency}). Press Ctrl+C to stop.")
+        try:
+            await worker.run()
+        finally:
+            await close_engine()
+        typer.echo("Worker stopped.")
+
+    asyncio.run(_run())
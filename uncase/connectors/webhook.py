@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import uuid
 from datetime import UTC, datetime
+from typing import Any
 
 from uncase.connectors.base import BaseConnector, ConnectorResult
 from uncase.core.privacy.scanner import PIIScanner
@@ -31,11 +32,14 @@ class WebhookConnector(BaseConnector):
         ]
     }
 
-    All text content is scanned for PII and anonymized before storage.
+    All text content is scanned for PII and anonymized before storage, in
+    one scanner batch per payload (``pii_processes > 1`` lets large payloads
+    use a process pool).
     """
 
-    def __init__(self, *, pii_confidence: float = 0.85) -> None:
+    def __init__(self, *, pii_confidence: float = 0.85, pii_processes: int = 1) -> None:
         self._scanner = PIIScanner(confidence_threshold=pii_confidence)
+        self._pii_processes = pii_processes
 
     def connector_name(self) -> str:
         return "Webhook"
@@ -61,9 +65,8 @@ class WebhookConnector(BaseConnector):
         if not isinstance(raw_conversations, list):
             return ConnectorResult(errors=["'conversations' must be an array"])
 
-        conversations: list[Conversation] = []
         errors: list[str] = []
-        total_pii = 0
+        valid: list[tuple[dict[str, Any], list[dict[str, Any]]]] = []
 
         for i, raw_conv in enumerate(raw_conversations):
             if not isinstance(raw_conv, dict) or "turns" not in raw_conv:
@@ -75,13 +78,20 @@ class WebhookConnector(BaseConnector):
                 errors.append(f"Conversation {i}: 'turns' must be a non-empty array")
                 continue
 
+            valid.append((raw_conv, raw_turns))
+
+        # Anonymize every turn's content in one batch
+        contents = [str(raw_turn.get("content", "")) for _, raw_turns in valid for raw_turn in raw_turns]
+        scans = iter(await self._scanner.scan_and_anonymize_many_async(contents, processes=self._pii_processes))
+
+        conversations: list[Conversation] = []
+        total_pii = 0
+
+        for raw_conv, raw_turns in valid:
             turns: list[ConversationTurn] = []
             for j, raw_turn in enumerate(raw_turns):
                 role = raw_turn.get("role", f"speaker_{j % 2}")
-                content = raw_turn.get("content", "")
-
-                # Anonymize content
-                scan = self._scanner.scan_and_anonymize(str(content))
+                scan = next(scans)
                 total_pii += scan.entity_count
 
                 # Convert turn metadata values to strings
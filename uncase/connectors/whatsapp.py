@@ -2,17 +2,26 @@
 
 from __future__ import annotations
 
+import io
 import re
 import uuid
+import zipfile
 from datetime import UTC, datetime
+from typing import IO, TYPE_CHECKING
 
 from uncase.connectors.base import BaseConnector, ConnectorResult
 from uncase.core.privacy.scanner import PIIScanner
 from uncase.log_config import get_logger
 from uncase.schemas.conversation import Conversation, ConversationTurn
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
 logger = get_logger(__name__)
 
+# Every N messages start a new conversation
+_MESSAGES_PER_CONVERSATION = 20
+
 # WhatsApp export line patterns:
 # [DD/MM/YYYY, HH:MM:SS] Name: Message
 # DD/MM/YYYY, HH:MM - Name: Message
@@ -60,13 +69,90 @@ def _parse_wa_line(line: str) -> tuple[str, str, str, str] | None:
     return None
 
 
+def _chat_member(archive: zipfile.ZipFile) -> str:
+    """Return the chat transcript inside a zipped export (``_chat.txt`` on iOS)."""
+    transcripts = [name for name in archive.namelist() if name.lower().endswith(".txt")]
+    if not transcripts:
+        msg = "No chat transcript (.txt) found in the WhatsApp export archive"
+        raise ValueError(msg)
+    for name in transcripts:
+        if name.rsplit("/", 1)[-1] == "_chat.txt":
+            return name
+    return transcripts[0]
+
+
+def _open_lines(raw_input: str | bytes | IO[bytes]) -> Iterator[str]:
+    """Return a lazy line iterator over an export given as text, bytes, a zip archive or a binary file.
+
+    Zipped exports are read from their transcript member only; media files
+    in the archive are never decompressed.
+
+    Raises:
+        ValueError: If a zip archive contains no transcript.
+    """
+    if isinstance(raw_input, str):
+        return (line.rstrip("\r\n") for line in io.StringIO(raw_input))
+
+    stream: IO[bytes] = io.BytesIO(raw_input) if isinstance(raw_input, bytes) else raw_input
+    if stream.seekable() and zipfile.is_zipfile(stream):
+        stream.seek(0)
+        archive = zipfile.ZipFile(stream)
+        stream = archive.open(_chat_member(archive))
+    elif stream.seekable():
+        stream.seek(0)
+    return _decoded_lines(stream)
+
+
+def _decoded_lines(stream: IO[bytes]) -> Iterator[str]:
+    """Decode *stream* line by line, leaving the caller's file object open."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        for line in text:
+            yield line.rstrip("\r\n")
+    finally:
+        text.detach()
+
+
+def _iter_messages(lines: Iterable[str]) -> Iterator[dict[str, str]]:
+    """Yield parsed messages, joining continuation lines onto the message they follow.
+
+    System messages are skipped; continuation lines after one still belong
+    to the last real message.
+    """
+    current: dict[str, str] | None = None
+    parts: list[str] = []
+
+    for line in lines:
+        parsed = _parse_wa_line(line)
+        if parsed:
+            date_str, time_str, sender, message = parsed
+            if _is_system_message(message):
+                continue
+            if current is not None:
+                current["message"] = "\n".join(parts)
+                yield current
+            current = {"date": date_str, "time": time_str, "sender": sender, "message": ""}
+            parts = [message]
+        elif current is not None and line.strip():
+            parts.append(line.strip())
+
+    if current is not None:
+        current["message"] = "\n".join(parts)
+        yield current
+
+
 class WhatsAppConnector(BaseConnector):
     """Parse WhatsApp chat export files into Conversation objects.
 
-    Handles multiple WhatsApp export formats (iOS/Android).
+    Handles multiple WhatsApp export formats (iOS/Android), plain or zipped.
+    The export is streamed line by line and parsing stops once
+    ``max_conversations`` message groups are built, so memory stays bounded
+    for multi-year group chats.
     Multi-line messages are concatenated with the previous message.
     System messages are automatically skipped.
-    PII is scanned and anonymized before conversations are returned.
+    PII is scanned and anonymized before conversations are returned, in one
+    scanner batch per export (``pii_processes > 1`` lets large imports use a
+    process pool); each sender name is anonymized once per export.
 
     Usage:
         connector = WhatsAppConnector()
@@ -80,8 +166,10 @@ class WhatsAppConnector(BaseConnector):
         pii_confidence: float = 0.85,
         max_conversations: int = 100,
         min_turns: int = 3,
+        pii_processes: int = 1,
     ) -> None:
         self._scanner = PIIScanner(confidence_threshold=pii_confidence)
+        self._pii_processes = pii_processes
         self._max_conversations = max_conversations
         self._min_turns = min_turns
 
@@ -89,117 +177,116 @@ class WhatsAppConnector(BaseConnector):
         return "WhatsApp Export"
 
     def supported_formats(self) -> list[str]:
-        return ["txt", "text/plain"]
-
-    async def ingest(self, raw_input: str | bytes, **kwargs: object) -> ConnectorResult:
-        """Parse a WhatsApp export and return anonymized conversations."""
-        text = raw_input if isinstance(raw_input, str) else raw_input.decode("utf-8", errors="replace")
-        lines = text.splitlines()
-
-        # Phase 1: Parse all messages
-        messages: list[dict[str, str]] = []
-        for line in lines:
-            parsed = _parse_wa_line(line)
-            if parsed:
-                date_str, time_str, sender, message = parsed
-                if not _is_system_message(message):
-                    messages.append(
-                        {
-                            "date": date_str,
-                            "time": time_str,
-                            "sender": sender,
-                            "message": message,
-                        }
-                    )
-            elif messages and line.strip():
-                # Continuation of previous message
-                messages[-1]["message"] += f"\n{line.strip()}"
+        return ["txt", "text/plain", "zip", "application/zip"]
+
+    async def ingest(self, raw_input: str | bytes | IO[bytes], **kwargs: object) -> ConnectorResult:
+        """Parse a WhatsApp export and return anonymized conversations.
+
+        Args:
+            raw_input: The export as text or bytes, a zipped export, or a
+                binary file object (read lazily, line by line).
+        """
+        try:
+            lines = _open_lines(raw_input)
+        except (ValueError, zipfile.BadZipFile) as exc:
+            return ConnectorResult(errors=[str(exc)])
+
+        # Group messages into conversations as they are parsed
+        # (every 20 messages = new conversation) and stop at max_conversations
+        groups: list[list[dict[str, str]]] = []
+        group: list[dict[str, str]] = []
+        total_messages = 0
+        for message in _iter_messages(lines):
+            total_messages += 1
+            group.append(message)
+            if len(group) < _MESSAGES_PER_CONVERSATION:
+                continue
+            groups.append(group)
+            group = []
+            if len(groups) >= self._max_conversations:
+                break
 
-        if not messages:
+        if not total_messages:
             return ConnectorResult(errors=["No valid WhatsApp messages found in input"])
 
-        # Phase 2: Group into conversations by message count
-        # (every 20 messages = new conversation)
-        conversation_groups: list[list[dict[str, str]]] = []
-        current_group: list[dict[str, str]] = [messages[0]]
+        if group and len(groups) < self._max_conversations:
+            groups.append(group)
 
-        for msg in messages[1:]:
-            current_group.append(msg)
-            if len(current_group) >= 20:
-                conversation_groups.append(current_group)
-                current_group = []
+        conversations, total_pii = await self._build_conversations(groups)
+        skipped = len(groups) - len(conversations)
 
-        if current_group:
-            conversation_groups.append(current_group)
+        logger.info(
+            "whatsapp_import_complete",
+            total_messages=total_messages,
+            conversations_created=len(conversations),
+            conversations_skipped=skipped,
+            pii_entities_anonymized=total_pii,
+        )
 
-        # Phase 3: Convert to Conversation objects with PII anonymization
-        conversations: list[Conversation] = []
-        total_pii = 0
-        skipped = 0
+        return ConnectorResult(
+            conversations=conversations,
+            total_imported=len(conversations),
+            total_skipped=skipped,
+            total_pii_anonymized=total_pii,
+        )
 
-        for group in conversation_groups[: self._max_conversations]:
-            if len(group) < self._min_turns:
-                skipped += 1
-                continue
+    async def _build_conversations(self, groups: list[list[dict[str, str]]]) -> tuple[list[Conversation], int]:
+        """Anonymize message groups into Conversations; return them with the PII entity total.
 
-            # Get unique senders
-            senders = list(dict.fromkeys(msg["sender"] for msg in group))
+        Groups shorter than ``min_turns`` are skipped.  Every message and each
+        distinct sender name is anonymized in a single scanner batch.
+        """
+        groups = [group for group in groups if len(group) >= self._min_turns]
+        sender_names = list(dict.fromkeys(msg["sender"] for group in groups for msg in group))
+        messages = [msg["message"] for group in groups for msg in group]
 
+        scanned = await self._scanner.scan_and_anonymize_many_async(
+            messages + sender_names, processes=self._pii_processes
+        )
+        # Sender name -> (anonymized name, PII entity count), shared by the whole export
+        senders = {
+            name: (result.anonymized_text, result.entity_count)
+            for name, result in zip(sender_names, scanned[len(messages) :], strict=True)
+        }
+        message_results = iter(scanned[: len(messages)])
+
+        conversations: list[Conversation] = []
+        total_pii = 0
+        for group in groups:
             turns: list[ConversationTurn] = []
             for i, msg in enumerate(group):
-                # Scan and anonymize message content
-                scan_result = self._scanner.scan_and_anonymize(msg["message"])
-                total_pii += scan_result.entity_count
-
-                # Anonymize sender names too
-                sender_scan = self._scanner.scan_and_anonymize(msg["sender"])
-                total_pii += sender_scan.entity_count
-
+                scan_result = next(message_results)
+                sender = senders[msg["sender"]]
+                total_pii += scan_result.entity_count + sender[1]
                 turns.append(
                     ConversationTurn(
                         turno=i + 1,
-                        rol=sender_scan.anonymized_text,
+                        rol=sender[0],
                         contenido=scan_result.anonymized_text,
                         herramientas_usadas=[],
                         metadata={"original_date": msg["date"], "original_time": msg["time"]},
                     )
                 )
 
-            # Anonymize role names in the roles list
-            anonymized_senders = []
-            for sender in senders:
-                sender_scan = self._scanner.scan_and_anonymize(sender)
-                anonymized_senders.append(sender_scan.anonymized_text)
-
-            conv = Conversation(
-                conversation_id=uuid.uuid4().hex,
-                seed_id="",
-                dominio="",
-                idioma="es",
-                turnos=turns,
-                es_sintetica=False,
-                created_at=datetime.now(UTC),
-                metadata={
-                    "source": "whatsapp",
-                    "connector": self.connector_name(),
-                    "original_message_count": str(len(group)),
-                    "roles": ",".join(anonymized_senders),
-                    "pii_entities_anonymized": str(total_pii),
-                },
+            # Anonymized role names, in order of first appearance
+            anonymized_senders = [senders[name][0] for name in dict.fromkeys(msg["sender"] for msg in group)]
+
+            conversations.append(
+                Conversation(
+                    conversation_id=uuid.uuid4().hex,
+                    seed_id="",
+                    dominio="",
+                    idioma="es",
+                    turnos=turns,
+                    es_sintetica=False,
+                    created_at=datetime.now(UTC),
+                    metadata={
+                        "source": "whatsapp",
+                        "connector": self.connector_name(),
+                        "original_message_count": str(len(group)),
+                        "roles": ",".join(anonymized_senders),
+                        "pii_entities_anonymized": str(total_pii),
+                    },
+                )
             )
-            conversations.append(conv)
-
-        logger.info(
-            "whatsapp_import_complete",
-            total_messages=len(messages),
-            conversations_created=len(conversations),
-            conversations_skipped=skipped,
-            pii_entities_anonymized=total_pii,
-        )
-
-        return ConnectorResult(
-            conversations=conversations,
-            total_imported=len(conversations),
-            total_skipped=skipped,
-            total_pii_anonymized=total_pii,
-        )
+        return conversations, total_pii
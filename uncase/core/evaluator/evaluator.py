@@ -15,6 +15,7 @@ from uncase.core.evaluator.metrics.privacy import PrivacyMetric
 from uncase.core.evaluator.metrics.rouge import ROUGELMetric
 from uncase.core.evaluator.metrics.tool_call import ToolCallValidatorMetric
 from uncase.core.evaluator.semantic_judge import EmbeddingDriftMetric, SemanticFidelityMetric
+from uncase.core.profiling import profile_span
 from uncase.schemas.quality import (
     _NEUTRAL_SCORE,
     OPTIONAL_METRICS,
@@ -22,6 +23,7 @@ from uncase.schemas.quality import (
     QualityReport,
     compute_composite_score,
 )
+from uncase.telemetry import EVALUATOR_METRIC_DURATION, observe_duration
 
 if TYPE_CHECKING:
     from uncase.core.evaluator.metrics.base import BaseMetric
@@ -96,10 +98,11 @@ class ConversationEvaluator(BaseEvaluator):
         for metric in self._metrics:
             # Prefer the async path when available — avoids the
             # "already in an event loop" fallback that returns 0.5.
-            if hasattr(metric, "compute_async"):
-                score = await metric.compute_async(conversation, seed)
-            else:
-                score = metric.compute(conversation, seed)
+            with observe_duration(EVALUATOR_METRIC_DURATION, metric=metric.name), profile_span(f"metric.{metric.name}"):
+                if hasattr(metric, "compute_async"):
+                    score = await metric.compute_async(conversation, seed)
+                else:
+                    score = metric.compute(conversation, seed)
             scores[metric.name] = max(0.0, min(1.0, score))  # Clamp to [0, 1]
 
         # Detect which optional metrics came back at neutral (weren't computed)
@@ -11,6 +11,7 @@ import contextlib
 import json
 import random
 import re
+import time
 import uuid
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
@@ -20,6 +21,7 @@ import structlog
 from uncase.core.generator.base import BaseGenerator
 from uncase.exceptions import GenerationError
 from uncase.schemas.conversation import Conversation, ConversationTurn
+from uncase.telemetry import LLM_REQUEST_DURATION, LLM_RETRIES, LLM_TOKENS
 
 if TYPE_CHECKING:
     from uncase.schemas.quality import QualityReport
@@ -792,6 +794,17 @@ def _parse_llm_response(raw_content: str, seed: SeedSchema) -> list[Conversation
     return _validate_turns(raw_turns, seed)
 
 
+def _record_token_usage(model: str, response: Any) -> None:
+    """Add a completion's prompt/completion token usage to the LLM token counter."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    for kind in ("prompt_tokens", "completion_tokens"):
+        tokens = getattr(usage, kind, None)
+        if isinstance(tokens, int) and tokens > 0:
+            LLM_TOKENS.labels(model=model, kind=kind.removesuffix("_tokens")).inc(tokens)
+
+
 class LiteLLMGenerator(BaseGenerator):
     """Synthetic conversation generator powered by LiteLLM.
 
@@ -883,19 +896,30 @@ class LiteLLMGenerator(BaseGenerator):
             retry_temp = min(2.0, base_temp + attempt * self._config.retry_temperature_step)
             kwargs["temperature"] = retry_temp
 
+            if attempt > 0:
+                LLM_RETRIES.labels(model=self._config.model).inc()
+
+            attempt_start = time.perf_counter()
             try:
                 if attempt == 0 and supports_response_format:
                     kwargs["response_format"] = {"type": "json_object"}
 
                 response = await litellm.acompletion(**kwargs)
+                _record_token_usage(self._config.model, response)
                 content = response.choices[0].message.content
 
                 if not content:
                     msg = "LLM returned empty response"
                     raise GenerationError(msg)
 
+                LLM_REQUEST_DURATION.labels(model=self._config.model, outcome="success").observe(
+                    time.perf_counter() - attempt_start
+                )
                 return content  # type: ignore[no-any-return]
             except Exception as exc:
+                LLM_REQUEST_DURATION.labels(model=self._config.model, outcome="error").observe(
+                    time.perf_counter() - attempt_start
+                )
                 last_error = exc
                 if "response_format" in kwargs:
                     kwargs.pop("response_format", None)
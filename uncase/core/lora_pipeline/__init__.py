@@ -1,11 +1,18 @@
 """Layer 4 — Integrated LoRA fine-tuning pipeline."""
 
 from uncase.core.lora_pipeline.base import BasePipeline
-from uncase.core.lora_pipeline.config import LoraConfig, PipelineConfig, PrivacyConfig, TrainingConfig
+from uncase.core.lora_pipeline.config import (
+    DatasetConfig,
+    LoraConfig,
+    PipelineConfig,
+    PrivacyConfig,
+    TrainingConfig,
+)
 from uncase.core.lora_pipeline.pipeline import LoraPipeline
 
 __all__ = [
     "BasePipeline",
+    "DatasetConfig",
     "LoraConfig",
     "LoraPipeline",
     "PipelineConfig",
@@ -7,7 +7,9 @@ hyperparameters, and differential privacy options.
 
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from typing import Literal
+
+from pydantic import BaseModel, Field, model_validator
 
 
 class LoraConfig(BaseModel):
@@ -59,6 +61,49 @@ class PrivacyConfig(BaseModel):
     max_grad_norm: float = Field(default=1.0, gt=0.0, description="Maximum gradient norm for clipping")
 
 
+class DatasetConfig(BaseModel):
+    """Training dataset storage configuration.
+
+    ``jsonl`` writes one chat-formatted JSON record per line and lets the
+    trainer tokenize at start-up. ``parquet`` writes pre-tokenized Arrow
+    shards that are memory-mapped at training time.
+
+    ``packing`` reduces padding waste on top of the Parquet format: ``pack``
+    concatenates conversations into ``max_seq_length`` sequences with
+    per-conversation attention boundaries, ``group_by_length`` batches
+    conversations of similar length together.
+
+    ``over_length`` applies to conversations whose rendered length exceeds
+    ``max_seq_length`` when counted with the base model's tokenizer: ``keep``
+    leaves them for the trainer to cut, ``drop`` removes them, ``truncate``
+    removes trailing turns until they fit.
+    """
+
+    format: Literal["jsonl", "parquet"] = Field(default="jsonl", description="On-disk dataset format")
+    num_shards: int = Field(
+        default=1,
+        ge=1,
+        le=1024,
+        description="Number of Parquet shards (records are assigned by a stable hash of the conversation ID)",
+    )
+    row_group_size: int = Field(default=1000, ge=1, description="Rows per Parquet row group")
+    packing: Literal["none", "pack", "group_by_length"] = Field(
+        default="none",
+        description="Padding reduction strategy (requires the parquet format)",
+    )
+    over_length: Literal["keep", "drop", "truncate"] = Field(
+        default="keep",
+        description="Policy for conversations longer than max_seq_length tokens",
+    )
+
+    @model_validator(mode="after")
+    def _packing_requires_parquet(self) -> DatasetConfig:
+        if self.packing != "none" and self.format != "parquet":
+            msg = f"packing='{self.packing}' requires format='parquet' (token counts are needed)"
+            raise ValueError(msg)
+        return self
+
+
 class PipelineConfig(BaseModel):
     """Complete pipeline configuration combining all sub-configs.
 
@@ -80,3 +125,4 @@ class PipelineConfig(BaseModel):
     lora: LoraConfig = Field(default_factory=LoraConfig, description="LoRA adapter configuration")
     training: TrainingConfig = Field(default_factory=TrainingConfig, description="Training hyperparameters")
     privacy: PrivacyConfig = Field(default_factory=PrivacyConfig, description="Differential privacy settings")
+    dataset: DatasetConfig = Field(default_factory=DatasetConfig, description="Training dataset storage settings")
@@ -0,0 +1,296 @@
+"""Columnar (Parquet/Arrow) training datasets for the LoRA pipeline.
+
+Writes chat-formatted conversations as pre-tokenized Parquet shards
+(``input_ids`` / ``attention_mask`` computed once with the target model's
+tokenizer) so training start-up can memory-map Arrow data instead of
+re-parsing JSONL and re-tokenizing every record.
+
+Layout::
+
+    datasets/train_parquet/
+        part-00000-of-00004.parquet
+        ...
+        dataset_info.json
+
+Records are assigned to shards by a stable hash of the conversation ID, so the
+same corpus always produces the same shards and multi-worker loaders can
+split work by file without coordination.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from uncase.exceptions import MLDependencyError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+logger = structlog.get_logger(__name__)
+
+DATASET_INFO_FILE = "dataset_info.json"
+_SHARD_NAME = "part-{index:05d}-of-{total:05d}.parquet"
+
+# ChatML fallback for tokenizers that ship without a chat template (base models)
+_IM_START = "<|im_start|>"
+_IM_END = "<|im_end|>"
+
+
+@dataclass
+class ParquetDatasetInfo:
+    """Summary of a written Parquet dataset, persisted as ``dataset_info.json``."""
+
+    tokenizer: str
+    max_seq_length: int
+    num_shards: int
+    num_rows: int = 0
+    total_tokens: int = 0
+    truncated: int = 0
+    shards: list[str] = field(default_factory=list)
+    packing: str = "none"
+    packing_stats: dict[str, Any] = field(default_factory=dict)
+
+
+def _check_parquet_dependencies() -> None:
+    """Verify that pyarrow is available.
+
+    Raises:
+        MLDependencyError: If pyarrow is not installed.
+    """
+    try:
+        __import__("pyarrow")
+    except ImportError as exc:
+        msg = "pyarrow is required for Parquet datasets. Install it with: pip install 'uncase[ml]'"
+        raise MLDependencyError(msg) from exc
+
+
+def shard_for(key: str, num_shards: int) -> int:
+    """Return the shard index for *key* using a stable (process-independent) hash.
+
+    Args:
+        key: Record key, typically the conversation ID.
+        num_shards: Total number of shards.
+
+    Returns:
+        Shard index in ``[0, num_shards)``.
+    """
+    if num_shards <= 1:
+        return 0
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % num_shards
+
+
+def render_messages(tokenizer: Any, messages: list[dict[str, str]]) -> tuple[str, bool]:
+    """Render chat messages to text with the tokenizer's chat template.
+
+    Falls back to ChatML when the tokenizer defines no chat template.
+
+    Args:
+        tokenizer: HuggingFace tokenizer.
+        messages: ``{"role", "content"}`` message dicts.
+
+    Returns:
+        Tuple of (rendered text, whether the template already added special tokens).
+    """
+    if getattr(tokenizer, "chat_template", None):
+        return tokenizer.apply_chat_template(messages, tokenize=False), True
+    text = "\n".join(f"{_IM_START}{m['role']}\n{m['content']}{_IM_END}" for m in messages)
+    return text, False
+
+
+class ParquetDatasetWriter:
+    """Tokenizes chat records and writes them as sharded Parquet files.
+
+    Usage::
+
+        writer = ParquetDatasetWriter(dataset_dir, tokenizer=tokenizer, max_seq_length=2048)
+        info = writer.write((conv.conversation_id, messages) for conv, messages in records)
+    """
+
+    def __init__(
+        self,
+        dataset_dir: Path,
+        *,
+        tokenizer: Any,
+        max_seq_length: int,
+        num_shards: int = 1,
+        row_group_size: int = 1000,
+    ) -> None:
+        _check_parquet_dependencies()
+
+        self._dataset_dir = dataset_dir
+        self._tokenizer = tokenizer
+        self._max_seq_length = max_seq_length
+        self._num_shards = num_shards
+        self._row_group_size = row_group_size
+
+    def write(self, records: Iterable[tuple[str, list[dict[str, str]]]]) -> ParquetDatasetInfo:
+        """Tokenize *records* and write all shards plus ``dataset_info.json``.
+
+        Args:
+            records: ``(conversation_id, messages)`` pairs.
+
+        Returns:
+            Summary of the written dataset.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema(
+            [
+                ("conversation_id", pa.string()),
+                ("text", pa.string()),
+                ("input_ids", pa.list_(pa.int32())),
+                ("attention_mask", pa.list_(pa.int8())),
+                ("num_tokens", pa.int32()),
+            ]
+        )
+
+        self._dataset_dir.mkdir(parents=True, exist_ok=True)
+        for stale in self._dataset_dir.glob("part-*.parquet"):
+            stale.unlink()
+
+        info = ParquetDatasetInfo(
+            tokenizer=str(getattr(self._tokenizer, "name_or_path", type(self._tokenizer).__name__)),
+            max_seq_length=self._max_seq_length,
+            num_shards=self._num_shards,
+        )
+        paths = [
+            self._dataset_dir / _SHARD_NAME.format(index=i, total=self._num_shards) for i in range(self._num_shards)
+        ]
+        writers = [pq.ParquetWriter(str(p), schema, compression="zstd") for p in paths]
+        buffers: list[list[tuple[str, list[dict[str, str]]]]] = [[] for _ in range(self._num_shards)]
+
+        try:
+            for conversation_id, messages in records:
+                index = shard_for(conversation_id, self._num_shards)
+                buffers[index].append((conversation_id, messages))
+                if len(buffers[index]) >= self._row_group_size:
+                    self._flush(writers[index], schema, buffers[index], info)
+                    buffers[index] = []
+
+            for index, buffer in enumerate(buffers):
+                if buffer:
+                    self._flush(writers[index], schema, buffer, info)
+        finally:
+            for writer in writers:
+                writer.close()
+
+        info.shards = [p.name for p in paths]
+        (self._dataset_dir / DATASET_INFO_FILE).write_text(json.dumps(asdict(info), indent=2), encoding="utf-8")
+
+        logger.info(
+            "parquet_dataset_written",
+            path=str(self._dataset_dir),
+            num_rows=info.num_rows,
+            num_shards=info.num_shards,
+            total_tokens=info.total_tokens,
+            truncated=info.truncated,
+        )
+        return info
+
+    def _flush(
+        self,
+        writer: Any,
+        schema: Any,
+        buffer: list[tuple[str, list[dict[str, str]]]],
+        info: ParquetDatasetInfo,
+    ) -> None:
+        """Batch-tokenize one buffer and append it as a Parquet row group."""
+        import pyarrow as pa
+
+        texts: list[str] = []
+        templated = False
+        for _, messages in buffer:
+            text, templated = render_messages(self._tokenizer, messages)
+            texts.append(text)
+
+        # Length is probed without truncation so over-long samples are counted
+        encoded = self._tokenizer(texts, add_special_tokens=not templated, truncation=False)
+        input_ids: list[list[int]] = []
+        attention_mask: list[list[int]] = []
+        for ids, mask in zip(encoded["input_ids"], encoded["attention_mask"], strict=True):
+            if len(ids) > self._max_seq_length:
+                info.truncated += 1
+                ids = ids[: self._max_seq_length]
+                mask = mask[: self._max_seq_length]
+            input_ids.append(list(ids))
+            attention_mask.append(list(mask))
+
+        num_tokens = [len(ids) for ids in input_ids]
+        table = pa.Table.from_pydict(
+            {
+                "conversation_id": [cid for cid, _ in buffer],
+                "text": texts,
+                "input_ids": input_ids,
+                "attention_mask": attention_mask,
+                "num_tokens": num_tokens,
+            },
+            schema=schema,
+        )
+        writer.write_table(table)
+
+        info.num_rows += len(buffer)
+        info.total_tokens += sum(num_tokens)
+
+
+def is_parquet_dataset(path: Path) -> bool:
+    """Return whether *path* is a Parquet dataset directory written by this module."""
+    return path.is_dir() and (path / DATASET_INFO_FILE).exists()
+
+
+def read_dataset_info(dataset_dir: Path) -> ParquetDatasetInfo:
+    """Load the ``dataset_info.json`` summary of a Parquet dataset."""
+    data = json.loads((dataset_dir / DATASET_INFO_FILE).read_text(encoding="utf-8"))
+    return ParquetDatasetInfo(**data)
+
+
+def shard_files(dataset_dir: Path, *, worker_index: int = 0, num_workers: int = 1) -> list[Path]:
+    """Return the shard files assigned to one data-loading worker.
+
+    Shards are distributed round-robin in file order, so the assignment is
+    deterministic for a given ``(worker_index, num_workers)``.
+
+    Args:
+        dataset_dir: Parquet dataset directory.
+        worker_index: Index of the current worker.
+        num_workers: Total number of workers.
+
+    Returns:
+        Sorted list of shard paths for this worker.
+    """
+    if not 0 <= worker_index < num_workers:
+        msg = f"worker_index must be in [0, {num_workers}), got {worker_index}"
+        raise ValueError(msg)
+    files = sorted(dataset_dir.glob("part-*.parquet"))
+    return files[worker_index::num_workers]
+
+
+def load_parquet_dataset(dataset_dir: Path, *, worker_index: int = 0, num_workers: int = 1) -> Any:
+    """Load a Parquet dataset as a memory-mapped ``datasets.Dataset``.
+
+    Args:
+        dataset_dir: Parquet dataset directory.
+        worker_index: Index of the current worker (for multi-worker loading).
+        num_workers: Total number of workers.
+
+    Returns:
+        A ``datasets.Dataset`` backed by Arrow memory maps.
+
+    Raises:
+        MLDependencyError: If the ``datasets`` package is not installed.
+    """
+    try:
+        from datasets import Dataset
+    except ImportError as exc:
+        msg = "The 'datasets' package is required to load Parquet datasets. Install it with: pip install 'uncase[ml]'"
+        raise MLDependencyError(msg) from exc
+
+    files = shard_files(dataset_dir, worker_index=worker_index, num_workers=num_workers)
+    return Dataset.from_parquet([str(f) for f in files])
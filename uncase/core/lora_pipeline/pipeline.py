@@ -10,6 +10,7 @@ from __future__ import annotations
 import asyncio
 import json
 import uuid
+from dataclasses import asdict
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -17,9 +18,27 @@ import structlog
 
 from uncase.core.lora_pipeline.base import BasePipeline
 from uncase.core.lora_pipeline.config import PipelineConfig
+from uncase.core.lora_pipeline.dataset import (
+    DATASET_INFO_FILE,
+    ParquetDatasetWriter,
+    is_parquet_dataset,
+    load_parquet_dataset,
+    read_dataset_info,
+    render_messages,
+)
+from uncase.core.lora_pipeline.packing import (
+    PackedSequenceCollator,
+    PackingStats,
+    group_by_length_stats,
+    pack_parquet_dataset,
+)
 from uncase.exceptions import DatasetPreparationError, MLDependencyError, TrainingError
+from uncase.templates.tokens import HFTokenCounter, TokenAccountant
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from typing import Literal
+
     from uncase.schemas.conversation import Conversation
 
 logger = structlog.get_logger(__name__)
@@ -96,6 +115,18 @@ def _estimate_tokens(text: str) -> int:
     return max(1, len(text) // 4)
 
 
+def _to_messages(conversation: Conversation) -> list[dict[str, str]]:
+    """Convert a conversation into ChatML-style ``{"role", "content"}`` messages.
+
+    Args:
+        conversation: The conversation to convert.
+
+    Returns:
+        Ordered list of message dicts.
+    """
+    return [{"role": _map_role(turn.rol), "content": turn.contenido} for turn in conversation.turnos]
+
+
 class LoraPipeline(BasePipeline):
     """LoRA/QLoRA fine-tuning pipeline — Layer 4.
 
@@ -132,6 +163,10 @@ class LoraPipeline(BasePipeline):
         dp_delta: float = 1e-5,
         dp_max_grad_norm: float = 1.0,
         mlflow_experiment: str | None = None,
+        dataset_format: Literal["jsonl", "parquet"] = "jsonl",
+        dataset_shards: int = 1,
+        packing: Literal["none", "pack", "group_by_length"] = "none",
+        over_length: Literal["keep", "drop", "truncate"] = "keep",
     ) -> None:
         """Initialize the LoRA pipeline.
 
@@ -154,8 +189,16 @@ class LoraPipeline(BasePipeline):
             dp_delta: Privacy budget delta.
             dp_max_grad_norm: Max gradient norm for DP clipping.
             mlflow_experiment: MLflow experiment name. None = no tracking.
+            dataset_format: ``jsonl`` (tokenized by the trainer) or ``parquet``
+                (pre-tokenized, memory-mapped Arrow shards).
+            dataset_shards: Number of Parquet shards for multi-worker loading.
+            packing: Padding reduction strategy for Parquet datasets: ``pack``
+                (multiple conversations per sequence) or ``group_by_length``.
+            over_length: Policy for conversations longer than ``max_seq_length``
+                tokens: ``keep``, ``drop`` or ``truncate`` (trailing turns).
         """
         from uncase.core.lora_pipeline.config import (
+            DatasetConfig,
             LoraConfig,
             PrivacyConfig,
             TrainingConfig,
@@ -186,6 +229,12 @@ class LoraPipeline(BasePipeline):
                 delta=dp_delta,
                 max_grad_norm=dp_max_grad_norm,
             ),
+            dataset=DatasetConfig(
+                format=dataset_format,
+                num_shards=dataset_shards,
+                packing=packing,
+                over_length=over_length,
+            ),
         )
 
         logger.info(
@@ -204,17 +253,24 @@ class LoraPipeline(BasePipeline):
     async def prepare_dataset(self, conversations: list[Conversation]) -> Path:
         """Prepare a training dataset from validated conversations.
 
-        Converts Conversation objects to ChatML-style training format
-        (one JSON object per line) and saves as a JSONL file.
+        Converts Conversation objects to ChatML-style training records.
+        With the default ``jsonl`` format, records are saved one JSON object
+        per line. With the ``parquet`` format, records are pre-tokenized with
+        the base model's tokenizer and written as sharded Parquet files, then
+        optionally packed or length-grouped (see ``DatasetConfig.packing``).
+        Unless ``DatasetConfig.over_length`` is ``keep``, conversations are
+        first counted with the base model's tokenizer and over-length ones
+        are dropped or truncated before anything is written.
 
         Args:
             conversations: List of validated synthetic conversations.
 
         Returns:
-            Path to the generated JSONL dataset file.
+            Path to the generated JSONL file, or to the Parquet dataset directory.
 
         Raises:
             DatasetPreparationError: If dataset preparation fails.
+            MLDependencyError: If the Parquet format is requested without ML dependencies.
         """
         if not conversations:
             msg = "No conversations provided for dataset preparation"
@@ -224,11 +280,19 @@ class LoraPipeline(BasePipeline):
             "preparing_dataset",
             num_conversations=len(conversations),
             output_dir=self._config.output_dir,
+            format=self._config.dataset.format,
         )
 
         try:
             dataset_dir = Path(self._config.output_dir) / "datasets"
             dataset_dir.mkdir(parents=True, exist_ok=True)
+
+            if self._config.dataset.over_length != "keep":
+                conversations = await asyncio.to_thread(self._apply_length_policy, conversations)
+
+            if self._config.dataset.format == "parquet":
+                return await asyncio.to_thread(self._prepare_parquet_sync, conversations, dataset_dir)
+
             dataset_path = dataset_dir / "train.jsonl"
 
             total_turns = 0
@@ -237,17 +301,8 @@ class LoraPipeline(BasePipeline):
 
             with dataset_path.open("w", encoding="utf-8") as fh:
                 for conversation in conversations:
-                    messages: list[dict[str, str]] = []
-
-                    for turn in conversation.turnos:
-                        role = _map_role(turn.rol)
-                        messages.append(
-                            {
-                                "role": role,
-                                "content": turn.contenido,
-                            }
-                        )
-                        total_tokens_estimate += _estimate_tokens(turn.contenido)
+                    messages = _to_messages(conversation)
+                    total_tokens_estimate += sum(_estimate_tokens(m["content"]) for m in messages)
 
                     if not messages:
                         logger.warning(
@@ -278,7 +333,7 @@ class LoraPipeline(BasePipeline):
 
             return dataset_path
 
-        except DatasetPreparationError:
+        except (DatasetPreparationError, MLDependencyError):
             raise
 
         except Exception as exc:
@@ -286,6 +341,149 @@ class LoraPipeline(BasePipeline):
             logger.error("dataset_preparation_failed", error=str(exc))
             raise DatasetPreparationError(msg) from exc
 
+    def _apply_length_policy(self, conversations: list[Conversation]) -> list[Conversation]:
+        """Drop or truncate conversations longer than ``max_seq_length`` (runs in thread pool).
+
+        Token counts are exact: each conversation is rendered with the base
+        model's chat template and counted with its tokenizer.
+
+        Args:
+            conversations: Validated conversations.
+
+        Returns:
+            The conversations that fit, in input order.
+
+        Raises:
+            DatasetPreparationError: If no conversation fits.
+        """
+        tokenizer = self._load_tokenizer()
+        accountant = TokenAccountant(HFTokenCounter(tokenizer))
+
+        def _render(batch: Iterable[Conversation]) -> Iterator[str]:
+            for conversation in batch:
+                yield render_messages(tokenizer, _to_messages(conversation))[0]
+
+        max_seq_length = self._config.training.max_seq_length
+        result = accountant.fit(
+            conversations,
+            _render,
+            max_tokens=max_seq_length,
+            policy=self._config.dataset.over_length,
+        )
+        if not result.kept:
+            msg = f"All {len(conversations)} conversations exceed max_seq_length={max_seq_length} tokens"
+            raise DatasetPreparationError(msg)
+
+        logger.info(
+            "dataset_length_filtered",
+            max_seq_length=max_seq_length,
+            policy=self._config.dataset.over_length,
+            kept=len(result.kept),
+            dropped=len(result.dropped),
+            truncated=len(result.truncated),
+        )
+        return [conversation for conversation, _, _ in result.kept]
+
+    def _prepare_parquet_sync(self, conversations: list[Conversation], dataset_dir: Path) -> Path:
+        """Tokenize conversations and write the sharded Parquet dataset (runs in thread pool).
+
+        Args:
+            conversations: Validated conversations.
+            dataset_dir: Parent ``datasets`` directory.
+
+        Returns:
+            Path to the Parquet dataset directory.
+        """
+        records: list[tuple[str, list[dict[str, str]]]] = []
+        for conversation in conversations:
+            messages = _to_messages(conversation)
+            if not messages:
+                logger.warning("skipping_empty_conversation", conversation_id=conversation.conversation_id)
+                continue
+            records.append((conversation.conversation_id, messages))
+
+        if not records:
+            msg = "No valid conversations could be converted to training records"
+            raise DatasetPreparationError(msg)
+
+        parquet_dir = dataset_dir / "train_parquet"
+        writer = ParquetDatasetWriter(
+            parquet_dir,
+            tokenizer=self._load_tokenizer(),
+            max_seq_length=self._config.training.max_seq_length,
+            num_shards=self._config.dataset.num_shards,
+            row_group_size=self._config.dataset.row_group_size,
+        )
+        info = writer.write(records)
+
+        logger.info(
+            "dataset_prepared",
+            path=str(parquet_dir),
+            total_conversations=info.num_rows,
+            total_tokens=info.total_tokens,
+            truncated=info.truncated,
+            num_shards=info.num_shards,
+        )
+        return self._apply_packing(parquet_dir, dataset_dir)
+
+    def _apply_packing(self, parquet_dir: Path, dataset_dir: Path) -> Path:
+        """Run the configured packing stage on a pre-tokenized Parquet dataset.
+
+        Args:
+            parquet_dir: Pre-tokenized Parquet dataset directory.
+            dataset_dir: Parent ``datasets`` directory.
+
+        Returns:
+            Path to the dataset to train on (the packed copy for ``pack``).
+        """
+        strategy = self._config.dataset.packing
+        batch_size = self._config.training.batch_size
+
+        if strategy == "pack":
+            packed_dir = dataset_dir / "train_packed"
+            _, stats = pack_parquet_dataset(
+                parquet_dir,
+                packed_dir,
+                max_seq_length=self._config.training.max_seq_length,
+                batch_size=batch_size,
+                row_group_size=self._config.dataset.row_group_size,
+            )
+            result_dir = packed_dir
+        elif strategy == "group_by_length":
+            stats = group_by_length_stats(parquet_dir, batch_size=batch_size)
+            info = read_dataset_info(parquet_dir)
+            info.packing = strategy
+            info.packing_stats = asdict(stats)
+            (parquet_dir / DATASET_INFO_FILE).write_text(json.dumps(asdict(info), indent=2), encoding="utf-8")
+            result_dir = parquet_dir
+        else:
+            return parquet_dir
+
+        logger.info("dataset_packing_applied", path=str(result_dir), **stats.as_metrics())
+        return result_dir
+
+    def _load_tokenizer(self) -> Any:
+        """Load the base model's tokenizer, ensuring a pad token is set.
+
+        Raises:
+            MLDependencyError: If transformers is not installed.
+        """
+        try:
+            from transformers import AutoTokenizer
+        except ImportError as exc:
+            msg = "transformers is required to tokenize datasets. Install it with: pip install 'uncase[ml]'"
+            raise MLDependencyError(msg) from exc
+
+        logger.info("loading_tokenizer", model=self._config.base_model)
+        tokenizer = AutoTokenizer.from_pretrained(
+            self._config.base_model,
+            trust_remote_code=True,
+        )
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+            tokenizer.pad_token_id = tokenizer.eos_token_id
+        return tokenizer
+
     async def train(self, dataset_path: Path, config: dict[str, Any]) -> Path:
         """Train a LoRA adapter on the prepared dataset.
 
@@ -294,7 +492,7 @@ class LoraPipeline(BasePipeline):
         All heavy computation runs in a thread pool executor.
 
         Args:
-            dataset_path: Path to the JSONL training dataset.
+            dataset_path: Path to the JSONL training dataset or Parquet dataset directory.
             config: Additional configuration overrides (merged with pipeline config).
 
         Returns:
@@ -364,7 +562,7 @@ class LoraPipeline(BasePipeline):
         ``asyncio.to_thread`` since these operations are CPU/GPU bound.
 
         Args:
-            dataset_path: Path to JSONL training dataset.
+            dataset_path: Path to JSONL training dataset or Parquet dataset directory.
             adapter_dir: Directory to save the adapter.
             run_id: Unique run identifier for logging.
 
@@ -375,18 +573,11 @@ class LoraPipeline(BasePipeline):
         from datasets import load_dataset
         from peft import LoraConfig as PeftLoraConfig
         from peft import TaskType, get_peft_model, prepare_model_for_kbit_training
-        from transformers import AutoModelForCausalLM, AutoTokenizer, BitsAndBytesConfig
+        from transformers import AutoModelForCausalLM, BitsAndBytesConfig
         from trl import SFTConfig, SFTTrainer
 
         # -- Load tokenizer ------------------------------------------------
-        logger.info("loading_tokenizer", model=self._config.base_model)
-        tokenizer = AutoTokenizer.from_pretrained(
-            self._config.base_model,
-            trust_remote_code=True,
-        )
-        if tokenizer.pad_token is None:
-            tokenizer.pad_token = tokenizer.eos_token
-            tokenizer.pad_token_id = tokenizer.eos_token_id
+        tokenizer = self._load_tokenizer()
 
         # -- Load model with optional quantization -------------------------
         model_kwargs: dict[str, Any] = {
@@ -459,8 +650,25 @@ class LoraPipeline(BasePipeline):
         _log_trainable_parameters(model, run_id)
 
         # -- Load dataset --------------------------------------------------
+        # Parquet datasets are pre-tokenized and memory-mapped, so the trainer
+        # skips its own formatting/tokenization pass entirely.
         logger.info("loading_dataset", path=str(dataset_path))
-        dataset = load_dataset("json", data_files=str(dataset_path), split="train")
+        pretokenized = is_parquet_dataset(dataset_path)
+        packing = "none"
+        packing_metrics: dict[str, float] = {}
+        data_collator: PackedSequenceCollator | None = None
+        if pretokenized:
+            dataset_info = read_dataset_info(dataset_path)
+            packing = dataset_info.packing
+            if dataset_info.packing_stats:
+                packing_metrics = PackingStats(**dataset_info.packing_stats).as_metrics()
+            if packing == "pack":
+                dataset = load_parquet_dataset(dataset_path).select_columns(["input_ids", "position_ids"])
+                data_collator = PackedSequenceCollator(tokenizer.pad_token_id)
+            else:
+                dataset = load_parquet_dataset(dataset_path).select_columns(["input_ids", "attention_mask"])
+        else:
+            dataset = load_dataset("json", data_files=str(dataset_path), split="train")
 
         # -- Configure SFTTrainer ------------------------------------------
         sft_config = SFTConfig(
@@ -481,6 +689,8 @@ class LoraPipeline(BasePipeline):
             report_to="mlflow" if self._config.mlflow_experiment else "none",
             run_name=run_id,
             dataset_text_field=None,
+            dataset_kwargs={"skip_prepare_dataset": True} if pretokenized else None,
+            group_by_length=packing == "group_by_length",
         )
 
         # -- MLflow tracking (optional) ------------------------------------
@@ -511,6 +721,7 @@ class LoraPipeline(BasePipeline):
             args=sft_config,
             train_dataset=dataset,
             processing_class=tokenizer,
+            data_collator=data_collator,
         )
 
         # Wrap optimizer with Opacus DP-SGD if enabled
@@ -532,6 +743,8 @@ class LoraPipeline(BasePipeline):
             train_loss=train_result.metrics.get("train_loss"),
             train_runtime=train_result.metrics.get("train_runtime"),
             train_samples_per_second=train_result.metrics.get("train_samples_per_second"),
+            packing=packing,
+            **packing_metrics,
         )
 
         # -- Save adapter --------------------------------------------------
@@ -555,7 +768,7 @@ class LoraPipeline(BasePipeline):
 
         # -- MLflow logging (optional) -------------------------------------
         if self._config.mlflow_experiment:
-            self._log_to_mlflow(train_result.metrics, adapter_dir, run_id)
+            self._log_to_mlflow({**train_result.metrics, **packing_metrics}, adapter_dir, run_id)
 
         return adapter_dir
 
@@ -820,6 +1033,8 @@ class LoraPipeline(BasePipeline):
                         "use_qlora": self._config.use_qlora,
                         "use_dp_sgd": self._config.privacy.use_dp_sgd,
                         "max_seq_length": self._config.training.max_seq_length,
+                        "dataset_format": self._config.dataset.format,
+                        "packing": self._config.dataset.packing,
                     }
                 )
 
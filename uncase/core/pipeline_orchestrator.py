@@ -26,12 +26,14 @@ from uncase.core.generator.litellm_generator import GenerationConfig, LiteLLMGen
 from uncase.core.lora_pipeline.pipeline import LoraPipeline
 from uncase.core.seed_engine.engine import SeedEngine
 from uncase.exceptions import TrainingError
+from uncase.telemetry import PIPELINE_STAGE_DURATION
 
 if TYPE_CHECKING:
     from collections.abc import Callable
     from pathlib import Path
 
     from uncase.config import UNCASESettings
+    from uncase.core.profiling import PipelineProfile, PipelineProfiler
     from uncase.schemas.conversation import Conversation
     from uncase.schemas.quality import QualityReport
     from uncase.schemas.seed import SeedSchema
@@ -54,6 +56,32 @@ class PipelineStageResult:
     error: str | None = None
 
 
+def _begin_stage(profiler: PipelineProfiler | None, stage: str) -> None:
+    """Open a profiling stage when the run is profiled; profiling never fails the run."""
+    if profiler is None:
+        return
+    try:
+        profiler.begin_stage(stage)
+    except Exception as exc:
+        logger.warning("pipeline_profiling_failed", stage=stage, error=str(exc))
+
+
+def _record_stage(
+    stages: list[PipelineStageResult],
+    stage_result: PipelineStageResult,
+    profiler: PipelineProfiler | None = None,
+) -> None:
+    """Append *stage_result*, observe its duration and close its profiling stage."""
+    stages.append(stage_result)
+    if profiler is not None:
+        try:
+            profiler.end_stage()
+        except Exception as exc:
+            logger.warning("pipeline_profiling_failed", stage=stage_result.stage, error=str(exc))
+    outcome = "success" if stage_result.success else "error"
+    PIPELINE_STAGE_DURATION.labels(stage=stage_result.stage, outcome=outcome).observe(stage_result.duration_seconds)
+
+
 @dataclass
 class PipelineResult:
     """Complete result of an end-to-end pipeline run."""
@@ -79,6 +107,9 @@ class PipelineResult:
     avg_quality_score: float = 0.0
     pass_rate: float = 0.0
 
+    # Profiling (only when the run was profiled)
+    profile: PipelineProfile | None = None
+
 
 class PipelineOrchestrator:
     """End-to-end orchestrator for the SCSF pipeline.
@@ -129,6 +160,7 @@ class PipelineOrchestrator:
         dp_epsilon: float | None = None,
         output_dir: str | None = None,
         run_id: str | None = None,
+        profiler: PipelineProfiler | None = None,
     ) -> PipelineResult:
         """Run the full end-to-end pipeline.
 
@@ -145,6 +177,8 @@ class PipelineOrchestrator:
             dp_epsilon: Privacy budget epsilon.
             output_dir: Output directory for all artifacts.
             run_id: Optional run identifier. Auto-generated if None.
+            profiler: Optional profiler recording per-stage timings, event loop
+                blocking and cProfile dumps; its profile is attached to the result.
 
         Returns:
             PipelineResult with all artifacts and statistics.
@@ -154,8 +188,48 @@ class PipelineOrchestrator:
         # Resolve None defaults from settings
         dp_epsilon = dp_epsilon if dp_epsilon is not None else self._settings.uncase_dp_epsilon
         output_dir = output_dir if output_dir is not None else self._settings.uncase_models_dir
-
         run_id = run_id or uuid.uuid4().hex[:12]
+
+        kwargs: dict[str, Any] = {
+            "raw_conversations": raw_conversations,
+            "domain": domain,
+            "count": count,
+            "model": model,
+            "temperature": temperature,
+            "train_adapter": train_adapter,
+            "base_model": base_model,
+            "use_qlora": use_qlora,
+            "use_dp_sgd": use_dp_sgd,
+            "dp_epsilon": dp_epsilon,
+            "output_dir": output_dir,
+            "run_id": run_id,
+        }
+        if profiler is None:
+            return await self._run_stages(**kwargs)
+
+        with profiler.activate():
+            result = await self._run_stages(**kwargs, profiler=profiler)
+        result.profile = profiler.profile
+        return result
+
+    async def _run_stages(
+        self,
+        *,
+        raw_conversations: list[str],
+        domain: str,
+        count: int,
+        model: str | None,
+        temperature: float,
+        train_adapter: bool,
+        base_model: str,
+        use_qlora: bool,
+        use_dp_sgd: bool,
+        dp_epsilon: float,
+        output_dir: str,
+        run_id: str,
+        profiler: PipelineProfiler | None = None,
+    ) -> PipelineResult:
+        """Run the pipeline stages; see :meth:`run` for the arguments."""
         total_start = time.monotonic()
         stages: list[PipelineStageResult] = []
 
@@ -176,6 +250,7 @@ class PipelineOrchestrator:
         )
 
         # ── Stage 1: Seed Engine (Layer 0) — parallel ─────────────────
+        _begin_stage(profiler, "seed_engine")
         self._progress("seed_engine", 0.0, "Creating seeds from raw conversations...")
         stage_start = time.monotonic()
         seeds: list[SeedSchema] = []
@@ -212,7 +287,7 @@ class PipelineOrchestrator:
             )
             logger.error("pipeline_seed_engine_failed", run_id=run_id, error=str(exc))
 
-        stages.append(stage_result)
+        _record_stage(stages, stage_result, profiler)
         result.seeds = seeds
         result.seeds_created = len(seeds)
 
@@ -222,6 +297,7 @@ class PipelineOrchestrator:
             return result
 
         # ── Stage 2: Generation (Layer 3) — parallel ─────────────────
+        _begin_stage(profiler, "generation")
         self._progress("generation", 0.0, "Generating synthetic conversations...")
         stage_start = time.monotonic()
         all_conversations: list[Conversation] = []
@@ -265,7 +341,7 @@ class PipelineOrchestrator:
             )
             logger.error("pipeline_generation_failed", run_id=run_id, error=str(exc))
 
-        stages.append(stage_result)
+        _record_stage(stages, stage_result, profiler)
         result.conversations = all_conversations
         result.conversations_generated = len(all_conversations)
 
@@ -275,6 +351,7 @@ class PipelineOrchestrator:
             return result
 
         # ── Stage 3: Quality Evaluation (Layer 2) — parallel batches ──
+        _begin_stage(profiler, "evaluation")
         self._progress("evaluation", 0.0, "Evaluating quality...")
         stage_start = time.monotonic()
         all_reports: list[QualityReport] = []
@@ -331,7 +408,7 @@ class PipelineOrchestrator:
             )
             logger.error("pipeline_evaluation_failed", run_id=run_id, error=str(exc))
 
-        stages.append(stage_result)
+        _record_stage(stages, stage_result, profiler)
         result.reports = all_reports
         result.conversations_passed = passed
         result.avg_quality_score = avg_score
@@ -339,6 +416,7 @@ class PipelineOrchestrator:
 
         # ── Stage 4: LoRA Training (Layer 4) ─────────────────────────────
         if train_adapter and all_conversations:
+            _begin_stage(profiler, "training")
             self._progress("training", 0.0, "Preparing dataset and training LoRA adapter...")
             stage_start = time.monotonic()
 
@@ -397,7 +475,7 @@ class PipelineOrchestrator:
                 )
                 logger.error("pipeline_training_failed", run_id=run_id, error=str(exc))
 
-            stages.append(stage_result)
+            _record_stage(stages, stage_result, profiler)
 
         # ── Finalize ─────────────────────────────────────────────────────
         result.stages = stages
@@ -2,13 +2,31 @@
 
 from __future__ import annotations
 
+import asyncio
+import multiprocessing
 import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
 from uncase.log_config import get_logger
+from uncase.telemetry import PII_SCAN_DURATION, observe_duration
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
 
 logger = get_logger(__name__)
 
+# Texts per spaCy ``nlp.pipe`` batch when Presidio scans a batch
+_PRESIDIO_BATCH_SIZE = 64
+# Below this many texts per worker, a process pool costs more than it saves
+_MIN_TEXTS_PER_PROCESS = 200
+# Chunks per worker, so a slow chunk doesn't leave the other workers idle
+_CHUNKS_PER_PROCESS = 4
+
 # Reuse the proven regex patterns from the evaluator metric
 _PII_PATTERNS: dict[str, re.Pattern[str]] = {
     "email": re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"),
@@ -96,6 +114,8 @@ class PIIScanner:
         scanner = PIIScanner(confidence_threshold=0.85)
         result = scanner.scan("Call me at 555-123-4567")
         result = scanner.scan_and_anonymize("My SSN is 123-45-6789")
+        results = scanner.scan_and_anonymize_many(["Call me at 555-123-4567", "Hola"])
+        results = await scanner.scan_and_anonymize_many_async(texts, processes=4)
     """
 
     def __init__(self, confidence_threshold: float = 0.85, bypass_words: set[str] | None = None) -> None:
@@ -131,24 +151,12 @@ class PIIScanner:
 
         Returns a PIIScanResult with all detected entities.
         """
-        entities: list[PIIEntity] = []
-
         # Strategy 1: Regex heuristics (always available)
-        for category, pattern in _PII_PATTERNS.items():
-            for match in pattern.finditer(text):
-                entities.append(
-                    PIIEntity(
-                        category=category,
-                        text=match.group(),
-                        start=match.start(),
-                        end=match.end(),
-                        score=1.0,
-                        source="regex",
-                    )
-                )
+        entities = self._regex_entities(text)
 
         # Strategy 2: Presidio NER (when available)
         if self._presidio_analyzer is not None:
+            presidio_start = time.perf_counter()
             try:
                 analyzer = self._presidio_analyzer
                 results = analyzer.analyze(  # type: ignore[attr-defined]
@@ -156,25 +164,138 @@ class PIIScanner:
                     language="en",
                     score_threshold=self.confidence_threshold,
                 )
-                for result in results:
-                    # Skip if a regex pattern already covers this span
-                    overlap = any(
-                        e.source == "regex" and e.start <= result.start and e.end >= result.end for e in entities
-                    )
-                    if not overlap:
-                        entities.append(
-                            PIIEntity(
-                                category=result.entity_type,
-                                text=text[result.start : result.end],
-                                start=result.start,
-                                end=result.end,
-                                score=result.score,
-                                source="presidio",
-                            )
+                _merge_presidio(text, entities, results)
+            except Exception as exc:
+                logger.warning("presidio_scan_error", error=str(exc))
+            PII_SCAN_DURATION.labels(engine="presidio").observe(time.perf_counter() - presidio_start)
+
+        return self._result(text, entities)
+
+    def scan_many(self, texts: Sequence[str]) -> list[PIIScanResult]:
+        """Scan a batch of texts, running Presidio over the whole batch at once.
+
+        With Presidio installed the texts go through spaCy's ``nlp.pipe`` via
+        ``BatchAnalyzerEngine`` instead of one ``analyze`` call per text.
+        Results are identical to calling :meth:`scan` on each text.
+        """
+        batch = [self._regex_entities(text) for text in texts]
+
+        if self._presidio_analyzer is not None and texts:
+            presidio_start = time.perf_counter()
+            for text, entities, results in zip(texts, batch, self._analyze_batch(texts), strict=True):
+                _merge_presidio(text, entities, results)
+            elapsed = time.perf_counter() - presidio_start
+            PII_SCAN_DURATION.labels(engine="presidio").observe(elapsed / len(texts))
+
+        return [self._result(text, entities) for text, entities in zip(texts, batch, strict=True)]
+
+    def scan_and_anonymize(self, text: str) -> PIIScanResult:
+        """Scan text and replace all detected PII with placeholder tokens."""
+        result = self.scan(text)
+        result.anonymized_text = _anonymize(text, result.entities)
+        return result
+
+    def scan_and_anonymize_many(self, texts: Sequence[str], *, processes: int = 1) -> list[PIIScanResult]:
+        """Scan and anonymize a batch of texts, e.g. every message of an import.
+
+        Equivalent to calling :meth:`scan_and_anonymize` per text, but shares
+        one Presidio pipeline pass across the batch.  With ``processes > 1``
+        and at least ``_MIN_TEXTS_PER_PROCESS`` texts per worker, chunks of
+        the batch are scanned in the shared process pool (see
+        :func:`shutdown_process_pool`); each worker builds its own scanner
+        with the same threshold and bypass words.  Blocks until the whole
+        batch is scanned: async callers use :meth:`scan_and_anonymize_many_async`.
+
+        Returns:
+            One result per input text, in input order.
+        """
+        workers = min(processes, len(texts) // _MIN_TEXTS_PER_PROCESS)
+        if workers > 1:
+            scan = partial(
+                _anonymize_chunk, confidence_threshold=self.confidence_threshold, bypass_words=self.bypass_words
+            )
+            chunks = _get_process_pool(workers).map(scan, self._pool_chunks(texts, workers))
+            return [result for chunk in chunks for result in chunk]
+
+        results = self.scan_many(texts)
+        for result in results:
+            result.anonymized_text = _anonymize(result.original_text, result.entities)
+        return results
+
+    async def scan_and_anonymize_many_async(self, texts: Sequence[str], *, processes: int = 1) -> list[PIIScanResult]:
+        """Like :meth:`scan_and_anonymize_many`, for code running on the event loop.
+
+        Batches large enough for the process pool are awaited there without
+        blocking the loop; smaller batches are scanned in-process, where a
+        pool round-trip would cost more than the scan.
+        """
+        workers = min(processes, len(texts) // _MIN_TEXTS_PER_PROCESS)
+        if workers <= 1:
+            return self.scan_and_anonymize_many(texts)
+
+        loop = asyncio.get_running_loop()
+        pool = _get_process_pool(workers)
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(pool, _anonymize_chunk, chunk, self.confidence_threshold, self.bypass_words)
+                for chunk in self._pool_chunks(texts, workers)
+            )
+        )
+        return [result for chunk in chunks for result in chunk]
+
+    def _regex_entities(self, text: str) -> list[PIIEntity]:
+        entities: list[PIIEntity] = []
+        with observe_duration(PII_SCAN_DURATION, engine="regex"):
+            for category, pattern in _PII_PATTERNS.items():
+                for match in pattern.finditer(text):
+                    entities.append(
+                        PIIEntity(
+                            category=category,
+                            text=match.group(),
+                            start=match.start(),
+                            end=match.end(),
+                            score=1.0,
+                            source="regex",
                         )
+                    )
+        return entities
+
+    def _analyze_batch(self, texts: Sequence[str]) -> list[list[Any]]:
+        """Run Presidio over *texts*, batched through ``nlp.pipe`` when possible."""
+        analyzer: Any = self._presidio_analyzer
+        try:
+            from presidio_analyzer import BatchAnalyzerEngine
+
+            batch_analyzer = BatchAnalyzerEngine(analyzer_engine=analyzer)
+            return [
+                list(results)
+                for results in batch_analyzer.analyze_iterator(
+                    list(texts),
+                    language="en",
+                    batch_size=_PRESIDIO_BATCH_SIZE,
+                    score_threshold=self.confidence_threshold,
+                )
+            ]
+        except Exception as exc:
+            logger.warning("presidio_batch_scan_error", error=str(exc), batch_size=len(texts))
+
+        per_text: list[list[Any]] = []
+        for text in texts:
+            try:
+                per_text.append(analyzer.analyze(text=text, language="en", score_threshold=self.confidence_threshold))
             except Exception as exc:
                 logger.warning("presidio_scan_error", error=str(exc))
+                per_text.append([])
+        return per_text
+
+    @staticmethod
+    def _pool_chunks(texts: Sequence[str], workers: int) -> list[list[str]]:
+        chunk_size = -(-len(texts) // (workers * _CHUNKS_PER_PROCESS))
+        chunks = [list(texts[i : i + chunk_size]) for i in range(0, len(texts), chunk_size)]
+        logger.info("pii_scan_process_pool", texts=len(texts), workers=workers, chunks=len(chunks))
+        return chunks
 
+    def _result(self, text: str, entities: list[PIIEntity]) -> PIIScanResult:
         # Sort by position
         entities.sort(key=lambda e: e.start)
 
@@ -188,19 +309,87 @@ class PIIScanner:
             anonymized_text=text,
         )
 
-    def scan_and_anonymize(self, text: str) -> PIIScanResult:
-        """Scan text and replace all detected PII with placeholder tokens."""
-        result = self.scan(text)
 
-        if not result.entities:
-            result.anonymized_text = text
-            return result
+def _merge_presidio(text: str, entities: list[PIIEntity], results: Iterable[Any]) -> None:
+    """Append Presidio results to *entities*, skipping spans a regex match already covers."""
+    regex_spans = [(e.start, e.end) for e in entities if e.source == "regex"]
+    for result in results:
+        if any(start <= result.start and end >= result.end for start, end in regex_spans):
+            continue
+        entities.append(
+            PIIEntity(
+                category=result.entity_type,
+                text=text[result.start : result.end],
+                start=result.start,
+                end=result.end,
+                score=result.score,
+                source="presidio",
+            )
+        )
 
-        # Replace entities from end to start to preserve positions
-        anonymized = text
-        for entity in reversed(result.entities):
-            replacement = _REPLACEMENT_MAP.get(entity.category, f"[{entity.category}]")
-            anonymized = anonymized[: entity.start] + replacement + anonymized[entity.end :]
 
-        result.anonymized_text = anonymized
-        return result
+def _anonymize(text: str, entities: list[PIIEntity]) -> str:
+    """Replace *entities* (sorted by start) with placeholder tokens in a single join.
+
+    Overlapping entities are merged into the earlier one's placeholder, so
+    no fragment of an overlapped span survives.
+    """
+    if not entities:
+        return text
+
+    parts: list[str] = []
+    cursor = 0
+    for entity in entities:
+        if entity.start < cursor:
+            cursor = max(cursor, entity.end)
+            continue
+        parts.append(text[cursor : entity.start])
+        parts.append(_REPLACEMENT_MAP.get(entity.category, f"[{entity.category}]"))
+        cursor = entity.end
+    parts.append(text[cursor:])
+    return "".join(parts)
+
+
+# -- Process pool -----------------------------------------------------------------
+
+_process_pool: ProcessPoolExecutor | None = None
+_process_pool_workers = 0
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the process-wide scan pool, starting it (or growing it to *workers*) on demand."""
+    global _process_pool, _process_pool_workers
+    with _process_pool_lock:
+        if _process_pool is None or workers > _process_pool_workers:
+            previous = _process_pool
+            # spawn, not fork: the API process runs threads (event loop, DB pools)
+            _process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _process_pool_workers = workers
+            if previous is not None:
+                # Chunks already queued on the smaller pool still finish there
+                previous.shutdown(wait=False)
+        return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the shared scan pool, if it was started; called on application shutdown."""
+    global _process_pool, _process_pool_workers
+    with _process_pool_lock:
+        pool, _process_pool, _process_pool_workers = _process_pool, None, 0
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+# Scanners built in a pool worker, one per (threshold, bypass words) configuration
+_worker_scanners: dict[tuple[float, frozenset[str]], PIIScanner] = {}
+
+
+def _anonymize_chunk(texts: list[str], confidence_threshold: float, bypass_words: set[str]) -> list[PIIScanResult]:
+    key = (confidence_threshold, frozenset(bypass_words))
+    scanner = _worker_scanners.get(key)
+    if scanner is None:
+        scanner = _worker_scanners[key] = PIIScanner(
+            confidence_threshold=confidence_threshold, bypass_words=bypass_words
+        )
+    return scanner.scan_and_anonymize_many(texts)
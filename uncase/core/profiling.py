@@ -0,0 +1,330 @@
+"""Opt-in profiling for pipeline runs.
+
+:class:`PipelineProfiler` records, per pipeline stage:
+
+- wall time and process CPU time;
+- wall/CPU time of named spans inside the stage (e.g. each quality metric),
+  recorded with :func:`profile_span` from anywhere in the call tree;
+- event loop blocking: a watchdog thread samples the loop thread's stack
+  whenever a heartbeat task is starved for longer than a threshold, so
+  synchronous CPU work on the loop shows up with the code that caused it;
+- optionally a cProfile dump (``<stage>.prof``) of the loop thread, readable
+  with ``pstats``, ``snakeviz`` or ``flameprof``.
+
+Only one profiler per process can run cProfile: concurrent pipeline jobs share
+the loop thread, and Python allows a single active profiling tool. A profiler
+that cannot claim cProfile still records timings and loop blocking, and logs
+that its dumps were skipped.
+
+Profiling is disabled unless a profiler is activated; :func:`profile_span`
+then costs a single context variable lookup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import cProfile
+import sys
+import threading
+import time
+import traceback
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from pathlib import Path
+
+logger = structlog.get_logger(__name__)
+
+_DEFAULT_BLOCK_THRESHOLD_MS = 100.0
+_MAX_BLOCKING_EVENTS = 200
+_STACK_DEPTH = 15
+
+_active_profiler: ContextVar[PipelineProfiler | None] = ContextVar("uncase_active_profiler", default=None)
+
+# Held by the profiler whose run writes cProfile dumps
+_cprofile_lock = threading.Lock()
+
+
+@dataclass
+class SpanTiming:
+    """Accumulated timings of one named span within a stage."""
+
+    count: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+
+
+@dataclass
+class BlockingEvent:
+    """A period during which the event loop could not run other tasks."""
+
+    stage: str | None
+    duration_ms: float
+    stack: list[str] = field(default_factory=list)
+
+
+@dataclass
+class StageProfile:
+    """Timings of a single pipeline stage."""
+
+    stage: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    spans: dict[str, SpanTiming] = field(default_factory=dict)
+    profile_path: str | None = None
+
+
+@dataclass
+class PipelineProfile:
+    """Everything recorded by a :class:`PipelineProfiler` for one run."""
+
+    stages: list[StageProfile] = field(default_factory=list)
+    blocking_events: list[BlockingEvent] = field(default_factory=list)
+    blocking_event_count: int = 0
+    block_threshold_ms: float = _DEFAULT_BLOCK_THRESHOLD_MS
+    cprofile_skipped: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable representation (e.g. for a job result)."""
+        return {
+            "block_threshold_ms": self.block_threshold_ms,
+            "blocking_event_count": self.blocking_event_count,
+            "cprofile_skipped": self.cprofile_skipped,
+            "blocking_events": [
+                {"stage": e.stage, "duration_ms": round(e.duration_ms, 1), "stack": e.stack}
+                for e in self.blocking_events
+            ],
+            "stages": [
+                {
+                    "stage": s.stage,
+                    "wall_seconds": round(s.wall_seconds, 4),
+                    "cpu_seconds": round(s.cpu_seconds, 4),
+                    "profile_path": s.profile_path,
+                    "spans": {
+                        name: {
+                            "count": t.count,
+                            "wall_seconds": round(t.wall_seconds, 4),
+                            "cpu_seconds": round(t.cpu_seconds, 4),
+                        }
+                        for name, t in sorted(s.spans.items())
+                    },
+                }
+                for s in self.stages
+            ],
+        }
+
+
+class _LoopBlockMonitor:
+    """Detects event loop stalls and captures the loop thread's stack during them.
+
+    A heartbeat task wakes every *interval*; a watchdog thread notices when the
+    heartbeat is overdue by more than *threshold* and snapshots the stack of the
+    loop thread, i.e. the code that is currently blocking it. The heartbeat
+    reports the measured stall once the loop runs again.
+    """
+
+    def __init__(self, threshold_seconds: float, on_block: Callable[[float, list[str]], None]) -> None:
+        self._threshold = threshold_seconds
+        self._interval = max(threshold_seconds / 4, 0.005)
+        self._on_block = on_block
+        self._last_tick = 0.0
+        self._pending_stack: list[str] | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._thread: threading.Thread | None = None
+        self._loop_thread_id = 0
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.perf_counter()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="uncase-loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            now = time.perf_counter()
+            stall = now - self._last_tick - self._interval
+            self._last_tick = now
+            if stall >= self._threshold:
+                with self._lock:
+                    stack, self._pending_stack = self._pending_stack, None
+                self._on_block(stall, stack or [])
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self._interval):
+            overdue = time.perf_counter() - self._last_tick - self._interval
+            if overdue < self._threshold:
+                continue
+            with self._lock:
+                if self._pending_stack is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    self._pending_stack = [line.rstrip() for line in traceback.format_stack(frame, limit=_STACK_DEPTH)]
+
+
+class PipelineProfiler:
+    """Collects per-stage timings, loop blocking and optional cProfile dumps.
+
+    Usage::
+
+        profiler = PipelineProfiler(dump_dir=Path("profiles/run-1"))
+        with profiler.activate():
+            profiler.begin_stage("evaluation")
+            ...
+            profiler.end_stage()
+        print(profiler.profile.to_dict())
+
+    Args:
+        dump_dir: Directory for per-stage cProfile dumps. No dumps are written if None,
+            or if another profiler in the process is already writing dumps.
+        block_threshold_ms: Loop stalls at least this long are recorded as blocking events.
+    """
+
+    def __init__(
+        self, *, dump_dir: Path | None = None, block_threshold_ms: float = _DEFAULT_BLOCK_THRESHOLD_MS
+    ) -> None:
+        self._dump_dir = dump_dir
+        self.profile = PipelineProfile(block_threshold_ms=block_threshold_ms)
+        self._monitor = _LoopBlockMonitor(block_threshold_ms / 1000, self._record_block)
+        self._current: StageProfile | None = None
+        self._stage_start = (0.0, 0.0)
+        self._cprofile: cProfile.Profile | None = None
+        self._owns_cprofile = False
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator[PipelineProfiler]:
+        """Make this the active profiler and run the loop watchdog; needs a running loop."""
+        if self._dump_dir is not None:
+            self._owns_cprofile = _cprofile_lock.acquire(blocking=False)
+            if not self._owns_cprofile:
+                self._skip_cprofile("another pipeline run is being profiled")
+        token = _active_profiler.set(self)
+        self._monitor.start()
+        try:
+            yield self
+        finally:
+            if self._current is not None:
+                self.end_stage()
+            self._monitor.stop()
+            _active_profiler.reset(token)
+            if self._owns_cprofile:
+                self._owns_cprofile = False
+                _cprofile_lock.release()
+
+    def begin_stage(self, stage: str) -> None:
+        """Start timing *stage*, ending the previous stage if one is still open."""
+        if self._current is not None:
+            self.end_stage()
+        self._current = StageProfile(stage=stage)
+        self._stage_start = (time.perf_counter(), time.process_time())
+        if self._owns_cprofile:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as exc:
+                # Python 3.12+: a profiler outside UNCASE (debugger, coverage) is active
+                self._owns_cprofile = False
+                _cprofile_lock.release()
+                self._skip_cprofile(str(exc))
+            else:
+                self._cprofile = profile
+
+    def end_stage(self) -> StageProfile | None:
+        """Stop timing the current stage and write its cProfile dump, if enabled.
+
+        The stage is closed even when writing the dump fails, so the error is
+        raised once and ``activate`` can still release the cProfile slot.
+        """
+        stage = self._current
+        if stage is None:
+            return None
+
+        wall_start, cpu_start = self._stage_start
+        stage.wall_seconds = time.perf_counter() - wall_start
+        stage.cpu_seconds = time.process_time() - cpu_start
+
+        try:
+            if self._cprofile is not None and self._dump_dir is not None:
+                profile, self._cprofile = self._cprofile, None
+                profile.disable()
+                self._dump_dir.mkdir(parents=True, exist_ok=True)
+                path = self._dump_dir / f"{stage.stage}.prof"
+                profile.dump_stats(path)
+                stage.profile_path = str(path)
+        finally:
+            self.profile.stages.append(stage)
+            self._current = None
+        logger.info(
+            "pipeline_stage_profiled",
+            stage=stage.stage,
+            wall_seconds=round(stage.wall_seconds, 3),
+            cpu_seconds=round(stage.cpu_seconds, 3),
+        )
+        return stage
+
+    def add_span(self, name: str, wall_seconds: float, cpu_seconds: float) -> None:
+        """Add one timed span to the current stage."""
+        if self._current is None:
+            return
+        timing = self._current.spans.setdefault(name, SpanTiming())
+        timing.count += 1
+        timing.wall_seconds += wall_seconds
+        timing.cpu_seconds += cpu_seconds
+
+    def _skip_cprofile(self, reason: str) -> None:
+        self.profile.cprofile_skipped = True
+        logger.info("pipeline_cprofile_skipped", reason=reason)
+
+    def _record_block(self, stall_seconds: float, stack: list[str]) -> None:
+        stage = self._current.stage if self._current is not None else None
+        self.profile.blocking_event_count += 1
+        if len(self.profile.blocking_events) < _MAX_BLOCKING_EVENTS:
+            self.profile.blocking_events.append(BlockingEvent(stage, stall_seconds * 1000, stack))
+        logger.warning(
+            "event_loop_blocked",
+            stage=stage,
+            duration_ms=round(stall_seconds * 1000, 1),
+            at=stack[-1].strip() if stack else None,
+        )
+
+
+def get_active_profiler() -> PipelineProfiler | None:
+    """Return the profiler active in the current context, if any."""
+    return _active_profiler.get()
+
+
+@contextlib.contextmanager
+def profile_span(name: str) -> Iterator[None]:
+    """Time the ``with`` block as span *name* of the active profiler's current stage.
+
+    CPU time is the loop thread's CPU time, so for a block that awaits it also
+    includes other tasks that ran in the meantime.
+    """
+    profiler = _active_profiler.get()
+    if profiler is None:
+        yield
+        return
+
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        yield
+    finally:
+        profiler.add_span(name, time.perf_counter() - wall_start, time.thread_time() - cpu_start)
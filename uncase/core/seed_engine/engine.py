@@ -206,40 +206,26 @@ class SeedEngine:
 
         logger.info("turns_parsed", turn_count=len(turns), domain=domain)
 
-        # 2. Strip PII from each turn
+        # 2. Strip PII from each turn and from the role names (they might
+        #    contain real names), in a single scanner batch
+        raw_roles = list(dict.fromkeys(turn.role for turn in turns))
+        cleaned = await self.strip_pii_many([turn.content for turn in turns] + raw_roles)
+        role_map = dict(zip(raw_roles, cleaned[len(turns) :], strict=True))
+
         sensitive_fields: list[str] = []
         anonymized_turns: list[RawTurn] = []
-        for turn in turns:
-            clean_content = await self.strip_pii(turn.content)
+        for turn, clean_content in zip(turns, cleaned[: len(turns)], strict=True):
             if clean_content != turn.content:
                 sensitive_fields.append(f"turn_{turn.turn_number}_{turn.role}")
             anonymized_turns.append(
                 RawTurn(
-                    role=turn.role,
+                    role=role_map[turn.role],
                     content=clean_content,
                     timestamp=turn.timestamp,
                     turn_number=turn.turn_number,
                 )
             )
 
-        # Also anonymize role names (they might contain real names)
-        anonymized_roles: list[str] = []
-        role_map: dict[str, str] = {}
-        for turn in anonymized_turns:
-            if turn.role not in role_map:
-                clean_role = await self.strip_pii(turn.role)
-                role_map[turn.role] = clean_role
-            anonymized_roles.append(role_map[turn.role])
-
-        # Update turns with clean role names
-        for i, turn in enumerate(anonymized_turns):
-            anonymized_turns[i] = RawTurn(
-                role=role_map[turn.role],
-                content=turn.content,
-                timestamp=turn.timestamp,
-                turn_number=turn.turn_number,
-            )
-
         # 3. Analyse conversation structure
         unique_roles = list(dict.fromkeys(role_map.values()))
         if len(unique_roles) < 2:
@@ -313,6 +299,21 @@ class SeedEngine:
             logger.debug("pii_stripped", entity_count=result.entity_count)
         return result.anonymized_text
 
+    async def strip_pii_many(self, texts: list[str]) -> list[str]:
+        """Remove all PII from a batch of texts in one scanner pass.
+
+        Args:
+            texts: Input texts potentially containing PII.
+
+        Returns:
+            The anonymized texts, in input order.
+        """
+        results = self._scanner.scan_and_anonymize_many(texts)
+        entity_count = sum(result.entity_count for result in results)
+        if entity_count:
+            logger.debug("pii_stripped", entity_count=entity_count, texts=len(texts))
+        return [result.anonymized_text for result in results]
+
     async def validate_privacy(self, seed: SeedSchema) -> bool:
         """Validate that a seed contains zero residual PII.
 
@@ -36,6 +36,19 @@ class Layer0Config(BaseModel):
         le=10,
         description="Maximum number of retries for Extractor API calls.",
     )
+    incremental_extraction: bool = Field(
+        default=True,
+        description=(
+            "Send only the new turns, the captured fields and the still-pending field descriptions "
+            "to the Extractor instead of the full transcript and schema on every turn."
+        ),
+    )
+    full_extraction_interval: int = Field(
+        default=5,
+        ge=1,
+        le=50,
+        description="In incremental mode, re-extract from the full transcript every N turns to reconcile the state.",
+    )
 
     # ── Interviewer settings ────────────────────────────────────────
     interviewer_provider: str = Field(
@@ -58,6 +71,13 @@ class Layer0Config(BaseModel):
         le=2.0,
         description="Temperature for the Interviewer LLM (controls creativity).",
     )
+    speculative_questions: bool = Field(
+        default=True,
+        description=(
+            "Generate the likely next question concurrently with extraction, and regenerate it only "
+            "if the action changed or the answer filled the field the question asks about."
+        ),
+    )
 
     # ── Industry ────────────────────────────────────────────────────
     industry: str = Field(
@@ -19,6 +19,7 @@ Usage::
 from __future__ import annotations
 
 import asyncio
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from uncase.core.seed_engine.layer0.config import Layer0Config
@@ -27,8 +28,10 @@ from uncase.core.seed_engine.layer0.interviewer.interviewer import Interviewer
 from uncase.core.seed_engine.layer0.schemas.automotriz import SeedAutomotriz
 from uncase.core.seed_engine.layer0.schemas.finance import SeedFinance
 from uncase.core.seed_engine.layer0.schemas.medical import SeedMedical
-from uncase.core.seed_engine.layer0.state_manager import ActionType, StateManager
+from uncase.core.seed_engine.layer0.state_manager import ActionType, NextAction, StateManager
+from uncase.exceptions import ExtractionError
 from uncase.log_config import get_logger
+from uncase.telemetry import LAYER0_SPECULATIVE_QUESTIONS
 
 if TYPE_CHECKING:
     from uncase.core.seed_engine.layer0.interviewer.base_provider import BaseLLMProvider
@@ -36,6 +39,47 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+# Actions whose question can be drafted before extraction finishes; summaries
+# depend on the extracted values and are always generated afterwards.
+_SPECULATIVE_ACTIONS = frozenset({ActionType.ASK_QUESTION, ActionType.REQUEST_CLARIFICATION})
+
+
+@dataclass
+class _Speculation:
+    """A next question being generated concurrently with extraction."""
+
+    action: NextAction
+    task: asyncio.Task[str]
+    settled: bool = False
+
+
+def _draft_action(predicted: NextAction) -> NextAction:
+    """Narrow *predicted* to the single field a speculative question asks about.
+
+    The interviewer asks about one field per turn, so the draft targets the
+    first missing (or, for a clarification, ambiguous) field.  Answers to any
+    other field then leave the draft valid.
+    """
+    if predicted.action == ActionType.REQUEST_CLARIFICATION:
+        return predicted.model_copy(update={"ambiguous_fields": predicted.ambiguous_fields[:1]})
+    return predicted.model_copy(update={"missing_fields": predicted.missing_fields[:1]})
+
+
+def _speculation_holds(draft: NextAction, actual: NextAction) -> bool:
+    """Whether a question drafted for *draft* still fits *actual*.
+
+    It holds when the action is unchanged and the field the draft asks about
+    is still pending; a field filled by the latest answer would otherwise be
+    asked about again.
+    """
+    if draft.action != actual.action:
+        return False
+    if draft.action == ActionType.REQUEST_CLARIFICATION:
+        targeted, pending = draft.ambiguous_fields, actual.ambiguous_fields
+    else:
+        targeted, pending = draft.missing_fields, actual.missing_fields
+    return {fm.field_name for fm in targeted} <= {fm.field_name for fm in pending}
+
 
 def _create_provider(config: Layer0Config) -> BaseLLMProvider:
     """Factory: create an LLM provider based on the config.
@@ -134,6 +178,8 @@ class AgenticExtractionEngine:
             self._interviewer = Interviewer(_provider, self._config)
 
         self._history: list[dict[str, str]] = []
+        self._extracted_upto: int = 0
+        self._speculation_outcomes: dict[str, int] = {"hit": 0, "miss": 0, "discarded": 0}
         self._response_event: asyncio.Event = asyncio.Event()
         self._pending_response: str | None = None
 
@@ -155,6 +201,65 @@ class AgenticExtractionEngine:
         """Return the conversation history."""
         return list(self._history)
 
+    @property
+    def speculation_stats(self) -> dict[str, Any]:
+        """Return speculative question outcomes and the hit rate for this session."""
+        hits = self._speculation_outcomes["hit"]
+        misses = self._speculation_outcomes["miss"]
+        return {
+            "hits": hits,
+            "misses": misses,
+            "discarded": self._speculation_outcomes["discarded"],
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+    def to_state(self) -> dict[str, Any]:
+        """Serialize the engine's session state to JSON-compatible data.
+
+        Captures the config, conversation history, schema values and field
+        statuses, so another process can resume the interview with
+        :meth:`from_state`.  LLM clients are not included.
+        """
+        return {
+            "config": self._config.model_dump(mode="json"),
+            "idioma": self._schema.idioma,
+            "state": self._state.to_state(),
+            "history": list(self._history),
+            "extracted_upto": self._extracted_upto,
+            "speculation": dict(self._speculation_outcomes),
+        }
+
+    @classmethod
+    def from_state(
+        cls,
+        data: dict[str, Any],
+        *,
+        extractor: SeedExtractor | None = None,
+        interviewer: Interviewer | None = None,
+        provider: BaseLLMProvider | None = None,
+    ) -> AgenticExtractionEngine:
+        """Rebuild an engine from :meth:`to_state` output.
+
+        Args:
+            data: Serialized engine state.
+            extractor: Optional pre-built ``SeedExtractor``.
+            interviewer: Optional pre-built ``Interviewer``.
+            provider: Optional pre-built ``BaseLLMProvider`` for the Interviewer.
+
+        Returns:
+            An engine positioned at the same turn as the serialized one.
+        """
+        config = Layer0Config.model_validate(data["config"])
+        schema = _load_schema(config.industry)
+        schema.idioma = data.get("idioma", schema.idioma)
+
+        engine = cls(config, schema=schema, extractor=extractor, interviewer=interviewer, provider=provider)
+        engine._state.restore(data.get("state", {}))
+        engine._history = [dict(message) for message in data.get("history", [])]
+        engine._extracted_upto = int(data.get("extracted_upto", len(engine._history)))
+        engine._speculation_outcomes.update(data.get("speculation", {}))
+        return engine
+
     def send_response(self, response: str) -> None:
         """Provide the user's response to the current question.
 
@@ -215,31 +320,35 @@ class AgenticExtractionEngine:
                 user_response_length=len(user_response),
             )
 
-            # Extract data from the full conversation
-            field_descriptions = {fm.field_name: fm.description for fm in self._schema.get_field_registry()}
-            extraction_result = await self._extractor.extract(
-                conversation_history=self._history,
-                current_schema_state=self._schema.to_extraction_dict(),
-                field_descriptions=field_descriptions,
-            )
-
-            # Update state with extraction results
-            updated = self._state.update(extraction_result)
-            logger.info(
-                "state_updated",
-                turn=self._state.turn_count,
-                fields_updated=len(updated),
-                updated_fields=updated,
-            )
-
-            # Decide what to do next
-            action = self._state.decide_next_action()
-
-            if action.action == ActionType.COMPLETE:
-                break
-
-            # Generate next question based on action type
-            question = await self._generate_for_action(action, industry, language)
+            # Draft the likely next question while extraction runs
+            speculation = self._start_speculation(industry, language)
+            try:
+                # Extract data from the new turn (or the full conversation); a failed
+                # pass leaves the state as is and its turns are resent next time
+                try:
+                    extraction_result = await self._extract()
+                except ExtractionError:
+                    extraction_result = {}
+
+                # Update state with extraction results
+                updated = self._state.update(extraction_result)
+                logger.info(
+                    "state_updated",
+                    turn=self._state.turn_count,
+                    fields_updated=len(updated),
+                    updated_fields=updated,
+                )
+
+                # Decide what to do next
+                action = self._state.decide_next_action()
+
+                if action.action == ActionType.COMPLETE:
+                    break
+
+                # Generate next question based on action type
+                question = await self._question_for(action, speculation, industry, language)
+            finally:
+                self._discard_speculation(speculation)
 
         # Generate final summary
         final_action = self._state.decide_next_action()
@@ -264,6 +373,7 @@ class AgenticExtractionEngine:
             "extraction_loop_complete",
             total_turns=self._state.turn_count,
             progress=self._state.get_progress(),
+            speculation=self.speculation_stats,
         )
 
         return messages
@@ -293,34 +403,34 @@ class AgenticExtractionEngine:
         self._history.append({"role": "user", "content": user_response})
         self._state.increment_turn()
 
-        # Extract — gracefully handle failures
-        field_descriptions = {fm.field_name: fm.description for fm in self._schema.get_field_registry()}
+        # Draft the likely next question while extraction runs
+        speculation = self._start_speculation(industry, language)
         try:
-            extraction_result = await self._extractor.extract(
-                conversation_history=self._history,
-                current_schema_state=self._schema.to_extraction_dict(),
-                field_descriptions=field_descriptions,
+            # Extract — gracefully handle failures
+            try:
+                extraction_result = await self._extract()
+            except Exception:
+                logger.exception("extraction_failed_in_turn", turn=self._state.turn_count)
+                extraction_result = {}
+
+            # Update state
+            updated = self._state.update(extraction_result)
+            logger.info(
+                "turn_processed",
+                turn=self._state.turn_count,
+                fields_updated=len(updated),
             )
-        except Exception:
-            logger.exception("extraction_failed_in_turn", turn=self._state.turn_count)
-            extraction_result = {}
 
-        # Update state
-        updated = self._state.update(extraction_result)
-        logger.info(
-            "turn_processed",
-            turn=self._state.turn_count,
-            fields_updated=len(updated),
-        )
-
-        # Decide next action
-        action = self._state.decide_next_action()
+            # Decide next action
+            action = self._state.decide_next_action()
 
-        if action.action == ActionType.COMPLETE:
-            return await self._build_summary_message(industry, language)
+            if action.action == ActionType.COMPLETE:
+                return await self._build_summary_message(industry, language)
 
-        # Generate next question
-        question = await self._generate_for_action(action, industry, language)
+            # Generate next question (or take the speculative draft)
+            question = await self._question_for(action, speculation, industry, language)
+        finally:
+            self._discard_speculation(speculation)
         self._history.append({"role": "interviewer", "content": question})
 
         return {
@@ -354,6 +464,101 @@ class AgenticExtractionEngine:
 
     # ── Private helpers ──────────────────────────────────────────────
 
+    async def _extract(self) -> dict[str, Any]:
+        """Run the Extractor for the turns recorded since the last extraction.
+
+        In incremental mode only those turns, the captured fields and the
+        descriptions of still-pending fields are sent, so the prompt does not
+        grow with the interview.  Every ``full_extraction_interval`` turns
+        (and always when incremental mode is off) the whole transcript and
+        schema are sent instead, reconciling anything an incremental pass
+        missed.  The turns are marked as extracted only when the pass
+        succeeds, so turns whose extraction raised are resent on the next pass.
+
+        Raises:
+            ExtractionError: If the Extractor's LLM call failed.
+        """
+        turn = self._state.turn_count
+        full = not self._config.incremental_extraction or turn % self._config.full_extraction_interval == 0
+
+        if full:
+            result = await self._extractor.extract(
+                conversation_history=list(self._history),
+                current_schema_state=self._schema.to_extraction_dict(),
+                field_descriptions={fm.field_name: fm.description for fm in self._schema.get_field_registry()},
+            )
+        else:
+            result = await self._extractor.extract(
+                conversation_history=self._history[self._extracted_upto :],
+                current_schema_state=self._state.captured_state(),
+                field_descriptions={fm.field_name: fm.description for fm in self._state.pending_fields()},
+                incremental=True,
+            )
+
+        self._extracted_upto = len(self._history)
+        logger.debug("extraction_pass", turn=turn, mode="full" if full else "incremental")
+        return result
+
+    def _start_speculation(self, industry: str, language: str) -> _Speculation | None:
+        """Start generating the question for the pre-extraction next action.
+
+        The history and captured data are snapshotted now, so the draft is
+        unaffected by the state update that happens while it runs.
+        """
+        if not self._config.speculative_questions:
+            return None
+        predicted = self._state.decide_next_action()
+        if predicted.action not in _SPECULATIVE_ACTIONS:
+            return None
+        draft = _draft_action(predicted)
+        task = asyncio.create_task(
+            self._generate_for_action(
+                draft,
+                industry,
+                language,
+                history=list(self._history),
+                captured=self._schema.to_extraction_dict(),
+            )
+        )
+        return _Speculation(action=draft, task=task)
+
+    async def _question_for(
+        self,
+        action: NextAction,
+        speculation: _Speculation | None,
+        industry: str,
+        language: str,
+    ) -> str:
+        """Return the speculative draft if it still fits *action*, else generate a fresh question."""
+        if speculation is not None:
+            speculation.settled = True
+            if _speculation_holds(speculation.action, action):
+                try:
+                    question = await speculation.task
+                except Exception:
+                    logger.exception("speculative_question_failed", turn=self._state.turn_count)
+                else:
+                    self._record_speculation("hit")
+                    return question
+            else:
+                speculation.task.cancel()
+            self._record_speculation("miss")
+        return await self._generate_for_action(action, industry, language)
+
+    def _discard_speculation(self, speculation: _Speculation | None) -> None:
+        """Cancel a draft that was never used (loop completed, stopped or failed)."""
+        if speculation is None or speculation.settled:
+            return
+        speculation.settled = True
+        speculation.task.cancel()
+        self._record_speculation("discarded")
+
+    def _record_speculation(self, outcome: str) -> None:
+        """Count a speculation outcome for this session and in the Prometheus counter."""
+        self._speculation_outcomes[outcome] += 1
+        LAYER0_SPECULATIVE_QUESTIONS.labels(outcome=outcome).inc()
+        logger.debug("speculative_question", outcome=outcome, turn=self._state.turn_count)
+
     async def _wait_for_response(self) -> str | None:
         """Wait for a user response via :meth:`send_response`."""
         self._response_event.clear()
@@ -372,13 +577,23 @@ class AgenticExtractionEngine:
         action: Any,
         industry: str,
         language: str,
+        *,
+        history: list[dict[str, str]] | None = None,
+        captured: dict[str, Any] | None = None,
     ) -> str:
-        """Generate the appropriate interviewer response for an action."""
-        captured = self._schema.to_extraction_dict()
+        """Generate the appropriate interviewer response for an action.
+
+        *history* and *captured* default to the engine's current history and
+        schema values.
+        """
+        if history is None:
+            history = self._history
+        if captured is None:
+            captured = self._schema.to_extraction_dict()
 
         if action.action == ActionType.REQUEST_CLARIFICATION:
             return await self._interviewer.generate_clarification(
-                history=self._history,
+                history=history,
                 missing_fields=action.missing_fields,
                 ambiguous_fields=action.ambiguous_fields,
                 industry=industry,
@@ -397,7 +612,7 @@ class AgenticExtractionEngine:
 
         # Default: ask a new question
         return await self._interviewer.generate_question(
-            history=self._history,
+            history=history,
             missing_fields=action.missing_fields,
             ambiguous_fields=action.ambiguous_fields,
             industry=industry,
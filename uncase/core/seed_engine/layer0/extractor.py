@@ -3,9 +3,11 @@
 Uses Claude (via the ``anthropic`` SDK) with ``instructor`` to produce
 validated JSON that maps conversational text to seed schema fields.
 
-The Extractor is **idempotent**: it receives the full conversation history
-every time and re-derives the schema, never losing previously confirmed data
-(fields with confidence ≥ 0.9 are protected).
+In a **full** pass the Extractor receives the whole conversation history and
+re-derives the schema; in an **incremental** pass it receives only the new
+turns, the fields captured so far and the descriptions of fields still
+pending.  Either way previously confirmed data is never lost (fields with
+confidence ≥ 0.9 are protected by the State Manager).
 """
 
 from __future__ import annotations
@@ -22,6 +24,7 @@ from tenacity import (
 )
 
 from uncase.core.seed_engine.layer0.config import Layer0Config
+from uncase.exceptions import ExtractionError
 from uncase.log_config import get_logger
 
 logger = get_logger(__name__)
@@ -123,13 +126,19 @@ class SeedExtractor:
         conversation_history: list[dict[str, str]],
         current_schema_state: dict[str, Any],
         field_descriptions: dict[str, str] | None = None,
+        *,
+        incremental: bool = False,
     ) -> dict[str, Any]:
-        """Run extraction on the full conversation history.
+        """Run extraction on the conversation history.
 
         Args:
             conversation_history: List of ``{"role": "...", "content": "..."}``.
+                The full transcript, or only the new turns when *incremental*.
             current_schema_state: Current field values as a flat dict.
             field_descriptions: Optional mapping of field names to descriptions.
+            incremental: Whether *conversation_history* holds only the turns
+                since the last extraction and *current_schema_state* only the
+                fields captured from earlier turns.
 
         Returns:
             Dict mapping field dot-paths to ``{"value": ..., "confidence": float}``.
@@ -137,13 +146,15 @@ class SeedExtractor:
         Raises:
             ExtractionError: If the LLM call fails after all retries.
         """
-        user_prompt = self._build_prompt(conversation_history, current_schema_state, field_descriptions)
+        user_prompt = self._build_prompt(
+            conversation_history, current_schema_state, field_descriptions, incremental=incremental
+        )
 
         try:
             extraction = await self._call_llm(user_prompt)
-        except Exception:
-            logger.exception("extraction_failed", turn_count=len(conversation_history) // 2)
-            return {}
+        except Exception as exc:
+            logger.exception("extraction_failed", incremental=incremental)
+            raise ExtractionError(f"Seed extraction failed: {exc}") from exc
 
         # Convert ExtractionResult to the dict format StateManager expects
         result: dict[str, Any] = {}
@@ -156,7 +167,9 @@ class SeedExtractor:
         logger.info(
             "extraction_complete",
             fields_extracted=len(result),
-            turn_count=len(conversation_history) // 2,
+            messages=len(conversation_history),
+            incremental=incremental,
+            prompt_chars=len(user_prompt),
         )
         return result
 
@@ -218,8 +231,13 @@ class SeedExtractor:
         conversation_history: list[dict[str, str]],
         current_state: dict[str, Any],
         field_descriptions: dict[str, str] | None = None,
+        *,
+        incremental: bool = False,
     ) -> str:
         """Build the extraction prompt with conversation and schema context."""
+        if incremental:
+            return self._build_incremental_prompt(conversation_history, current_state, field_descriptions)
+
         parts: list[str] = []
 
         # Conversation transcript
@@ -251,3 +269,35 @@ class SeedExtractor:
         )
 
         return "\n".join(parts)
+
+    @staticmethod
+    def _build_incremental_prompt(
+        new_turns: list[dict[str, str]],
+        captured_state: dict[str, Any],
+        pending_descriptions: dict[str, str] | None = None,
+    ) -> str:
+        """Build a compact prompt covering only the turns since the last extraction."""
+        parts: list[str] = ["## New Conversation Turns\n"]
+        for msg in new_turns:
+            parts.append(f"**{msg.get('role', 'unknown')}**: {msg.get('content', '')}")
+        parts.append("")
+
+        parts.append("## Already Captured Fields\n")
+        parts.append(json.dumps(captured_state, ensure_ascii=False, separators=(",", ":"), default=str))
+        parts.append("")
+
+        if pending_descriptions:
+            parts.append("## Fields Still Needed\n")
+            for name, desc in pending_descriptions.items():
+                parts.append(f"- **{name}**: {desc}")
+            parts.append("")
+
+        parts.append("## Instructions\n")
+        parts.append(
+            "Earlier turns have already been extracted into the captured fields above. "
+            "Extract information from the new turns only: fill fields still needed, and return a "
+            "captured field only if the new turns correct or refine it. "
+            "Return an ExtractionResult JSON."
+        )
+
+        return "\n".join(parts)
@@ -270,6 +270,57 @@ class StateManager:
             },
         }
 
+    def captured_state(self) -> dict[str, Any]:
+        """Return the values of fields the extractor has filled so far.
+
+        Unlike ``schema.to_extraction_dict()`` this leaves out untouched
+        fields and their schema defaults, so it stays compact in prompts.
+        """
+        return {
+            name: self._schema.get_field_value(name)
+            for name, meta in self._field_registry.items()
+            if meta.status != FieldStatus.EMPTY
+        }
+
+    def pending_fields(self) -> list[FieldMeta]:
+        """Return fields that are empty, ambiguous or below the confidence threshold."""
+        return [
+            meta
+            for meta in self._field_registry.values()
+            if meta.status in {FieldStatus.EMPTY, FieldStatus.AMBIGUOUS}
+            or meta.confidence < self._config.min_confidence_required
+        ]
+
+    def to_state(self) -> dict[str, Any]:
+        """Return the turn counter, captured values and field statuses as JSON-serializable data."""
+        return {
+            "turn_count": self._turn_count,
+            "user_requested_stop": self._user_requested_stop,
+            "values": self.captured_state(),
+            "fields": {
+                name: {"status": meta.status.value, "confidence": meta.confidence}
+                for name, meta in self._field_registry.items()
+                if meta.status != FieldStatus.EMPTY
+            },
+        }
+
+    def restore(self, state: dict[str, Any]) -> None:
+        """Load a snapshot produced by :meth:`to_state` into this (fresh) state manager."""
+        self._turn_count = int(state.get("turn_count", 0))
+        self._user_requested_stop = bool(state.get("user_requested_stop", False))
+
+        for field_name, value in state.get("values", {}).items():
+            if field_name in self._field_registry:
+                self._schema.set_field_value(field_name, value)
+
+        for field_name, field_state in state.get("fields", {}).items():
+            meta = self._field_registry.get(field_name)
+            if meta is None:
+                logger.warning("unknown_field_skipped", field_name=field_name)
+                continue
+            meta.status = FieldStatus(field_state["status"])
+            meta.confidence = float(field_state["confidence"])
+
     def get_seed_final(self) -> BaseSeedExtraction:
         """Return the final extracted schema."""
         return self._schema
@@ -42,6 +42,18 @@ def init_engine(settings: UNCASESettings) -> None:
     )
 
 
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Return the session factory, for code that opens its own sessions (e.g. job workers).
+
+    Raises:
+        RuntimeError: If init_engine() has not been called.
+    """
+    if _session_factory is None:
+        msg = "Database engine not initialized. Call init_engine() first."
+        raise RuntimeError(msg)
+    return _session_factory
+
+
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """Dependency that yields an async database session.
 
@@ -9,6 +9,7 @@ from uncase.db.models.blockchain import (
     MerkleProofModel,
 )
 from uncase.db.models.conversation import ConversationModel
+from uncase.db.models.cost import CostLedgerModel, CostRollupModel
 from uncase.db.models.custom_tool import CustomToolModel
 from uncase.db.models.evaluation import EvaluationReportModel
 from uncase.db.models.installed_plugin import InstalledPluginModel
@@ -18,7 +19,7 @@ from uncase.db.models.organization import APIKeyAuditLogModel, APIKeyModel, Orga
 from uncase.db.models.provider import LLMProviderModel
 from uncase.db.models.seed import SeedModel
 from uncase.db.models.template_config import TemplateConfigModel
-from uncase.db.models.usage import UsageEventModel
+from uncase.db.models.usage import UsageEventModel, UsageRollupModel
 from uncase.db.models.user import OrgMembershipModel, UserModel
 from uncase.db.models.webhook import WebhookDeliveryModel, WebhookSubscriptionModel
 
@@ -27,6 +28,8 @@ __all__ = [
     "APIKeyModel",
     "AuditLogModel",
     "ConversationModel",
+    "CostLedgerModel",
+    "CostRollupModel",
     "CustomToolModel",
     "EvaluationHashModel",
     "EvaluationReportModel",
@@ -42,6 +45,7 @@ __all__ = [
     "SeedModel",
     "TemplateConfigModel",
     "UsageEventModel",
+    "UsageRollupModel",
     "UserModel",
     "WebhookDeliveryModel",
     "WebhookSubscriptionModel",
@@ -0,0 +1,67 @@
+"""LLM cost ledger and daily cost rollup models."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, date, datetime
+
+from sqlalchemy import BigInteger, Date, DateTime, Index, Integer, Numeric, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from uncase.db.base import Base
+
+
+class CostLedgerModel(Base):
+    """One typed row per cost-bearing usage event (LLM gateway calls and generations).
+
+    Written together with the usage event, so cost reports aggregate numeric
+    columns in SQL instead of parsing usage event metadata.
+    """
+
+    __tablename__ = "cost_ledger"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    usage_event_id: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
+    organization_id: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    provider: Mapped[str] = mapped_column(String(50), nullable=False, default="unknown", server_default="unknown")
+    model: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    job_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    cost_usd: Mapped[float] = mapped_column(
+        Numeric(14, 6, asdecimal=False), nullable=False, default=0.0, server_default="0"
+    )
+    input_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    output_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    total_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC), server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index("ix_cost_ledger_org_created", "organization_id", "created_at"),
+        Index("ix_cost_ledger_org_provider_created", "organization_id", "provider", "created_at"),
+        Index("ix_cost_ledger_job", "job_id"),
+    )
+
+
+class CostRollupModel(Base):
+    """Daily cost totals per organization, provider and event type.
+
+    Ledger rows without an organization are rolled up under ``organization_id=""``.
+    """
+
+    __tablename__ = "cost_rollups_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    organization_id: Mapped[str] = mapped_column(String(32), primary_key=True, default="", server_default="")
+    provider: Mapped[str] = mapped_column(String(50), primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    cost_usd: Mapped[float] = mapped_column(
+        Numeric(18, 6, asdecimal=False), nullable=False, default=0.0, server_default="0"
+    )
+    input_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    output_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    total_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    event_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (Index("ix_cost_rollups_org_day", "organization_id", "day"),)
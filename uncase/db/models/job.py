@@ -76,12 +76,26 @@ class JobModel(Base, TimestampMixin):
     max_attempts: Mapped[int] = mapped_column(
         Integer, nullable=False, default=3, server_default="3", comment="Maximum retry attempts"
     )
+    available_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, comment="Earliest time a worker may claim the job (retry backoff)"
+    )
+
+    # Worker lease (queue execution)
+    lease_owner: Mapped[str | None] = mapped_column(String(100), nullable=True, comment="Worker holding the job")
+    lease_expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, comment="When the lease lapses unless renewed by a heartbeat"
+    )
+    heartbeat_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, comment="Last worker heartbeat"
+    )
 
     __table_args__ = (
         Index("ix_jobs_status", "status"),
         Index("ix_jobs_org_status", "organization_id", "status"),
         Index("ix_jobs_type_status", "job_type", "status"),
         Index("ix_jobs_created", "created_at"),
+        Index("ix_jobs_status_available", "status", "available_at"),
+        Index("ix_jobs_status_lease", "status", "lease_expires_at"),
     )
 
     def mark_running(self) -> None:
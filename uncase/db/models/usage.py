@@ -5,7 +5,7 @@ from __future__ import annotations
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String, func
+from sqlalchemy import JSON, BigInteger, DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from uncase.db.base import Base
@@ -70,3 +70,22 @@ class UsageEventModel(Base):
         Index("ix_usage_events_created", "created_at"),
         Index("ix_usage_events_type_created", "event_type", "created_at"),
     )
+
+
+class UsageRollupModel(Base):
+    """Hourly pre-aggregated usage counts per organization and event type.
+
+    Maintained alongside ``usage_events`` on every write, so usage summaries
+    and timelines read a few rows per hour instead of scanning raw events.
+    Events without an organization are rolled up under ``organization_id=""``.
+    """
+
+    __tablename__ = "usage_rollups_hourly"
+
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    organization_id: Mapped[str] = mapped_column(String(32), primary_key=True, default="", server_default="")
+    event_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    total_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    event_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (Index("ix_usage_rollups_org_bucket", "organization_id", "bucket_start"),)
@@ -0,0 +1,39 @@
+"""Counter upserts for rollup tables (PostgreSQL and SQLite)."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from uncase.db.base import Base
+
+
+async def increment_counters(
+    session: AsyncSession,
+    model: type[Base],
+    rows: Sequence[dict[str, Any]],
+    *,
+    keys: Sequence[str],
+    counters: Sequence[str],
+) -> None:
+    """Insert *rows*, or add their *counters* to the existing row with the same *keys*.
+
+    All rows are written with one ``INSERT ... ON CONFLICT DO UPDATE``
+    statement; *keys* must be the table's primary key or a unique constraint.
+    """
+    if not rows:
+        return
+
+    dialect = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(model)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={name: getattr(model, name) + statement.excluded[name] for name in counters},
+    )
+    await session.execute(statement, list(rows))
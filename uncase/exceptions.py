@@ -293,6 +293,23 @@ class DatasetPreparationError(UNCASEError):
     detail = "Dataset preparation failed"
 
 
+# -- Export --
+
+
+class ExportError(UNCASEError):
+    """Conversation export failed."""
+
+    status_code = 500
+    detail = "Export failed"
+
+
+class ExportDependencyError(ExportError):
+    """Parquet export requires pyarrow. Install with: pip install 'uncase[ml]'"""
+
+    status_code = 503
+    detail = "Parquet export requires pyarrow. Install with: pip install 'uncase[ml]'"
+
+
 # -- Blockchain --
 
 
@@ -313,6 +330,13 @@ class ExtractionLoopError(UNCASEError):
     detail = "Extraction loop error"
 
 
+class ExtractionError(ExtractionLoopError):
+    """The Extractor LLM call failed after all retries."""
+
+    status_code = 502
+    detail = "Seed extraction failed"
+
+
 class ExtractionTimeoutError(ExtractionLoopError):
     """Agentic extraction loop timed out waiting for user response."""
 
@@ -320,6 +344,13 @@ class ExtractionTimeoutError(ExtractionLoopError):
     detail = "Extraction loop timed out"
 
 
+class ExtractionSessionConflictError(ExtractionLoopError):
+    """The extraction session was updated by another request since it was loaded."""
+
+    status_code = 409
+    detail = "Extraction session was modified concurrently"
+
+
 class ProviderConfigError(UNCASEError):
     """LLM provider for the extraction loop is misconfigured."""
 
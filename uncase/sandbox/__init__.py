@@ -1,6 +1,8 @@
-"""E2B sandbox module for parallel generation, demos, and evaluation."""
+"""Sandbox module for parallel generation (E2B or local workers), demos, and evaluation."""
 
-from uncase.sandbox.e2b_client import E2BSandboxOrchestrator
+from uncase.sandbox.e2b_client import E2BSandboxBackend, E2BSandboxOrchestrator
+from uncase.sandbox.local_backend import LocalSubprocessBackend
+from uncase.sandbox.orchestrator import SandboxBackend, SandboxOrchestrator, create_sandbox_orchestrator
 from uncase.sandbox.schemas import (
     DemoSandboxRequest,
     DemoSandboxResponse,
@@ -25,13 +27,16 @@ from uncase.sandbox.schemas import (
 __all__ = [
     "DemoSandboxRequest",
     "DemoSandboxResponse",
+    "E2BSandboxBackend",
     "E2BSandboxOrchestrator",
     "ExportArtifact",
+    "LocalSubprocessBackend",
     "OpikConversationResult",
     "OpikEvaluationRequest",
     "OpikEvaluationResponse",
     "OpikEvaluationSummary",
     "OpikMetricResult",
+    "SandboxBackend",
     "SandboxConfig",
     "SandboxExportResult",
     "SandboxGenerateRequest",
@@ -39,7 +44,9 @@ __all__ = [
     "SandboxGenerationSummary",
     "SandboxJob",
     "SandboxJobStatus",
+    "SandboxOrchestrator",
     "SandboxProgress",
     "SandboxSeedResult",
     "SandboxTemplate",
+    "create_sandbox_orchestrator",
 ]
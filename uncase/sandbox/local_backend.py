@@ -0,0 +1,192 @@
+"""Local sandbox backend — a pool of reusable ``worker.py`` subprocesses.
+
+Each worker runs ``worker.py --serve`` with this interpreter, handling one
+JSON payload per line, so seeds after the first skip the interpreter and
+litellm start-up entirely.  Conversation lines streamed by the worker are
+forwarded as they are read, until its result line.  Workers get a minimal environment (none of the
+API server's secrets) and are bounded by ``SANDBOX_LOCAL_WORKERS``.  A worker
+that times out or fails mid-payload is killed rather than reused.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import sys
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from uncase.sandbox.orchestrator import WORKER_PATH
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+logger = structlog.get_logger(__name__)
+
+# Upper bound for one worker output line (a streamed conversation or a result)
+_MAX_LINE_BYTES = 64 * 1024 * 1024
+
+# Environment variables passed through to workers (proxies and TLS settings for LLM calls)
+_WORKER_ENV_ALLOWLIST = (
+    "PATH",
+    "HOME",
+    "LANG",
+    "LC_ALL",
+    "TMPDIR",
+    "HTTP_PROXY",
+    "HTTPS_PROXY",
+    "NO_PROXY",
+    "SSL_CERT_FILE",
+    "REQUESTS_CA_BUNDLE",
+)
+
+
+class LocalSubprocessBackend:
+    """Runs the worker in a pool of long-lived local subprocesses.
+
+    Args:
+        max_workers: Maximum number of worker processes (and concurrent runs).
+        timeout_seconds: Timeout of a run when the caller passes none; the worker is killed when exceeded.
+        worker_path: Worker script to run.
+        python: Interpreter used to start workers.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 4,
+        timeout_seconds: int = 300,
+        worker_path: Path = WORKER_PATH,
+        python: str = sys.executable,
+    ) -> None:
+        self.timeout_seconds = timeout_seconds
+        self._command = (python, str(worker_path), "--serve")
+        self._slots = asyncio.Semaphore(max_workers)
+        self._idle: list[asyncio.subprocess.Process] = []
+
+    @property
+    def idle_workers(self) -> int:
+        """Number of started workers waiting for a payload."""
+        return len(self._idle)
+
+    async def run(
+        self,
+        payload: dict[str, Any],
+        progress: Callable[[str], object],
+        on_event: Callable[[dict[str, Any]], object],
+        *,
+        timeout: float | None = None,
+    ) -> dict[str, Any]:
+        """Run *payload* on an idle worker, starting one if none is available."""
+        async with self._slots:
+            process = self._take_idle()
+            if process is None:
+                progress("booting")
+                process = await self._spawn()
+
+            progress("generating")
+            try:
+                result = await asyncio.wait_for(
+                    _exchange(process, payload, on_event), timeout=timeout or self.timeout_seconds
+                )
+            except BaseException:
+                # The worker may still be busy with this payload; never hand it to another seed
+                await _kill(process)
+                raise
+
+            self._idle.append(process)
+            return result
+
+    def resize(self, pending_runs: int) -> None:
+        """No-op: the pool is shared across requests and bounded by ``max_workers``."""
+
+    async def drain(self) -> None:
+        """No-op: idle workers stay warm for the next request."""
+
+    async def aclose(self) -> None:
+        """Stop idle workers (they exit on EOF)."""
+        idle, self._idle = self._idle, []
+        for process in idle:
+            if process.stdin is not None:
+                process.stdin.close()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except TimeoutError:
+                await _kill(process)
+
+    def _take_idle(self) -> asyncio.subprocess.Process | None:
+        while self._idle:
+            process = self._idle.pop()
+            if process.returncode is None:
+                return process
+        return None
+
+    async def _spawn(self) -> asyncio.subprocess.Process:
+        process = await asyncio.create_subprocess_exec(
+            *self._command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            env={key: os.environ[key] for key in _WORKER_ENV_ALLOWLIST if key in os.environ},
+            limit=_MAX_LINE_BYTES,
+        )
+        logger.info("local_sandbox_worker_started", pid=process.pid)
+        return process
+
+
+async def _exchange(
+    process: asyncio.subprocess.Process,
+    payload: dict[str, Any],
+    on_event: Callable[[dict[str, Any]], object],
+) -> dict[str, Any]:
+    """Send one payload line to *process*, forward its event lines and return its result line."""
+    if process.stdin is None or process.stdout is None:
+        raise RuntimeError("Local sandbox worker has no pipes")
+
+    process.stdin.write(json.dumps(payload, ensure_ascii=False).encode() + b"\n")
+    await process.stdin.drain()
+    while True:
+        line = await process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"Local sandbox worker exited with code {await process.wait()}")
+        message: dict[str, Any] = json.loads(line)
+        if "event" not in message:
+            return message
+        on_event(message)
+
+
+async def _kill(process: asyncio.subprocess.Process) -> None:
+    with contextlib.suppress(ProcessLookupError):
+        process.kill()
+    await process.wait()
+    logger.info("local_sandbox_worker_stopped", pid=process.pid, returncode=process.returncode)
+
+
+_local_backend: LocalSubprocessBackend | None = None
+
+
+def get_local_backend() -> LocalSubprocessBackend:
+    """Return the process-wide local worker pool, configured from settings."""
+    global _local_backend
+    if _local_backend is None:
+        from uncase.config import UNCASESettings
+
+        settings = UNCASESettings()
+        _local_backend = LocalSubprocessBackend(
+            max_workers=settings.sandbox_local_workers,
+            timeout_seconds=settings.sandbox_local_timeout,
+        )
+    return _local_backend
+
+
+async def close_local_backend() -> None:
+    """Stop the process-wide worker pool, if it was started."""
+    global _local_backend
+    if _local_backend is not None:
+        await _local_backend.aclose()
+        _local_backend = None
@@ -0,0 +1,626 @@
+"""Backend-neutral fan-out of seed generation across isolated sandbox workers.
+
+A :class:`SandboxBackend` runs the self-contained ``worker.py`` on a payload
+of one or more packed seeds, forwards the conversation lines the worker
+streams as each conversation finishes, and returns its final JSON result.
+:class:`SandboxOrchestrator` packs seeds into runs, fans the runs out over a
+backend, bounded by an asyncio.Semaphore, and turns the worker output into
+``SandboxSeedResult``/``SandboxProgress``/``SandboxGenerateResponse``.
+
+Backends:
+
+- ``e2b``: remote E2B sandboxes, pooled and reused across the runs of a
+  fan-out (:mod:`uncase.sandbox.e2b_client`).
+- ``local``: a pool of reusable ``worker.py`` subprocesses on this node
+  (:mod:`uncase.sandbox.local_backend`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+import structlog
+
+from uncase.sandbox.schemas import (
+    SandboxGenerateResponse,
+    SandboxGenerationSummary,
+    SandboxProgress,
+    SandboxSeedResult,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Callable
+
+    from uncase.config import UNCASESettings
+    from uncase.schemas.conversation import Conversation
+    from uncase.schemas.quality import QualityReport
+
+logger = structlog.get_logger(__name__)
+
+# Path to the self-contained worker script run by every backend
+WORKER_PATH = Path(__file__).parent / "worker.py"
+
+# Upper bound for a per-request max_parallel override
+_MAX_PARALLEL_CAP = 20
+
+# Automatic packing: at most this many seeds per worker run...
+_MAX_SEEDS_PER_RUN = 10
+# ...while keeping at least this many runs per parallel slot
+_RUNS_PER_SLOT = 4
+
+# LLM calls in flight per worker run
+DEFAULT_WORKER_CONCURRENCY = 4
+
+
+class SandboxBackend(Protocol):
+    """Runs ``worker.py`` on one payload in an isolated environment."""
+
+    name: str
+    timeout_seconds: int
+
+    async def run(
+        self,
+        payload: dict[str, Any],
+        progress: Callable[[str], object],
+        on_event: Callable[[dict[str, Any]], object],
+        *,
+        timeout: float | None = None,
+    ) -> dict[str, Any]:
+        """Run the worker on *payload* and return its JSON result.
+
+        *payload* is ``{"payloads": [...], "max_concurrency": n}`` (one
+        entry per packed seed) and the result ``{"results": [...]}`` in the
+        same order.  Each conversation line the worker writes before its
+        result is passed to ``on_event`` as soon as it is read.  Calls
+        ``progress("booting")``/``progress("generating")`` as the
+        environment comes up.  Raises ``TimeoutError`` when the worker
+        exceeds *timeout* seconds (``timeout_seconds`` if None); other
+        failures raise any exception.
+        """
+        ...
+
+    def resize(self, pending_runs: int) -> None:
+        """Adapt pooled capacity to the runs still queued or in flight."""
+        ...
+
+    async def drain(self) -> None:
+        """Release capacity held for the fan-out that just finished."""
+        ...
+
+
+def _parse_sandbox_conversations(raw_conversations: list[dict[str, Any]]) -> list[Conversation]:
+    """Parse raw conversation dicts from sandbox output into Conversation models."""
+    from uncase.schemas.conversation import Conversation, ConversationTurn
+
+    conversations: list[Conversation] = []
+    for raw in raw_conversations:
+        turns = [
+            ConversationTurn(
+                turno=t.get("turno", i + 1),
+                rol=t.get("rol", ""),
+                contenido=t.get("contenido", ""),
+                herramientas_usadas=t.get("herramientas_usadas", []),
+                metadata=t.get("metadata", {}),
+            )
+            for i, t in enumerate(raw.get("turnos", []))
+        ]
+        if not turns:
+            continue
+
+        conversations.append(
+            Conversation(
+                conversation_id=raw.get("conversation_id", ""),
+                seed_id=raw.get("seed_id", ""),
+                dominio=raw.get("dominio", ""),
+                idioma=raw.get("idioma", "es"),
+                turnos=turns,
+                es_sintetica=raw.get("es_sintetica", True),
+                metadata=raw.get("metadata", {}),
+            )
+        )
+    return conversations
+
+
+def _parse_sandbox_reports(raw_reports: list[dict[str, Any]] | None) -> list[QualityReport] | None:
+    """Parse raw quality report dicts from sandbox output into QualityReport models."""
+    if raw_reports is None:
+        return None
+
+    from uncase.schemas.quality import QualityMetrics, QualityReport
+
+    reports: list[QualityReport] = []
+    for raw in raw_reports:
+        metrics_data = raw.get("metrics", {})
+        metrics = QualityMetrics(
+            rouge_l=metrics_data.get("rouge_l", 0.0),
+            fidelidad_factual=metrics_data.get("fidelidad_factual", 0.0),
+            diversidad_lexica=metrics_data.get("diversidad_lexica", 0.0),
+            coherencia_dialogica=metrics_data.get("coherencia_dialogica", 0.0),
+            privacy_score=metrics_data.get("privacy_score", 0.0),
+            memorizacion=metrics_data.get("memorizacion", 0.0),
+        )
+        reports.append(
+            QualityReport(
+                conversation_id=raw.get("conversation_id", ""),
+                seed_id=raw.get("seed_id", ""),
+                metrics=metrics,
+                composite_score=raw.get("composite_score", 0.0),
+                passed=raw.get("passed", False),
+                failures=raw.get("failures", []),
+            )
+        )
+    return reports
+
+
+class SandboxOrchestrator:
+    """Orchestrates parallel conversation generation over a sandbox backend.
+
+    Seeds are packed into worker runs of ``seeds_per_run`` seeds (``0``
+    picks a pack size from the batch size), and runs are bounded by an
+    asyncio.Semaphore.  Inside a run the worker keeps up to
+    ``worker_concurrency`` LLM calls in flight and streams conversations
+    back as they finish.  The backend is told how many runs are still
+    queued or in flight, so pooled backends can size their warm pool.
+
+    Usage:
+        orchestrator = SandboxOrchestrator(LocalSubprocessBackend(), max_parallel=4)
+        response = await orchestrator.fan_out_generate(seeds=seeds, count_per_seed=3)
+    """
+
+    def __init__(
+        self,
+        backend: SandboxBackend,
+        *,
+        max_parallel: int,
+        seeds_per_run: int = 1,
+        worker_concurrency: int = DEFAULT_WORKER_CONCURRENCY,
+    ) -> None:
+        self._backend = backend
+        self._semaphore = asyncio.Semaphore(max_parallel)
+        self._seeds_per_run = seeds_per_run
+        self._worker_concurrency = worker_concurrency
+        self._pending_runs = 0
+
+    @property
+    def backend_name(self) -> str:
+        """Name of the backend running the workers."""
+        return self._backend.name
+
+    def _packs(self, total_seeds: int) -> list[list[int]]:
+        """Split seed indices into worker runs."""
+        size = self._seeds_per_run
+        if size <= 0:
+            # Enough runs per slot to balance uneven seeds, but as few worker invocations as that allows
+            size = max(1, min(_MAX_SEEDS_PER_RUN, total_seeds // (self._semaphore._value * _RUNS_PER_SLOT)))
+        indices = list(range(total_seeds))
+        return [indices[i : i + size] for i in range(0, total_seeds, size)]
+
+    async def _run_pack(
+        self,
+        *,
+        seeds: list[dict[str, Any]],
+        pack: list[int],
+        count: int,
+        model: str,
+        temperature: float,
+        api_key: str | None,
+        api_base: str | None,
+        language_override: str | None,
+        evaluate_after: bool,
+        on_progress: Callable[[SandboxProgress], object] | None = None,
+    ) -> list[SandboxSeedResult]:
+        """Run generation for the seeds at *pack* indices in one worker invocation.
+
+        Returns each seed's result, in pack order.  Progress events,
+        including one per conversation streamed by the worker, are passed
+        to *on_progress* as they happen.
+
+        The backend's ``timeout_seconds`` is a per-seed budget: the run may
+        take that long for each seed in the pack.  When it still times out,
+        seeds whose conversations were all streamed succeed and only the
+        unfinished ones fail, keeping what they streamed.
+        """
+        start_time = time.monotonic()
+        seed_ids = [seeds[i].get("seed_id", "unknown") for i in pack]
+        streamed: list[list[dict[str, Any]]] = [[] for _ in pack]
+
+        def _progress(slot: int, status: str, completed: int = 0, error: str | None = None) -> None:
+            if on_progress is None:
+                return
+            on_progress(
+                SandboxProgress(
+                    seed_id=seed_ids[slot],
+                    sandbox_index=pack[slot],
+                    total_sandboxes=len(seeds),
+                    status=status,
+                    conversations_completed=completed,
+                    conversations_total=count,
+                    error=error,
+                    elapsed_seconds=round(time.monotonic() - start_time, 2),
+                )
+            )
+
+        def _progress_all(status: str) -> None:
+            for slot in range(len(pack)):
+                _progress(slot, status)
+
+        def _failed(slot: int, error_msg: str) -> SandboxSeedResult:
+            _progress(slot, "error", error=error_msg)
+            return SandboxSeedResult(
+                seed_id=seed_ids[slot],
+                error=error_msg,
+                duration_seconds=round(time.monotonic() - start_time, 2),
+            )
+
+        def _collected(slot: int, error: str | None = None) -> SandboxSeedResult:
+            conversations = _parse_sandbox_conversations([event["conversation"] for event in streamed[slot]])
+            reports = (
+                _parse_sandbox_reports([event["report"] for event in streamed[slot] if event.get("report")])
+                if evaluate_after
+                else None
+            )
+            passed_count = sum(1 for r in reports if r.passed) if reports else 0
+            _progress(slot, "complete" if error is None else "error", completed=len(conversations), error=error)
+            return SandboxSeedResult(
+                seed_id=seed_ids[slot],
+                conversations=conversations,
+                reports=reports,
+                passed_count=passed_count,
+                error=error,
+                duration_seconds=round(time.monotonic() - start_time, 2),
+            )
+
+        def _on_event(event: dict[str, Any]) -> None:
+            slot = event.get("index")
+            if event.get("event") != "conversation" or not isinstance(slot, int) or not 0 <= slot < len(pack):
+                logger.warning("sandbox_unknown_event", backend=self._backend.name, event=event.get("event"))
+                return
+            streamed[slot].append(event)
+            _progress(slot, "generating", completed=len(streamed[slot]))
+
+        _progress_all("queued")
+
+        payload = {
+            "payloads": [
+                {
+                    "seed": seeds[i],
+                    "count": count,
+                    "model": model,
+                    "temperature": temperature,
+                    "api_key": api_key,
+                    "api_base": api_base,
+                    "language_override": language_override,
+                    "evaluate_after": evaluate_after,
+                }
+                for i in pack
+            ],
+            "max_concurrency": self._worker_concurrency,
+        }
+
+        timeout = self._backend.timeout_seconds * len(pack)
+        async with self._semaphore:
+            logger.info(
+                "sandbox_executing",
+                backend=self._backend.name,
+                seed_ids=seed_ids,
+                sandbox_index=pack[0],
+                model=model,
+                count=count,
+            )
+            try:
+                result_data = await self._backend.run(payload, _progress_all, _on_event, timeout=timeout)
+            except TimeoutError:
+                unfinished = [slot for slot in range(len(pack)) if len(streamed[slot]) < count]
+                logger.error(
+                    "sandbox_timeout",
+                    backend=self._backend.name,
+                    seed_ids=seed_ids,
+                    timeout=timeout,
+                    unfinished=[seed_ids[slot] for slot in unfinished],
+                )
+                error_msg = f"Sandbox timed out after {timeout}s"
+                return [_collected(slot, error_msg if slot in unfinished else None) for slot in range(len(pack))]
+            except Exception as exc:
+                logger.error("sandbox_error", backend=self._backend.name, seed_ids=seed_ids, error=str(exc))
+                return [_failed(slot, str(exc)) for slot in range(len(pack))]
+
+        seed_results = result_data.get("results")
+        if result_data.get("error") or not isinstance(seed_results, list) or len(seed_results) != len(pack):
+            error_msg = result_data.get("error") or "Malformed output from sandbox"
+            return [_failed(slot, error_msg) for slot in range(len(pack))]
+
+        outcomes: list[SandboxSeedResult] = []
+        for slot, seed_data in enumerate(seed_results):
+            if seed_data.get("error"):
+                # Conversations streamed before the failure are discarded with the seed
+                outcomes.append(_failed(slot, seed_data["error"]))
+                continue
+
+            outcomes.append(_collected(slot))
+
+        logger.info(
+            "sandbox_complete",
+            backend=self._backend.name,
+            seed_ids=seed_ids,
+            sandbox_index=pack[0],
+            conversations=sum(len(result.conversations) for result in outcomes),
+            passed=sum(result.passed_count for result in outcomes),
+            duration=round(time.monotonic() - start_time, 2),
+        )
+        return outcomes
+
+    async def _run_tracked(self, **kwargs: Any) -> list[SandboxSeedResult]:
+        """Run a pack, then tell the backend how many runs are still pending."""
+        try:
+            return await self._run_pack(**kwargs)
+        finally:
+            self._pending_runs -= 1
+            self._backend.resize(self._pending_runs)
+
+    def _start_runs(
+        self,
+        seeds: list[dict[str, Any]],
+        **kwargs: Any,
+    ) -> tuple[list[list[int]], list[asyncio.Task[list[SandboxSeedResult]]]]:
+        packs = self._packs(len(seeds))
+        self._pending_runs = len(packs)
+        self._backend.resize(self._pending_runs)
+        tasks = [asyncio.create_task(self._run_tracked(seeds=seeds, pack=pack, **kwargs)) for pack in packs]
+        return packs, tasks
+
+    def _summarize(
+        self,
+        results: list[SandboxSeedResult],
+        *,
+        total_seeds: int,
+        model: str,
+        temperature: float,
+        evaluate_after: bool,
+        start_time: float,
+    ) -> SandboxGenerateResponse:
+        total_conversations = sum(len(r.conversations) for r in results)
+        total_passed: int | None = None
+        avg_score: float | None = None
+
+        if evaluate_after:
+            all_reports = [r for result in results if result.reports for r in result.reports]
+            if all_reports:
+                total_passed = sum(1 for r in all_reports if r.passed)
+                avg_score = round(sum(r.composite_score for r in all_reports) / len(all_reports), 4)
+
+        failed_seeds = sum(1 for r in results if r.error is not None)
+        duration = round(time.monotonic() - start_time, 2)
+
+        summary = SandboxGenerationSummary(
+            total_seeds=total_seeds,
+            total_conversations=total_conversations,
+            total_passed=total_passed,
+            avg_composite_score=avg_score,
+            failed_seeds=failed_seeds,
+            model_used=model,
+            temperature=temperature,
+            max_parallel=self._semaphore._value,
+            duration_seconds=duration,
+            sandbox_mode=True,
+        )
+
+        logger.info(
+            "sandbox_fan_out_complete",
+            backend=self._backend.name,
+            total_seeds=total_seeds,
+            total_conversations=total_conversations,
+            total_passed=total_passed,
+            failed_seeds=failed_seeds,
+            duration=duration,
+        )
+
+        return SandboxGenerateResponse(results=results, summary=summary)
+
+    async def fan_out_generate(
+        self,
+        *,
+        seeds: list[dict[str, Any]],
+        count_per_seed: int = 1,
+        model: str = "claude-sonnet-4-20250514",
+        temperature: float = 0.7,
+        api_key: str | None = None,
+        api_base: str | None = None,
+        language_override: str | None = None,
+        evaluate_after: bool = True,
+        max_parallel: int | None = None,
+    ) -> SandboxGenerateResponse:
+        """Fan out generation across parallel sandbox workers.
+
+        Packs seeds into worker runs. Each seed is generated independently
+        and optionally evaluated. Results are collected after all runs
+        complete.
+
+        Args:
+            seeds: List of seed dicts to generate from.
+            count_per_seed: Conversations to generate per seed.
+            model: LLM model to use.
+            temperature: Sampling temperature.
+            api_key: API key for the LLM provider.
+            api_base: Optional API base URL.
+            language_override: Override language for all seeds.
+            evaluate_after: Run quality evaluation in each sandbox.
+            max_parallel: Override max parallel sandboxes.
+
+        Returns:
+            SandboxGenerateResponse with per-seed results and summary.
+        """
+        if max_parallel is not None:
+            self._semaphore = asyncio.Semaphore(min(max_parallel, _MAX_PARALLEL_CAP))
+
+        start_time = time.monotonic()
+        total_sandboxes = len(seeds)
+
+        # Launch all runs concurrently (semaphore controls actual parallelism)
+        packs, tasks = self._start_runs(
+            seeds,
+            count=count_per_seed,
+            model=model,
+            temperature=temperature,
+            api_key=api_key,
+            api_base=api_base,
+            language_override=language_override,
+            evaluate_after=evaluate_after,
+        )
+
+        logger.info(
+            "sandbox_fan_out_start",
+            backend=self._backend.name,
+            total_seeds=total_sandboxes,
+            runs=len(packs),
+            count_per_seed=count_per_seed,
+            model=model,
+            max_parallel=self._semaphore._value,
+        )
+
+        try:
+            task_results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            await self._backend.drain()
+
+        # Collect results in seed order
+        by_index: dict[int, SandboxSeedResult] = {}
+        for pack, task_result in zip(packs, task_results, strict=True):
+            if isinstance(task_result, BaseException):
+                for i in pack:
+                    by_index[i] = SandboxSeedResult(
+                        seed_id=seeds[i].get("seed_id", "unknown"),
+                        error=str(task_result),
+                        duration_seconds=0.0,
+                    )
+            else:
+                for i, seed_result in zip(pack, task_result, strict=True):
+                    by_index[i] = seed_result
+        results = [by_index[i] for i in range(total_sandboxes)]
+
+        return self._summarize(
+            results,
+            total_seeds=total_sandboxes,
+            model=model,
+            temperature=temperature,
+            evaluate_after=evaluate_after,
+            start_time=start_time,
+        )
+
+    async def fan_out_generate_stream(
+        self,
+        *,
+        seeds: list[dict[str, Any]],
+        count_per_seed: int = 1,
+        model: str = "claude-sonnet-4-20250514",
+        temperature: float = 0.7,
+        api_key: str | None = None,
+        api_base: str | None = None,
+        language_override: str | None = None,
+        evaluate_after: bool = True,
+        max_parallel: int | None = None,
+    ) -> AsyncGenerator[SandboxProgress | SandboxGenerateResponse, None]:
+        """Stream progress events during parallel sandbox generation.
+
+        Yields SandboxProgress events as they happen (including one per
+        conversation streamed back by a worker), then yields the final
+        SandboxGenerateResponse.
+
+        Usage with SSE:
+            async for event in orchestrator.fan_out_generate_stream(...):
+                if isinstance(event, SandboxProgress):
+                    yield f"data: {event.model_dump_json()}\\n\\n"
+                else:
+                    yield f"event: complete\\ndata: {event.model_dump_json()}\\n\\n"
+        """
+        if max_parallel is not None:
+            self._semaphore = asyncio.Semaphore(min(max_parallel, _MAX_PARALLEL_CAP))
+
+        start_time = time.monotonic()
+        total_sandboxes = len(seeds)
+
+        # Progress events and finished runs, in the order they happen
+        events: asyncio.Queue[SandboxProgress | asyncio.Task[list[SandboxSeedResult]]] = asyncio.Queue()
+        packs, tasks = self._start_runs(
+            seeds,
+            count=count_per_seed,
+            model=model,
+            temperature=temperature,
+            api_key=api_key,
+            api_base=api_base,
+            language_override=language_override,
+            evaluate_after=evaluate_after,
+            on_progress=events.put_nowait,
+        )
+        for task in tasks:
+            task.add_done_callback(events.put_nowait)
+
+        results: list[SandboxSeedResult] = []
+        remaining = len(tasks)
+
+        try:
+            while remaining:
+                item = await events.get()
+                if isinstance(item, SandboxProgress):
+                    yield item
+                    continue
+
+                remaining -= 1
+                pack = packs[tasks.index(item)]
+                exc = item.exception()
+                if exc is not None:
+                    for idx in pack:
+                        error_result = SandboxSeedResult(
+                            seed_id=seeds[idx].get("seed_id", "unknown"),
+                            error=str(exc),
+                            duration_seconds=0.0,
+                        )
+                        results.append(error_result)
+                        yield SandboxProgress(
+                            seed_id=error_result.seed_id,
+                            sandbox_index=idx,
+                            total_sandboxes=total_sandboxes,
+                            status="error",
+                            conversations_total=count_per_seed,
+                            error=str(exc),
+                            elapsed_seconds=round(time.monotonic() - start_time, 2),
+                        )
+                else:
+                    results.extend(item.result())
+        finally:
+            for task in tasks:
+                task.cancel()
+            await self._backend.drain()
+
+        yield self._summarize(
+            results,
+            total_seeds=total_sandboxes,
+            model=model,
+            temperature=temperature,
+            evaluate_after=evaluate_after,
+            start_time=start_time,
+        )
+
+
+def create_sandbox_orchestrator(settings: UNCASESettings) -> SandboxOrchestrator | None:
+    """Create the orchestrator for ``SANDBOX_BACKEND``, or None when no backend is usable.
+
+    ``e2b`` needs ``E2B_ENABLED`` and ``E2B_API_KEY``; ``local`` always works
+    and shares one process-wide worker pool.
+    """
+    if settings.sandbox_backend == "local":
+        from uncase.sandbox.local_backend import get_local_backend
+
+        return SandboxOrchestrator(
+            get_local_backend(),
+            max_parallel=settings.sandbox_local_workers,
+            worker_concurrency=settings.sandbox_worker_concurrency,
+        )
+
+    if settings.sandbox_available:
+        from uncase.sandbox.e2b_client import E2BSandboxOrchestrator
+
+        return E2BSandboxOrchestrator(settings=settings)
+    return None
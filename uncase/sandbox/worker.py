@@ -14,14 +14,33 @@ The worker receives a JSON payload via stdin containing:
   - language_override: optional language override
   - evaluate_after: whether to run quality evaluation
 
-It writes a JSON result to stdout containing:
-  - conversations: list of generated conversations
-  - reports: optional list of quality reports
-  - error: optional error message
+The ``count`` conversations are generated concurrently, at most
+``max_concurrency`` LLM calls in flight per invocation, and evaluated in a
+thread pool while the remaining calls are still running.  Each conversation
+is streamed to stdout as soon as it is ready, one JSON line per conversation:
+  - event: "conversation"
+  - index: position of the seed's payload in the invocation
+  - conversation: the generated conversation
+  - report: its quality report, or null when evaluate_after is false
+
+The last stdout line is the JSON result, containing:
+  - conversations_streamed: number of conversation lines written for the seed
+  - error: optional error message (conversations already streamed for a
+    failed seed must be discarded)
+  - duration_seconds: wall time for the seed
+
+Several seeds can be packed into one invocation as ``{"payloads": [...],
+"max_concurrency": n}``; they run concurrently, share the in-flight cap, and
+the result is ``{"results": [...]}`` with one result per payload, in order.
+
+With ``--serve`` the worker stays alive and handles one payload per stdin
+line, writing its conversation lines and then its result line, so the local
+subprocess backend can reuse the process across seeds.
 """
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import json
 import re
@@ -29,7 +48,13 @@ import sys
 import time
 import uuid
 from datetime import UTC, datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any, TextIO
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# LLM calls in flight per invocation when the payload does not set max_concurrency
+DEFAULT_MAX_CONCURRENCY = 4
 
 
 def build_system_prompt(seed: dict[str, Any], language: str | None = None) -> str:
@@ -308,10 +333,18 @@ def evaluate_conversation(turns: list[dict[str, Any]], seed: dict[str, Any]) ->
     }
 
 
-async def run_generation(payload: dict[str, Any]) -> dict[str, Any]:
-    """Run the generation pipeline inside the sandbox."""
-    import litellm
+async def run_generation(
+    payload: dict[str, Any],
+    emit: Callable[[dict[str, Any], dict[str, Any] | None], None],
+    limiter: asyncio.Semaphore,
+) -> None:
+    """Run the generation pipeline inside the sandbox.
 
+    Generates the conversations concurrently (LLM calls bounded by
+    *limiter*), evaluating each one in a worker thread, and passes every
+    finished conversation and its report to *emit*.  The first failure
+    cancels the remaining conversations and is raised.
+    """
     seed = payload["seed"]
     count = payload.get("count", 1)
     model = payload.get("model", "claude-sonnet-4-20250514")
@@ -321,6 +354,8 @@ async def run_generation(payload: dict[str, Any]) -> dict[str, Any]:
     language = payload.get("language_override") or seed.get("idioma", "es")
     evaluate_after = payload.get("evaluate_after", True)
 
+    import litellm
+
     system_prompt = build_system_prompt(seed, language=language)
     pasos = seed.get("pasos_turnos", {})
     turnos_min = pasos.get("turnos_min", 4)
@@ -332,10 +367,7 @@ async def run_generation(payload: dict[str, Any]) -> dict[str, Any]:
         f"Generate between {turnos_min} and {turnos_max} turns."
     )
 
-    conversations = []
-    reports = []
-
-    for i in range(count):
+    async def generate_one(i: int) -> None:
         temp_variation = (i - count / 2) * 0.05
         adjusted_temp = max(0.0, min(2.0, temperature + temp_variation))
 
@@ -356,20 +388,21 @@ async def run_generation(payload: dict[str, Any]) -> dict[str, Any]:
 
         # Try with JSON response format first, fallback without it
         last_error = None
-        for attempt in range(3):
-            try:
-                if attempt == 0:
-                    kwargs["response_format"] = {"type": "json_object"}
-                response = await litellm.acompletion(**kwargs)
-                raw = response.choices[0].message.content
-                if not raw:
-                    raise ValueError("Empty LLM response")
-                break
-            except Exception as exc:
-                last_error = exc
-                kwargs.pop("response_format", None)
-        else:
-            raise RuntimeError(f"LLM call failed after 3 attempts: {last_error}")
+        async with limiter:
+            for attempt in range(3):
+                try:
+                    if attempt == 0:
+                        kwargs["response_format"] = {"type": "json_object"}
+                    response = await litellm.acompletion(**kwargs)
+                    raw = response.choices[0].message.content
+                    if not raw:
+                        raise ValueError("Empty LLM response")
+                    break
+                except Exception as exc:
+                    last_error = exc
+                    kwargs.pop("response_format", None)
+            else:
+                raise RuntimeError(f"LLM call failed after 3 attempts: {last_error}")
 
         turns = parse_llm_response(raw, seed.get("roles", []))
 
@@ -388,43 +421,108 @@ async def run_generation(payload: dict[str, Any]) -> dict[str, Any]:
                 "generation_index": str(i),
             },
         }
-        conversations.append(conversation)
 
+        report = None
         if evaluate_after:
-            report = evaluate_conversation(turns, seed)
+            # Scoring runs in a thread so the event loop keeps collecting LLM responses
+            report = await asyncio.to_thread(evaluate_conversation, turns, seed)
             report["conversation_id"] = conversation["conversation_id"]
             report["seed_id"] = seed.get("seed_id", "unknown")
             report["evaluated_at"] = datetime.now(UTC).isoformat()
-            reports.append(report)
 
+        emit(conversation, report)
+
+    tasks = [asyncio.create_task(generate_one(i)) for i in range(count)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def run_one(
+    payload: dict[str, Any],
+    emit: Callable[[dict[str, Any], dict[str, Any] | None], None],
+    limiter: asyncio.Semaphore,
+) -> dict[str, Any]:
+    """Run generation for one seed payload, reporting any failure as the result's error."""
+    start = time.monotonic()
+    streamed = 0
+
+    def counted(conversation: dict[str, Any], report: dict[str, Any] | None) -> None:
+        nonlocal streamed
+        streamed += 1
+        emit(conversation, report)
+
+    try:
+        await run_generation(payload, counted, limiter)
+        error = None
+    except Exception as exc:
+        error = str(exc)
     return {
-        "conversations": conversations,
-        "reports": reports if evaluate_after else None,
-        "error": None,
+        "conversations_streamed": streamed,
+        "error": error,
+        "duration_seconds": round(time.monotonic() - start, 2),
     }
 
 
-async def main() -> None:
-    """Entry point: read JSON payload from stdin, run generation, write result to stdout."""
-    raw_input = sys.stdin.read()
-    payload = json.loads(raw_input)
+async def run_payload(raw_input: str, out: TextIO) -> dict[str, Any]:
+    """Decode a single or packed JSON payload and run generation for every seed in it.
 
-    start = time.monotonic()
+    Conversation lines are written to *out* as they finish; the result is
+    returned for the caller to write last.
+    """
     try:
-        result = await run_generation(payload)
-        result["duration_seconds"] = round(time.monotonic() - start, 2)
-    except Exception as exc:
-        result = {
-            "conversations": [],
-            "reports": None,
-            "error": str(exc),
-            "duration_seconds": round(time.monotonic() - start, 2),
-        }
+        payload = json.loads(raw_input)
+    except json.JSONDecodeError as exc:
+        return {"conversations_streamed": 0, "error": f"Invalid payload: {exc}"}
 
-    print(json.dumps(result, ensure_ascii=False))
+    limiter = asyncio.Semaphore(max(1, int(payload.get("max_concurrency") or DEFAULT_MAX_CONCURRENCY)))
 
+    def emitter(index: int) -> Callable[[dict[str, Any], dict[str, Any] | None], None]:
+        def emit(conversation: dict[str, Any], report: dict[str, Any] | None) -> None:
+            event = {"event": "conversation", "index": index, "conversation": conversation, "report": report}
+            out.write(json.dumps(event, ensure_ascii=False) + "\n")
+            out.flush()
 
-if __name__ == "__main__":
-    import asyncio
+        return emit
+
+    if "payloads" not in payload:
+        return await run_one(payload, emitter(0), limiter)
+    # Packed seeds run concurrently, so a pack takes about as long as its slowest seed
+    results = await asyncio.gather(*(run_one(p, emitter(i), limiter) for i, p in enumerate(payload["payloads"])))
+    return {"results": list(results), "error": None}
+
+
+def _claim_stdout() -> TextIO:
+    """Reserve stdout for protocol lines; library output (e.g. litellm notices) goes to stderr."""
+    out = sys.stdout
+    sys.stdout = sys.stderr
+    return out
+
+
+async def main() -> None:
+    """Entry point: read JSON payload from stdin, stream conversations and the result to stdout."""
+    out = _claim_stdout()
+    result = await run_payload(sys.stdin.read(), out)
+    out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    out.flush()
 
-    asyncio.run(main())
+
+async def serve() -> None:
+    """Entry point for ``--serve``: one JSON payload per stdin line, its output lines on stdout, until EOF."""
+    out = _claim_stdout()
+
+    while True:
+        line = await asyncio.to_thread(sys.stdin.readline)
+        if not line:
+            break
+        if not line.strip():
+            continue
+        result = await run_payload(line, out)
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        out.flush()
+
+
+if __name__ == "__main__":
+    asyncio.run(serve() if "--serve" in sys.argv[1:] else main())
@@ -0,0 +1,67 @@
+"""Export API schemas — server-side bulk export of persisted conversations."""
+
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+ExportFormat = Literal["jsonl", "jsonl.gz", "parquet"]
+
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "jsonl": "application/x-ndjson",
+    "jsonl.gz": "application/gzip",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class ExportRequest(BaseModel):
+    """Filters and output options for a conversation export.
+
+    Conversations are read from the database, optionally rendered through a
+    chat template, and encoded in the requested format without ever
+    materializing the full result set.
+    """
+
+    format: ExportFormat = Field(default="jsonl", description="Output format: 'jsonl', 'jsonl.gz' or 'parquet'.")
+    template_name: str | None = Field(
+        default=None,
+        description="Chat template used to render each conversation. When omitted, raw conversations are exported.",
+    )
+    tool_call_mode: str = Field(default="none", description="Tool call handling mode: 'none' or 'inline'.")
+    system_prompt: str | None = Field(default=None, description="Optional system prompt for rendered output.")
+
+    # -- Filters --
+    domain: str | None = Field(default=None, description="Filter by domain namespace.")
+    seed_id: str | None = Field(default=None, description="Filter by origin seed ID.")
+    status: str | None = Field(default=None, description="Filter by validation status.")
+    language: str | None = Field(default=None, description="Filter by language code.")
+    min_rating: float | None = Field(default=None, description="Only export conversations rated at least this value.")
+    min_quality_score: float | None = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="Only export conversations with an evaluation report scoring at least this composite value.",
+    )
+    passed_only: bool = Field(default=False, description="Only export conversations with a passing evaluation.")
+    limit: int | None = Field(default=None, ge=1, description="Maximum number of conversations to export.")
+
+    batch_size: int = Field(default=500, ge=1, le=10_000, description="Rows fetched and encoded per batch.")
+
+
+class ExportJobResponse(BaseModel):
+    """Response for a background export job submission."""
+
+    job_id: str = Field(..., description="Background job ID for tracking")
+    status: str = Field(..., description="Job status")
+    message: str = Field(..., description="Human-readable message")
+
+
+class ExportSummary(BaseModel):
+    """Result of an export written to a file."""
+
+    path: str = Field(..., description="Path of the exported file")
+    format: ExportFormat = Field(..., description="Output format")
+    exported: int = Field(..., ge=0, description="Number of conversations written")
+    skipped: int = Field(default=0, ge=0, description="Rows skipped because they failed validation")
+    bytes_written: int = Field(..., ge=0, description="Size of the exported file in bytes")
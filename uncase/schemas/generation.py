@@ -52,6 +52,7 @@ class GenerateResponse(BaseModel):
 class SandboxStatusResponse(BaseModel):
     """Response for sandbox availability check."""
 
-    enabled: bool = Field(..., description="Whether E2B sandbox is configured and enabled")
+    enabled: bool = Field(..., description="Whether sandbox fan-out is available (E2B configured, or local backend)")
     max_parallel: int = Field(..., description="Max concurrent sandboxes allowed")
     template_id: str = Field(..., description="E2B template ID in use")
+    backend: str = Field(default="e2b", description="Fan-out backend: 'e2b' or 'local'")
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from typing import Literal
+
+from pydantic import BaseModel, Field, model_validator
 
 from uncase.schemas.conversation import Conversation  # noqa: TC001
 
@@ -26,6 +28,32 @@ class RenderRequest(BaseModel):
         default=None,
         description="Optional system prompt prepended to each conversation.",
     )
+    tokenizer: str | None = Field(
+        default=None,
+        description=(
+            "Tokenizer for token accounting, one of the server's TEMPLATE_TOKENIZERS "
+            "(e.g. 'tiktoken:cl100k_base'). Enables token counts in the response."
+        ),
+    )
+    max_tokens: int | None = Field(
+        default=None,
+        ge=1,
+        description="Maximum rendered length in tokens. Requires 'tokenizer'.",
+    )
+    over_length: Literal["keep", "drop", "truncate"] = Field(
+        default="drop",
+        description=(
+            "What to do with conversations longer than max_tokens: keep them, drop them, "
+            "or truncate trailing turns until they fit."
+        ),
+    )
+
+    @model_validator(mode="after")
+    def _max_tokens_requires_tokenizer(self) -> RenderRequest:
+        if self.max_tokens is not None and self.tokenizer is None:
+            msg = "max_tokens requires a tokenizer"
+            raise ValueError(msg)
+        return self
 
 
 class RenderResponse(BaseModel):
@@ -34,3 +62,9 @@ class RenderResponse(BaseModel):
     rendered: list[str] = Field(..., description="Rendered prompt strings, one per conversation.")
     template_name: str = Field(..., description="Name of the template used.")
     count: int = Field(..., ge=0, description="Number of conversations rendered.")
+    token_counts: list[int] | None = Field(
+        default=None,
+        description="Token count of each rendered string (only when a tokenizer was given).",
+    )
+    dropped: list[str] = Field(default_factory=list, description="IDs of conversations dropped for length.")
+    truncated: list[str] = Field(default_factory=list, description="IDs of conversations truncated to fit.")
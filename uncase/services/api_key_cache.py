@@ -0,0 +1,170 @@
+"""Process-local cache of verified API keys and coalesced ``last_used_at`` writes.
+
+Argon2id verification is deliberately slow (64 MiB, ~tens of ms of CPU), so
+running it on every request caps a worker at a few dozen authenticated
+requests per second. :class:`VerifiedKeyCache` remembers which raw keys have
+already been verified against which stored hash for a short TTL, so warm
+requests skip Argon2 entirely.
+
+Entries are keyed by a keyed BLAKE2b digest of the raw key (the key itself is
+never held in memory) with a random per-process secret. A hit is only honoured
+if the stored hash still matches, and callers still load the key row, so a
+revoked, expired or rotated key is rejected immediately even on another worker.
+
+:class:`LastUsedRecorder` collects ``last_used_at`` timestamps in memory and
+writes them in one batched UPDATE, instead of one flush per request.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import secrets
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, cast
+
+from sqlalchemy import bindparam, update
+
+from uncase.db.models.organization import APIKeyModel
+from uncase.log_config import get_logger
+
+if TYPE_CHECKING:
+    from sqlalchemy import Table
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = get_logger(__name__)
+
+_DEFAULT_TTL_SECONDS = 60.0
+_DEFAULT_MAX_ENTRIES = 10_000
+
+
+@dataclass(frozen=True)
+class _VerifiedKey:
+    key_id: str
+    key_hash: str
+    verified_at: float
+
+
+class VerifiedKeyCache:
+    """TTL cache of raw API keys that passed Argon2 verification."""
+
+    def __init__(self, *, ttl_seconds: float = _DEFAULT_TTL_SECONDS, max_entries: int = _DEFAULT_MAX_ENTRIES) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._secret = secrets.token_bytes(32)
+        self._entries: dict[bytes, _VerifiedKey] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _digest(self, raw_key: str) -> bytes:
+        return hashlib.blake2b(raw_key.encode(), key=self._secret, digest_size=32).digest()
+
+    def is_verified(self, raw_key: str, key_id: str, key_hash: str) -> bool:
+        """Return whether *raw_key* was recently verified against *key_hash*."""
+        if self._ttl <= 0:
+            return False
+
+        digest = self._digest(raw_key)
+        entry = self._entries.get(digest)
+        if entry is None:
+            return False
+
+        if time.monotonic() - entry.verified_at > self._ttl or entry.key_id != key_id or entry.key_hash != key_hash:
+            del self._entries[digest]
+            return False
+        return True
+
+    def add(self, raw_key: str, key_id: str, key_hash: str) -> None:
+        """Record a successful verification of *raw_key*."""
+        if self._ttl <= 0:
+            return
+
+        if len(self._entries) >= self._max_entries:
+            self._evict()
+        self._entries[self._digest(raw_key)] = _VerifiedKey(key_id, key_hash, time.monotonic())
+
+    def invalidate(self, key_id: str) -> None:
+        """Forget every cached verification for *key_id* (on revoke or rotate)."""
+        stale = [digest for digest, entry in self._entries.items() if entry.key_id == key_id]
+        for digest in stale:
+            del self._entries[digest]
+
+    def clear(self) -> None:
+        """Drop all cached verifications."""
+        self._entries.clear()
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the oldest half if still full."""
+        cutoff = time.monotonic() - self._ttl
+        self._entries = {d: e for d, e in self._entries.items() if e.verified_at >= cutoff}
+        if len(self._entries) >= self._max_entries:
+            # Dicts keep insertion order, so the first entries are the oldest
+            keep = list(self._entries.items())[len(self._entries) // 2 :]
+            self._entries = dict(keep)
+
+
+class LastUsedRecorder:
+    """Buffers ``last_used_at`` updates and writes them in a single batch."""
+
+    def __init__(self) -> None:
+        self._pending: dict[str, datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def touch(self, api_key_pk: str, when: datetime | None = None) -> None:
+        """Record that the key with primary key *api_key_pk* was just used."""
+        self._pending[api_key_pk] = when or datetime.now(UTC)
+
+    async def flush(self, session: AsyncSession) -> int:
+        """Write all buffered timestamps in one executemany UPDATE and commit.
+
+        Returns:
+            Number of keys updated.
+        """
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        # Core UPDATE so keys deleted since they were touched are silently skipped
+        table = cast("Table", APIKeyModel.__table__)
+        statement = update(table).where(table.c.id == bindparam("pk")).values(last_used_at=bindparam("used_at"))
+        try:
+            await session.execute(
+                statement,
+                [{"pk": pk, "used_at": used_at} for pk, used_at in pending.items()],
+            )
+            await session.commit()
+        except Exception:
+            # Keep the newest timestamp per key for the next attempt
+            for pk, used_at in pending.items():
+                self._pending[pk] = max(used_at, self._pending.get(pk, used_at))
+            raise
+
+        logger.debug("api_key_last_used_flushed", count=len(pending))
+        return len(pending)
+
+
+_verified_key_cache: VerifiedKeyCache | None = None
+_last_used_recorder = LastUsedRecorder()
+
+
+def get_verified_key_cache() -> VerifiedKeyCache:
+    """Return the process-wide verified-key cache, sized from settings."""
+    global _verified_key_cache
+    if _verified_key_cache is None:
+        from uncase.config import UNCASESettings
+
+        settings = UNCASESettings()
+        _verified_key_cache = VerifiedKeyCache(
+            ttl_seconds=settings.api_key_cache_ttl,
+            max_entries=settings.api_key_cache_max_entries,
+        )
+    return _verified_key_cache
+
+
+def get_last_used_recorder() -> LastUsedRecorder:
+    """Return the process-wide ``last_used_at`` recorder."""
+    return _last_used_recorder
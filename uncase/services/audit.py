@@ -2,23 +2,84 @@
 
 Every sensitive operation calls ``audit()`` to record the action.
 This is separate from application logs (structlog) and metrics.
+
+While the API's audit flusher runs, ``audit()`` hands entries to the
+process-wide :class:`AuditSink`, which writes them in multi-row INSERTs on
+its own session: the request pays no round trip and the caller's session is
+never committed on its behalf. Entries are only written inline (and the
+caller's session committed, as before) when no flusher is running or the
+sink is full. Entries are dropped (and logged) only when they cannot be
+written at all, or when the database stays unreachable long enough for
+requeued entries to exceed ``max_entries``.
 """
 
 from __future__ import annotations
 
+import uuid
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
 import structlog
+from sqlalchemy import insert
 
 from uncase.db.models.audit import AuditLogModel
+from uncase.services.batching import BatchingSink
 
 if TYPE_CHECKING:
     from fastapi import Request
     from sqlalchemy.ext.asyncio import AsyncSession
 
+    from uncase.config import UNCASESettings
+
 logger = structlog.get_logger(__name__)
 
 
+class AuditSink(BatchingSink):
+    """Bounded in-memory queue of audit entries, flushed to the database in batches.
+
+    Args:
+        max_entries: Entries held in memory; beyond this ``audit()`` writes inline.
+        batch_size: Entries written per INSERT; reaching it triggers a flush.
+        flush_interval: Maximum seconds an entry waits in the sink.
+    """
+
+    name = "audit"
+
+    def __init__(self, *, max_entries: int = 10_000, batch_size: int = 500, flush_interval: float = 1.0) -> None:
+        super().__init__(max_rows=max_entries, batch_size=batch_size, flush_interval=flush_interval)
+
+    @classmethod
+    def from_settings(cls, settings: UNCASESettings) -> AuditSink:
+        """Build a sink with the configured limits."""
+        return cls(
+            max_entries=settings.audit_buffer_max_entries,
+            batch_size=settings.audit_flush_batch_size,
+            flush_interval=settings.audit_flush_interval,
+        )
+
+    def enqueue(self, entry: dict[str, Any]) -> bool:
+        """Queue an entry for the next flush; returns False (entry not taken) when full."""
+        return self._append(entry)
+
+    async def _write(self, session: AsyncSession, batch: list[dict[str, Any]]) -> int:
+        await session.execute(insert(AuditLogModel), batch)
+        await session.commit()
+        return len(batch)
+
+
+_audit_sink: AuditSink | None = None
+
+
+def get_audit_sink() -> AuditSink:
+    """Return the process-wide audit sink, configured from settings."""
+    global _audit_sink
+    if _audit_sink is None:
+        from uncase.config import UNCASESettings
+
+        _audit_sink = AuditSink.from_settings(UNCASESettings())
+    return _audit_sink
+
+
 async def audit(
     session: AsyncSession,
     *,
@@ -60,22 +121,30 @@ async def audit(
             endpoint = str(request.url.path)
             http_method = request.method
 
-        entry = AuditLogModel(
-            action=action,
-            resource_type=resource_type,
-            resource_id=resource_id,
-            actor_type=actor_type,
-            actor_id=actor_id,
-            organization_id=organization_id,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            endpoint=endpoint,
-            http_method=http_method,
-            detail=detail,
-            extra_data=extra_data,
-            status=status,
-        )
-        session.add(entry)
+        now = datetime.now(UTC)
+        entry: dict[str, Any] = {
+            "id": uuid.uuid4().hex,
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "actor_type": actor_type,
+            "actor_id": actor_id,
+            "organization_id": organization_id,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "endpoint": endpoint,
+            "http_method": http_method,
+            "detail": detail,
+            "extra_data": extra_data,
+            "status": status,
+            "created_at": now,
+            "updated_at": now,
+        }
+        sink = get_audit_sink()
+        if sink.running and sink.enqueue(entry):
+            return
+
+        session.add(AuditLogModel(**entry))
         await session.commit()
     except Exception:
         logger.debug("audit_log_write_failed", action=action, resource_type=resource_type)
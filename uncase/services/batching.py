@@ -0,0 +1,171 @@
+"""Write-behind batching shared by the usage buffer and the audit sink.
+
+A :class:`BatchingSink` queues rows in memory; a flusher task (:meth:`run`)
+writes them in batches on its own session, once ``batch_size`` rows are
+queued or every ``flush_interval`` seconds, and once more on shutdown.
+
+A batch that fails is split in halves and retried until the rows that
+cannot be written (e.g. unserializable metadata) are isolated; those are
+logged and rejected, and the rest is committed, so one bad row never blocks
+the rows queued behind it.  Only failures that look transient (connection
+lost, database unavailable) put rows back at the front of the queue, and
+never more than ``max_rows``: the overflow policy applies to the excess.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from uncase.log_config import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from contextlib import AbstractAsyncContextManager
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+logger = get_logger(__name__)
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Whether *exc* means the database could not be reached, rather than that the rows are bad."""
+    if isinstance(exc, OperationalError | InterfaceError | OSError):
+        return True
+    return isinstance(exc, DBAPIError) and exc.connection_invalidated
+
+
+class BatchingSink(ABC):
+    """Bounded in-memory queue of rows, flushed to the database in batches.
+
+    Subclasses implement :meth:`_write` and may override :meth:`_overflow`
+    (rows that do not fit in the queue) and :meth:`_before_flush`.
+
+    Args:
+        max_rows: Rows held in memory, including rows requeued after a failed flush.
+        batch_size: Rows written per batch; reaching it triggers a flush.
+        flush_interval: Maximum seconds a row waits in the queue.
+    """
+
+    # Prefix of the sink's log events, e.g. ``usage`` -> ``usage_flush_failed``
+    name: ClassVar[str]
+
+    def __init__(self, *, max_rows: int, batch_size: int, flush_interval: float) -> None:
+        self._max_rows = max_rows
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending: deque[dict[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._running = False
+        self.dropped = 0
+        self.rejected = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @property
+    def running(self) -> bool:
+        """Whether a flusher (:meth:`run`) is consuming the queue."""
+        return self._running
+
+    def _append(self, row: dict[str, Any]) -> bool:
+        """Queue *row*; returns False, without queueing it, when the queue is full."""
+        if len(self._pending) >= self._max_rows:
+            return False
+        self._pending.append(row)
+        if len(self._pending) >= self._batch_size:
+            self._wakeup.set()
+        return True
+
+    async def run(self, session_factory: SessionFactory) -> None:
+        """Flush batches until cancelled, then flush whatever is left."""
+        self._running = True
+        try:
+            while True:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+                self._wakeup.clear()
+                try:
+                    async with session_factory() as session:
+                        await self.flush(session)
+                except Exception as exc:
+                    logger.error(f"{self.name}_flush_failed", error=str(exc)[:200], pending=len(self._pending))
+        finally:
+            self._running = False
+            try:
+                async with session_factory() as session:
+                    await self.flush(session)
+            except Exception as exc:
+                logger.error(f"{self.name}_final_flush_failed", error=str(exc)[:200], pending=len(self._pending))
+
+    async def flush(self, session: AsyncSession) -> int:
+        """Write all queued rows in batches; returns the number written.
+
+        Raises the error of a transient failure after requeueing the rows
+        not yet written.
+        """
+        async with self._lock:
+            self._before_flush()
+            written = 0
+            while self._pending:
+                batch = [self._pending.popleft() for _ in range(min(self._batch_size, len(self._pending)))]
+                written += await self._write_isolating(session, batch)
+            if written:
+                logger.debug(f"{self.name}_flushed", count=written)
+            return written
+
+    async def _write_isolating(self, session: AsyncSession, batch: list[dict[str, Any]]) -> int:
+        """Write *batch*, bisecting failed chunks down to the rows that cannot be written."""
+        written = 0
+        chunks = [batch]
+        while chunks:
+            chunk = chunks.pop()
+            try:
+                written += await self._write(session, chunk)
+            except Exception as exc:
+                await session.rollback()
+                if is_transient_error(exc):
+                    # Everything not committed yet goes back, in order
+                    self._requeue([row for part in (chunk, *reversed(chunks)) for row in part])
+                    raise
+                if len(chunk) == 1:
+                    self._reject(chunk[0], exc)
+                    continue
+                middle = len(chunk) // 2
+                chunks += [chunk[middle:], chunk[:middle]]
+        return written
+
+    @abstractmethod
+    async def _write(self, session: AsyncSession, batch: list[dict[str, Any]]) -> int:
+        """Write and commit *batch*; returns the number of rows written."""
+
+    def _before_flush(self) -> None:
+        """Hook run at the start of every flush, under the flush lock."""
+        return
+
+    def _requeue(self, rows: list[dict[str, Any]]) -> None:
+        """Put *rows* back at the front of the queue, overflowing what no longer fits."""
+        room = max(self._max_rows - len(self._pending), 0)
+        for row in rows[room:]:
+            self._overflow(row)
+        self._pending.extendleft(reversed(rows[:room]))
+
+    def _overflow(self, row: dict[str, Any]) -> bool:
+        """Handle a row that does not fit in the queue; the default drops it."""
+        self.dropped += 1
+        if self.dropped == 1 or self.dropped % 1000 == 0:
+            logger.warning(f"{self.name}_rows_dropped", dropped=self.dropped, max_rows=self._max_rows)
+        return False
+
+    def _reject(self, row: dict[str, Any], exc: Exception) -> None:
+        """Drop a row that failed on its own with a non-transient error."""
+        self.rejected += 1
+        logger.error(f"{self.name}_row_rejected", error=str(exc)[:200], rejected=self.rejected)
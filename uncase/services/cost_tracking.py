@@ -2,19 +2,29 @@
 
 Records estimated spend on LLM API calls, allowing per-org and per-job
 cost visibility. Costs are derived from token counts and provider pricing.
+
+Cost-bearing usage events (:data:`COST_EVENT_TYPES`) are copied into the typed
+``cost_ledger`` table, and into the ``cost_rollups_daily`` totals, when the
+usage event is written (see :meth:`CostTrackingService.record_usage`). Reports
+aggregate those numeric columns in SQL.
 """
 
 from __future__ import annotations
 
+import uuid
+from collections import defaultdict
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
 import structlog
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select
 
-from uncase.db.models.usage import UsageEventModel
+from uncase.db.models.cost import CostLedgerModel, CostRollupModel
+from uncase.db.upsert import increment_counters
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = structlog.get_logger(__name__)
@@ -31,22 +41,124 @@ PROVIDER_PRICING: dict[str, float] = {
 }
 
 
+COST_EVENT_TYPES = ("gateway_call", "conversation_generated")
+
+
 def estimate_cost(provider: str, token_count: int) -> float:
     """Estimate cost in USD for a given provider and token count."""
     rate = PROVIDER_PRICING.get(provider.lower(), PROVIDER_PRICING["default"])
     return round(rate * (token_count / 1000), 6)
 
 
+def _as_int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def ledger_row(usage_row: dict[str, Any]) -> dict[str, Any] | None:
+    """Cost ledger values for a usage event row, or None if the event carries no cost.
+
+    Reads ``cost_usd``, ``provider``, ``model``, ``job_id`` and ``tokens`` (or
+    ``input_tokens``/``output_tokens``) from the event metadata; the job
+    defaults to the event's ``resource_id``.
+    """
+    if usage_row["event_type"] not in COST_EVENT_TYPES:
+        return None
+
+    meta: dict[str, Any] = dict(usage_row.get("metadata_") or {})
+    input_tokens = _as_int(meta.get("input_tokens"))
+    output_tokens = _as_int(meta.get("output_tokens"))
+    model = meta.get("model")
+    job_id = meta.get("job_id") or usage_row.get("resource_id")
+    return {
+        "id": uuid.uuid4().hex,
+        "usage_event_id": usage_row["id"],
+        "organization_id": usage_row.get("organization_id"),
+        "event_type": usage_row["event_type"],
+        "provider": str(meta.get("provider") or "unknown")[:50],
+        "model": str(model)[:200] if model else None,
+        "job_id": str(job_id)[:64] if job_id else None,
+        "cost_usd": _as_float(meta.get("cost_usd")),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": _as_int(meta.get("tokens")) or input_tokens + output_tokens,
+        "created_at": usage_row["created_at"],
+    }
+
+
 class CostTrackingService:
-    """Aggregate LLM API cost data from usage events.
+    """Record and aggregate LLM API cost data.
 
-    Costs are embedded in usage event metadata (``cost_usd``, ``provider``,
-    ``tokens``). This service queries and aggregates those events.
+    Costs arrive as usage event metadata (``cost_usd``, ``provider``,
+    ``tokens``); :meth:`record_usage` materialises them into the cost ledger
+    and daily rollups that the report methods aggregate.
     """
 
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
+    async def record_usage(self, usage_rows: Iterable[dict[str, Any]]) -> int:
+        """Add the cost-bearing events among *usage_rows* to the ledger and daily rollups.
+
+        Runs inside the caller's transaction (no commit).
+
+        Returns:
+            Number of ledger rows written.
+        """
+        rows = [row for row in map(ledger_row, usage_rows) if row is not None]
+        if not rows:
+            return 0
+
+        await self._session.execute(insert(CostLedgerModel), rows)
+
+        totals: dict[tuple[Any, ...], list[float]] = defaultdict(lambda: [0.0, 0, 0, 0, 0])
+        for row in rows:
+            created_at: datetime = row["created_at"]
+            day = (created_at.astimezone(UTC) if created_at.tzinfo else created_at).date()
+            entry = totals[(day, row["organization_id"] or "", row["provider"], row["event_type"])]
+            entry[0] += row["cost_usd"]
+            entry[1] += row["input_tokens"]
+            entry[2] += row["output_tokens"]
+            entry[3] += row["total_tokens"]
+            entry[4] += 1
+
+        await increment_counters(
+            self._session,
+            CostRollupModel,
+            [
+                {
+                    "day": day,
+                    "organization_id": organization_id,
+                    "provider": provider,
+                    "event_type": event_type,
+                    "cost_usd": cost,
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                    "total_tokens": total_tokens,
+                    "event_count": event_count,
+                }
+                for (day, organization_id, provider, event_type), (
+                    cost,
+                    input_tokens,
+                    output_tokens,
+                    total_tokens,
+                    event_count,
+                ) in totals.items()
+            ],
+            keys=["day", "organization_id", "provider", "event_type"],
+            counters=["cost_usd", "input_tokens", "output_tokens", "total_tokens", "event_count"],
+        )
+        return len(rows)
+
     async def get_org_cost_summary(
         self,
         organization_id: str,
@@ -61,41 +173,42 @@ class CostTrackingService:
         """
         cutoff = datetime.now(UTC) - timedelta(days=period_days)
 
-        # Fetch all gateway/generation events with cost metadata
         stmt = (
-            select(UsageEventModel)
+            select(
+                CostLedgerModel.provider,
+                CostLedgerModel.event_type,
+                func.sum(CostLedgerModel.cost_usd).label("cost_usd"),
+                func.sum(CostLedgerModel.total_tokens).label("tokens"),
+                func.count().label("event_count"),
+            )
             .where(
-                UsageEventModel.organization_id == organization_id,
-                UsageEventModel.created_at >= cutoff,
-                UsageEventModel.event_type.in_(["gateway_call", "conversation_generated"]),
+                CostLedgerModel.organization_id == organization_id,
+                CostLedgerModel.created_at >= cutoff,
             )
-            .order_by(UsageEventModel.created_at.desc())
+            .group_by(CostLedgerModel.provider, CostLedgerModel.event_type)
         )
-        result = await self._session.execute(stmt)
-        events = result.scalars().all()
+        rows = (await self._session.execute(stmt)).all()
 
         total_cost = 0.0
         total_tokens = 0
+        event_count = 0
         cost_by_provider: dict[str, float] = {}
         cost_by_event_type: dict[str, float] = {}
 
-        for event in events:
-            meta: dict[str, Any] = dict(event.metadata_) if event.metadata_ else {}
-            cost = float(meta.get("cost_usd", 0.0))
-            tokens = int(meta.get("tokens", 0))
-            provider = str(meta.get("provider", "unknown"))
-
+        for row in rows:
+            cost = float(row.cost_usd or 0.0)
             total_cost += cost
-            total_tokens += tokens
-            cost_by_provider[provider] = cost_by_provider.get(provider, 0.0) + cost
-            cost_by_event_type[event.event_type] = cost_by_event_type.get(event.event_type, 0.0) + cost
+            total_tokens += int(row.tokens or 0)
+            event_count += int(row.event_count)
+            cost_by_provider[row.provider] = cost_by_provider.get(row.provider, 0.0) + cost
+            cost_by_event_type[row.event_type] = cost_by_event_type.get(row.event_type, 0.0) + cost
 
         return {
             "organization_id": organization_id,
             "period_days": period_days,
             "total_cost_usd": round(total_cost, 4),
             "total_tokens": total_tokens,
-            "event_count": len(events),
+            "event_count": event_count,
             "cost_by_provider": {k: round(v, 4) for k, v in cost_by_provider.items()},
             "cost_by_event_type": {k: round(v, 4) for k, v in cost_by_event_type.items()},
         }
@@ -103,27 +216,20 @@ class CostTrackingService:
     async def get_job_cost(self, job_id: str) -> dict[str, Any]:
         """Get total cost for a specific job.
 
-        Jobs record usage events with resource_id == job_id in metadata.
+        Jobs record usage events with resource_id == job_id (or ``job_id`` in metadata).
         """
-        stmt = select(UsageEventModel).where(
-            UsageEventModel.resource_id == job_id,
-            UsageEventModel.event_type.in_(["gateway_call", "conversation_generated"]),
-        )
-        result = await self._session.execute(stmt)
-        events = result.scalars().all()
-
-        total_cost = 0.0
-        total_tokens = 0
-        for event in events:
-            meta: dict[str, Any] = dict(event.metadata_) if event.metadata_ else {}
-            total_cost += float(meta.get("cost_usd", 0.0))
-            total_tokens += int(meta.get("tokens", 0))
+        stmt = select(
+            func.sum(CostLedgerModel.cost_usd).label("cost_usd"),
+            func.sum(CostLedgerModel.total_tokens).label("tokens"),
+            func.count().label("event_count"),
+        ).where(CostLedgerModel.job_id == job_id)
+        row = (await self._session.execute(stmt)).one()
 
         return {
             "job_id": job_id,
-            "total_cost_usd": round(total_cost, 4),
-            "total_tokens": total_tokens,
-            "event_count": len(events),
+            "total_cost_usd": round(float(row.cost_usd or 0.0), 4),
+            "total_tokens": int(row.tokens or 0),
+            "event_count": int(row.event_count),
         }
 
     async def get_daily_costs(
@@ -132,35 +238,36 @@ class CostTrackingService:
         organization_id: str | None = None,
         days: int = 30,
     ) -> list[dict[str, Any]]:
-        """Get daily cost breakdown.
+        """Get daily cost breakdown from the daily rollups (UTC days, including the first partial day).
 
-        Returns list of {date, cost_usd, tokens, events} dicts.
+        Returns list of {date, cost_usd, tokens, event_count} dicts.
         """
-        cutoff = datetime.now(UTC) - timedelta(days=days)
+        first_day = (datetime.now(UTC) - timedelta(days=days)).date()
 
         stmt = (
             select(
-                func.date(UsageEventModel.created_at).label("day"),
-                func.count().label("event_count"),
-            )
-            .where(
-                UsageEventModel.created_at >= cutoff,
-                UsageEventModel.event_type.in_(["gateway_call", "conversation_generated"]),
+                CostRollupModel.day,
+                func.sum(CostRollupModel.cost_usd).label("cost_usd"),
+                func.sum(CostRollupModel.total_tokens).label("tokens"),
+                func.sum(CostRollupModel.event_count).label("event_count"),
             )
-            .group_by(func.date(UsageEventModel.created_at))
-            .order_by(func.date(UsageEventModel.created_at))
+            .where(CostRollupModel.day >= first_day)
+            .group_by(CostRollupModel.day)
+            .order_by(CostRollupModel.day)
         )
 
         if organization_id is not None:
-            stmt = stmt.where(UsageEventModel.organization_id == organization_id)
+            stmt = stmt.where(CostRollupModel.organization_id == organization_id)
 
         result = await self._session.execute(stmt)
         rows = result.all()
 
         return [
             {
-                "date": str(row.day),
-                "event_count": row.event_count,
+                "date": row.day.isoformat(),
+                "cost_usd": round(float(row.cost_usd or 0.0), 4),
+                "tokens": int(row.tokens or 0),
+                "event_count": int(row.event_count),
             }
             for row in rows
         ]
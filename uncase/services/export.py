@@ -0,0 +1,395 @@
+"""Conversation export service — streams persisted conversations to JSONL, gzip or Parquet.
+
+Rows are read through a server-side cursor (``yield_per``) and encoded batch
+by batch, so memory stays constant regardless of how many conversations match
+the filters.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import zlib
+from typing import TYPE_CHECKING, Any
+
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy import func, select
+
+from uncase.db.models.conversation import ConversationModel
+from uncase.db.models.evaluation import EvaluationReportModel
+from uncase.exceptions import ExportDependencyError
+from uncase.log_config import get_logger
+from uncase.schemas.conversation import Conversation
+from uncase.schemas.export import ExportSummary
+from uncase.templates import get_template_registry, register_all_templates
+from uncase.templates.base import ToolCallMode
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+    from pathlib import Path
+
+    from sqlalchemy import Select
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from uncase.schemas.export import ExportRequest
+    from uncase.templates.base import BaseChatTemplate
+
+logger = get_logger(__name__)
+
+_COLUMNS = (
+    ConversationModel.conversation_id,
+    ConversationModel.seed_id,
+    ConversationModel.dominio,
+    ConversationModel.idioma,
+    ConversationModel.turnos,
+    ConversationModel.num_turnos,
+    ConversationModel.es_sintetica,
+    ConversationModel.metadata_json,
+)
+
+
+# ---------------------------------------------------------------------------
+# Encoders
+# ---------------------------------------------------------------------------
+
+
+class _Encoder:
+    """Incremental encoder turning record batches into byte chunks."""
+
+    def encode(self, records: list[dict[str, Any]]) -> bytes:
+        raise NotImplementedError
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class _JSONLEncoder(_Encoder):
+    def encode(self, records: list[dict[str, Any]]) -> bytes:
+        if not records:
+            return b""
+        lines = [json.dumps(r, ensure_ascii=False) for r in records]
+        lines.append("")
+        return "\n".join(lines).encode("utf-8")
+
+
+class _GzipJSONLEncoder(_JSONLEncoder):
+    def __init__(self) -> None:
+        # wbits=31 emits a gzip header/trailer, so the stream is a valid .gz file
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def encode(self, records: list[dict[str, Any]]) -> bytes:
+        return self._compressor.compress(super().encode(records))
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _DrainableSink:
+    """Minimal writable file object whose buffered bytes can be drained."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self) -> None:
+        return None
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _ParquetEncoder(_Encoder):
+    """Writes one Parquet row group per batch and drains it immediately."""
+
+    def __init__(self, *, rendered: bool) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ExportDependencyError() from exc
+
+        fields = [
+            ("conversation_id", pa.string()),
+            ("seed_id", pa.string()),
+            ("dominio", pa.string()),
+            ("idioma", pa.string()),
+            ("num_turnos", pa.int32()),
+        ]
+        if rendered:
+            fields += [("template", pa.string()), ("text", pa.string())]
+        else:
+            fields += [("es_sintetica", pa.bool_()), ("turnos", pa.string()), ("metadata", pa.string())]
+
+        self._pa = pa
+        self._schema = pa.schema(fields)
+        self._json_columns = () if rendered else ("turnos", "metadata")
+        self._sink = _DrainableSink()
+        self._writer = pq.ParquetWriter(self._sink, self._schema, compression="zstd")
+
+    def encode(self, records: list[dict[str, Any]]) -> bytes:
+        if not records:
+            return b""
+        if self._json_columns:
+            records = [
+                {k: json.dumps(v, ensure_ascii=False) if k in self._json_columns else v for k, v in r.items()}
+                for r in records
+            ]
+        table = self._pa.Table.from_pylist(records, schema=self._schema)
+        self._writer.write_table(table)
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+def check_export_dependencies(export_format: str) -> None:
+    """Raise ``ExportDependencyError`` if *export_format* needs a library that is not installed.
+
+    Streamed exports call this before responding: an encoder failing inside the
+    stream would only surface after the 200 headers were sent.
+    """
+    if export_format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise ExportDependencyError()
+
+
+def _make_encoder(export_format: str, *, rendered: bool) -> _Encoder:
+    if export_format == "jsonl":
+        return _JSONLEncoder()
+    if export_format == "jsonl.gz":
+        return _GzipJSONLEncoder()
+    return _ParquetEncoder(rendered=rendered)
+
+
+# ---------------------------------------------------------------------------
+# Service
+# ---------------------------------------------------------------------------
+
+
+class ExportService:
+    """Service for streaming conversation exports out of the database.
+
+    Usage::
+
+        service = ExportService(session)
+        async for chunk in service.stream(request, organization_id=org_id):
+            sink.write(chunk)
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self.exported = 0
+        self.skipped = 0
+
+    async def count(self, request: ExportRequest, *, organization_id: str | None = None) -> int:
+        """Return the number of conversations matching the export filters."""
+        subquery = self._build_query(request, organization_id=organization_id).subquery()
+        result = await self.session.execute(select(func.count()).select_from(subquery))
+        return int(result.scalar_one())
+
+    async def iter_conversations(
+        self, request: ExportRequest, *, organization_id: str | None = None
+    ) -> AsyncIterator[list[Conversation]]:
+        """Yield batches of matching conversations using a server-side cursor.
+
+        Rows that no longer validate against the ``Conversation`` schema are
+        skipped and counted in :attr:`skipped`.
+        """
+        query = self._build_query(request, organization_id=organization_id)
+        query = query.execution_options(yield_per=request.batch_size)
+        result = await self.session.stream(query)
+
+        async for partition in result.partitions(request.batch_size):
+            batch: list[Conversation] = []
+            for row in partition:
+                try:
+                    batch.append(
+                        Conversation(
+                            conversation_id=row.conversation_id,
+                            seed_id=row.seed_id or "",
+                            dominio=row.dominio,
+                            idioma=row.idioma,
+                            turnos=row.turnos,
+                            es_sintetica=row.es_sintetica,
+                            metadata={k: str(v) for k, v in (row.metadata_json or {}).items()},
+                        )
+                    )
+                except PydanticValidationError:
+                    self.skipped += 1
+                    logger.warning("export_row_skipped", conversation_id=row.conversation_id)
+            if batch:
+                yield batch
+
+    async def iter_records(
+        self, request: ExportRequest, *, organization_id: str | None = None
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield batches of export records, rendered through a template when requested."""
+        template = self._resolve_template(request.template_name)
+        context = (
+            template.compile(ToolCallMode(request.tool_call_mode), request.system_prompt)
+            if template is not None
+            else None
+        )
+
+        async for batch in self.iter_conversations(request, organization_id=organization_id):
+            if template is None:
+                records = [
+                    {
+                        "conversation_id": c.conversation_id,
+                        "seed_id": c.seed_id,
+                        "dominio": c.dominio,
+                        "idioma": c.idioma,
+                        "num_turnos": c.num_turnos,
+                        "es_sintetica": c.es_sintetica,
+                        "turnos": [t.model_dump(mode="json", exclude_none=True) for t in c.turnos],
+                        "metadata": c.metadata,
+                    }
+                    for c in batch
+                ]
+            else:
+                rendered = template.iter_render(batch, context=context)
+                records = [
+                    {
+                        "conversation_id": c.conversation_id,
+                        "seed_id": c.seed_id,
+                        "dominio": c.dominio,
+                        "idioma": c.idioma,
+                        "num_turnos": c.num_turnos,
+                        "template": template.name,
+                        "text": text,
+                    }
+                    for c, text in zip(batch, rendered, strict=True)
+                ]
+            self.exported += len(records)
+            yield records
+
+    async def stream(self, request: ExportRequest, *, organization_id: str | None = None) -> AsyncIterator[bytes]:
+        """Yield the encoded export as a sequence of byte chunks."""
+        encoder = _make_encoder(request.format, rendered=request.template_name is not None)
+
+        async for records in self.iter_records(request, organization_id=organization_id):
+            chunk = encoder.encode(records)
+            if chunk:
+                yield chunk
+
+        tail = encoder.finish()
+        if tail:
+            yield tail
+
+        logger.info(
+            "conversations_export_streamed",
+            format=request.format,
+            template=request.template_name,
+            exported=self.exported,
+            skipped=self.skipped,
+        )
+
+    async def export_to_file(
+        self,
+        request: ExportRequest,
+        path: Path,
+        *,
+        organization_id: str | None = None,
+        on_batch: Callable[[int], Awaitable[None]] | None = None,
+    ) -> ExportSummary:
+        """Write the export to *path* atomically.
+
+        Args:
+            request: Export filters and format options.
+            path: Destination file. Parent directories are created as needed.
+            organization_id: Optional owning organization scope.
+            on_batch: Optional callback invoked with the running exported count after each batch.
+
+        Returns:
+            Summary of the written export.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.partial")
+        bytes_written = 0
+        last_reported = 0
+
+        try:
+            with tmp_path.open("wb") as fh:
+                async for chunk in self.stream(request, organization_id=organization_id):
+                    fh.write(chunk)
+                    bytes_written += len(chunk)
+                    if on_batch is not None and self.exported != last_reported:
+                        last_reported = self.exported
+                        await on_batch(self.exported)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        logger.info("conversations_exported_to_file", path=str(path), exported=self.exported, bytes=bytes_written)
+        return ExportSummary(
+            path=str(path),
+            format=request.format,
+            exported=self.exported,
+            skipped=self.skipped,
+            bytes_written=bytes_written,
+        )
+
+    # -- Helpers --
+
+    @staticmethod
+    def _resolve_template(template_name: str | None) -> BaseChatTemplate | None:
+        if template_name is None:
+            return None
+        register_all_templates()
+        return get_template_registry().get(template_name)
+
+    @staticmethod
+    def _build_query(request: ExportRequest, *, organization_id: str | None = None) -> Select[Any]:
+        """Build the column-only SELECT for the export filters.
+
+        Only the columns needed for rendering are selected so rows are never
+        hydrated into ORM objects or kept in the session identity map.
+        """
+        query = select(*_COLUMNS)
+
+        if request.domain is not None:
+            query = query.where(ConversationModel.dominio == request.domain)
+        if request.seed_id is not None:
+            query = query.where(ConversationModel.seed_id == request.seed_id)
+        if request.status is not None:
+            query = query.where(ConversationModel.status == request.status)
+        if request.language is not None:
+            query = query.where(ConversationModel.idioma == request.language)
+        if request.min_rating is not None:
+            query = query.where(ConversationModel.rating >= request.min_rating)
+        if organization_id is not None:
+            query = query.where(ConversationModel.organization_id == organization_id)
+
+        if request.min_quality_score is not None or request.passed_only:
+            report = select(EvaluationReportModel.id).where(
+                EvaluationReportModel.conversation_id == ConversationModel.conversation_id
+            )
+            if request.min_quality_score is not None:
+                report = report.where(EvaluationReportModel.composite_score >= request.min_quality_score)
+            if request.passed_only:
+                report = report.where(EvaluationReportModel.passed.is_(True))
+            query = query.where(report.exists())
+
+        query = query.order_by(ConversationModel.created_at, ConversationModel.id)
+        if request.limit is not None:
+            query = query.limit(request.limit)
+        return query
@@ -0,0 +1,218 @@
+"""Job progress — coalesced progress writes and an in-process event channel.
+
+Pipeline and export jobs report progress for every seed, conversation and
+batch. Writing each report to the job row would mean one UPDATE + commit per
+report, so :class:`ProgressReporter` keeps the latest state in memory and
+writes it at most every ``interval`` seconds, and only when the stage changed
+or progress moved by at least ``min_delta``. The final state is always written
+on :meth:`ProgressReporter.aclose`.
+
+Every report is also published to :data:`job_events`, which feeds the
+``GET /api/v1/jobs/{id}/events`` SSE stream without touching the database.
+Subscribers keep only the latest event, so a slow client never queues up a
+backlog.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from uncase.services.jobs import JobService
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from contextlib import AbstractAsyncContextManager
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from uncase.config import UNCASESettings
+
+    SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """A progress snapshot of one job."""
+
+    job_id: str
+    stage: str | None
+    progress: float
+    message: str | None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable representation."""
+        return asdict(self)
+
+
+class _Subscription:
+    """Mailbox holding the latest event for one subscriber."""
+
+    def __init__(self) -> None:
+        self._latest: ProgressEvent | None = None
+        self._ready = asyncio.Event()
+
+    def push(self, event: ProgressEvent) -> None:
+        self._latest = event
+        self._ready.set()
+
+    async def next(self, timeout: float) -> ProgressEvent | None:
+        """Wait up to *timeout* seconds for an event newer than the last one returned."""
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        self._ready.clear()
+        event, self._latest = self._latest, None
+        return event
+
+
+class JobEventBroker:
+    """Fans job progress events out to in-process subscribers."""
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, set[_Subscription]] = {}
+
+    def publish(self, event: ProgressEvent) -> None:
+        """Deliver *event* to every subscriber of its job."""
+        for subscription in self._subscribers.get(event.job_id, ()):
+            subscription.push(event)
+
+    @contextlib.contextmanager
+    def subscribe(self, job_id: str) -> Iterator[_Subscription]:
+        """Subscribe to events of *job_id* for the duration of the ``with`` block."""
+        subscription = _Subscription()
+        self._subscribers.setdefault(job_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers.get(job_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[job_id]
+
+
+job_events = JobEventBroker()
+
+
+def shared_session(session: AsyncSession) -> SessionFactory:
+    """Session factory that always hands out *session* (without closing it)."""
+    return lambda: contextlib.nullcontext(session)
+
+
+class ProgressReporter:
+    """Coalesces progress reports of one job into throttled job row updates.
+
+    Use :meth:`report` from synchronous callbacks (it schedules the write in
+    the background) and :meth:`update` from async code that shares the
+    reporter's session (it writes inline, so the session is never used
+    concurrently). Call :meth:`aclose` when the job finishes.
+
+    Args:
+        job_id: Job whose row is updated.
+        session_factory: Opens the session used for each write.
+        interval: Minimum seconds between two writes.
+        min_delta: Minimum progress change that warrants a write within a stage.
+        broker: Event channel every report is published to.
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        session_factory: SessionFactory,
+        *,
+        interval: float = 1.0,
+        min_delta: float = 0.01,
+        broker: JobEventBroker = job_events,
+    ) -> None:
+        self._job_id = job_id
+        self._session_factory = session_factory
+        self._interval = interval
+        self._min_delta = min_delta
+        self._broker = broker
+        self._pending: ProgressEvent | None = None
+        self._written: ProgressEvent | None = None
+        self._last_write = float("-inf")
+        self._lock = asyncio.Lock()
+        self._scheduled: asyncio.Task[None] | None = None
+        self.writes = 0
+
+    @classmethod
+    def from_settings(cls, job_id: str, session_factory: SessionFactory, settings: UNCASESettings) -> ProgressReporter:
+        """Build a reporter with the configured interval and minimum delta."""
+        return cls(
+            job_id,
+            session_factory,
+            interval=settings.job_progress_interval_ms / 1000,
+            min_delta=settings.job_progress_min_delta,
+        )
+
+    def report(self, stage: str, progress: float, message: str) -> None:
+        """Record a report; the job row is written later if the change is significant."""
+        delay = self._record(stage, progress, message)
+        if delay is not None and self._scheduled is None:
+            self._scheduled = asyncio.ensure_future(self._write_after(delay))
+
+    async def update(self, stage: str, progress: float, message: str) -> None:
+        """Record a report and write it now if it is due."""
+        delay = self._record(stage, progress, message)
+        if delay == 0.0:
+            await self._write()
+
+    async def flush(self) -> None:
+        """Write the latest reported state if it has not been written yet."""
+        await self._write(force=True)
+
+    async def aclose(self, *, flush: bool = True) -> None:
+        """Cancel any scheduled write and, unless *flush* is False, write the final state."""
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._scheduled
+            self._scheduled = None
+        if flush:
+            await self.flush()
+
+    def _record(self, stage: str, progress: float, message: str) -> float | None:
+        """Store the report and publish it; return the delay until a write is due, or None."""
+        event = ProgressEvent(self._job_id, stage, min(max(progress, 0.0), 1.0), message)
+        self._pending = event
+        self._broker.publish(event)
+        if not self._significant(event):
+            return None
+        return max(0.0, self._last_write + self._interval - time.monotonic())
+
+    def _significant(self, event: ProgressEvent) -> bool:
+        written = self._written
+        if written is None or written.stage != event.stage:
+            return True
+        return abs(event.progress - written.progress) >= self._min_delta
+
+    async def _write_after(self, delay: float) -> None:
+        try:
+            await asyncio.sleep(delay)
+            await self._write()
+        finally:
+            self._scheduled = None
+
+    async def _write(self, *, force: bool = False) -> None:
+        async with self._lock:
+            event = self._pending
+            if event is None or event == self._written or not (force or self._significant(event)):
+                return
+            self._last_write = time.monotonic()
+            self._written = event
+            try:
+                async with self._session_factory() as session:
+                    await JobService(session).update_progress(
+                        self._job_id, progress=event.progress, current_stage=event.stage, status_message=event.message
+                    )
+                self.writes += 1
+            except Exception:
+                logger.debug("job_progress_write_failed", job_id=self._job_id, stage=event.stage)
@@ -0,0 +1,300 @@
+"""Durable job queue — leasing, heartbeats and retries on top of the ``jobs`` table.
+
+API nodes enqueue by creating ``pending`` job rows (:meth:`JobService.create_job`);
+``uncase worker`` processes claim them through :class:`JobQueue`:
+
+* **Claiming** picks the oldest claimable job. On PostgreSQL the candidate row
+  is selected with ``FOR UPDATE SKIP LOCKED`` so concurrent workers never
+  contend on the same row; on SQLite (no row locks) the claim is a conditional
+  ``UPDATE`` that only succeeds if the row is still claimable, so exactly one
+  worker wins.
+* **Leases**: a claimed job is ``running`` with ``lease_owner`` and
+  ``lease_expires_at``. Workers renew the lease with :meth:`JobQueue.heartbeat`;
+  if a worker dies, its lease lapses and another worker reclaims the job.
+* **Cancellation**: :meth:`JobService.cancel_job` moves the row to ``cancelled``,
+  so the owner's next heartbeat fails and it stops the job.
+* **Retries**: a failed attempt goes back to ``pending`` with exponential
+  backoff (``available_at``) until ``max_attempts`` is reached.
+
+Job types are executed by handlers registered with :func:`job_handler`.
+"""
+
+from __future__ import annotations
+
+import importlib
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+import structlog
+from sqlalchemy import and_, or_, select, update
+
+from uncase.db.models.job import JobModel
+from uncase.services.jobs import JobService
+
+if TYPE_CHECKING:
+    from sqlalchemy import ColumnElement
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from uncase.config import UNCASESettings
+    from uncase.services.job_progress import ProgressReporter
+
+logger = structlog.get_logger(__name__)
+
+# Modules whose import registers the built-in job handlers
+_HANDLER_MODULES = ("uncase.api.routers.exports", "uncase.api.routers.pipeline")
+
+# Candidates tried per claim before giving up for this poll (lost races on SQLite)
+_CLAIM_ATTEMPTS = 5
+
+
+@dataclass
+class JobContext:
+    """Everything a job handler needs to run one claimed job."""
+
+    job_id: str
+    job_type: str
+    config: dict[str, Any]
+    organization_id: str | None
+    attempt: int
+    session: AsyncSession
+    settings: UNCASESettings
+    reporter: ProgressReporter
+
+    async def progress(self, stage: str, progress: float, message: str) -> None:
+        """Report progress; writes to the job row are coalesced by :attr:`reporter`."""
+        await self.reporter.update(stage, progress, message)
+
+
+JobHandler = Callable[[JobContext], Coroutine[Any, Any, dict[str, Any] | None]]
+
+_handlers: dict[str, JobHandler] = {}
+
+
+def job_handler(job_type: str) -> Callable[[JobHandler], JobHandler]:
+    """Register the decorated coroutine as the handler for *job_type*.
+
+    The handler receives a :class:`JobContext` and returns the job result
+    (stored on the row) or None; raising marks the attempt as failed.
+    """
+
+    def _register(func: JobHandler) -> JobHandler:
+        _handlers[job_type] = func
+        return func
+
+    return _register
+
+
+def get_job_handler(job_type: str) -> JobHandler | None:
+    """Return the handler registered for *job_type*, if any."""
+    return _handlers.get(job_type)
+
+
+def load_job_handlers() -> list[str]:
+    """Import the modules that register the built-in handlers; return the registered job types."""
+    for module in _HANDLER_MODULES:
+        importlib.import_module(module)
+    return sorted(_handlers)
+
+
+def _now() -> datetime:
+    return datetime.now(UTC)
+
+
+def _claimable(now: datetime) -> ColumnElement[bool]:
+    """Pending jobs that are due, or running jobs whose lease lapsed with attempts left."""
+    return or_(
+        and_(
+            JobModel.status == "pending",
+            or_(JobModel.available_at.is_(None), JobModel.available_at <= now),
+        ),
+        and_(
+            JobModel.status == "running",
+            JobModel.lease_expires_at.is_not(None),
+            JobModel.lease_expires_at < now,
+            JobModel.attempts < JobModel.max_attempts,
+        ),
+    )
+
+
+class JobQueue:
+    """Claims, renews and settles jobs on behalf of a worker."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    @property
+    def _skip_locked(self) -> bool:
+        return self._session.get_bind().dialect.name == "postgresql"
+
+    async def claim(
+        self,
+        worker_id: str,
+        *,
+        lease_seconds: int,
+        job_types: list[str] | None = None,
+    ) -> JobModel | None:
+        """Lease the oldest claimable job to *worker_id*.
+
+        Args:
+            worker_id: Identifier of the claiming worker.
+            lease_seconds: Lease duration; renew it with :meth:`heartbeat`.
+            job_types: Only claim these job types (all types if None).
+
+        Returns:
+            The claimed job (status ``running``), or None if nothing is claimable.
+        """
+        for _ in range(_CLAIM_ATTEMPTS):
+            now = _now()
+            candidate = select(JobModel.id).where(_claimable(now)).order_by(JobModel.created_at).limit(1)
+            if job_types is not None:
+                candidate = candidate.where(JobModel.job_type.in_(job_types))
+            if self._skip_locked:
+                candidate = candidate.with_for_update(skip_locked=True)
+
+            job_id = (await self._session.execute(candidate)).scalar_one_or_none()
+            if job_id is None:
+                await self._session.commit()
+                return None
+
+            # Conditional on the row still being claimable: a no-op if another worker won the race
+            cursor = await self._session.execute(
+                update(JobModel)
+                .where(JobModel.id == job_id, _claimable(now))
+                .values(
+                    status="running",
+                    lease_owner=worker_id,
+                    lease_expires_at=now + timedelta(seconds=lease_seconds),
+                    heartbeat_at=now,
+                    started_at=now,
+                    available_at=None,
+                    attempts=JobModel.attempts + 1,
+                )
+            )
+            await self._session.commit()
+            if cursor.rowcount == 1:  # type: ignore[attr-defined]
+                job = await JobService(self._session).get_job(job_id)
+                await self._session.refresh(job)
+                logger.info("job_claimed", job_id=job_id, job_type=job.job_type, worker=worker_id, attempt=job.attempts)
+                return job
+
+        return None
+
+    async def heartbeat(self, job_id: str, worker_id: str, *, lease_seconds: int) -> bool:
+        """Extend the lease of a job owned by *worker_id*.
+
+        Returns:
+            False if the job was cancelled, finished or re-leased to another
+            worker; the caller must then stop working on it.
+        """
+        now = _now()
+        cursor = await self._session.execute(
+            update(JobModel)
+            .where(*self._owned(job_id, worker_id))
+            .values(lease_expires_at=now + timedelta(seconds=lease_seconds), heartbeat_at=now)
+        )
+        await self._session.commit()
+        return bool(cursor.rowcount == 1)  # type: ignore[attr-defined]
+
+    async def complete(self, job_id: str, worker_id: str, result: dict[str, Any] | None = None) -> bool:
+        """Mark a leased job completed; returns False if the lease was lost meanwhile."""
+        cursor = await self._session.execute(
+            update(JobModel)
+            .where(*self._owned(job_id, worker_id))
+            .values(
+                status="completed",
+                completed_at=_now(),
+                progress=1.0,
+                result=result,
+                error_message=None,
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+        )
+        await self._session.commit()
+        completed = bool(cursor.rowcount == 1)  # type: ignore[attr-defined]
+        if completed:
+            logger.info("job_completed", job_id=job_id, worker=worker_id)
+        return completed
+
+    async def fail(self, job_id: str, worker_id: str, error: str, *, retry_backoff_seconds: int) -> bool:
+        """Record a failed attempt; requeue with backoff if attempts remain.
+
+        The delay doubles with every attempt: ``retry_backoff_seconds * 2 ** (attempts - 1)``.
+
+        Returns:
+            True if the job was requeued for another attempt.
+        """
+        row = (
+            await self._session.execute(
+                select(JobModel.attempts, JobModel.max_attempts).where(*self._owned(job_id, worker_id))
+            )
+        ).first()
+        if row is None:
+            await self._session.commit()
+            return False
+
+        attempts, max_attempts = int(row.attempts), int(row.max_attempts)
+        released: dict[str, Any] = {"lease_owner": None, "lease_expires_at": None, "error_message": error}
+        retry = attempts < max_attempts
+        if retry:
+            delay = retry_backoff_seconds * 2 ** max(attempts - 1, 0)
+            values = {**released, "status": "pending", "available_at": _now() + timedelta(seconds=delay)}
+        else:
+            values = {**released, "status": "failed", "completed_at": _now()}
+
+        await self._session.execute(update(JobModel).where(*self._owned(job_id, worker_id)).values(**values))
+        await self._session.commit()
+
+        if retry:
+            logger.warning("job_attempt_failed", job_id=job_id, attempt=attempts, retry_in=delay, error=error)
+        else:
+            logger.error("job_failed", job_id=job_id, attempts=attempts, error=error)
+        return retry
+
+    async def release(self, job_id: str, worker_id: str) -> bool:
+        """Hand a job back to the queue without consuming an attempt (worker shutdown)."""
+        cursor = await self._session.execute(
+            update(JobModel)
+            .where(*self._owned(job_id, worker_id))
+            .values(
+                status="pending",
+                lease_owner=None,
+                lease_expires_at=None,
+                available_at=None,
+                attempts=JobModel.attempts - 1,
+            )
+        )
+        await self._session.commit()
+        return bool(cursor.rowcount == 1)  # type: ignore[attr-defined]
+
+    async def fail_exhausted(self) -> int:
+        """Fail running jobs whose lease lapsed on their last attempt.
+
+        Returns:
+            Number of jobs marked failed.
+        """
+        now = _now()
+        cursor = await self._session.execute(
+            update(JobModel)
+            .where(
+                JobModel.status == "running",
+                JobModel.lease_expires_at.is_not(None),
+                JobModel.lease_expires_at < now,
+                JobModel.attempts >= JobModel.max_attempts,
+            )
+            .values(
+                status="failed",
+                completed_at=now,
+                error_message="Worker lease expired on the final attempt",
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+        )
+        await self._session.commit()
+        return int(cursor.rowcount)  # type: ignore[attr-defined]
+
+    @staticmethod
+    def _owned(job_id: str, worker_id: str) -> tuple[ColumnElement[bool], ...]:
+        return JobModel.id == job_id, JobModel.lease_owner == worker_id, JobModel.status == "running"
@@ -0,0 +1,209 @@
+"""Job worker — claims queued jobs and runs them outside the API process.
+
+Started with ``uncase worker``. Each worker runs up to ``concurrency`` jobs at
+a time; every running job gets a heartbeat task that renews its lease and
+stops the job as soon as the lease is lost (job cancelled or reclaimed).
+Add capacity by starting more workers, on any host with database access.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import os
+import socket
+import uuid
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from uncase.services.job_progress import ProgressReporter
+from uncase.services.job_queue import JobContext, JobQueue, get_job_handler, load_job_handlers
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from uncase.config import UNCASESettings
+    from uncase.db.models.job import JobModel
+
+logger = structlog.get_logger(__name__)
+
+
+def default_worker_id() -> str:
+    """Return a worker identifier unique across hosts and processes."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class JobWorker:
+    """Polls the job queue and executes claimed jobs with their registered handlers.
+
+    Args:
+        session_factory: Factory for database sessions (one per job and per heartbeat).
+        settings: Application settings (lease, heartbeat, backoff and poll intervals).
+        worker_id: Lease owner identifier; generated if None.
+        concurrency: Maximum number of jobs run at once.
+        job_types: Only claim these job types; defaults to every registered handler.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        settings: UNCASESettings,
+        *,
+        worker_id: str | None = None,
+        concurrency: int = 1,
+        job_types: list[str] | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._settings = settings
+        self.worker_id = worker_id or default_worker_id()
+        self._concurrency = max(1, concurrency)
+        registered = load_job_handlers()
+        self._job_types = job_types or registered
+        self._running: dict[str, asyncio.Task[None]] = {}
+        self._stop = asyncio.Event()
+
+    @property
+    def running_jobs(self) -> list[str]:
+        """IDs of the jobs currently executing on this worker."""
+        return list(self._running)
+
+    def stop(self) -> None:
+        """Ask :meth:`run` to stop claiming and hand running jobs back to the queue."""
+        self._stop.set()
+
+    async def run(self) -> None:
+        """Claim and run jobs until :meth:`stop` is called."""
+        logger.info(
+            "job_worker_started", worker=self.worker_id, concurrency=self._concurrency, job_types=self._job_types
+        )
+        try:
+            while not self._stop.is_set():
+                started = await self.claim_available()
+                if started == 0:
+                    await self._reap()
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(self._stop.wait(), timeout=self._settings.job_poll_interval)
+        finally:
+            await self._shutdown()
+            logger.info("job_worker_stopped", worker=self.worker_id)
+
+    async def claim_available(self) -> int:
+        """Claim jobs until the worker is full or the queue is empty.
+
+        Returns:
+            Number of jobs started.
+        """
+        started = 0
+        while len(self._running) < self._concurrency and not self._stop.is_set():
+            async with self._session_factory() as session:
+                job = await JobQueue(session).claim(
+                    self.worker_id, lease_seconds=self._settings.job_lease_seconds, job_types=self._job_types
+                )
+            if job is None:
+                break
+            task = asyncio.create_task(self._execute(job), name=f"job-{job.id}")
+            self._running[job.id] = task
+            task.add_done_callback(functools.partial(self._forget, job.id))
+            started += 1
+        return started
+
+    def _forget(self, job_id: str, _task: asyncio.Task[None]) -> None:
+        self._running.pop(job_id, None)
+
+    async def wait_idle(self) -> None:
+        """Wait until every running job has finished."""
+        while self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+    async def _execute(self, job: JobModel) -> None:
+        handler = get_job_handler(job.job_type)
+        if handler is None:
+            await self._settle_failure(job.id, f"No handler registered for job type '{job.job_type}'")
+            return
+
+        reporter = ProgressReporter.from_settings(job.id, self._session_factory, self._settings)
+        async with self._session_factory() as session:
+            context = JobContext(
+                job_id=job.id,
+                job_type=job.job_type,
+                config=dict(job.config or {}),
+                organization_id=job.organization_id,
+                attempt=job.attempts,
+                session=session,
+                settings=self._settings,
+                reporter=reporter,
+            )
+            work = asyncio.create_task(handler(context))
+            heartbeat = asyncio.create_task(self._heartbeat(job.id, work))
+            try:
+                result = await work
+                await reporter.aclose()
+            except asyncio.CancelledError:
+                await reporter.aclose(flush=False)
+                if self._stop.is_set():
+                    await self._release(job.id)
+                else:
+                    logger.info("job_stopped_lease_lost", job_id=job.id, worker=self.worker_id)
+                return
+            except Exception as exc:
+                await reporter.aclose()
+                logger.exception("job_handler_failed", job_id=job.id, job_type=job.job_type)
+                await self._settle_failure(job.id, str(exc) or type(exc).__name__)
+                return
+            finally:
+                heartbeat.cancel()
+
+        async with self._session_factory() as session:
+            if not await JobQueue(session).complete(job.id, self.worker_id, result):
+                logger.warning("job_result_discarded_lease_lost", job_id=job.id, worker=self.worker_id)
+
+    async def _heartbeat(self, job_id: str, work: asyncio.Task[Any]) -> None:
+        """Renew the lease periodically; cancel *work* once the lease is lost."""
+        while True:
+            await asyncio.sleep(self._settings.job_heartbeat_interval)
+            try:
+                async with self._session_factory() as session:
+                    owned = await JobQueue(session).heartbeat(
+                        job_id, self.worker_id, lease_seconds=self._settings.job_lease_seconds
+                    )
+            except Exception as exc:
+                # Transient DB errors: keep working; the lease only lapses after job_lease_seconds
+                logger.warning("job_heartbeat_failed", job_id=job_id, error=str(exc))
+                continue
+            if not owned:
+                logger.info("job_lease_lost", job_id=job_id, worker=self.worker_id)
+                work.cancel()
+                return
+
+    async def _settle_failure(self, job_id: str, error: str) -> None:
+        async with self._session_factory() as session:
+            await JobQueue(session).fail(
+                job_id, self.worker_id, error, retry_backoff_seconds=self._settings.job_retry_backoff_seconds
+            )
+
+    async def _release(self, job_id: str) -> None:
+        try:
+            async with self._session_factory() as session:
+                await JobQueue(session).release(job_id, self.worker_id)
+            logger.info("job_released", job_id=job_id, worker=self.worker_id)
+        except Exception as exc:
+            # The lease still lapses, so another worker reclaims the job later
+            logger.warning("job_release_failed", job_id=job_id, error=str(exc))
+
+    async def _reap(self) -> None:
+        try:
+            async with self._session_factory() as session:
+                failed = await JobQueue(session).fail_exhausted()
+            if failed:
+                logger.warning("jobs_failed_lease_expired", count=failed)
+        except Exception as exc:
+            logger.warning("job_reap_failed", error=str(exc))
+
+    async def _shutdown(self) -> None:
+        """Cancel running jobs; each hands its job back to the queue for another worker."""
+        self._stop.set()
+        for task in list(self._running.values()):
+            task.cancel()
+        await self.wait_idle()
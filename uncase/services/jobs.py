@@ -22,7 +22,9 @@ class JobService:
     """Service for creating, querying, and managing background jobs.
 
     Jobs are persisted in PostgreSQL for durability. Long-running operations
-    are executed via ``asyncio.create_task`` with progress tracking.
+    are executed via ``asyncio.create_task`` with progress tracking, or, with
+    ``job_execution_mode="worker"``, claimed from the table by ``uncase worker``
+    processes (see :mod:`uncase.services.job_queue`).
     """
 
     def __init__(self, session: AsyncSession) -> None:
@@ -34,6 +36,7 @@ class JobService:
         job_type: str,
         config: dict[str, Any],
         organization_id: str | None = None,
+        running: bool = False,
     ) -> JobModel:
         """Create a new pending job.
 
@@ -41,6 +44,8 @@ class JobService:
             job_type: Job type (pipeline_run, generation, evaluation, training, import).
             config: Job configuration parameters.
             organization_id: Optional owning organization.
+            running: Create the job already running in the calling process, e.g.
+                for a synchronous request; workers never claim it.
 
         Returns:
             The created JobModel instance.
@@ -50,9 +55,12 @@ class JobService:
             job_type=job_type,
             config=config,
             organization_id=organization_id,
-            status="pending",
+            status="running" if running else "pending",
             progress=0.0,
         )
+        if running:
+            job.started_at = datetime.now(UTC)
+            job.attempts = 1
         self._session.add(job)
         await self._session.commit()
         await self._session.refresh(job)
@@ -133,19 +141,25 @@ class JobService:
         await self._session.execute(stmt)
         await self._session.commit()
 
-    async def mark_running(self, job_id: str) -> None:
-        """Mark a job as running."""
+    async def mark_running(self, job_id: str) -> bool:
+        """Mark a pending job as running.
+
+        Returns:
+            False if the job is no longer pending (claimed by an ``uncase
+            worker``, cancelled or finished); the caller must not run it.
+        """
         stmt = (
             update(JobModel)
-            .where(JobModel.id == job_id)
+            .where(JobModel.id == job_id, JobModel.status == "pending")
             .values(
                 status="running",
                 started_at=datetime.now(UTC),
                 attempts=JobModel.attempts + 1,
             )
         )
-        await self._session.execute(stmt)
+        cursor = await self._session.execute(stmt)
         await self._session.commit()
+        return bool(cursor.rowcount == 1)  # type: ignore[attr-defined]
 
     async def mark_completed(self, job_id: str, result: dict[str, Any] | None = None) -> None:
         """Mark a job as completed with optional result data."""
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
 import uuid
 from datetime import UTC, datetime
@@ -26,6 +27,7 @@ from uncase.schemas.organization import (
     OrganizationResponse,
     OrganizationUpdate,
 )
+from uncase.services.api_key_cache import get_last_used_recorder, get_verified_key_cache
 from uncase.utils.security import generate_api_key, parse_api_key, validate_scopes, verify_api_key
 
 if TYPE_CHECKING:
@@ -169,6 +171,7 @@ class OrganizationService:
         self.session.add(audit)
 
         await self.session.commit()
+        get_verified_key_cache().invalidate(key_id)
         logger.info("api_key_revoked", org_id=org_id, key_id=key_id)
 
     async def rotate_api_key(self, org_id: str, key_id: str, *, environment: str = "test") -> APIKeyCreatedResponse:
@@ -186,6 +189,7 @@ class OrganizationService:
             api_key_id=old_key.id,
         )
         self.session.add(audit_revoke)
+        get_verified_key_cache().invalidate(key_id)
 
         # Create new with same metadata
         new_key_data = APIKeyCreate(name=old_key.name, scopes=old_key.scopes)
@@ -199,6 +203,13 @@ class OrganizationService:
     async def verify_and_get_org(self, raw_key: str) -> OrganizationModel:
         """Verify an API key and return the associated organization.
 
+        The key row and its organization are loaded in a single query, so
+        revocation and expiry are always checked against the database. The
+        Argon2 check is skipped when the same raw key was verified against
+        the same hash within the cache TTL; otherwise it runs in a worker
+        thread. On warm hits ``last_used_at`` is buffered and written by the
+        periodic batch flush instead of on every request.
+
         Args:
             raw_key: The full API key from the request header.
 
@@ -215,32 +226,40 @@ class OrganizationService:
 
         key_id_value, _ = parsed
 
-        result = await self.session.execute(select(APIKeyModel).where(APIKeyModel.key_id == key_id_value))
-        key_model = result.scalar_one_or_none()
+        result = await self.session.execute(
+            select(APIKeyModel, OrganizationModel)
+            .outerjoin(OrganizationModel, OrganizationModel.id == APIKeyModel.organization_id)
+            .where(APIKeyModel.key_id == key_id_value)
+        )
+        row = result.one_or_none()
 
-        if key_model is None:
+        if row is None:
             raise AuthenticationError("API key not found")
+        key_model, org = row.tuple()
 
+        cache = get_verified_key_cache()
         if not key_model.is_active:
+            cache.invalidate(key_id_value)
             raise APIKeyRevokedError()
 
-        if key_model.expires_at is not None and key_model.expires_at < datetime.now(UTC):
+        now = datetime.now(UTC)
+        if key_model.expires_at is not None and key_model.expires_at < now:
             raise AuthenticationError("API key has expired")
 
-        if not verify_api_key(raw_key, key_model.key_hash):
-            raise AuthenticationError("Invalid API key")
+        if cache.is_verified(raw_key, key_id_value, key_model.key_hash):
+            get_last_used_recorder().touch(key_model.id, now)
+        else:
+            if not await asyncio.to_thread(verify_api_key, raw_key, key_model.key_hash):
+                raise AuthenticationError("Invalid API key")
+            cache.add(raw_key, key_id_value, key_model.key_hash)
+
+            # First use within the TTL is written immediately
+            key_model.last_used_at = now
+            await self.session.flush()
 
         # Store for scope checking without extra DB query
         self.last_verified_key = key_model
 
-        # Update last_used_at
-        key_model.last_used_at = datetime.now(UTC)
-        await self.session.flush()
-
-        result_org = await self.session.execute(
-            select(OrganizationModel).where(OrganizationModel.id == key_model.organization_id)
-        )
-        org = result_org.scalar_one_or_none()
         if org is None:
             raise OrganizationNotFoundError()
 
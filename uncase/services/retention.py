@@ -2,22 +2,36 @@
 
 Configurable per-organization retention periods. Resources older than
 the retention period are automatically purged via a scheduled task.
+
+Expired rows are deleted in bounded batches (select a page of ids, delete
+them, commit), so a purge never holds long locks or builds one huge
+transaction on a busy primary; an optional pause between batches leaves
+room for regular traffic.
 """
 
 from __future__ import annotations
 
+import asyncio
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
 import structlog
-from sqlalchemy import delete
+from sqlalchemy import delete, select
 
 from uncase.db.models.audit import AuditLogModel
 from uncase.db.models.job import JobModel
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sqlalchemy import ColumnElement
     from sqlalchemy.ext.asyncio import AsyncSession
 
+    from uncase.db.base import Base
+
+    # Called after every batch with (policy, rows deleted so far for that policy)
+    RetentionProgress = Callable[[str, int], None]
+
 logger = structlog.get_logger(__name__)
 
 # Default retention periods (days). Override per org in config.
@@ -35,24 +49,41 @@ class RetentionService:
     Usage:
         service = RetentionService(session)
         stats = await service.apply_policies()
+
+    Args:
+        session: Database session; committed after every batch.
+        overrides: Retention days per policy, overriding :data:`DEFAULT_RETENTION`.
+        batch_size: Rows deleted per statement and transaction.
+        pause_seconds: Sleep between two batches.
     """
 
     def __init__(
         self,
         session: AsyncSession,
         overrides: dict[str, int] | None = None,
+        *,
+        batch_size: int = 1000,
+        pause_seconds: float = 0.0,
     ) -> None:
         self._session = session
         self._retention = {**DEFAULT_RETENTION, **(overrides or {})}
+        self._batch_size = batch_size
+        self._pause_seconds = pause_seconds
+        self._progress: RetentionProgress | None = None
 
-    async def apply_policies(self) -> dict[str, Any]:
+    async def apply_policies(self, *, progress: RetentionProgress | None = None) -> dict[str, Any]:
         """Apply all retention policies and return deletion statistics.
 
+        Args:
+            progress: Called after every deleted batch with the policy name
+                and the number of rows deleted for it so far.
+
         Returns:
             Dict with keys for each policy and counts of deleted records.
         """
         stats: dict[str, Any] = {}
         now = datetime.now(UTC)
+        self._progress = progress
 
         # Audit logs
         audit_cutoff = now - timedelta(days=self._retention["audit_logs"])
@@ -84,20 +115,38 @@ class RetentionService:
 
     async def _delete_audit_logs(self, cutoff: datetime) -> int:
         """Delete audit log records older than cutoff."""
-        stmt = delete(AuditLogModel).where(AuditLogModel.created_at < cutoff)
-        cursor = await self._session.execute(stmt)
-        await self._session.commit()
-        return int(cursor.rowcount)  # type: ignore[attr-defined]
+        return await self._delete_in_batches("audit_logs", AuditLogModel, AuditLogModel.created_at < cutoff)
 
     async def _delete_jobs(self, status: str, cutoff: datetime) -> int:
         """Delete jobs with given status older than cutoff."""
-        stmt = delete(JobModel).where(
+        return await self._delete_in_batches(
+            f"{status}_jobs",
+            JobModel,
             JobModel.status == status,
             JobModel.completed_at < cutoff,
         )
-        cursor = await self._session.execute(stmt)
-        await self._session.commit()
-        return int(cursor.rowcount)  # type: ignore[attr-defined]
+
+    async def _delete_in_batches(self, policy: str, model: type[Base], *conditions: ColumnElement[bool]) -> int:
+        """Delete rows matching *conditions* ``batch_size`` at a time, committing each batch."""
+        pk = model.__table__.c.id
+        deleted = 0
+        while True:
+            ids = list((await self._session.execute(select(pk).where(*conditions).limit(self._batch_size))).scalars())
+            if not ids:
+                break
+
+            cursor = await self._session.execute(delete(model).where(pk.in_(ids)))
+            await self._session.commit()
+            deleted += int(cursor.rowcount)  # type: ignore[attr-defined]
+
+            logger.debug("retention_batch_deleted", policy=policy, batch=len(ids), deleted=deleted)
+            if self._progress is not None:
+                self._progress(policy, deleted)
+            if len(ids) < self._batch_size:
+                break
+            if self._pause_seconds > 0:
+                await asyncio.sleep(self._pause_seconds)
+        return deleted
 
     async def get_retention_config(self) -> dict[str, int]:
         """Return the current retention configuration."""
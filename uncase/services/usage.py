@@ -1,14 +1,21 @@
-"""Usage metering service layer."""
+"""Usage metering service layer.
+
+Every write also updates ``usage_rollups_hourly``, so summaries and timelines
+read hourly rollups for the whole hours of a period and only touch raw
+events for the partial hours at its edges.
+"""
 
 from __future__ import annotations
 
 import uuid
-from datetime import UTC, datetime
-from typing import TYPE_CHECKING
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import func, select, text
+from sqlalchemy import func, insert, select
 
-from uncase.db.models.usage import UsageEventModel
+from uncase.db.models.usage import UsageEventModel, UsageRollupModel
+from uncase.db.upsert import increment_counters
 from uncase.log_config import get_logger
 from uncase.schemas.usage import (
     UsageEventRecord,
@@ -18,12 +25,60 @@ from uncase.schemas.usage import (
     UsageTimelinePoint,
     UsageTimelineResponse,
 )
+from uncase.services.cost_tracking import CostTrackingService
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = get_logger(__name__)
 
+_GRANULARITIES = ("hour", "day", "week", "month")
+
+# (bucket_start, event_type) -> [total_count, event_count]
+_HourlyCounts = dict[tuple[datetime, str], list[int]]
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything is stored in UTC
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return _as_utc(value).replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floor = _floor_hour(value)
+    return floor if floor == _as_utc(value) else floor + timedelta(hours=1)
+
+
+def _truncate(bucket: datetime, granularity: str) -> datetime:
+    """Truncate an hourly bucket like PostgreSQL ``date_trunc`` (weeks start on Monday)."""
+    if granularity == "hour":
+        return bucket
+    day = bucket.replace(hour=0)
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def event_row(event: UsageEventRecord, *, created_at: datetime | None = None) -> dict[str, Any]:
+    """Column values of the ``usage_events`` row for *event*, keyed by model attribute."""
+    return {
+        "id": uuid.uuid4().hex,
+        "organization_id": event.organization_id,
+        "event_type": event.event_type,
+        "resource_id": event.resource_id,
+        "count": event.count,
+        "metadata_": event.metadata,
+        "ip_address": event.ip_address,
+        "created_at": created_at or datetime.now(UTC),
+    }
+
 
 class UsageMeteringService:
     """Service for recording and querying usage events."""
@@ -37,16 +92,10 @@ class UsageMeteringService:
         This is the primary entry point for metering. Call this from
         routers or services after a successful operation.
         """
-        model = UsageEventModel(
-            id=uuid.uuid4().hex,
-            organization_id=event.organization_id,
-            event_type=event.event_type,
-            resource_id=event.resource_id,
-            count=event.count,
-            metadata_=event.metadata,
-            ip_address=event.ip_address,
-        )
+        row = event_row(event)
+        model = UsageEventModel(**row)
         self.session.add(model)
+        await self._add_derived([row])
         await self.session.commit()
         await self.session.refresh(model)
 
@@ -58,6 +107,20 @@ class UsageMeteringService:
         )
         return self._to_response(model)
 
+    async def record_batch(self, rows: list[dict[str, Any]]) -> int:
+        """Insert pre-built event rows (see :func:`event_row`) and their rollups in one transaction.
+
+        Returns:
+            Number of events written.
+        """
+        if not rows:
+            return 0
+        await self.session.execute(insert(UsageEventModel), rows)
+        await self._add_derived(rows)
+        await self.session.commit()
+        logger.debug("usage_events_batch_recorded", count=len(rows))
+        return len(rows)
+
     async def get_summary(
         self,
         *,
@@ -74,32 +137,15 @@ class UsageMeteringService:
             # Default to current month
             period_start = period_end.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
-        query = (
-            select(
-                UsageEventModel.event_type,
-                func.sum(UsageEventModel.count).label("total_count"),
-                func.count().label("event_count"),
-            )
-            .where(
-                UsageEventModel.created_at >= period_start,
-                UsageEventModel.created_at <= period_end,
-            )
-            .group_by(UsageEventModel.event_type)
-        )
-
-        if organization_id is not None:
-            query = query.where(UsageEventModel.organization_id == organization_id)
-
-        result = await self.session.execute(query)
-        rows = result.all()
+        counts = await self._hourly_counts(period_start, period_end, organization_id=organization_id)
+        by_type: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+        for (_, event_type), (total_count, event_count) in counts.items():
+            by_type[event_type][0] += total_count
+            by_type[event_type][1] += event_count
 
         items = [
-            UsageSummaryItem(
-                event_type=row.event_type,
-                total_count=int(row.total_count),
-                event_count=int(row.event_count),
-            )
-            for row in rows
+            UsageSummaryItem(event_type=event_type, total_count=total_count, event_count=event_count)
+            for event_type, (total_count, event_count) in sorted(by_type.items())
         ]
         total_events = sum(item.event_count for item in items)
 
@@ -128,41 +174,17 @@ class UsageMeteringService:
         if period_start is None:
             period_start = period_end.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
-        # Truncation expression based on granularity
-        trunc_map = {
-            "hour": "hour",
-            "day": "day",
-            "week": "week",
-            "month": "month",
-        }
-        trunc_part = trunc_map.get(granularity, "day")
+        trunc_part = granularity if granularity in _GRANULARITIES else "day"
 
-        query = (
-            select(
-                func.date_trunc(trunc_part, UsageEventModel.created_at).label("period"),
-                func.sum(UsageEventModel.count).label("total_count"),
-            )
-            .where(
-                UsageEventModel.event_type == event_type,
-                UsageEventModel.created_at >= period_start,
-                UsageEventModel.created_at <= period_end,
-            )
-            .group_by(text("1"))
-            .order_by(text("1"))
+        counts = await self._hourly_counts(
+            period_start, period_end, organization_id=organization_id, event_type=event_type
         )
-
-        if organization_id is not None:
-            query = query.where(UsageEventModel.organization_id == organization_id)
-
-        result = await self.session.execute(query)
-        rows = result.all()
+        by_period: dict[datetime, int] = defaultdict(int)
+        for (bucket, _), (total_count, _) in counts.items():
+            by_period[_truncate(bucket, trunc_part)] += total_count
 
         points = [
-            UsageTimelinePoint(
-                period=row.period.isoformat() if hasattr(row.period, "isoformat") else str(row.period),
-                count=int(row.total_count),
-            )
-            for row in rows
+            UsageTimelinePoint(period=period.isoformat(), count=count) for period, count in sorted(by_period.items())
         ]
 
         return UsageTimelineResponse(
@@ -202,6 +224,115 @@ class UsageMeteringService:
 
         return [self._to_response(e) for e in events], total
 
+    async def _hourly_counts(
+        self,
+        period_start: datetime,
+        period_end: datetime,
+        *,
+        organization_id: str | None,
+        event_type: str | None = None,
+    ) -> _HourlyCounts:
+        """Per-hour totals for ``period_start <= created_at <= period_end``.
+
+        Whole hours come from the rollup table; the partial hours at either
+        edge of the period are aggregated from raw events.
+        """
+        counts: _HourlyCounts = defaultdict(lambda: [0, 0])
+        first_whole, last_whole = _ceil_hour(period_start), _floor_hour(period_end)
+
+        if first_whole > last_whole:
+            # The whole period lies within a single hour
+            await self._add_raw_counts(
+                counts, _floor_hour(period_start), period_start, period_end, True, organization_id, event_type
+            )
+            return counts
+
+        if period_start < first_whole:
+            await self._add_raw_counts(
+                counts, _floor_hour(period_start), period_start, first_whole, False, organization_id, event_type
+            )
+        await self._add_raw_counts(counts, last_whole, last_whole, period_end, True, organization_id, event_type)
+
+        if first_whole < last_whole:
+            query = select(
+                UsageRollupModel.bucket_start,
+                UsageRollupModel.event_type,
+                UsageRollupModel.total_count,
+                UsageRollupModel.event_count,
+            ).where(UsageRollupModel.bucket_start >= first_whole, UsageRollupModel.bucket_start < last_whole)
+            if organization_id is not None:
+                query = query.where(UsageRollupModel.organization_id == organization_id)
+            if event_type is not None:
+                query = query.where(UsageRollupModel.event_type == event_type)
+            for row in (await self.session.execute(query)).all():
+                entry = counts[(_as_utc(row.bucket_start), row.event_type)]
+                entry[0] += int(row.total_count)
+                entry[1] += int(row.event_count)
+
+        return counts
+
+    async def _add_raw_counts(
+        self,
+        counts: _HourlyCounts,
+        bucket: datetime,
+        start: datetime,
+        end: datetime,
+        include_end: bool,
+        organization_id: str | None,
+        event_type: str | None,
+    ) -> None:
+        """Add raw event totals of ``[start, end)`` (or ``[start, end]``), all within hour *bucket*."""
+        query = (
+            select(
+                UsageEventModel.event_type,
+                func.sum(UsageEventModel.count).label("total_count"),
+                func.count().label("event_count"),
+            )
+            .where(
+                UsageEventModel.created_at >= start,
+                UsageEventModel.created_at <= end if include_end else UsageEventModel.created_at < end,
+            )
+            .group_by(UsageEventModel.event_type)
+        )
+        if organization_id is not None:
+            query = query.where(UsageEventModel.organization_id == organization_id)
+        if event_type is not None:
+            query = query.where(UsageEventModel.event_type == event_type)
+        for row in (await self.session.execute(query)).all():
+            entry = counts[(bucket, row.event_type)]
+            entry[0] += int(row.total_count)
+            entry[1] += int(row.event_count)
+
+    async def _add_derived(self, rows: list[dict[str, Any]]) -> None:
+        """Update the usage rollups and cost ledger for newly written event rows."""
+        await self._add_to_rollups(rows)
+        await CostTrackingService(self.session).record_usage(rows)
+
+    async def _add_to_rollups(self, rows: Iterable[dict[str, Any]]) -> None:
+        """Add event rows to their hourly rollups with one upsert statement."""
+        deltas: dict[tuple[datetime, str, str], list[int]] = defaultdict(lambda: [0, 0])
+        for row in rows:
+            key = (_floor_hour(row["created_at"]), row["organization_id"] or "", row["event_type"])
+            deltas[key][0] += row["count"]
+            deltas[key][1] += 1
+
+        await increment_counters(
+            self.session,
+            UsageRollupModel,
+            [
+                {
+                    "bucket_start": bucket,
+                    "organization_id": organization_id,
+                    "event_type": event_type,
+                    "total_count": total_count,
+                    "event_count": event_count,
+                }
+                for (bucket, organization_id, event_type), (total_count, event_count) in deltas.items()
+            ],
+            keys=["bucket_start", "organization_id", "event_type"],
+            counters=["total_count", "event_count"],
+        )
+
     @staticmethod
     def _to_response(model: UsageEventModel) -> UsageEventResponse:
         return UsageEventResponse(
@@ -0,0 +1,150 @@
+"""In-process usage event buffer — takes metering writes off the request path.
+
+``meter()`` runs on nearly every API write. Recording each event inline costs
+an INSERT, a rollup upsert and a commit inside the user's request. While the
+API's flusher task is running, :class:`UsageBuffer` instead queues events in
+memory and writes them in batches, with one multi-row INSERT, one rollup
+upsert, their webhook dispatches and a single commit per batch. A batch is
+flushed once ``batch_size`` events are queued or every ``flush_interval``
+seconds, whichever comes first, and once more on shutdown.
+
+The queue is bounded. When it is full, new events are either dropped (and
+counted) or, with ``overflow="spill"``, appended to a JSON-lines file that
+the next flush replays. Events that cannot be written at all are isolated
+and rejected without holding back the rest (see
+:class:`~uncase.services.batching.BatchingSink`).
+
+Without a running flusher (CLI commands, scripts, tests), ``meter()`` keeps
+recording inline.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from uncase.log_config import get_logger
+from uncase.services.batching import BatchingSink
+from uncase.services.usage import UsageMeteringService, event_row
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from uncase.config import UNCASESettings
+    from uncase.schemas.usage import UsageEventRecord
+
+logger = get_logger(__name__)
+
+OverflowPolicy = Literal["drop", "spill"]
+
+
+class UsageBuffer(BatchingSink):
+    """Bounded in-memory queue of usage events, flushed to the database in batches.
+
+    Args:
+        max_events: Events held in memory before the overflow policy applies.
+        batch_size: Events written per INSERT; reaching it triggers a flush.
+        flush_interval: Maximum seconds an event waits in the buffer.
+        overflow: ``"drop"`` discards events while full; ``"spill"`` appends them to *spill_path*.
+        spill_path: JSON-lines file for spilled events.
+    """
+
+    name = "usage"
+
+    def __init__(
+        self,
+        *,
+        max_events: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 2.0,
+        overflow: OverflowPolicy = "drop",
+        spill_path: str | Path | None = None,
+    ) -> None:
+        if overflow == "spill" and spill_path is None:
+            msg = "spill_path is required when overflow='spill'"
+            raise ValueError(msg)
+        super().__init__(max_rows=max_events, batch_size=batch_size, flush_interval=flush_interval)
+        self._overflow_policy = overflow
+        self._spill_path = Path(spill_path) if spill_path is not None else None
+        self.spilled = 0
+
+    @classmethod
+    def from_settings(cls, settings: UNCASESettings) -> UsageBuffer:
+        """Build a buffer with the configured limits and overflow policy."""
+        return cls(
+            max_events=settings.usage_buffer_max_events,
+            batch_size=settings.usage_flush_batch_size,
+            flush_interval=settings.usage_flush_interval,
+            overflow=settings.usage_buffer_overflow,
+            spill_path=settings.usage_spill_path,
+        )
+
+    def enqueue(self, event: UsageEventRecord) -> bool:
+        """Queue *event* for the next flush; returns False if it was dropped."""
+        row = event_row(event)
+        return self._append(row) or self._overflow(row)
+
+    async def _write(self, session: AsyncSession, batch: list[dict[str, Any]]) -> int:
+        from uncase.services.webhook import WebhookService
+
+        webhooks = WebhookService(session)
+        for row in batch:
+            await webhooks.dispatch_event(
+                row["event_type"],
+                organization_id=row["organization_id"],
+                resource_id=row["resource_id"],
+                data=row["metadata_"],
+            )
+        # Commits the deliveries together with the events
+        return await UsageMeteringService(session).record_batch(batch)
+
+    def _overflow(self, row: dict[str, Any]) -> bool:
+        if self._overflow_policy == "spill" and self._spill_path is not None:
+            try:
+                self._spill_path.parent.mkdir(parents=True, exist_ok=True)
+                with self._spill_path.open("a", encoding="utf-8") as fh:
+                    fh.write(json.dumps({**row, "created_at": row["created_at"].isoformat()}, default=str) + "\n")
+                self.spilled += 1
+                return True
+            except OSError:
+                logger.warning("usage_spill_failed", path=str(self._spill_path))
+        return super()._overflow(row)
+
+    def _before_flush(self) -> None:
+        """Move spilled events back into the queue while there is room."""
+        path = self._spill_path
+        if path is None or not path.exists() or len(self._pending) >= self._max_rows:
+            return
+
+        replaying = path.with_name(path.name + ".replay")
+        os.replace(path, replaying)
+        with replaying.open(encoding="utf-8") as fh:
+            lines = fh.readlines()
+        replaying.unlink()
+
+        for line in lines:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            row["created_at"] = datetime.fromisoformat(row["created_at"]).astimezone(UTC)
+            if len(self._pending) < self._max_rows:
+                self._pending.append(row)
+            else:
+                self._overflow(row)
+        logger.info("usage_spill_replayed", count=len(lines))
+
+
+_usage_buffer: UsageBuffer | None = None
+
+
+def get_usage_buffer() -> UsageBuffer:
+    """Return the process-wide usage buffer, configured from settings."""
+    global _usage_buffer
+    if _usage_buffer is None:
+        from uncase.config import UNCASESettings
+
+        _usage_buffer = UsageBuffer.from_settings(UNCASESettings())
+    return _usage_buffer
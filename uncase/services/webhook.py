@@ -2,15 +2,12 @@
 
 from __future__ import annotations
 
-import hashlib
-import hmac
-import json
 import secrets
 import uuid
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, event, func, insert, select
 
 from uncase.db.models.webhook import WebhookDeliveryModel, WebhookSubscriptionModel
 from uncase.log_config import get_logger
@@ -22,15 +19,20 @@ from uncase.schemas.webhook import (
     WebhookSubscriptionResponse,
     WebhookSubscriptionUpdate,
 )
+from uncase.services.webhook_delivery import (
+    WebhookDeliveryEngine,
+    notify_deliveries_pending,
+    schedule_retry,
+    sign_payload,
+)
+from uncase.services.webhook_index import get_subscription_index
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import Session
 
 logger = get_logger(__name__)
 
-MAX_DELIVERY_ATTEMPTS = 5
-RETRY_BASE_SECONDS = 300  # 5 minutes, exponential backoff
-
 
 class WebhookService:
     """Manage webhook subscriptions and event deliveries."""
@@ -56,6 +58,7 @@ class WebhookService:
         )
         self.session.add(model)
         await self.session.commit()
+        get_subscription_index().invalidate(organization_id)
         await self.session.refresh(model)
 
         logger.info(
@@ -112,6 +115,7 @@ class WebhookService:
             setattr(model, field, value)
         model.updated_at = datetime.now(UTC)
         await self.session.commit()
+        get_subscription_index().invalidate(organization_id)
         await self.session.refresh(model)
         logger.info("webhook_subscription_updated", subscription_id=subscription_id)
         return self._to_response(model)
@@ -121,6 +125,7 @@ class WebhookService:
         model = await self._get_or_raise(subscription_id, organization_id)
         await self.session.delete(model)
         await self.session.commit()
+        get_subscription_index().invalidate(organization_id)
         logger.info("webhook_subscription_deleted", subscription_id=subscription_id)
 
     # -- Event Dispatch (fire-and-forget) --
@@ -134,21 +139,20 @@ class WebhookService:
         resource_type: str | None = None,
         data: dict[str, object] | None = None,
     ) -> int:
-        """Dispatch an event to matching subscriptions. Returns count of deliveries created."""
+        """Dispatch an event to matching subscriptions. Returns count of deliveries created.
+
+        Matching subscriptions come from the process-local subscription index,
+        so an event without subscribers costs no query; the delivery rows of
+        all matches are inserted in one statement.
+        """
         if organization_id is None:
             return 0
 
+        index = get_subscription_index()
         try:
-            result = await self.session.execute(
-                select(WebhookSubscriptionModel).where(
-                    and_(
-                        WebhookSubscriptionModel.organization_id == organization_id,
-                        WebhookSubscriptionModel.is_active.is_(True),
-                    )
-                )
-            )
-            subscriptions = result.scalars().all()
-            matching = [s for s in subscriptions if event_type in (s.events or [])]
+            matching = index.lookup(organization_id, event_type)
+            if matching is None:
+                matching = await self._load_subscription_index(organization_id, event_type)
 
             if not matching:
                 return 0
@@ -163,17 +167,20 @@ class WebhookService:
                 data=data or {},
             )
 
-            for sub in matching:
-                self.session.add(
-                    WebhookDeliveryModel(
-                        id=uuid.uuid4().hex,
-                        subscription_id=sub.id,
-                        event_type=event_type,
-                        payload=payload.model_dump(),
-                    )
-                )
-
-            await self.session.flush()
+            body = payload.model_dump()
+            await self.session.execute(
+                insert(WebhookDeliveryModel),
+                [
+                    {
+                        "id": uuid.uuid4().hex,
+                        "subscription_id": subscription_id,
+                        "event_type": event_type,
+                        "payload": body,
+                    }
+                    for subscription_id in matching
+                ],
+            )
+            self._wake_engine_on_commit()
             logger.info(
                 "webhook_event_dispatched",
                 event_type=event_type,
@@ -181,6 +188,8 @@ class WebhookService:
             )
             return len(matching)
         except Exception:
+            # The index may be stale (e.g. a subscription deleted through another replica)
+            index.invalidate(organization_id)
             logger.error(
                 "webhook_dispatch_failed",
                 event_type=event_type,
@@ -193,79 +202,22 @@ class WebhookService:
 
     # -- Delivery execution --
 
-    async def execute_pending_deliveries(self, batch_size: int = 100) -> int:
-        """Process pending deliveries. Called by background scheduler."""
-        import httpx
-
-        now = datetime.now(UTC)
-        result = await self.session.execute(
-            select(WebhookDeliveryModel)
-            .where(
-                and_(
-                    WebhookDeliveryModel.status == "pending",
-                    or_(
-                        WebhookDeliveryModel.next_retry_at.is_(None),
-                        WebhookDeliveryModel.next_retry_at <= now,
-                    ),
-                    WebhookDeliveryModel.attempts < MAX_DELIVERY_ATTEMPTS,
-                )
-            )
-            .order_by(WebhookDeliveryModel.created_at.asc())
-            .limit(batch_size)
-        )
-        deliveries = result.scalars().all()
-        processed = 0
-
-        for delivery in deliveries:
-            sub = await self.session.get(WebhookSubscriptionModel, delivery.subscription_id)
-            if sub is None:
-                delivery.status = "failed"
-                delivery.error_message = "Subscription deleted"
-                processed += 1
-                continue
-
-            delivery.attempts += 1
-            signature = self._sign_payload(delivery.payload, sub.secret)
-
-            try:
-                async with httpx.AsyncClient(timeout=10.0) as client:
-                    resp = await client.post(
-                        sub.url,
-                        json=delivery.payload,
-                        headers={
-                            "Content-Type": "application/json",
-                            "X-Webhook-Signature": f"sha256={signature}",
-                            "X-Webhook-ID": delivery.id,
-                            "X-Webhook-Event": delivery.event_type,
-                        },
-                    )
-                delivery.http_status_code = resp.status_code
-
-                if 200 <= resp.status_code < 300:
-                    delivery.status = "delivered"
-                    delivery.delivered_at = datetime.now(UTC)
-                    sub.last_triggered_at = datetime.now(UTC)
-                else:
-                    delivery.error_message = f"HTTP {resp.status_code}"
-                    self._schedule_retry(delivery)
-            except httpx.TimeoutException:
-                delivery.error_message = "Request timeout"
-                self._schedule_retry(delivery)
-            except Exception as exc:
-                delivery.error_message = str(exc)[:500]
-                self._schedule_retry(delivery)
-                logger.error(
-                    "webhook_delivery_error",
-                    delivery_id=delivery.id,
-                    error=str(exc)[:200],
-                )
+    async def execute_pending_deliveries(
+        self, batch_size: int = 100, *, engine: WebhookDeliveryEngine | None = None
+    ) -> int:
+        """Claim and send one batch of due deliveries. Returns the number processed.
 
-            processed += 1
+        The background scheduler passes its long-lived engine; without one, a
+        temporary engine (and HTTP client) is used for this call.
+        """
+        if engine is not None:
+            return await engine.deliver_pending(self.session, batch_size=batch_size)
 
-        await self.session.commit()
-        if processed:
-            logger.info("webhook_deliveries_processed", count=processed)
-        return processed
+        engine = WebhookDeliveryEngine()
+        try:
+            return await engine.deliver_pending(self.session, batch_size=batch_size)
+        finally:
+            await engine.aclose()
 
     # -- Delivery history --
 
@@ -302,6 +254,35 @@ class WebhookService:
 
     # -- Helpers --
 
+    async def _load_subscription_index(self, organization_id: str, event_type: str) -> tuple[str, ...]:
+        """Load the organization's active subscriptions into the index; return those matching *event_type*."""
+        index = get_subscription_index()
+        token = index.begin_load(organization_id)
+        result = await self.session.execute(
+            select(WebhookSubscriptionModel.id, WebhookSubscriptionModel.events).where(
+                and_(
+                    WebhookSubscriptionModel.organization_id == organization_id,
+                    WebhookSubscriptionModel.is_active.is_(True),
+                )
+            )
+        )
+        rows = [(subscription_id, events or []) for subscription_id, events in result.all()]
+        index.store(organization_id, token, rows)
+        return tuple(subscription_id for subscription_id, events in rows if event_type in events)
+
+    def _wake_engine_on_commit(self) -> None:
+        """Wake the delivery engine once the dispatching transaction commits (rows are visible then)."""
+        info = self.session.sync_session.info
+        if info.get("webhook_wake_pending"):
+            return
+        info["webhook_wake_pending"] = True
+
+        def _after_commit(session: Session) -> None:
+            session.info.pop("webhook_wake_pending", None)
+            notify_deliveries_pending()
+
+        event.listen(self.session.sync_session, "after_commit", _after_commit, once=True)
+
     async def _get_or_raise(self, subscription_id: str, organization_id: str) -> WebhookSubscriptionModel:
         result = await self.session.execute(
             select(WebhookSubscriptionModel).where(
@@ -320,15 +301,10 @@ class WebhookService:
 
     @staticmethod
     def _sign_payload(payload: dict[str, object], secret: str) -> str:
-        body = json.dumps(payload, separators=(",", ":"), sort_keys=True)
-        return hmac.new(secret.encode(), body.encode(), hashlib.sha256).hexdigest()
+        return sign_payload(payload, secret)
 
     def _schedule_retry(self, delivery: WebhookDeliveryModel) -> None:
-        if delivery.attempts >= MAX_DELIVERY_ATTEMPTS:
-            delivery.status = "failed"
-        else:
-            backoff = RETRY_BASE_SECONDS * (2 ** (delivery.attempts - 1))
-            delivery.next_retry_at = datetime.now(UTC) + timedelta(seconds=backoff)
+        schedule_retry(delivery)
 
     @staticmethod
     def _to_response(model: WebhookSubscriptionModel) -> WebhookSubscriptionResponse:
@@ -0,0 +1,304 @@
+"""Webhook delivery engine — concurrent, pooled delivery of pending webhook events.
+
+One engine per process sends all pending deliveries:
+
+* **Claiming**: a batch of due deliveries is claimed by setting ``claimed_by``
+  and ``claimed_until`` (``FOR UPDATE SKIP LOCKED`` on PostgreSQL, a
+  conditional ``UPDATE`` elsewhere), so several API replicas never send the
+  same delivery. Claims left behind by a crashed replica expire, so a batch
+  is never larger than the engine can send before its claim runs out.
+* **Prefetch**: the subscriptions of the whole batch are loaded in one query.
+* **Sending**: one pooled HTTP client (HTTP/2 when ``h2`` is installed) shared
+  by all deliveries, with a global concurrency limit and a per-host limit, so
+  a slow subscriber endpoint only holds up its own deliveries.
+* **Wake-up**: :meth:`WebhookService.dispatch_event` wakes the engine once the
+  dispatching transaction commits, instead of waiting for the next poll.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import hmac
+import importlib.util
+import json
+import os
+import socket
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+import httpx
+from sqlalchemy import and_, or_, select, update
+
+from uncase.db.models.webhook import WebhookDeliveryModel, WebhookSubscriptionModel
+from uncase.log_config import get_logger
+
+if TYPE_CHECKING:
+    from sqlalchemy import ColumnElement
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from uncase.config import UNCASESettings
+
+logger = get_logger(__name__)
+
+MAX_DELIVERY_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 300  # 5 minutes, exponential backoff
+
+_active_engine: WebhookDeliveryEngine | None = None
+
+
+def notify_deliveries_pending() -> None:
+    """Wake the running delivery engine of this process, if any."""
+    if _active_engine is not None:
+        _active_engine.wake()
+
+
+def sign_payload(payload: dict[str, object], secret: str) -> str:
+    """HMAC-SHA256 of the canonical JSON payload, sent as ``X-Webhook-Signature``."""
+    body = json.dumps(payload, separators=(",", ":"), sort_keys=True)
+    return hmac.new(secret.encode(), body.encode(), hashlib.sha256).hexdigest()
+
+
+def _claimable(now: datetime) -> ColumnElement[bool]:
+    return and_(
+        WebhookDeliveryModel.status == "pending",
+        or_(WebhookDeliveryModel.next_retry_at.is_(None), WebhookDeliveryModel.next_retry_at <= now),
+        WebhookDeliveryModel.attempts < MAX_DELIVERY_ATTEMPTS,
+        or_(WebhookDeliveryModel.claimed_until.is_(None), WebhookDeliveryModel.claimed_until < now),
+    )
+
+
+class WebhookDeliveryEngine:
+    """Claims pending deliveries and sends them concurrently over a shared connection pool.
+
+    Args:
+        max_concurrency: Deliveries in flight at once.
+        per_host_limit: Deliveries in flight to a single host at once.
+        timeout: Per-request timeout in seconds, covering the whole request.
+        claim_seconds: How long claimed deliveries stay reserved for this engine.
+        engine_id: Claim owner identifier; generated if None.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 32,
+        per_host_limit: int = 4,
+        timeout: float = 10.0,
+        claim_seconds: int = 120,
+        engine_id: str | None = None,
+    ) -> None:
+        self.engine_id = engine_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._max_concurrency = max_concurrency
+        self._per_host_limit = per_host_limit
+        self._timeout = timeout
+        self._claim_seconds = claim_seconds
+        self._client: httpx.AsyncClient | None = None
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+        self._wakeup = asyncio.Event()
+
+    @classmethod
+    def from_settings(cls, settings: UNCASESettings) -> WebhookDeliveryEngine:
+        """Build an engine with the configured limits."""
+        return cls(
+            max_concurrency=settings.webhook_max_concurrency,
+            per_host_limit=settings.webhook_per_host_limit,
+            timeout=settings.webhook_timeout_seconds,
+            claim_seconds=settings.webhook_claim_seconds,
+        )
+
+    @property
+    def max_batch_size(self) -> int:
+        """Most deliveries one batch may claim without its claim expiring mid-batch.
+
+        In the worst case every delivery goes to one host, so they are sent
+        ``per_host_limit`` at a time, each taking up to ``timeout``.  One
+        timeout of the claim is kept for claiming and committing the batch.
+        """
+        rounds = max(1, int((self._claim_seconds - self._timeout) // self._timeout))
+        return rounds * min(self._per_host_limit, self._max_concurrency)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared HTTP client, created on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(
+                    max_connections=self._max_concurrency,
+                    max_keepalive_connections=self._max_concurrency,
+                ),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def wake(self) -> None:
+        """Make :meth:`run` deliver now instead of waiting for the next poll."""
+        self._wakeup.set()
+
+    async def run(self, session_factory: async_sessionmaker[AsyncSession], *, poll_interval: float) -> None:
+        """Deliver pending webhooks until cancelled, waking on dispatches or every *poll_interval*."""
+        global _active_engine
+        _active_engine = self
+        try:
+            while True:
+                try:
+                    async with session_factory() as session:
+                        await self.drain(session)
+                except Exception as exc:
+                    logger.error("webhook_delivery_round_failed", error=str(exc)[:200])
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=poll_interval)
+                self._wakeup.clear()
+        finally:
+            if _active_engine is self:
+                _active_engine = None
+            await self.aclose()
+
+    async def drain(self, session: AsyncSession, *, batch_size: int = 100) -> int:
+        """Deliver batches until no due deliveries are left; returns the number processed."""
+        batch_size = min(batch_size, self.max_batch_size)
+        total = 0
+        while True:
+            processed = await self.deliver_pending(session, batch_size=batch_size)
+            total += processed
+            if processed < batch_size:
+                return total
+
+    async def deliver_pending(self, session: AsyncSession, *, batch_size: int = 100) -> int:
+        """Claim up to *batch_size* due deliveries, send them concurrently and record the outcomes.
+
+        *batch_size* is capped at :attr:`max_batch_size`.
+
+        Returns:
+            Number of deliveries processed.
+        """
+        deliveries = await self._claim(session, min(batch_size, self.max_batch_size))
+        if not deliveries:
+            return 0
+
+        subscription_ids = {d.subscription_id for d in deliveries}
+        result = await session.execute(
+            select(WebhookSubscriptionModel).where(WebhookSubscriptionModel.id.in_(subscription_ids))
+        )
+        subscriptions = {s.id: s for s in result.scalars().all()}
+
+        global_limit = asyncio.Semaphore(self._max_concurrency)
+        await asyncio.gather(
+            *(self._deliver(d, subscriptions.get(d.subscription_id), global_limit) for d in deliveries)
+        )
+
+        for delivery in deliveries:
+            delivery.claimed_by = None
+            delivery.claimed_until = None
+        await session.commit()
+
+        logger.info("webhook_deliveries_processed", count=len(deliveries))
+        return len(deliveries)
+
+    async def _claim(self, session: AsyncSession, batch_size: int) -> list[WebhookDeliveryModel]:
+        now = datetime.now(UTC)
+        candidates = (
+            select(WebhookDeliveryModel.id)
+            .where(_claimable(now))
+            .order_by(WebhookDeliveryModel.created_at.asc())
+            .limit(batch_size)
+        )
+        if session.get_bind().dialect.name == "postgresql":
+            candidates = candidates.with_for_update(skip_locked=True)
+
+        ids = list((await session.execute(candidates)).scalars().all())
+        if not ids:
+            await session.commit()
+            return []
+
+        # Conditional on the rows still being claimable, so a concurrent engine's claim wins cleanly
+        await session.execute(
+            update(WebhookDeliveryModel)
+            .where(WebhookDeliveryModel.id.in_(ids), _claimable(now))
+            .values(claimed_by=self.engine_id, claimed_until=now + timedelta(seconds=self._claim_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+
+        result = await session.execute(
+            select(WebhookDeliveryModel)
+            .where(WebhookDeliveryModel.id.in_(ids), WebhookDeliveryModel.claimed_by == self.engine_id)
+            .order_by(WebhookDeliveryModel.created_at.asc())
+            .execution_options(populate_existing=True)
+        )
+        return list(result.scalars().all())
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self._per_host_limit)
+        return limit
+
+    async def _deliver(
+        self,
+        delivery: WebhookDeliveryModel,
+        sub: WebhookSubscriptionModel | None,
+        global_limit: asyncio.Semaphore,
+    ) -> None:
+        """Send one delivery and record the outcome on the (not yet committed) row."""
+        if sub is None:
+            delivery.status = "failed"
+            delivery.error_message = "Subscription deleted"
+            return
+
+        delivery.attempts += 1
+        signature = sign_payload(delivery.payload, sub.secret)
+
+        try:
+            async with global_limit, self._host_limit(sub.url), asyncio.timeout(self._timeout):
+                # httpx applies its timeout per connect/read/write; this bounds the whole request
+                resp = await self.client.post(
+                    sub.url,
+                    json=delivery.payload,
+                    headers={
+                        "Content-Type": "application/json",
+                        "X-Webhook-Signature": f"sha256={signature}",
+                        "X-Webhook-ID": delivery.id,
+                        "X-Webhook-Event": delivery.event_type,
+                    },
+                )
+            delivery.http_status_code = resp.status_code
+
+            if 200 <= resp.status_code < 300:
+                delivery.status = "delivered"
+                delivery.delivered_at = datetime.now(UTC)
+                sub.last_triggered_at = datetime.now(UTC)
+            else:
+                delivery.error_message = f"HTTP {resp.status_code}"
+                schedule_retry(delivery)
+        except (httpx.TimeoutException, TimeoutError):
+            delivery.error_message = "Request timeout"
+            schedule_retry(delivery)
+        except Exception as exc:
+            delivery.error_message = str(exc)[:500]
+            schedule_retry(delivery)
+            logger.error(
+                "webhook_delivery_error",
+                delivery_id=delivery.id,
+                error=str(exc)[:200],
+            )
+
+
+def schedule_retry(delivery: WebhookDeliveryModel) -> None:
+    """Back off exponentially, or mark the delivery failed once attempts are exhausted."""
+    if delivery.attempts >= MAX_DELIVERY_ATTEMPTS:
+        delivery.status = "failed"
+    else:
+        backoff = RETRY_BASE_SECONDS * (2 ** (delivery.attempts - 1))
+        delivery.next_retry_at = datetime.now(UTC) + timedelta(seconds=backoff)
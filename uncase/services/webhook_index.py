@@ -0,0 +1,111 @@
+"""Process-local index of active webhook subscriptions by organization and event type.
+
+:meth:`WebhookService.dispatch_event` runs on nearly every API write (via
+``meter()``), and almost always for an event nobody subscribed to. Rather than
+loading all of an organization's subscriptions on each call,
+:class:`SubscriptionIndex` keeps ``org → event_type → subscription ids`` in
+memory, so the common "no subscribers" case is a dictionary lookup with no
+query at all.
+
+Entries are dropped when a subscription of the organization is created,
+updated or deleted in this process, and expire after a short TTL so changes
+made through another replica are picked up too. A load that races with an
+invalidation is discarded instead of caching the stale result.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+_DEFAULT_TTL_SECONDS = 30.0
+_DEFAULT_MAX_ORGS = 10_000
+
+
+@dataclass(frozen=True)
+class _OrgSubscriptions:
+    by_event: dict[str, tuple[str, ...]]
+    loaded_at: float
+
+
+class SubscriptionIndex:
+    """TTL cache mapping ``(organization_id, event_type)`` to active subscription ids."""
+
+    def __init__(self, *, ttl_seconds: float = _DEFAULT_TTL_SECONDS, max_orgs: int = _DEFAULT_MAX_ORGS) -> None:
+        self._ttl = ttl_seconds
+        self._max_orgs = max_orgs
+        self._entries: dict[str, _OrgSubscriptions] = {}
+        self._generations: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, organization_id: str, event_type: str) -> tuple[str, ...] | None:
+        """Return the subscription ids for *event_type*, or None if the organization is not loaded."""
+        entry = self._entries.get(organization_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.loaded_at > self._ttl:
+            del self._entries[organization_id]
+            return None
+        return entry.by_event.get(event_type, ())
+
+    def begin_load(self, organization_id: str) -> int:
+        """Return a token to pass to :meth:`store` once the organization's subscriptions are loaded."""
+        return self._generations.get(organization_id, 0)
+
+    def store(self, organization_id: str, token: int, subscriptions: Iterable[tuple[str, Iterable[str]]]) -> None:
+        """Cache the ``(subscription_id, events)`` pairs of an organization.
+
+        Ignored if the organization was invalidated since :meth:`begin_load`
+        returned *token*.
+        """
+        if self._ttl <= 0 or self._generations.get(organization_id, 0) != token:
+            return
+
+        by_event: dict[str, list[str]] = {}
+        for subscription_id, events in subscriptions:
+            for event_type in events:
+                by_event.setdefault(event_type, []).append(subscription_id)
+
+        if len(self._entries) >= self._max_orgs and organization_id not in self._entries:
+            self._evict()
+        self._entries[organization_id] = _OrgSubscriptions(
+            {event_type: tuple(ids) for event_type, ids in by_event.items()}, time.monotonic()
+        )
+
+    def invalidate(self, organization_id: str) -> None:
+        """Forget the organization's subscriptions (after a subscription change)."""
+        self._entries.pop(organization_id, None)
+        self._generations[organization_id] = self._generations.get(organization_id, 0) + 1
+
+    def clear(self) -> None:
+        """Drop all cached organizations."""
+        self._entries.clear()
+        self._generations.clear()
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the oldest half if still full."""
+        cutoff = time.monotonic() - self._ttl
+        self._entries = {org: e for org, e in self._entries.items() if e.loaded_at >= cutoff}
+        if len(self._entries) >= self._max_orgs:
+            # Dicts keep insertion order, so the first entries are the oldest
+            keep = list(self._entries.items())[len(self._entries) // 2 :]
+            self._entries = dict(keep)
+
+
+_subscription_index: SubscriptionIndex | None = None
+
+
+def get_subscription_index() -> SubscriptionIndex:
+    """Return the process-wide subscription index, with the TTL from settings."""
+    global _subscription_index
+    if _subscription_index is None:
+        from uncase.config import UNCASESettings
+
+        _subscription_index = SubscriptionIndex(ttl_seconds=UNCASESettings().webhook_index_ttl)
+    return _subscription_index
@@ -0,0 +1,168 @@
+"""Prometheus metrics for the API and the SCSF hot paths.
+
+All metrics are defined here so the API layer and the core layers share one
+set of series. Latencies are real histograms (``histogram_quantile`` works in
+Grafana), and HTTP series are labelled by route template, e.g.
+``/api/v1/conversations/{conversation_id}``, so cardinality stays bounded.
+
+Multi-worker deployments
+------------------------
+With several uvicorn/gunicorn workers each process keeps its own counters.
+Set ``PROMETHEUS_MULTIPROC_DIR`` to an empty, writable directory **before**
+the workers start; every process then writes its samples to memory-mapped
+files there and ``/metrics`` aggregates all of them. Under gunicorn, also
+call :func:`mark_process_dead` from the ``child_exit`` server hook so live
+gauges of dead workers are discarded::
+
+    # gunicorn.conf.py
+    from uncase.telemetry import mark_process_dead
+
+    def child_exit(server, worker):
+        mark_process_dead(worker.pid)
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Label used for requests that matched no route (404s, scanners), so unknown
+# paths never create new series
+UNMATCHED_ROUTE = "<unmatched>"
+
+_HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+_LLM_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 90.0, 120.0, 300.0)
+_CPU_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+_STAGE_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0, 7200.0)
+
+# -- HTTP --
+
+HTTP_REQUESTS = Counter(
+    "uncase_http_requests",
+    "Total HTTP requests",
+    ["method", "route", "status"],
+)
+HTTP_ERRORS = Counter(
+    "uncase_http_errors",
+    "Total HTTP errors (4xx + 5xx)",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "uncase_http_request_duration_seconds",
+    "HTTP request duration in seconds, until the last body chunk is sent",
+    ["method", "route"],
+    buckets=_HTTP_BUCKETS,
+)
+ACTIVE_REQUESTS = Gauge(
+    "uncase_active_requests",
+    "Currently processing requests",
+    multiprocess_mode="livesum",
+)
+
+# -- LLM calls (Layer 3 generator) --
+
+LLM_REQUEST_DURATION = Histogram(
+    "uncase_llm_request_duration_seconds",
+    "Latency of a single LLM completion attempt",
+    ["model", "outcome"],
+    buckets=_LLM_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "uncase_llm_tokens",
+    "Tokens consumed by LLM completions",
+    ["model", "kind"],
+)
+LLM_RETRIES = Counter(
+    "uncase_llm_retries",
+    "LLM completion attempts that were retried",
+    ["model"],
+)
+
+# -- Layer 0 interview loop --
+
+LAYER0_SPECULATIVE_QUESTIONS = Counter(
+    "uncase_layer0_speculative_questions",
+    "Next questions generated concurrently with extraction, by outcome (hit, miss, discarded)",
+    ["outcome"],
+)
+
+# -- Sandboxes --
+
+SANDBOX_ACQUISITIONS = Counter(
+    "uncase_sandbox_acquisitions",
+    "Sandboxes handed to E2B worker runs, by outcome (booted, reused)",
+    ["outcome"],
+)
+
+# -- Evaluation, privacy and pipeline --
+
+EVALUATOR_METRIC_DURATION = Histogram(
+    "uncase_evaluator_metric_duration_seconds",
+    "Time to compute one quality metric for one conversation",
+    ["metric"],
+    buckets=_CPU_BUCKETS,
+)
+PII_SCAN_DURATION = Histogram(
+    "uncase_pii_scan_duration_seconds",
+    "Time to scan one text for PII",
+    ["engine"],
+    buckets=_CPU_BUCKETS,
+)
+PIPELINE_STAGE_DURATION = Histogram(
+    "uncase_pipeline_stage_duration_seconds",
+    "Duration of an end-to-end pipeline stage",
+    ["stage", "outcome"],
+    buckets=_STAGE_BUCKETS,
+)
+
+
+@contextmanager
+def observe_duration(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """Observe the wall time of the ``with`` block in *histogram*.
+
+    The observation is recorded even if the block raises.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Render all metrics in the Prometheus text format.
+
+    Aggregates across worker processes when ``PROMETHEUS_MULTIPROC_DIR`` is set.
+
+    Returns:
+        Tuple of (payload, content type).
+    """
+    if os.environ.get(_MULTIPROC_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Discard the live gauges of a worker that exited (multiprocess mode only)."""
+    if os.environ.get(_MULTIPROC_ENV):
+        multiprocess.mark_process_dead(pid)  # type: ignore[no-untyped-call]
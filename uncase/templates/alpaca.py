@@ -22,7 +22,10 @@ from uncase.templates import get_template_registry
 from uncase.templates.base import BaseChatTemplate, ToolCallMode
 
 if TYPE_CHECKING:
+    import io
+
     from uncase.schemas.conversation import Conversation
+    from uncase.templates.base import RenderContext
     from uncase.tools.schemas import ToolDefinition
 
 # Roles that map to assistant / response
@@ -86,8 +89,13 @@ class AlpacaTemplate(BaseChatTemplate):
         str
             The fully rendered Alpaca prompt string.
         """
-        parts: list[str] = []
-        system_prefix: str | None = system_prompt
+        return self._render_compiled(conversation, tool_call_mode, system_prompt, available_tools)
+
+    def render_into(self, buffer: io.StringIO, conversation: Conversation, context: RenderContext) -> None:
+        """Write a conversation in Alpaca format into *buffer*."""
+        write = buffer.write
+        sep = ""
+        system_prefix: str | None = context.system_prompt
 
         for turn in conversation.turnos:
             role = turn.rol
@@ -102,16 +110,16 @@ class AlpacaTemplate(BaseChatTemplate):
                 if system_prefix:
                     instruction_content = f"{system_prefix}\n\n{instruction_content}"
                     system_prefix = None
-                parts.append(f"### Instruction:\n{instruction_content}")
+                write(f"{sep}### Instruction:\n{instruction_content}")
 
             elif role in _ASSISTANT_ROLES:
-                parts.append(f"### Response:\n{turn.contenido}")
+                write(f"{sep}### Response:\n{turn.contenido}")
 
             else:
                 # Unknown roles rendered as instruction turns
-                parts.append(f"### Instruction:\n{turn.contenido}")
+                write(f"{sep}### Instruction:\n{turn.contenido}")
 
-        return "\n\n".join(parts)
+            sep = "\n\n"
 
 
 # -- Auto-register ----------------------------------------------------------
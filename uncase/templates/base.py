@@ -3,15 +3,25 @@
 Defines the contract that every chat template implementation must follow
 in order to render ``Conversation`` objects into prompt strings suitable
 for LLM fine-tuning.
+
+Rendering many conversations goes through a small engine: the options shared
+by a batch (tool-call mode, system prompt, tool definitions) are compiled once
+into a :class:`RenderContext` — including the rendered system/tool prefix —
+and each conversation is written into a reused ``io.StringIO`` buffer.
+:pymethod:`BaseChatTemplate.iter_render` streams the results one at a time.
 """
 
 from __future__ import annotations
 
+import io
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from enum import StrEnum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
     from uncase.schemas.conversation import Conversation
     from uncase.tools.schemas import ToolDefinition
 
@@ -23,6 +33,33 @@ class ToolCallMode(StrEnum):
     INLINE = "inline"
 
 
+@dataclass(frozen=True)
+class RenderContext:
+    """Rendering options compiled once and shared by every conversation in a batch.
+
+    Attributes
+    ----------
+    tool_call_mode:
+        How to handle tool calls.
+    system_prompt:
+        Optional system prompt supplied by the caller.
+    available_tools:
+        Tool definitions to include when *tool_call_mode* is ``INLINE``.
+    prefix:
+        Pre-rendered system/tool block written before each conversation's
+        turns, or ``None`` when the template has nothing to prepend.
+    extras:
+        Template-specific precompiled values (e.g. the effective system
+        prompt for templates that embed it inside the first turn).
+    """
+
+    tool_call_mode: ToolCallMode
+    system_prompt: str | None
+    available_tools: list[ToolDefinition] | None
+    prefix: str | None = None
+    extras: dict[str, Any] = field(default_factory=dict)
+
+
 class BaseChatTemplate(ABC):
     """Abstract base for all UNCASE chat templates.
 
@@ -100,6 +137,113 @@ class BaseChatTemplate(ABC):
 
     # -- Concrete methods ---------------------------------------------------
 
+    def compile(
+        self,
+        tool_call_mode: ToolCallMode = ToolCallMode.NONE,
+        system_prompt: str | None = None,
+        available_tools: list[ToolDefinition] | None = None,
+    ) -> RenderContext:
+        """Precompile the rendering options shared by a batch of conversations.
+
+        Templates override this to pre-render their system/tool prefix; the
+        default context carries the raw options only.
+
+        Parameters
+        ----------
+        tool_call_mode:
+            How to handle tool calls.
+        system_prompt:
+            Optional system prompt prepended to each conversation.
+        available_tools:
+            Tool definitions to include when *tool_call_mode* is ``INLINE``.
+
+        Returns
+        -------
+        RenderContext
+            Context to pass to :pymethod:`render_into`.
+        """
+        return RenderContext(
+            tool_call_mode=tool_call_mode,
+            system_prompt=system_prompt,
+            available_tools=available_tools,
+        )
+
+    def render_into(self, buffer: io.StringIO, conversation: Conversation, context: RenderContext) -> None:
+        """Write one rendered conversation into *buffer*.
+
+        The default implementation delegates to :pymethod:`render`, so
+        templates that only implement ``render`` keep working; built-in
+        templates override it to write directly with the precompiled prefix.
+
+        Parameters
+        ----------
+        buffer:
+            Output buffer the rendered text is appended to.
+        conversation:
+            The conversation to render.
+        context:
+            Options compiled by :pymethod:`compile`.
+        """
+        buffer.write(
+            self.render(
+                conversation=conversation,
+                tool_call_mode=context.tool_call_mode,
+                system_prompt=context.system_prompt,
+                available_tools=context.available_tools,
+            )
+        )
+
+    def iter_render(
+        self,
+        conversations: Iterable[Conversation],
+        tool_call_mode: ToolCallMode = ToolCallMode.NONE,
+        system_prompt: str | None = None,
+        available_tools: list[ToolDefinition] | None = None,
+        *,
+        context: RenderContext | None = None,
+    ) -> Iterator[str]:
+        """Lazily render conversations, compiling the shared prefix once.
+
+        Parameters
+        ----------
+        conversations:
+            Any iterable of conversations (consumed lazily).
+        tool_call_mode:
+            How to handle tool calls (applied to every conversation).
+        system_prompt:
+            Optional system prompt prepended to each conversation.
+        available_tools:
+            Tool definitions to include when *tool_call_mode* is ``INLINE``.
+        context:
+            A context from :pymethod:`compile` to reuse across calls (e.g. one
+            per export rather than one per page); overrides the options above.
+
+        Yields
+        ------
+        str
+            One rendered prompt string per conversation, in input order.
+        """
+        if context is None:
+            context = self.compile(tool_call_mode, system_prompt, available_tools)
+        buffer = io.StringIO()
+        for conversation in conversations:
+            buffer.seek(0)
+            buffer.truncate()
+            self.render_into(buffer, conversation, context)
+            yield buffer.getvalue()
+
+    def _render_compiled(
+        self,
+        conversation: Conversation,
+        tool_call_mode: ToolCallMode,
+        system_prompt: str | None,
+        available_tools: list[ToolDefinition] | None,
+    ) -> str:
+        """Render a single conversation through :pymethod:`render_into`."""
+        buffer = io.StringIO()
+        self.render_into(buffer, conversation, self.compile(tool_call_mode, system_prompt, available_tools))
+        return buffer.getvalue()
+
     def render_batch(
         self,
         conversations: list[Conversation],
@@ -125,12 +269,4 @@ class BaseChatTemplate(ABC):
         list[str]
             Rendered prompt strings, one per conversation.
         """
-        return [
-            self.render(
-                conversation=conv,
-                tool_call_mode=tool_call_mode,
-                system_prompt=system_prompt,
-                available_tools=available_tools,
-            )
-            for conv in conversations
-        ]
+        return list(self.iter_render(conversations, tool_call_mode, system_prompt, available_tools))
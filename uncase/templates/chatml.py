@@ -19,9 +19,11 @@ import json
 from typing import TYPE_CHECKING
 
 from uncase.templates import get_template_registry
-from uncase.templates.base import BaseChatTemplate, ToolCallMode
+from uncase.templates.base import BaseChatTemplate, RenderContext, ToolCallMode
 
 if TYPE_CHECKING:
+    import io
+
     from uncase.schemas.conversation import Conversation
     from uncase.tools.schemas import ToolCall, ToolDefinition, ToolResult
 
@@ -98,33 +100,54 @@ class ChatMLTemplate(BaseChatTemplate):
         str
             The fully rendered ChatML prompt string.
         """
-        parts: list[str] = []
+        return self._render_compiled(conversation, tool_call_mode, system_prompt, available_tools)
 
-        # -- System prompt --------------------------------------------------
+    def compile(
+        self,
+        tool_call_mode: ToolCallMode = ToolCallMode.NONE,
+        system_prompt: str | None = None,
+        available_tools: list[ToolDefinition] | None = None,
+    ) -> RenderContext:
+        """Pre-render the ChatML system block (including tool definitions) once."""
         effective_system = self._build_system_prompt(system_prompt, available_tools, tool_call_mode)
-        if effective_system:
-            parts.append(self._format_message("system", effective_system))
+        return RenderContext(
+            tool_call_mode=tool_call_mode,
+            system_prompt=system_prompt,
+            available_tools=available_tools,
+            prefix=self._format_message("system", effective_system) if effective_system else None,
+        )
+
+    def render_into(self, buffer: io.StringIO, conversation: Conversation, context: RenderContext) -> None:
+        """Write a conversation in ChatML format into *buffer*."""
+        write = buffer.write
+        inline = context.tool_call_mode == ToolCallMode.INLINE
+        sep = ""
+
+        # -- System prompt --------------------------------------------------
+        if context.prefix:
+            write(context.prefix)
+            sep = "\n"
 
         # -- Conversation turns ---------------------------------------------
         for turn in conversation.turnos:
             role = _ROLE_MAP.get(turn.rol, turn.rol)
 
             # Tool-result turns rendered as function messages
-            if tool_call_mode == ToolCallMode.INLINE and turn.tool_results and role in ("function", "herramienta"):
+            if inline and turn.tool_results and role in ("function", "herramienta"):
                 for result in turn.tool_results:
-                    parts.append(self._format_tool_result(result))
+                    write(sep + self._format_tool_result(result))
+                    sep = "\n"
                 continue
 
             # Regular content
             content = turn.contenido
 
             # Append inline tool calls if enabled
-            if tool_call_mode == ToolCallMode.INLINE and turn.tool_calls and role == "assistant":
+            if inline and turn.tool_calls and role == "assistant":
                 content = self._append_tool_calls(content, turn.tool_calls)
 
-            parts.append(self._format_message(role, content))
-
-        return "\n".join(parts)
+            write(f"{sep}{_IM_START}{role}\n{content}{_IM_END}")
+            sep = "\n"
 
     # -- Private helpers ----------------------------------------------------
 
@@ -15,9 +15,11 @@ import json
 from typing import TYPE_CHECKING, Any
 
 from uncase.templates import get_template_registry
-from uncase.templates.base import BaseChatTemplate, ToolCallMode
+from uncase.templates.base import BaseChatTemplate, RenderContext, ToolCallMode
 
 if TYPE_CHECKING:
+    import io
+
     from uncase.schemas.conversation import Conversation
     from uncase.tools.schemas import ToolCall, ToolDefinition, ToolResult
 
@@ -98,32 +100,53 @@ class HarmonyTemplate(BaseChatTemplate):
         str
             The fully rendered Harmony prompt string.
         """
-        parts: list[str] = []
+        return self._render_compiled(conversation, tool_call_mode, system_prompt, available_tools)
 
-        # -- System prompt --------------------------------------------------
+    def compile(
+        self,
+        tool_call_mode: ToolCallMode = ToolCallMode.NONE,
+        system_prompt: str | None = None,
+        available_tools: list[ToolDefinition] | None = None,
+    ) -> RenderContext:
+        """Pre-render the Harmony system turn (including tool signatures) once."""
         effective_system = self._build_system_prompt(system_prompt, available_tools, tool_call_mode)
-        if effective_system:
-            parts.append(self._format_turn(_SYSTEM, effective_system))
+        return RenderContext(
+            tool_call_mode=tool_call_mode,
+            system_prompt=system_prompt,
+            available_tools=available_tools,
+            prefix=self._format_turn(_SYSTEM, effective_system) if effective_system else None,
+        )
+
+    def render_into(self, buffer: io.StringIO, conversation: Conversation, context: RenderContext) -> None:
+        """Write a conversation in Harmony format into *buffer*."""
+        write = buffer.write
+        inline = context.tool_call_mode == ToolCallMode.INLINE
+        sep = ""
+
+        # -- System prompt --------------------------------------------------
+        if context.prefix:
+            write(context.prefix)
+            sep = "\n"
 
         # -- Conversation turns ---------------------------------------------
         for turn in conversation.turnos:
             role_token = _ROLE_TOKEN_MAP.get(turn.rol, _USER)
 
             # Tool-result turns rendered as system results
-            if tool_call_mode == ToolCallMode.INLINE and turn.tool_results and role_token == _SYSTEM:
+            if inline and turn.tool_results and role_token == _SYSTEM:
                 for result in turn.tool_results:
-                    parts.append(self._format_tool_result(result))
+                    write(sep + self._format_tool_result(result))
+                    sep = "\n"
                 continue
 
             content = turn.contenido
 
             # Append inline tool calls if enabled
-            if tool_call_mode == ToolCallMode.INLINE and turn.tool_calls and role_token == _CHATBOT:
+            if inline and turn.tool_calls and role_token == _CHATBOT:
                 content = self._build_tool_call_content(content, turn.tool_calls)
 
-            parts.append(self._format_turn(role_token, content))
-
-        return "\n".join(parts)
+            write(f"{sep}{_START}{role_token}{content}{_END}")
+            sep = "\n"
 
     # -- Private helpers ----------------------------------------------------
 
@@ -10,9 +10,11 @@ from __future__ import annotations
 import json
 from typing import TYPE_CHECKING
 
-from uncase.templates.base import BaseChatTemplate, ToolCallMode
+from uncase.templates.base import BaseChatTemplate, RenderContext, ToolCallMode
 
 if TYPE_CHECKING:
+    import io
+
     from uncase.schemas.conversation import Conversation, ConversationTurn
     from uncase.tools.schemas import ToolDefinition
 
@@ -105,22 +107,40 @@ class LlamaChatTemplate(BaseChatTemplate):
         available_tools: list[ToolDefinition] | None = None,
     ) -> str:
         """Render a conversation into a Llama 3/4 prompt string."""
-        parts: list[str] = ["<|begin_of_text|>"]
+        return self._render_compiled(conversation, tool_call_mode, system_prompt, available_tools)
 
-        # -- System prompt --------------------------------------------------
+    def compile(
+        self,
+        tool_call_mode: ToolCallMode = ToolCallMode.NONE,
+        system_prompt: str | None = None,
+        available_tools: list[ToolDefinition] | None = None,
+    ) -> RenderContext:
+        """Pre-render ``<|begin_of_text|>`` and the system header (including tools) once."""
         effective_system = system_prompt or ""
         if tool_call_mode == ToolCallMode.INLINE and available_tools:
             tool_block = "\n\nAvailable tools:\n" + _render_tool_definitions(available_tools)
             effective_system += tool_block
 
+        prefix = "<|begin_of_text|>"
         if effective_system:
-            parts.append(f"<|start_header_id|>system<|end_header_id|>\n\n{effective_system}<|eot_id|>")
+            prefix += f"\n<|start_header_id|>system<|end_header_id|>\n\n{effective_system}<|eot_id|>"
+
+        return RenderContext(
+            tool_call_mode=tool_call_mode,
+            system_prompt=system_prompt,
+            available_tools=available_tools,
+            prefix=prefix,
+        )
+
+    def render_into(self, buffer: io.StringIO, conversation: Conversation, context: RenderContext) -> None:
+        """Write a conversation in Llama 3 format into *buffer*."""
+        write = buffer.write
+        write(context.prefix or "")
 
         # -- Conversation turns ---------------------------------------------
         for turn in conversation.turnos:
-            parts.extend(self._render_turn(turn, tool_call_mode))
-
-        return "\n".join(parts)
+            for fragment in self._render_turn(turn, context.tool_call_mode):
+                write("\n" + fragment)
 
     def _render_turn(
         self,
@@ -11,9 +11,11 @@ import json
 import random
 from typing import TYPE_CHECKING
 
-from uncase.templates.base import BaseChatTemplate, ToolCallMode
+from uncase.templates.base import BaseChatTemplate, RenderContext, ToolCallMode
 
 if TYPE_CHECKING:
+    import io
+
     from uncase.schemas.conversation import Conversation, ConversationTurn
     from uncase.tools.schemas import ToolDefinition
 
@@ -107,15 +109,36 @@ class MistralChatTemplate(BaseChatTemplate):
         available_tools: list[ToolDefinition] | None = None,
     ) -> str:
         """Render a conversation into a Mistral v3 prompt string."""
-        # Build effective system prompt
+        return self._render_compiled(conversation, tool_call_mode, system_prompt, available_tools)
+
+    def compile(
+        self,
+        tool_call_mode: ToolCallMode = ToolCallMode.NONE,
+        system_prompt: str | None = None,
+        available_tools: list[ToolDefinition] | None = None,
+    ) -> RenderContext:
+        """Precompile the effective system prompt (embedded in the first ``[INST]`` block) once."""
         effective_system = system_prompt or ""
         if tool_call_mode == ToolCallMode.INLINE and available_tools:
             tool_block = "\n\nAvailable tools:\n" + _render_tool_definitions(available_tools)
             effective_system += tool_block
 
+        return RenderContext(
+            tool_call_mode=tool_call_mode,
+            system_prompt=system_prompt,
+            available_tools=available_tools,
+            extras={"effective_system": effective_system},
+        )
+
+    def render_into(self, buffer: io.StringIO, conversation: Conversation, context: RenderContext) -> None:
+        """Write a conversation in Mistral v3 format into *buffer*."""
+        write = buffer.write
+        tool_call_mode = context.tool_call_mode
+        effective_system: str = context.extras["effective_system"]
+
         # Categorise turns into logical pairs
         turns = conversation.turnos
-        parts: list[str] = []
+        started = False
         idx = 0
 
         # First exchange must start with <s> and may include the system prompt
@@ -151,10 +174,9 @@ class MistralChatTemplate(BaseChatTemplate):
                         continue
                     break
 
-                if not parts:
-                    parts.append(f"<s>[INST] {inst_content} [/INST]{assistant_content}</s>")
-                else:
-                    parts.append(f"[INST] {inst_content} [/INST]{assistant_content}</s>")
+                bos = "" if started else "<s>"
+                write(f"{bos}[INST] {inst_content} [/INST]{assistant_content}</s>")
+                started = True
 
             # -- Assistant turn (tool call or standalone) -------------------
             elif role == "assistant":
@@ -169,25 +191,24 @@ class MistralChatTemplate(BaseChatTemplate):
                     idx += 1
 
                 if tool_result_parts:
-                    parts.append(content)
-                    parts.extend(tool_result_parts)
+                    write(content)
+                    for part in tool_result_parts:
+                        write(part)
                 else:
                     # Standalone assistant in non-first position — unusual but handled
-                    if not parts:
-                        parts.append(f"<s>{content}</s>")
-                    else:
-                        parts.append(f"{content}</s>")
+                    bos = "" if started else "<s>"
+                    write(f"{bos}{content}</s>")
+                started = True
 
             # -- Tool turn (when INLINE, outside of user/assistant flow) ----
             elif role == "tool" and tool_call_mode == ToolCallMode.INLINE:
-                parts.append(self._build_tool_result_content(turns[idx]))
+                write(self._build_tool_result_content(turns[idx]))
+                started = True
                 idx += 1
 
             else:
                 idx += 1
 
-        return "".join(parts)
-
     # -- Helpers ------------------------------------------------------------
 
     def _build_inst_content(
@@ -18,9 +18,11 @@ import json
 from typing import TYPE_CHECKING
 
 from uncase.templates import get_template_registry
-from uncase.templates.base import BaseChatTemplate, ToolCallMode
+from uncase.templates.base import BaseChatTemplate, RenderContext, ToolCallMode
 
 if TYPE_CHECKING:
+    import io
+
     from uncase.schemas.conversation import Conversation
     from uncase.tools.schemas import ToolCall, ToolDefinition, ToolResult
 
@@ -121,12 +123,33 @@ class MoonshotTemplate(BaseChatTemplate):
         str
             The fully rendered Moonshot prompt string.
         """
-        parts: list[str] = []
+        return self._render_compiled(conversation, tool_call_mode, system_prompt, available_tools)
 
-        # -- System prompt --------------------------------------------------
+    def compile(
+        self,
+        tool_call_mode: ToolCallMode = ToolCallMode.NONE,
+        system_prompt: str | None = None,
+        available_tools: list[ToolDefinition] | None = None,
+    ) -> RenderContext:
+        """Pre-render the Moonshot system block (including tool definitions) once."""
         effective_system = self._build_system_prompt(system_prompt, available_tools, tool_call_mode)
-        if effective_system:
-            parts.append(f"{_IM_SYSTEM}{effective_system}{_IM_END}")
+        return RenderContext(
+            tool_call_mode=tool_call_mode,
+            system_prompt=system_prompt,
+            available_tools=available_tools,
+            prefix=f"{_IM_SYSTEM}{effective_system}{_IM_END}" if effective_system else None,
+        )
+
+    def render_into(self, buffer: io.StringIO, conversation: Conversation, context: RenderContext) -> None:
+        """Write a conversation in Moonshot format into *buffer*."""
+        write = buffer.write
+        inline = context.tool_call_mode == ToolCallMode.INLINE
+        sep = ""
+
+        # -- System prompt --------------------------------------------------
+        if context.prefix:
+            write(context.prefix)
+            sep = "\n"
 
         # -- Conversation turns ---------------------------------------------
         prev_role: str | None = None
@@ -135,29 +158,30 @@ class MoonshotTemplate(BaseChatTemplate):
             role = _ROLE_MAP.get(turn.rol, turn.rol)
 
             # Tool-result turns rendered as tool messages
-            if tool_call_mode == ToolCallMode.INLINE and turn.tool_results and role in ("tool", "herramienta"):
+            if inline and turn.tool_results and role in ("tool", "herramienta"):
                 for result in turn.tool_results:
-                    parts.append(self._format_tool_result(result))
+                    write(sep + self._format_tool_result(result))
+                    sep = "\n"
                 prev_role = "tool"
                 continue
 
             # Insert middle token before assistant turns
             if role == "assistant" and prev_role != "assistant":
-                parts.append(_IM_MIDDLE)
+                write(sep + _IM_MIDDLE)
+                sep = "\n"
 
             # Build content
             content = turn.contenido
             start_token = _ROLE_TOKEN_MAP.get(role, f"<|im_{role}|>")
 
             # Append inline tool calls if enabled
-            if tool_call_mode == ToolCallMode.INLINE and turn.tool_calls and role == "assistant":
+            if inline and turn.tool_calls and role == "assistant":
                 content = self._append_tool_calls(content, turn.tool_calls)
 
-            parts.append(f"{start_token}{content}{_IM_END}")
+            write(f"{sep}{start_token}{content}{_IM_END}")
+            sep = "\n"
             prev_role = role
 
-        return "\n".join(parts)
-
     # -- Private helpers ----------------------------------------------------
 
     @staticmethod
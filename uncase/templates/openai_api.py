@@ -22,9 +22,11 @@ import json
 from typing import TYPE_CHECKING, Any
 
 from uncase.templates import get_template_registry
-from uncase.templates.base import BaseChatTemplate, ToolCallMode
+from uncase.templates.base import BaseChatTemplate, RenderContext, ToolCallMode
 
 if TYPE_CHECKING:
+    import io
+
     from uncase.schemas.conversation import Conversation
     from uncase.tools.schemas import ToolCall, ToolDefinition, ToolResult
 
@@ -100,24 +102,50 @@ class OpenAIAPITemplate(BaseChatTemplate):
         str
             A valid JSON string representing the conversation.
         """
+        return self._render_compiled(conversation, tool_call_mode, system_prompt, available_tools)
+
+    def compile(
+        self,
+        tool_call_mode: ToolCallMode = ToolCallMode.NONE,
+        system_prompt: str | None = None,
+        available_tools: list[ToolDefinition] | None = None,
+    ) -> RenderContext:
+        """Pre-serialize the top-level ``"tools"`` member once per batch."""
+        tools_member: str | None = None
+        if tool_call_mode == ToolCallMode.INLINE and available_tools:
+            tools = [self._build_tool_definition(t) for t in available_tools]
+            # Strip the enclosing "{\n" / "\n}" so the member can be spliced
+            # into each conversation's object at the same indentation level.
+            tools_member = json.dumps({"tools": tools}, ensure_ascii=False, indent=2)[2:-2]
+
+        return RenderContext(
+            tool_call_mode=tool_call_mode,
+            system_prompt=system_prompt,
+            available_tools=available_tools,
+            extras={"tools_member": tools_member},
+        )
+
+    def render_into(self, buffer: io.StringIO, conversation: Conversation, context: RenderContext) -> None:
+        """Write a conversation as an OpenAI API JSON object into *buffer*."""
+        inline = context.tool_call_mode == ToolCallMode.INLINE
         messages: list[dict[str, Any]] = []
 
         # -- System prompt --------------------------------------------------
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
+        if context.system_prompt:
+            messages.append({"role": "system", "content": context.system_prompt})
 
         # -- Conversation turns ---------------------------------------------
         for turn in conversation.turnos:
             role = _ROLE_MAP.get(turn.rol, turn.rol)
 
             # Tool-result turns rendered as tool messages
-            if tool_call_mode == ToolCallMode.INLINE and turn.tool_results and role in ("tool", "herramienta"):
+            if inline and turn.tool_results and role in ("tool", "herramienta"):
                 for result in turn.tool_results:
                     messages.append(self._build_tool_result_message(result))
                 continue
 
             # Assistant turn with tool calls
-            if tool_call_mode == ToolCallMode.INLINE and turn.tool_calls and role == "assistant":
+            if inline and turn.tool_calls and role == "assistant":
                 messages.append(self._build_assistant_tool_call_message(turn.tool_calls))
                 continue
 
@@ -125,13 +153,14 @@ class OpenAIAPITemplate(BaseChatTemplate):
             messages.append({"role": role, "content": turn.contenido})
 
         # -- Build output object --------------------------------------------
-        output: dict[str, Any] = {"messages": messages}
-
-        # Add tools definitions at top level when available
-        if tool_call_mode == ToolCallMode.INLINE and available_tools:
-            output["tools"] = [self._build_tool_definition(t) for t in available_tools]
-
-        return json.dumps(output, ensure_ascii=False, indent=2)
+        body = json.dumps({"messages": messages}, ensure_ascii=False, indent=2)
+
+        # Add the precompiled tools definitions at top level when available
+        tools_member: str | None = context.extras.get("tools_member")
+        if tools_member is None:
+            buffer.write(body)
+        else:
+            buffer.write(f"{body[:-2]},\n{tools_member}\n}}")
 
     # -- Private helpers ----------------------------------------------------
 
@@ -10,9 +10,11 @@ from __future__ import annotations
 import json
 from typing import TYPE_CHECKING
 
-from uncase.templates.base import BaseChatTemplate, ToolCallMode
+from uncase.templates.base import BaseChatTemplate, RenderContext, ToolCallMode
 
 if TYPE_CHECKING:
+    import io
+
     from uncase.schemas.conversation import Conversation, ConversationTurn
     from uncase.tools.schemas import ToolDefinition
 
@@ -117,21 +119,41 @@ class QwenChatTemplate(BaseChatTemplate):
         available_tools: list[ToolDefinition] | None = None,
     ) -> str:
         """Render a conversation into a Qwen 3 prompt string."""
-        parts: list[str] = []
+        return self._render_compiled(conversation, tool_call_mode, system_prompt, available_tools)
 
-        # -- System prompt --------------------------------------------------
+    def compile(
+        self,
+        tool_call_mode: ToolCallMode = ToolCallMode.NONE,
+        system_prompt: str | None = None,
+        available_tools: list[ToolDefinition] | None = None,
+    ) -> RenderContext:
+        """Pre-render the Qwen system block (including ``<tools>`` definitions) once."""
         effective_system = system_prompt or ""
         if tool_call_mode == ToolCallMode.INLINE and available_tools:
             effective_system += _render_tool_definitions(available_tools)
 
-        if effective_system:
-            parts.append(f"<|im_start|>system\n{effective_system}<|im_end|>")
+        return RenderContext(
+            tool_call_mode=tool_call_mode,
+            system_prompt=system_prompt,
+            available_tools=available_tools,
+            prefix=f"<|im_start|>system\n{effective_system}<|im_end|>" if effective_system else None,
+        )
+
+    def render_into(self, buffer: io.StringIO, conversation: Conversation, context: RenderContext) -> None:
+        """Write a conversation in Qwen format into *buffer*."""
+        write = buffer.write
+        sep = ""
+
+        # -- System prompt --------------------------------------------------
+        if context.prefix:
+            write(context.prefix)
+            sep = "\n"
 
         # -- Conversation turns ---------------------------------------------
         for turn in conversation.turnos:
-            parts.extend(self._render_turn(turn, tool_call_mode))
-
-        return "\n".join(parts)
+            for fragment in self._render_turn(turn, context.tool_call_mode):
+                write(sep + fragment)
+                sep = "\n"
 
     def _render_turn(
         self,
@@ -0,0 +1,450 @@
+"""Token accounting for rendered templates.
+
+Counts the exact number of tokens a rendered conversation occupies for a
+given tokenizer, so over-length samples can be dropped or truncated before
+they reach training.
+
+Two tokenizer families are supported:
+
+* HuggingFace tokenizers (``transformers`` when installed, otherwise the
+  lighter ``tokenizers`` package) — spec is the model ID, e.g.
+  ``"meta-llama/Llama-3.1-8B"``. Repository code is never executed.
+* tiktoken BPE encodings (``uncase[tokens]``) — spec
+  ``"tiktoken:<encoding>"``, e.g. ``"tiktoken:cl100k_base"``. Set
+  ``TIKTOKEN_CACHE_DIR`` to load the BPE files from a local directory in
+  air-gapped deployments.
+
+Specs are trusted input: API callers are restricted to the server's
+``TEMPLATE_TOKENIZERS`` allowlist by :func:`check_tokenizer_allowed`.
+
+Counts are cached by a hash of the text content, so re-rendering the same
+corpus into several templates only tokenizes each distinct string once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Literal
+
+import structlog
+
+from uncase.exceptions import MLDependencyError, ValidationError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    from uncase.schemas.conversation import Conversation
+
+logger = structlog.get_logger(__name__)
+
+OverLengthPolicy = Literal["keep", "drop", "truncate"]
+
+_TIKTOKEN_PREFIX = "tiktoken:"
+
+
+# ---------------------------------------------------------------------------
+# Token counters
+# ---------------------------------------------------------------------------
+
+
+class TokenCounter(ABC):
+    """Counts tokens for batches of texts with one specific tokenizer."""
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Identifier of the underlying tokenizer."""
+
+    @abstractmethod
+    def count_batch(self, texts: Sequence[str]) -> list[int]:
+        """Return the token count of every text in *texts*.
+
+        Parameters
+        ----------
+        texts:
+            Texts to tokenize.
+
+        Returns
+        -------
+        list[int]
+            Token counts, one per text, in input order.
+        """
+
+
+class HFTokenCounter(TokenCounter):
+    """Token counter backed by a HuggingFace tokenizer.
+
+    Accepts either a ``transformers`` tokenizer or a raw ``tokenizers.Tokenizer``.
+    Special tokens are not added: rendered templates already contain them.
+    """
+
+    def __init__(self, tokenizer: Any, name: str | None = None) -> None:
+        self._tokenizer = tokenizer
+        self._name = name or str(getattr(tokenizer, "name_or_path", type(tokenizer).__name__))
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @classmethod
+    def from_pretrained(cls, model_id: str) -> HFTokenCounter:
+        """Load the tokenizer of *model_id* from the HuggingFace Hub or a local path.
+
+        Raises
+        ------
+        MLDependencyError
+            If neither ``transformers`` nor ``tokenizers`` is installed.
+        """
+        try:
+            from transformers import AutoTokenizer
+        except ImportError:
+            try:
+                from tokenizers import Tokenizer
+            except ImportError as exc:
+                msg = "transformers or tokenizers is required for HuggingFace token counting"
+                raise MLDependencyError(msg) from exc
+            return cls(Tokenizer.from_pretrained(model_id), name=model_id)
+
+        return cls(AutoTokenizer.from_pretrained(model_id), name=model_id)
+
+    def count_batch(self, texts: Sequence[str]) -> list[int]:
+        if not texts:
+            return []
+        if hasattr(self._tokenizer, "encode_batch"):
+            # Raw ``tokenizers.Tokenizer`` (Rust batch encoder)
+            encodings = self._tokenizer.encode_batch(list(texts), add_special_tokens=False)
+            return [len(e.ids) for e in encodings]
+        encoded = self._tokenizer(list(texts), add_special_tokens=False)
+        return [len(ids) for ids in encoded["input_ids"]]
+
+
+class TiktokenCounter(TokenCounter):
+    """Token counter backed by a tiktoken BPE encoding.
+
+    Template special tokens (``<|im_start|>`` etc.) are counted as ordinary
+    text, since tiktoken encodings only know their own special tokens.
+    """
+
+    def __init__(self, encoding: Any) -> None:
+        self._encoding = encoding
+
+    @property
+    def name(self) -> str:
+        return f"{_TIKTOKEN_PREFIX}{self._encoding.name}"
+
+    @classmethod
+    def from_encoding_name(cls, encoding_name: str) -> TiktokenCounter:
+        """Load a named tiktoken encoding (e.g. ``cl100k_base``).
+
+        Raises
+        ------
+        MLDependencyError
+            If ``tiktoken`` is not installed.
+        """
+        try:
+            import tiktoken
+        except ImportError as exc:
+            msg = "tiktoken is required for 'tiktoken:' tokenizers. Install with: pip install 'uncase[tokens]'"
+            raise MLDependencyError(msg) from exc
+
+        return cls(tiktoken.get_encoding(encoding_name))
+
+    def count_batch(self, texts: Sequence[str]) -> list[int]:
+        if not texts:
+            return []
+        return [len(ids) for ids in self._encoding.encode_ordinary_batch(list(texts))]
+
+
+def is_tiktoken_spec(spec: str) -> bool:
+    """Whether *spec* names a tiktoken encoding rather than a HuggingFace tokenizer."""
+    return spec.startswith(_TIKTOKEN_PREFIX)
+
+
+def check_tokenizer_allowed(spec: str, allowed: Sequence[str]) -> str:
+    """Return *spec* if it is in the *allowed* tokenizer specs.
+
+    Raises
+    ------
+    ValidationError
+        If *spec* is not allowed.
+    """
+    if spec not in allowed:
+        raise ValidationError(f"Tokenizer '{spec}' is not enabled on this server. Allowed: {', '.join(allowed)}")
+    return spec
+
+
+@lru_cache(maxsize=8)
+def load_token_counter(spec: str) -> TokenCounter:
+    """Load (and memoize) the token counter described by *spec*.
+
+    Parameters
+    ----------
+    spec:
+        ``"tiktoken:<encoding>"`` or a HuggingFace model ID / local path.
+
+    Returns
+    -------
+    TokenCounter
+        The loaded counter, shared across calls with the same spec.
+
+    Raises
+    ------
+    ValidationError
+        If the tokenizer cannot be loaded.
+    MLDependencyError
+        If the tokenizer library for *spec* is not installed.
+    """
+    try:
+        if is_tiktoken_spec(spec):
+            return TiktokenCounter.from_encoding_name(spec.removeprefix(_TIKTOKEN_PREFIX))
+        return HFTokenCounter.from_pretrained(spec)
+    except MLDependencyError:
+        raise
+    except Exception as exc:
+        raise ValidationError(f"Could not load tokenizer '{spec}': {exc}") from exc
+
+
+# ---------------------------------------------------------------------------
+# Accounting
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ConversationTokenCount:
+    """Token usage of one rendered conversation.
+
+    Attributes
+    ----------
+    conversation_id:
+        ID of the conversation.
+    total_tokens:
+        Tokens of the fully rendered text (turns, system prompt, template markup).
+    turn_tokens:
+        Tokens of each turn's content, in turn order.
+    """
+
+    conversation_id: str
+    total_tokens: int
+    turn_tokens: list[int] = field(default_factory=list)
+
+    @property
+    def template_overhead(self) -> int:
+        """Tokens spent on template markup and the system prompt."""
+        return self.total_tokens - sum(self.turn_tokens)
+
+
+@dataclass
+class LengthFilterResult:
+    """Outcome of applying a max-length policy to a set of conversations.
+
+    Attributes
+    ----------
+    kept:
+        ``(conversation, rendered text, token count)`` for every conversation
+        that fits, possibly truncated, in input order.
+    dropped:
+        IDs of conversations removed because they did not fit.
+    truncated:
+        IDs of conversations shortened by removing trailing turns.
+    """
+
+    kept: list[tuple[Conversation, str, int]] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
+    truncated: list[str] = field(default_factory=list)
+
+
+class TokenAccountant:
+    """Batch token counting with an LRU cache keyed by content hash.
+
+    Usage::
+
+        accountant = TokenAccountant(load_token_counter("tiktoken:cl100k_base"))
+        counts = accountant.count(template.render_batch(conversations))
+    """
+
+    def __init__(self, counter: TokenCounter, *, cache_size: int = 100_000) -> None:
+        self._counter = counter
+        self._cache: OrderedDict[bytes, int] = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def counter(self) -> TokenCounter:
+        """The underlying token counter."""
+        return self._counter
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def count(self, texts: Sequence[str]) -> list[int]:
+        """Return token counts for *texts*, tokenizing only uncached content.
+
+        Parameters
+        ----------
+        texts:
+            Texts to count.
+
+        Returns
+        -------
+        list[int]
+            Token counts, one per text, in input order.
+        """
+        results = [0] * len(texts)
+        pending: dict[bytes, list[int]] = {}
+        keys = [self._key(text) for text in texts]
+        with self._lock:
+            for index, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is None:
+                    pending.setdefault(key, []).append(index)
+                else:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    results[index] = cached
+
+        if not pending:
+            return results
+
+        # Tokenize outside the lock; accountants are shared across request threads
+        counts = self._counter.count_batch([texts[indices[0]] for indices in pending.values()])
+        with self._lock:
+            self.misses += len(pending)
+            for (key, indices), value in zip(pending.items(), counts, strict=True):
+                self._cache[key] = value
+                for index in indices:
+                    results[index] = value
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+        return results
+
+    def count_conversations(
+        self,
+        conversations: Sequence[Conversation],
+        rendered: Sequence[str],
+    ) -> list[ConversationTokenCount]:
+        """Compute per-conversation and per-turn token counts.
+
+        Parameters
+        ----------
+        conversations:
+            The conversations.
+        rendered:
+            Their rendered texts (same order), e.g. from ``template.iter_render``.
+
+        Returns
+        -------
+        list[ConversationTokenCount]
+            One entry per conversation.
+        """
+        totals = self.count(rendered)
+        turn_counts = iter(self.count([turn.contenido for conv in conversations for turn in conv.turnos]))
+        return [
+            ConversationTokenCount(
+                conversation_id=conv.conversation_id,
+                total_tokens=total,
+                turn_tokens=[next(turn_counts) for _ in conv.turnos],
+            )
+            for conv, total in zip(conversations, totals, strict=True)
+        ]
+
+    def fit(
+        self,
+        conversations: Iterable[Conversation],
+        render: Callable[[Iterable[Conversation]], Iterable[str]],
+        *,
+        max_tokens: int | None,
+        policy: OverLengthPolicy = "drop",
+    ) -> LengthFilterResult:
+        """Render, count, and apply a max-length policy to *conversations*.
+
+        Parameters
+        ----------
+        conversations:
+            Conversations to render.
+        render:
+            Renders an iterable of conversations lazily, e.g.
+            ``functools.partial(template.iter_render, context=context)``.
+        max_tokens:
+            Maximum rendered length in tokens. ``None`` disables filtering.
+        policy:
+            ``keep`` leaves over-length conversations untouched, ``drop``
+            removes them, ``truncate`` removes trailing turns until the
+            conversation fits (dropping it if even the first turn does not).
+
+        Returns
+        -------
+        LengthFilterResult
+            Kept conversations with their rendered text and token counts.
+        """
+        conversations = list(conversations)
+        rendered = list(render(conversations))
+        counts = self.count(rendered)
+        result = LengthFilterResult()
+
+        for conv, text, tokens in zip(conversations, rendered, counts, strict=True):
+            if max_tokens is None or tokens <= max_tokens or policy == "keep":
+                result.kept.append((conv, text, tokens))
+            elif policy == "truncate" and (fitted := self._truncate(conv, render, max_tokens)) is not None:
+                result.kept.append(fitted)
+                result.truncated.append(conv.conversation_id)
+            else:
+                result.dropped.append(conv.conversation_id)
+
+        if result.dropped or result.truncated:
+            logger.info(
+                "token_length_policy_applied",
+                tokenizer=self._counter.name,
+                max_tokens=max_tokens,
+                policy=policy,
+                kept=len(result.kept),
+                dropped=len(result.dropped),
+                truncated=len(result.truncated),
+            )
+        return result
+
+    def _truncate(
+        self,
+        conversation: Conversation,
+        render: Callable[[Iterable[Conversation]], Iterable[str]],
+        max_tokens: int,
+    ) -> tuple[Conversation, str, int] | None:
+        """Keep the longest prefix of turns that fits in *max_tokens* (binary search)."""
+        best: tuple[Conversation, str, int] | None = None
+        low, high = 1, len(conversation.turnos) - 1
+        while low <= high:
+            mid = (low + high) // 2
+            candidate = conversation.model_copy(update={"turnos": conversation.turnos[:mid]})
+            text = next(iter(render([candidate])))
+            tokens = self.count([text])[0]
+            if tokens <= max_tokens:
+                best = (candidate, text, tokens)
+                low = mid + 1
+            else:
+                high = mid - 1
+        return best
+
+
+@lru_cache(maxsize=8)
+def get_token_accountant(spec: str) -> TokenAccountant:
+    """Return the process-wide :class:`TokenAccountant` for tokenizer *spec*.
+
+    Sharing one accountant per tokenizer lets the content-hash cache carry
+    over between requests.
+
+    Raises
+    ------
+    ValidationError
+        If the tokenizer cannot be loaded.
+    MLDependencyError
+        If the tokenizer library for *spec* is not installed.
+    """
+    return TokenAccountant(load_token_counter(spec))